@@ -6,10 +6,24 @@ from hooqu.analyzers.analyzer import (
 )
 from hooqu.analyzers.completeness import Completeness
 from hooqu.analyzers.compliance import Compliance
-from hooqu.analyzers.grouping_analyzers import FrequenciesAndNumRows
+from hooqu.analyzers.correlation import Correlation, CorrelationState
+from hooqu.analyzers.count_distinct import CountDistinct
+from hooqu.analyzers.data_type import DataType, DataTypeHistogram, DataTypeInstance
+from hooqu.analyzers.distinctness import Distinctness
+from hooqu.analyzers.drift import Drift
+from hooqu.analyzers.entropy import Entropy
+from hooqu.analyzers.grouping_analyzers import (
+    ApproxCountDistinct,
+    ApproxCountDistinctState,
+    FrequenciesAndNumRows,
+    TopK,
+    TopKState,
+)
+from hooqu.analyzers.histogram import Histogram, HistogramState
 from hooqu.analyzers.maximum import Maximum, MaxState
 from hooqu.analyzers.mean import Mean, MeanState
 from hooqu.analyzers.minimum import Minimum, MinState
+from hooqu.analyzers.mutual_information import MutualInformation
 from hooqu.analyzers.pattern_match import PatternMatch
 from hooqu.analyzers.quantile import Quantile, QuantileState
 from hooqu.analyzers.size import NumMatches, Size
@@ -39,6 +53,22 @@ __all__ = [
     "SumState",
     "StandardDeviationState",
     "Uniqueness",
+    "Distinctness",
+    "CountDistinct",
+    "Entropy",
+    "MutualInformation",
     "FrequenciesAndNumRows",
+    "ApproxCountDistinct",
+    "ApproxCountDistinctState",
+    "TopK",
+    "TopKState",
+    "Histogram",
+    "HistogramState",
+    "Drift",
+    "Correlation",
+    "CorrelationState",
+    "DataType",
+    "DataTypeHistogram",
+    "DataTypeInstance",
     "PatternMatch",
 ]
@@ -1,7 +1,7 @@
 import logging
 import traceback
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
     Callable,
     Generic,
@@ -14,6 +14,9 @@ from typing import (
     Union,
 )
 
+import numpy as np
+
+from hooqu.backends import backend_for
 from hooqu.dataframe import DataFrameLike
 from hooqu.metrics import DoubleMetric, Entity, Metric
 from tryingsnake import Failure, Success
@@ -104,19 +107,26 @@ class Analyzer(ABC, Generic[S, M]):
         except (ValueError, KeyError) as ex:
             return self.to_failure_metric(ex)
 
-        # TODO: deal with aggregate_with
-        # TODO: deal save_states_with
-
         try:
-            state = self.compute_state_from(data)
+            state = backend_for(data).compute_state(self, data)
         except Exception as e:
             return self.to_failure_metric(e)
 
         return self.calculate_metric(state, aggregate_with, save_states_with)
 
     def calculate_metric(self, state, aggregate_with, save_states_with) -> M:
-        # TODO: deal with state
-        # TODO: deal with aggregate_with
+        """
+        Computes the metric from the state, merged with the state loaded from
+        ``aggregate_with`` (if any). The resulting state is persisted with
+        ``save_states_with`` (if any).
+        """
+        if aggregate_with is not None:
+            loaded = aggregate_with.load(self)
+            if loaded is not None:
+                state = loaded if state is None else state.sum(loaded)
+
+        if state is not None and save_states_with is not None:
+            save_states_with.persist(self, state)
 
         return self.compute_metric_from(state)
 
@@ -132,7 +142,7 @@ class Analyzer(ABC, Generic[S, M]):
     def __eq__(self, other):
         return (
             isinstance(other, Analyzer)
-            and self.name == self.name
+            and self.name == other.name
             and self.instance == other.instance
             and self.entity == other.entity
             and self.where == other.where
@@ -308,10 +318,35 @@ class NumMatchesAndCount(DoubledValuedState["NumMatchesAndCount"]):
 
     num_matches: int
     count: int
+    # the outcome of each row, kept by the row level analyzers when requested
+    # (see RowLevelAnalyzer)
+    full_column: Optional[np.ndarray] = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_row_outcomes(
+        cls, matches: np.ndarray, selected: Optional[np.ndarray] = None
+    ) -> "NumMatchesAndCount":
+        """
+        The state of the rows matching a condition, keeping the outcome of
+        each row. The rows not ``selected`` by the filter of the analyzer are
+        not counted and pass.
+        """
+        if selected is None:
+            return cls(int(np.count_nonzero(matches)), len(matches), matches)
+        return cls(
+            int(np.count_nonzero(matches & selected)),
+            int(np.count_nonzero(selected)),
+            matches | ~selected,
+        )
 
     def sum(self, other: "NumMatchesAndCount") -> "NumMatchesAndCount":
+        full_column = None
+        if self.full_column is not None and other.full_column is not None:
+            full_column = np.concatenate([self.full_column, other.full_column])
         return NumMatchesAndCount(
-            self.num_matches + other.num_matches, self.count + other.count
+            self.num_matches + other.num_matches,
+            self.count + other.count,
+            full_column,
         )
 
     def metric_value(self) -> float:
@@ -321,6 +356,27 @@ class NumMatchesAndCount(DoubledValuedState["NumMatchesAndCount"]):
         return self.num_matches / self.count
 
 
+class RowLevelAnalyzer(ABC):
+    """
+    Analyzer of the fraction of the rows matching a condition, that can keep
+    the outcome of each row in its state (``NumMatchesAndCount.full_column``)
+    to split the rows passing its constraints from the other ones.
+    """
+
+    where: Optional[str]
+
+    @abstractmethod
+    def row_matches(self, data: DataFrameLike) -> np.ndarray:
+        """Whether each row of the data matches the condition"""
+        pass
+
+    def row_level_state_from(self, data: DataFrameLike) -> NumMatchesAndCount:
+        selected = None
+        if self.where is not None:
+            selected = data.eval(self.where).to_numpy(dtype=bool)
+        return NumMatchesAndCount.from_row_outcomes(self.row_matches(data), selected)
+
+
 class GroupingAnalyzer(Analyzer[S, M]):
     @property
     @abstractmethod
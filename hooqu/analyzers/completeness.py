@@ -2,13 +2,16 @@
 
 from typing import Callable, List, Optional
 
+import numpy as np
+
 from hooqu.analyzers.analyzer import (AggDefinition, NumMatchesAndCount,
+                                      RowLevelAnalyzer,
                                       StandardScanShareableAnalyzer)
 from hooqu.analyzers.preconditions import has_column
 from hooqu.dataframe import DataFrameLike, count_all, count_not_null
 
 
-class Completeness(StandardScanShareableAnalyzer[NumMatchesAndCount]):
+class Completeness(StandardScanShareableAnalyzer[NumMatchesAndCount], RowLevelAnalyzer):
     def __init__(self, column: str, where: Optional[str] = None):
         super().__init__("Completeness", column, where=where)
 
@@ -27,6 +30,9 @@ class Completeness(StandardScanShareableAnalyzer[NumMatchesAndCount]):
     def _aggregation_functions(self, where: Optional[str] = None) -> AggDefinition:
         return {self.instance: {count_not_null, count_all}}
 
+    def row_matches(self, data: DataFrameLike) -> np.ndarray:
+        return data[self.instance].notna().to_numpy()
+
     def additional_preconditions(self) -> List[Callable[[DataFrameLike], None]]:
         # TODO: does it make sense to implement is_not_nested?
         return [has_column(self.instance)]
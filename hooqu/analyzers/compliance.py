@@ -1,10 +1,17 @@
 from typing import Optional
 
-from hooqu.analyzers.analyzer import Entity, NonScanAnalyzer, NumMatchesAndCount
+import numpy as np
+
+from hooqu.analyzers.analyzer import (
+    Entity,
+    NonScanAnalyzer,
+    NumMatchesAndCount,
+    RowLevelAnalyzer,
+)
 from hooqu.dataframe import DataFrameLike
 
 
-class Compliance(NonScanAnalyzer[NumMatchesAndCount]):
+class Compliance(NonScanAnalyzer[NumMatchesAndCount], RowLevelAnalyzer):
     """
     Compliance is a measure of the fraction of rows that complies with the given
     column constraint.
@@ -39,6 +46,10 @@ class Compliance(NonScanAnalyzer[NumMatchesAndCount]):
         matches = result.sum()
         return NumMatchesAndCount(matches, count)
 
+    def row_matches(self, dataframe: DataFrameLike) -> np.ndarray:
+        result = np.asarray(dataframe.eval(self.predicate), dtype=bool)
+        return np.broadcast_to(result, (len(dataframe),))
+
     def __eq__(self, other):
         # I have to re-implement again this because
         # I am inheriting from a data class with default values and I cannot
@@ -0,0 +1,172 @@
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hooqu.analyzers.analyzer import (
+    AggDefinition,
+    DoubledValuedState,
+    StandardScanShareableAnalyzer,
+)
+from hooqu.analyzers.preconditions import has_column, is_numeric
+from hooqu.dataframe import DataFrameLike
+from hooqu.metrics import Entity
+
+
+@dataclass(frozen=True)
+class CorrelationState(DoubledValuedState["CorrelationState"]):
+    """
+    Number of rows where both columns have a value, the means of the columns
+    and their co-moment (sum of the products of the deviations from the means)
+    and moments on those rows. States are merged with the pairwise formulas of
+    ``StandardDeviationState``.
+    """
+
+    n: float
+    x_avg: float
+    y_avg: float
+    ck: float
+    x_mk: float
+    y_mk: float
+
+    def sum(self, other: "CorrelationState") -> "CorrelationState":
+        n = self.n + other.n
+        dx = other.x_avg - self.x_avg
+        dy = other.y_avg - self.y_avg
+        weight = self.n * other.n / n
+        return CorrelationState(
+            n,
+            self.x_avg + dx * other.n / n,
+            self.y_avg + dy * other.n / n,
+            self.ck + other.ck + dx * dy * weight,
+            self.x_mk + other.x_mk + dx * dx * weight,
+            self.y_mk + other.y_mk + dy * dy * weight,
+        )
+
+    def metric_value(self) -> float:
+        denominator = math.sqrt(self.x_mk * self.y_mk)
+        if denominator == 0.0:
+            return float("nan")
+        return self.ck / denominator
+
+
+def comoment_states(
+    block: np.ndarray, pairs: Sequence[Tuple[int, int]]
+) -> List[Optional[CorrelationState]]:
+    """
+    The states of the pairs of columns (given by their index) of a two
+    dimensional block of floats, where NaN are missing values.
+
+    The moments of all the pairs are computed at once from three matrix
+    products of the block, each pair only using the rows where both of its
+    columns have a value. The columns are centered first, so the products do
+    not lose precision on large values.
+    """
+    present = ~np.isnan(block)
+    counts = present.sum(axis=0)
+    totals = np.nansum(block, axis=0)
+    means = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+    centered = np.where(present, block - means, 0.0)
+    weights = present.astype(np.float64)
+
+    n = weights.T @ weights  # rows where both columns have a value
+    sums = centered.T @ weights  # sums[i, j]: sum of column i on those rows
+    products = centered.T @ centered
+    squares = (centered * centered).T @ weights
+
+    states: List[Optional[CorrelationState]] = []
+    for i, j in pairs:
+        rows = n[i, j]
+        if rows == 0:
+            states.append(None)
+            continue
+        x_sum, y_sum = sums[i, j], sums[j, i]
+        states.append(
+            CorrelationState(
+                int(rows),
+                float(means[i] + x_sum / rows),
+                float(means[j] + y_sum / rows),
+                float(products[i, j] - x_sum * y_sum / rows),
+                float(squares[i, j] - x_sum * x_sum / rows),
+                float(squares[j, i] - y_sum * y_sum / rows),
+            )
+        )
+    return states
+
+
+def correlation_states(
+    columns: Mapping[str, np.ndarray], analyzers: Sequence["Correlation"]
+) -> Dict["Correlation", Optional[CorrelationState]]:
+    """
+    The states of the correlations of (already filtered) columns, computed in a
+    single batch over the block of all the columns of the analyzers.
+    """
+    names = list(dict.fromkeys(c for an in analyzers for c in an.columns))
+    block = np.column_stack([np.asarray(columns[c], dtype=np.float64) for c in names])
+    index = {c: i for i, c in enumerate(names)}
+    pairs = [(index[an.first], index[an.second]) for an in analyzers]
+    return dict(zip(analyzers, comoment_states(block, pairs)))
+
+
+def frame_correlation_states(
+    data: DataFrameLike, analyzers: Sequence["Correlation"]
+) -> Dict["Correlation", Optional[CorrelationState]]:
+    """``correlation_states`` of analyzers with the same filter on a DataFrame"""
+    where = analyzers[0].where
+    if where is not None:
+        data = data.query(where)
+    columns = {
+        c: data[c].to_numpy(dtype=np.float64, na_value=np.nan)
+        for an in analyzers
+        for c in an.columns
+    }
+    return correlation_states(columns, analyzers)
+
+
+class Correlation(StandardScanShareableAnalyzer[CorrelationState]):
+    """
+    Pearson correlation coefficient of two numeric columns, on the rows where
+    both have a value. It is computed in a single pass and states of different
+    data can be merged; the correlations of several pairs of columns are
+    computed together by the backends from the moments of the stacked columns.
+
+    Parameters:
+    -----------
+
+    first, second:
+        Columns in DataFrameLike whose correlation is computed.
+
+    where:
+         Additional filter to apply before the analyzer is run.
+    """
+
+    def __init__(self, first: str, second: str, where: Optional[str] = None):
+        super().__init__(
+            "Correlation", f"{first},{second}", Entity.MULTICOLUMN, where=where
+        )
+        self.first = first
+        self.second = second
+
+    @property
+    def columns(self) -> Tuple[str, str]:
+        return self.first, self.second
+
+    def compute_state_from(self, data: DataFrameLike) -> Optional[CorrelationState]:
+        return frame_correlation_states(data, [self])[self]
+
+    def _aggregation_functions(self, where: Optional[str] = None) -> AggDefinition:
+        # the moments are computed by compute_state_from
+        return {}
+
+    def from_aggregation_result(
+        self, result: DataFrameLike, offset: int = 0
+    ) -> Optional[CorrelationState]:
+        raise NotImplementedError("The state is computed by compute_state_from")
+
+    def additional_preconditions(self) -> List[Callable[[DataFrameLike], None]]:
+        return [
+            precondition
+            for c in self.columns
+            for precondition in (has_column(c), is_numeric(c))
+        ]
@@ -0,0 +1,33 @@
+# coding: utf-8
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from .analyzer import COUNT_COL, AggDefinition
+from .grouping_analyzers import ScanShareableFrequencyBasedAnalyzer
+
+
+@dataclass
+class _CountDistinctDataClassMixin:
+    columns: Sequence[str]
+    where: Optional[str]
+
+
+class CountDistinct(ScanShareableFrequencyBasedAnalyzer, _CountDistinctDataClassMixin):
+    """
+    Number of distinct values of a column(s), counted exactly (see
+    ``ApproxCountDistinct`` for an estimation with a bounded memory).
+    """
+
+    def __init__(self, columns: Sequence[str], where: Optional[str] = None):
+        super().__init__("CountDistinct", columns)
+        self.columns = columns
+        self.where = where
+
+    def _aggregation_functions(self, num_rows: int) -> AggDefinition:
+        def count_distinct_aggregation(s, groups=None):
+            if groups is not None:
+                return groups.sum()
+            return len(s)
+
+        return {COUNT_COL: {count_distinct_aggregation}}
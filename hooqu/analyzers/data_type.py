@@ -0,0 +1,228 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+from tryingsnake import Success
+
+from hooqu.analyzers.analyzer import (
+    AggDefinition,
+    EmptyStateException,
+    StandardScanShareableAnalyzer,
+    State,
+    metric_from_failure,
+)
+from hooqu.analyzers.preconditions import has_column
+from hooqu.dataframe import DataFrameLike
+from hooqu.metrics import Distribution, DistributionValue, Entity, HistogramMetric
+
+
+class DataTypeInstance(Enum):
+    UNKNOWN = "Unknown"  # missing values
+    FRACTIONAL = "Fractional"
+    INTEGRAL = "Integral"
+    BOOLEAN = "Boolean"
+    STRING = "String"
+
+
+# the text of the values is matched with these patterns (after stripping the
+# whitespace), in this order, the values that match none of them are strings
+INTEGRAL_PATTERN = r"[+-]?\d+"
+FRACTIONAL_PATTERN = r"[+-]?(?:\d+\.\d*|\.\d+|\d+(?=[eE]))(?:[eE][+-]?\d+)?"
+BOOLEAN_PATTERN = r"(?i:true|false)"
+
+_PATTERNS = [
+    (DataTypeInstance.INTEGRAL, INTEGRAL_PATTERN),
+    (DataTypeInstance.FRACTIONAL, FRACTIONAL_PATTERN),
+    (DataTypeInstance.BOOLEAN, BOOLEAN_PATTERN),
+]
+
+# index of the counts of each type in DataTypeHistogram.counts
+_TYPES = [
+    DataTypeInstance.UNKNOWN,
+    DataTypeInstance.FRACTIONAL,
+    DataTypeInstance.INTEGRAL,
+    DataTypeInstance.BOOLEAN,
+    DataTypeInstance.STRING,
+]
+_INDEX = {t: i for i, t in enumerate(_TYPES)}
+
+
+def classify(values: pd.Series) -> np.ndarray:
+    """
+    The index (in ``_TYPES``) of the type of each (non missing) value, from the
+    patterns matched by its text. Each pattern is matched by a single
+    vectorized call over all the values.
+    """
+    text = values.astype(str).str.strip()
+    types = np.full(len(values), _INDEX[DataTypeInstance.STRING])
+    undecided = np.ones(len(values), dtype=bool)
+    for data_type, pattern in _PATTERNS:
+        matches = text.str.fullmatch(pattern).to_numpy(dtype=bool) & undecided
+        types[matches] = _INDEX[data_type]
+        undecided &= ~matches
+    return types
+
+
+@dataclass(frozen=True)
+class DataTypeHistogram(State["DataTypeHistogram"]):
+    """The number of values of each type (``DataTypeInstance``)"""
+
+    num_null: int
+    num_fractional: int
+    num_integral: int
+    num_boolean: int
+    num_string: int
+
+    @classmethod
+    def from_counts(cls, counts: np.ndarray) -> "DataTypeHistogram":
+        return cls(*(int(c) for c in counts))
+
+    @classmethod
+    def from_values(cls, values) -> "DataTypeHistogram":
+        """
+        The types of numeric and boolean arrays are known from their dtype.
+        Other values are factorized, so that the patterns are only matched on
+        the distinct values, whose types are then weighted by their counts.
+        """
+        values = np.asarray(values)
+        counts = np.zeros(len(_TYPES), dtype=np.int64)
+        kind = values.dtype.kind
+        if kind in "iub":
+            data_type = (
+                DataTypeInstance.BOOLEAN if kind == "b" else DataTypeInstance.INTEGRAL
+            )
+            counts[_INDEX[data_type]] = len(values)
+            return cls.from_counts(counts)
+        if kind == "f":
+            nulls = int(np.count_nonzero(np.isnan(values)))
+            counts[_INDEX[DataTypeInstance.UNKNOWN]] = nulls
+            counts[_INDEX[DataTypeInstance.FRACTIONAL]] = len(values) - nulls
+            return cls.from_counts(counts)
+
+        if pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+            # mixed objects are factorized by their text, 1 and True are equal
+            # (the same distinct value) but they do not have the same type
+            text = pd.Series(values, dtype=object)
+            values = text.where(text.isna(), text.astype(str)).to_numpy()
+
+        codes, uniques = pd.factorize(values)
+        present = codes[codes >= 0]
+        types = classify(pd.Series(uniques, dtype=object))
+        counts += np.bincount(types[present], minlength=len(_TYPES))
+        counts[_INDEX[DataTypeInstance.UNKNOWN]] = len(values) - len(present)
+        return cls.from_counts(counts)
+
+    @classmethod
+    def from_distinct_values(
+        cls, values: pd.Series, counts: np.ndarray, nulls: int
+    ) -> "DataTypeHistogram":
+        """The histogram of distinct (non missing) values and their counts"""
+        types = classify(values)
+        totals = np.bincount(types, weights=counts, minlength=len(_TYPES))
+        totals[_INDEX[DataTypeInstance.UNKNOWN]] = nulls
+        return cls.from_counts(totals)
+
+    @property
+    def counts(self) -> List[int]:
+        return [
+            self.num_null,
+            self.num_fractional,
+            self.num_integral,
+            self.num_boolean,
+            self.num_string,
+        ]
+
+    def sum(self, other: "DataTypeHistogram") -> "DataTypeHistogram":
+        return DataTypeHistogram.from_counts(np.add(self.counts, other.counts))
+
+
+def determine_type(distribution: Distribution) -> DataTypeInstance:
+    """
+    The type of a column from the distribution of the types of its values (the
+    metric of ``DataType``): the most general type of its non missing values,
+    booleans mixed with numbers being strings.
+    """
+
+    def absolute(data_type: DataTypeInstance) -> int:
+        return distribution[data_type.value].absolute
+
+    numbers = absolute(DataTypeInstance.INTEGRAL) + absolute(
+        DataTypeInstance.FRACTIONAL
+    )
+    if absolute(DataTypeInstance.STRING) or (
+        absolute(DataTypeInstance.BOOLEAN) and numbers
+    ):
+        return DataTypeInstance.STRING
+    if absolute(DataTypeInstance.BOOLEAN):
+        return DataTypeInstance.BOOLEAN
+    if absolute(DataTypeInstance.FRACTIONAL):
+        return DataTypeInstance.FRACTIONAL
+    if absolute(DataTypeInstance.INTEGRAL):
+        return DataTypeInstance.INTEGRAL
+    return DataTypeInstance.UNKNOWN
+
+
+class DataType(StandardScanShareableAnalyzer[DataTypeHistogram]):
+    """
+    Distribution of the types of the values of a column: missing (``Unknown``),
+    ``Fractional``, ``Integral``, ``Boolean`` or ``String``. The values of
+    object columns (e.g. read from CSV files) are classified by their text,
+    so e.g. ``"1.5"`` is fractional.
+
+    Parameters:
+    -----------
+
+    column:
+        Column in DataFrameLike whose types are analyzed.
+
+    where:
+         Additional filter to apply before the analyzer is run.
+    """
+
+    def __init__(self, column: str, where: Optional[str] = None):
+        super().__init__("DataType", column, where=where)
+
+    def compute_state_from(self, data: DataFrameLike) -> DataTypeHistogram:
+        if self.where is not None:
+            data = data.query(self.where)
+        return DataTypeHistogram.from_values(data[self.instance].to_numpy())
+
+    def _aggregation_functions(self, where: Optional[str] = None) -> AggDefinition:
+        # the types are not a scalar aggregation, see compute_state_from
+        return {}
+
+    def from_aggregation_result(
+        self, result: DataFrameLike, offset: int = 0
+    ) -> Optional[DataTypeHistogram]:
+        raise NotImplementedError("The state is computed by compute_state_from")
+
+    def additional_preconditions(self) -> List[Callable[[DataFrameLike], None]]:
+        return [has_column(self.instance)]
+
+    def compute_metric_from(self, state: Optional[DataTypeHistogram] = None):
+        if state is None:
+            return self.to_failure_metric(
+                EmptyStateException(f"Empty state for analyzer {self}")
+            )
+
+        total = sum(state.counts)
+        distribution = Distribution(
+            {
+                data_type.value: DistributionValue(
+                    count, count / total if total else 0.0
+                )
+                for data_type, count in zip(_TYPES, state.counts)
+            },
+            len(_TYPES),
+        )
+        return HistogramMetric(
+            Entity.COLUMN, self.name, self.instance, Success(distribution)
+        )
+
+    def to_failure_metric(self, ex: Exception) -> HistogramMetric:
+        failure = metric_from_failure(ex, self.name, self.instance, self.entity)
+        return HistogramMetric(
+            failure.entity, failure.name, failure.instance, failure.value
+        )
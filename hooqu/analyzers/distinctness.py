@@ -0,0 +1,34 @@
+# coding: utf-8
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from .analyzer import COUNT_COL, AggDefinition
+from .grouping_analyzers import ScanShareableFrequencyBasedAnalyzer
+
+
+@dataclass
+class _DistinctnessDataClassMixin:
+    columns: Sequence[str]
+    where: Optional[str]
+
+
+class Distinctness(ScanShareableFrequencyBasedAnalyzer, _DistinctnessDataClassMixin):
+    """
+    Distinctness is the fraction of distinct values of a column(s), i.e., the
+    number of distinct values over the number of rows.
+    """
+
+    def __init__(self, columns: Sequence[str], where: Optional[str] = None):
+        super().__init__("Distinctness", columns)
+        self.columns = columns
+        self.where = where
+
+    def _aggregation_functions(self, num_rows: int) -> AggDefinition:
+        def distinctness_aggregation(s, groups=None):
+            distinct = (s >= 1).astype(int)
+            if groups is not None:
+                distinct = distinct * groups
+            return distinct.sum() / num_rows
+
+        return {COUNT_COL: {distinctness_aggregation}}
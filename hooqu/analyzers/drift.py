@@ -0,0 +1,169 @@
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from hooqu.analyzers.analyzer import (
+    EmptyStateException,
+    metric_from_failure,
+    metric_from_value,
+)
+from hooqu.analyzers.histogram import (
+    NULL_VALUE,
+    Histogram,
+    HistogramState,
+    _edges,
+    bin_labels,
+)
+from hooqu.metrics import DoubleMetric
+
+# ratio given to the bins without rows, so the PSI of an empty bin is finite
+PSI_EPSILON = 1e-4
+
+
+def _ratios(counts: pd.Series, labels: pd.Index) -> np.ndarray:
+    counts = counts.reindex(labels, fill_value=0).to_numpy(dtype=np.float64)
+    total = counts.sum()
+    return counts / total if total else counts
+
+
+def psi(reference: pd.Series, current: pd.Series) -> float:
+    """
+    Population stability index of the counts of the bins: the sum over the bins
+    of ``(current - reference) * ln(current / reference)`` of their ratios.
+    """
+    labels = reference.index.union(current.index, sort=False)
+    expected = np.maximum(_ratios(reference, labels), PSI_EPSILON)
+    actual = np.maximum(_ratios(current, labels), PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def linf_distance(reference: pd.Series, current: pd.Series) -> float:
+    """The largest difference of the ratio of a bin"""
+    labels = reference.index.union(current.index, sort=False)
+    differences = _ratios(reference, labels) - _ratios(current, labels)
+    return float(np.max(np.abs(differences), initial=0.0))
+
+
+def ks_distance(reference: pd.Series, current: pd.Series) -> float:
+    """
+    Kolmogorov-Smirnov distance of the binned values: the largest difference of
+    their cumulative distributions, the bins being in the order of the index of
+    the counts (the missing values are left out).
+    """
+    labels = reference.index.drop(NULL_VALUE, errors="ignore")
+    expected = np.cumsum(_ratios(reference, labels))
+    actual = np.cumsum(_ratios(current, labels))
+    return float(np.max(np.abs(actual - expected), initial=0.0))
+
+
+DISTANCES: Dict[str, Callable[[pd.Series, pd.Series], float]] = {
+    "psi": psi,
+    "ks": ks_distance,
+    "linf": linf_distance,
+}
+
+
+class Drift(Histogram):
+    """
+    Distance between the distribution of the values of a column and a reference
+    distribution, e.g. the ``HistogramState`` of a previous run stored by a
+    state provider. Only the counts of the bins of the reference are needed,
+    never its data.
+
+    The distribution is computed as ``Histogram``, in the same scan as the other
+    analyzers, so the ``histogram`` of a run can be persisted as the reference
+    of a later run.
+
+    Parameters:
+    -----------
+
+    column:
+        Column in DataFrameLike for which the drift is computed.
+
+    reference:
+        Histogram state to compare to, computed with the same bins.
+
+    distance:
+        ``"psi"`` (population stability index), ``"linf"`` (largest difference
+        of the ratio of a bin) or ``"ks"`` (Kolmogorov-Smirnov distance, for
+        numeric bins only).
+
+    bins, range:
+        Numeric bins of the histograms, see ``Histogram``.
+
+    where:
+         Additional filter to apply before the analyzer is run.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        reference: HistogramState,
+        distance: str = "psi",
+        bins: Union[int, Sequence[float], None] = None,
+        range: Optional[Tuple[float, float]] = None,
+        where: Optional[str] = None,
+    ):
+        if distance not in DISTANCES:
+            raise ValueError(
+                f"Unknown distance {distance!r}, expected one of {list(DISTANCES)}"
+            )
+        # the bins of Histogram, but the metric is named after this analyzer
+        super(Histogram, self).__init__("Drift", column, where=where)
+        self.edges = _edges(bins, range)
+        # all the bins are compared, the metric is a distance
+        self.max_detail_bins = 0
+        if distance == "ks" and self.edges is None:
+            raise ValueError("The Kolmogorov-Smirnov distance requires numeric bins")
+        self.reference = reference
+        self.distance = distance
+
+    @property
+    def histogram(self) -> Histogram:
+        """The histogram whose state is a reference for this analyzer"""
+        return Histogram(self.instance, self.edges, where=self.where)
+
+    def _reference_counts(self) -> pd.Series:
+        counts = self.reference.counts
+        if self.edges is not None:
+            labels = bin_labels(self.edges) + [NULL_VALUE]
+            if not counts.index.isin(labels).all():
+                raise ValueError(
+                    f"The bins of the reference are not the bins of {self}"
+                )
+            # in the order of the bins, for the cumulative distributions
+            counts = counts.reindex(labels, fill_value=0)
+        return counts
+
+    def compute_metric_from(
+        self, state: Optional[HistogramState] = None
+    ) -> DoubleMetric:
+        if state is None:
+            return self.to_failure_metric(
+                EmptyStateException(f"Empty state for analyzer {self}")
+            )
+        try:
+            reference = self._reference_counts()
+        except ValueError as ex:
+            return self.to_failure_metric(ex)
+        value = DISTANCES[self.distance](reference, state.counts)
+        return metric_from_value(value, self.name, self.instance, self.entity)
+
+    def to_failure_metric(self, ex: Exception) -> DoubleMetric:
+        return metric_from_failure(ex, self.name, self.instance, self.entity)
+
+    def __eq__(self, other):
+        if not isinstance(other, Drift):
+            return NotImplemented
+        return (
+            super().__eq__(other)
+            and self.distance == other.distance
+            and self.reference.num_rows == other.reference.num_rows
+            and self.reference.counts.equals(other.reference.counts)
+        )
+
+    def __hash__(self):
+        return super().__hash__() ^ hash((self.distance, self.reference.num_rows))
+
+    def __repr__(self):
+        return super().__repr__()[:-1] + f", distance={self.distance})"
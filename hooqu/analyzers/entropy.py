@@ -0,0 +1,39 @@
+# coding: utf-8
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .analyzer import COUNT_COL, AggDefinition
+from .grouping_analyzers import ScanShareableFrequencyBasedAnalyzer
+
+
+@dataclass
+class _EntropyDataClassMixin:
+    column: str
+    where: Optional[str]
+
+
+class Entropy(ScanShareableFrequencyBasedAnalyzer, _EntropyDataClassMixin):
+    """
+    Entropy is a measure of the level of information contained in a column,
+    ``-sum(p * ln(p))`` where ``p`` is the fraction of the rows having each
+    value.
+    """
+
+    def __init__(self, column: str, where: Optional[str] = None):
+        super().__init__("Entropy", [column])
+        self.column = column
+        self.where = where
+
+    def _aggregation_functions(self, num_rows: int) -> AggDefinition:
+        def entropy_aggregation(s, groups=None):
+            p = np.asarray(s, dtype=np.float64) / num_rows
+            terms = -p * np.log(p)
+            if groups is not None:
+                terms = terms * groups
+            # sorted, so the sum does not depend on the order of the groups
+            return np.sort(terms).sum()
+
+        return {COUNT_COL: {entropy_aggregation}}
@@ -1,14 +1,22 @@
+import math
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Callable, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from tryingsnake import Success
 
 from hooqu.dataframe import DataFrameLike
-from hooqu.metrics import DoubleMetric
+from hooqu.metrics import DoubleMetric, Entity, KeyedDoubleMetric
 
 from .analyzer import (
     COUNT_COL,
     AggDefinition,
+    EmptyStateException,
+    DoubledValuedState,
     GroupingAnalyzer,
+    StandardScanShareableAnalyzer,
     State,
     entity_from,
     metric_from_empty,
@@ -18,13 +26,134 @@ from .analyzer import (
 from .preconditions import at_least_one, has_column
 
 
+# column of the 64 bits hashes of the groups in compact frequencies
+HASH_COL = "__hooqu_hash__"
+# column of the number of groups having each count, in histograms of the counts
+GROUPS_COL = "__hooqu_groups__"
+# the HyperLogLog sketches have 2 ** HLL_PRECISION registers (~0.8% error)
+HLL_PRECISION = 14
+# values counted exactly at a time by the top-k sketches
+TOP_K_CHUNK_SIZE = 1 << 20
+
+
+def _column_names(frequencies: DataFrameLike) -> List[str]:
+    # Arrow tables have column_names, Pandas and Polars data frames columns
+    names = getattr(frequencies, "column_names", None)
+    return list(names if names is not None else frequencies.columns)
+
+
+def _as_pandas(frequencies: DataFrameLike) -> pd.DataFrame:
+    # the frequencies computed by the Arrow and Polars backends
+    if not isinstance(frequencies, pd.DataFrame) and hasattr(frequencies, "to_pandas"):
+        return frequencies.to_pandas()
+    return frequencies
+
+
+def _key_columns(frequencies: pd.DataFrame) -> List[str]:
+    return [c for c in frequencies.columns if c not in (COUNT_COL, HASH_COL)]
+
+
+def _normalized(values: pd.Series) -> pd.Series:
+    # as in hll_hashes, numbers are hashed as floats (an integer column is read
+    # as floats where it has missing values) and all the missing values alike
+    if values.dtype.kind in "biuf":
+        return values.astype(np.float64) + 0.0  # -0.0 is 0.0
+    values = values.astype(object)
+    return values.where(values.notna(), None)
+
+
+def _hashes(frequencies: pd.DataFrame) -> np.ndarray:
+    if HASH_COL in frequencies.columns:
+        return frequencies[HASH_COL].to_numpy(dtype=np.uint64)
+    keys = pd.DataFrame(
+        {c: _normalized(frequencies[c]) for c in _key_columns(frequencies)}
+    )
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+
 @dataclass(frozen=True)
 class FrequenciesAndNumRows(State["FrequenciesAndNumRows"]):
+    """
+    The number of occurrences (``COUNT_COL``) of each group of values of the
+    grouping columns, and the number of rows counted.
+
+    The frequencies can be compacted (see ``compact``) to a 64 bits hash of the
+    group (``HASH_COL``) and its count, optionally keeping the group values.
+
+    When the groups are counted out of core (see ``hooqu.backends.spill``) the
+    frequencies are a histogram of the counts: the number of groups
+    (``GROUPS_COL``) having each count. Such frequencies can not be merged.
+    """
+
     frequencies: DataFrameLike
     num_rows: int
 
+    @property
+    def has_keys(self) -> bool:
+        return bool(_key_columns(_as_pandas(self.frequencies)))
+
+    @property
+    def is_histogram(self) -> bool:
+        return GROUPS_COL in _column_names(self.frequencies)
+
+    def _check_not_histogram(self):
+        if self.is_histogram:
+            raise NotImplementedError(
+                "The frequencies were counted out of core, they can not be merged"
+            )
+
+    def compact(self, keep_keys: bool = False) -> "FrequenciesAndNumRows":
+        """
+        Frequencies with the hashes of the groups and their counts (as int64),
+        plus the values of the grouping columns if ``keep_keys``. Without the
+        values the state is much smaller (e.g. to send it to another process or
+        to store it) while merges are exact unless two groups have the same
+        hash.
+        """
+        self._check_not_histogram()
+        frequencies = _as_pandas(self.frequencies)
+        columns = {HASH_COL: _hashes(frequencies)}
+        if keep_keys:
+            keys = _key_columns(frequencies)
+            columns.update({c: frequencies[c].to_numpy() for c in keys})
+        columns[COUNT_COL] = frequencies[COUNT_COL].to_numpy(dtype=np.int64)
+        return FrequenciesAndNumRows(pd.DataFrame(columns), self.num_rows)
+
     def sum(self, other: "FrequenciesAndNumRows") -> "FrequenciesAndNumRows":
-        raise NotImplementedError("Not yet implemented")
+        """
+        Merges the frequencies: by the values of the groups when both states
+        have them, otherwise by their hashes (and the result has no values).
+        """
+        self._check_not_histogram()
+        other._check_not_histogram()
+        mine, theirs = _as_pandas(self.frequencies), _as_pandas(other.frequencies)
+        num_rows = self.num_rows + other.num_rows
+
+        keys = _key_columns(mine)
+        if keys and keys == _key_columns(theirs):
+            frequencies = (
+                pd.concat([mine[keys + [COUNT_COL]], theirs[keys + [COUNT_COL]]])
+                .groupby(keys, sort=False, dropna=False)[COUNT_COL]
+                .sum()
+                .reset_index()
+            )
+            return FrequenciesAndNumRows(frequencies, num_rows)
+
+        # sort-merge of the hashes: the counts of equal hashes are added up
+        hashes = np.concatenate([_hashes(mine), _hashes(theirs)])
+        counts = np.concatenate(
+            [
+                mine[COUNT_COL].to_numpy(dtype=np.int64),
+                theirs[COUNT_COL].to_numpy(dtype=np.int64),
+            ]
+        )
+        order = np.argsort(hashes, kind="stable")
+        hashes, counts = hashes[order], counts[order]
+        starts = np.flatnonzero(np.r_[True, hashes[1:] != hashes[:-1]])
+        frequencies = pd.DataFrame(
+            {HASH_COL: hashes[starts], COUNT_COL: np.add.reduceat(counts, starts)}
+        )
+        return FrequenciesAndNumRows(frequencies, num_rows)
 
 
 class FrequencyBasedAnalyzer(GroupingAnalyzer[FrequenciesAndNumRows, DoubleMetric]):
@@ -119,6 +248,11 @@ class ScanShareableFrequencyBasedAnalyzer(FrequencyBasedAnalyzer, ABC):
 
     @abstractmethod
     def _aggregation_functions(self, num_rows: int) -> AggDefinition:
+        """
+        The functions computing the metric from the counts of the groups. They
+        also receive the number of groups having each count when the state is a
+        histogram of the counts.
+        """
         pass
 
     def compute_metric_from(
@@ -126,9 +260,21 @@ class ScanShareableFrequencyBasedAnalyzer(FrequencyBasedAnalyzer, ABC):
     ) -> DoubleMetric:
 
         if state is not None:
+            # the aggregations only use the counts, which are extracted as an
+            # array so that the frequencies can come from any backend
+            counts = np.asarray(state.frequencies[COUNT_COL])
             aggs = self._aggregation_functions(state.num_rows)
-            result = state.frequencies.agg(aggs)
-            return self.from_aggregation_result(result, 0)
+            if state.is_histogram:
+                groups = np.asarray(state.frequencies[GROUPS_COL])
+                values = [agg(counts, groups) for agg in aggs[COUNT_COL]]
+            else:
+                values = [agg(counts) for agg in aggs[COUNT_COL]]
+            return metric_from_value(
+                float(values[0]),
+                self.name,
+                self.instance,
+                entity_from(self.grouping_columns),
+            )
         else:
             return metric_from_empty(
                 self,
@@ -163,3 +309,287 @@ class ScanShareableFrequencyBasedAnalyzer(FrequencyBasedAnalyzer, ABC):
             self.instance,
             entity_from(self.grouping_columns),
         )
+
+
+def hll_hashes(values) -> np.ndarray:
+    """
+    64 bits hashes of the values, missing values (None and NaN) are skipped.
+    Numbers are hashed as floats, so that an integer column has the same hashes
+    as the same column read as floats (e.g. because of missing values).
+    """
+    values = np.asarray(values)
+    values = values[~pd.isna(values)]
+    if values.dtype.kind in "biuf":
+        values = values.astype(np.float64) + 0.0  # -0.0 is 0.0
+    elif values.dtype.kind in "US":
+        values = values.astype(object)
+    return pd.util.hash_array(values)
+
+
+def hll_registers(hashes: np.ndarray, precision: int = HLL_PRECISION) -> np.ndarray:
+    """
+    HyperLogLog registers of the hashes: the first ``precision`` bits of a hash
+    select its register, which keeps the maximum position of the leftmost 1 in
+    the remaining bits.
+    """
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    bits = 64 - precision
+    index = (hashes >> np.uint64(bits)).astype(np.intp)
+    rest = hashes & np.uint64((1 << bits) - 1)
+    # the remaining bits (at most 53) are exact as floats, their exponent is
+    # their bit length (0 for 0)
+    _, bit_length = np.frexp(rest.astype(np.float64))
+    np.maximum.at(registers, index, (bits + 1 - bit_length).astype(np.uint8))
+    return registers
+
+
+def _sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        previous, z = z, z - (1.0 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+@dataclass(frozen=True, eq=False)
+class ApproxCountDistinctState(DoubledValuedState["ApproxCountDistinctState"]):
+    """
+    The registers of a HyperLogLog sketch. Sketches are merged with the
+    elementwise maximum of their registers, so they can be computed on chunks or
+    partitions of the data in any order.
+    """
+
+    registers: np.ndarray
+
+    @classmethod
+    def from_values(cls, values) -> "ApproxCountDistinctState":
+        return cls(hll_registers(hll_hashes(values)))
+
+    def sum(self, other: "ApproxCountDistinctState") -> "ApproxCountDistinctState":
+        if len(self.registers) != len(other.registers):
+            raise ValueError("Sketches with different precisions can not be merged")
+        return ApproxCountDistinctState(np.maximum(self.registers, other.registers))
+
+    def metric_value(self) -> float:
+        """
+        The estimate of Ertl's improved estimator ("New cardinality estimation
+        algorithms for HyperLogLog sketches", 2017), which is unbiased from
+        small to large cardinalities without the empirical bias correction of
+        HyperLogLog++.
+        """
+        m = len(self.registers)
+        q = 64 - int(math.log2(m))
+        histogram = np.bincount(self.registers, minlength=q + 2)
+        z = m * _tau(1.0 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        return float(round(m * m / (2 * math.log(2) * z)))
+
+
+class ApproxCountDistinct(StandardScanShareableAnalyzer[ApproxCountDistinctState]):
+    """
+    Approximate number of distinct values of a column, computed with a
+    HyperLogLog sketch (relative standard error of ~0.8%) instead of the
+    frequencies of the values.
+
+    Parameters:
+    -----------
+
+    column:
+        Column in DataFrameLike for which the distinct values are counted.
+
+    where:
+         Additional filter to apply before the analyzer is run.
+    """
+
+    def __init__(self, column: str, where: Optional[str] = None):
+        super().__init__("ApproxCountDistinct", column, where=where)
+
+    def compute_state_from(self, data: DataFrameLike) -> ApproxCountDistinctState:
+        if self.where is not None:
+            data = data.query(self.where)
+        return ApproxCountDistinctState.from_values(data[self.instance].to_numpy())
+
+    def _aggregation_functions(self, where: Optional[str] = None) -> AggDefinition:
+        # the registers are not a scalar aggregation, see compute_state_from
+        return {}
+
+    def from_aggregation_result(
+        self, result: DataFrameLike, offset: int = 0
+    ) -> Optional[ApproxCountDistinctState]:
+        raise NotImplementedError("The state is computed by compute_state_from")
+
+    def additional_preconditions(self) -> List[Callable[[DataFrameLike], None]]:
+        return [has_column(self.instance)]
+
+
+def _misra_gries(counts: pd.Series, capacity: int) -> pd.Series:
+    """
+    Keeps at most ``capacity`` counters, decremented by the count of the first
+    one dropped, so that each count is at most (dropped rows) / (capacity + 1)
+    below the true count of its value.
+    """
+    if len(counts) <= capacity:
+        return counts
+    counts = counts.sort_values(ascending=False, kind="stable")
+    counts = counts.iloc[:capacity] - counts.iloc[capacity]
+    return counts[counts > 0]
+
+
+@dataclass(frozen=True, eq=False)
+class TopKState(State["TopKState"]):
+    """
+    A Misra-Gries summary of the values of a column: the (under)estimated count
+    of at most ``capacity`` values, indexed by value, and the number of rows
+    summarized (missing values included).
+
+    Two summaries are merged by adding up their counters and keeping the
+    ``capacity`` largest ones again, so the error bound holds whatever the
+    order and the number of merges.
+    """
+
+    counts: pd.Series
+    num_rows: int
+    capacity: int
+
+    @classmethod
+    def from_values(cls, values, capacity: int) -> "TopKState":
+        """Summarizes the values, counting exactly a chunk of them at a time"""
+        values = np.asarray(values)
+        state = None
+        for start in range(0, max(len(values), 1), TOP_K_CHUNK_SIZE):
+            chunk = pd.Series(values[start:start + TOP_K_CHUNK_SIZE])
+            counts = chunk.value_counts(dropna=True, sort=False)
+            chunk_state = cls.from_counts(counts, len(chunk), capacity)
+            state = chunk_state if state is None else state.sum(chunk_state)
+        return state
+
+    @classmethod
+    def from_counts(cls, counts: pd.Series, num_rows: int, capacity: int):
+        """The summary of exact counts of (non missing) values"""
+        counts = counts.astype(np.int64)
+        return cls(_misra_gries(counts, capacity), num_rows, capacity)
+
+    @property
+    def max_error(self) -> float:
+        """Maximum difference between the true and the estimated counts"""
+        return (self.num_rows - int(self.counts.sum())) / (self.capacity + 1)
+
+    def sum(self, other: "TopKState") -> "TopKState":
+        capacity = min(self.capacity, other.capacity)
+        counts = (
+            pd.concat([self.counts, other.counts])
+            .groupby(level=0, sort=False)
+            .sum()
+        )
+        return TopKState(
+            _misra_gries(counts, capacity), self.num_rows + other.num_rows, capacity
+        )
+
+    def top(self, k: int) -> Dict[Any, float]:
+        """The k most frequent values and their fraction of the rows"""
+        if not self.num_rows:
+            return {}
+        counts = self.counts.sort_values(ascending=False, kind="stable").iloc[:k]
+        return {value: count / self.num_rows for value, count in counts.items()}
+
+
+class TopK(StandardScanShareableAnalyzer[TopKState]):
+    """
+    The k most frequent values of a column and the fraction of the rows holding
+    each of them, most frequent first. Missing values are not counted as values
+    (see ``Completeness``).
+
+    The values are counted with a bounded memory sketch (Misra-Gries), so the
+    fractions may underestimate the true ones, by at most 1 / (capacity + 1).
+
+    Parameters:
+    -----------
+
+    column:
+        Column in DataFrameLike for which the most frequent values are found.
+
+    k:
+        Number of values returned.
+
+    where:
+         Additional filter to apply before the analyzer is run.
+
+    capacity:
+        Number of values tracked by the sketch (at least k).
+    """
+
+    def __init__(
+        self,
+        column: str,
+        k: int = 10,
+        where: Optional[str] = None,
+        capacity: int = 1000,
+    ):
+        super().__init__("TopK", column, where=where)
+        self.k = k
+        self.capacity = max(k, capacity)
+
+    def compute_state_from(self, data: DataFrameLike) -> TopKState:
+        if self.where is not None:
+            data = data.query(self.where)
+        return TopKState.from_values(data[self.instance].to_numpy(), self.capacity)
+
+    def _aggregation_functions(self, where: Optional[str] = None) -> AggDefinition:
+        # the counters are not a scalar aggregation, see compute_state_from
+        return {}
+
+    def from_aggregation_result(
+        self, result: DataFrameLike, offset: int = 0
+    ) -> Optional[TopKState]:
+        raise NotImplementedError("The state is computed by compute_state_from")
+
+    def additional_preconditions(self) -> List[Callable[[DataFrameLike], None]]:
+        return [has_column(self.instance)]
+
+    def compute_metric_from(self, state: Optional[TopKState] = None):
+        if state is None:
+            return self.to_failure_metric(
+                EmptyStateException(f"Empty state for analyzer {self}")
+            )
+        return KeyedDoubleMetric(
+            Entity.COLUMN, self.name, self.instance, Success(state.top(self.k))
+        )
+
+    def to_failure_metric(self, ex: Exception) -> KeyedDoubleMetric:
+        failure = metric_from_failure(ex, self.name, self.instance, self.entity)
+        return KeyedDoubleMetric(
+            failure.entity, failure.name, failure.instance, failure.value
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, TopK):
+            return NotImplemented
+        return (
+            super().__eq__(other)
+            and self.k == other.k
+            and self.capacity == other.capacity
+        )
+
+    def __hash__(self):
+        return super().__hash__() ^ hash((self.k, self.capacity))
+
+    def __repr__(self):
+        return super().__repr__()[:-1] + f", k={self.k})"
@@ -0,0 +1,219 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from tryingsnake import Success
+
+from hooqu.analyzers.analyzer import (
+    AggDefinition,
+    EmptyStateException,
+    State,
+    StandardScanShareableAnalyzer,
+    metric_from_failure,
+)
+from hooqu.analyzers.preconditions import has_column, is_numeric
+from hooqu.dataframe import DataFrameLike
+from hooqu.metrics import Distribution, DistributionValue, Entity, HistogramMetric
+
+# bin of the missing values
+NULL_VALUE = "NullValue"
+
+
+def bin_labels(edges: Sequence[float]) -> List[str]:
+    """
+    Names of the bins of ``bin_counts``: below the first edge, between each
+    pair of edges (the last bin includes its upper edge) and above the last edge.
+    """
+    edges = [float(e) for e in edges]
+    labels = [f"< {edges[0]}"]
+    labels += [f"[{lo}, {hi})" for lo, hi in zip(edges[:-2], edges[1:-1])]
+    labels += [f"[{edges[-2]}, {edges[-1]}]", f"> {edges[-1]}"]
+    return labels
+
+
+def bin_counts(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Number of (non missing) values in each bin of ``bin_labels``, computed with
+    a single binary search per value.
+    """
+    index = np.searchsorted(edges, values, side="right")
+    # as in numpy.histogram, the last bin includes its upper edge
+    index[values == edges[-1]] = len(edges) - 1
+    return np.bincount(index, minlength=len(edges) + 1)
+
+
+@dataclass(frozen=True, eq=False)
+class HistogramState(State["HistogramState"]):
+    """
+    The number of rows in each bin (indexed by the value of the column, or by
+    the bin label for numeric bins) and the number of rows counted. States are
+    merged by adding up the counts of the same bins.
+    """
+
+    counts: pd.Series
+    num_rows: int
+
+    @classmethod
+    def from_values(
+        cls, values, edges: Optional[np.ndarray] = None
+    ) -> "HistogramState":
+        values = np.asarray(values)
+        missing = pd.isna(values)
+        present = values[~missing]
+        if edges is None:
+            counts = pd.Series(present).value_counts(sort=False)
+        else:
+            counts = pd.Series(
+                bin_counts(present.astype(np.float64), edges), index=bin_labels(edges)
+            )
+        return cls.with_nulls(counts, int(missing.sum()), len(values))
+
+    @classmethod
+    def with_nulls(cls, counts: pd.Series, nulls: int, num_rows: int):
+        """The state of the counts of the bins, plus the missing values"""
+        counts = counts.astype(np.int64)
+        if nulls:
+            counts = pd.concat([counts, pd.Series([nulls], index=[NULL_VALUE])])
+        return cls(counts, num_rows)
+
+    def sum(self, other: "HistogramState") -> "HistogramState":
+        counts = (
+            pd.concat([self.counts, other.counts])
+            .groupby(level=0, sort=False)
+            .sum()
+        )
+        return HistogramState(counts, self.num_rows + other.num_rows)
+
+
+class Histogram(StandardScanShareableAnalyzer[HistogramState]):
+    """
+    Histogram of the values of a column: the number and fraction of the rows
+    having each value (missing values being counted in the ``NullValue`` bin),
+    or, when ``bins`` is given, in each numeric bin.
+
+    Parameters:
+    -----------
+
+    column:
+        Column in DataFrameLike for which the histogram is computed.
+
+    bins:
+        Edges of the numeric bins, or their number (the bins then have the same
+        width and span ``range``). Values out of the edges are counted in two
+        additional bins. By default each value is a bin.
+
+    range:
+        The lowest and highest edges when ``bins`` is a number. The edges can
+        not depend on the data, so that histograms of different data can be
+        merged.
+
+    max_detail_bins:
+        Maximum number of bins (the most frequent ones) in the metric for
+        histograms of values.
+
+    where:
+         Additional filter to apply before the analyzer is run.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        bins: Union[int, Sequence[float], None] = None,
+        range: Optional[Tuple[float, float]] = None,
+        max_detail_bins: int = 1000,
+        where: Optional[str] = None,
+    ):
+        super().__init__("Histogram", column, where=where)
+        self.edges = _edges(bins, range)
+        self.max_detail_bins = max_detail_bins
+
+    @property
+    def edges_array(self) -> Optional[np.ndarray]:
+        return None if self.edges is None else np.array(self.edges)
+
+    def compute_state_from(self, data: DataFrameLike) -> HistogramState:
+        if self.where is not None:
+            data = data.query(self.where)
+        return HistogramState.from_values(
+            data[self.instance].to_numpy(), self.edges_array
+        )
+
+    def _aggregation_functions(self, where: Optional[str] = None) -> AggDefinition:
+        # the counts are not a scalar aggregation, see compute_state_from
+        return {}
+
+    def from_aggregation_result(
+        self, result: DataFrameLike, offset: int = 0
+    ) -> Optional[HistogramState]:
+        raise NotImplementedError("The state is computed by compute_state_from")
+
+    def additional_preconditions(self) -> List[Callable[[DataFrameLike], None]]:
+        preconditions = [has_column(self.instance)]
+        if self.edges is not None:
+            preconditions.append(is_numeric(self.instance))
+        return preconditions
+
+    def compute_metric_from(self, state: Optional[HistogramState] = None):
+        if state is None:
+            return self.to_failure_metric(
+                EmptyStateException(f"Empty state for analyzer {self}")
+            )
+
+        counts = state.counts
+        if self.edges is None:
+            counts = counts.sort_values(ascending=False, kind="stable")
+            counts = counts.iloc[: self.max_detail_bins]
+        distribution = Distribution(
+            {
+                key: DistributionValue(
+                    int(count), count / state.num_rows if state.num_rows else 0.0
+                )
+                for key, count in counts.items()
+            },
+            len(state.counts),
+        )
+        return HistogramMetric(
+            Entity.COLUMN, self.name, self.instance, Success(distribution)
+        )
+
+    def to_failure_metric(self, ex: Exception) -> HistogramMetric:
+        failure = metric_from_failure(ex, self.name, self.instance, self.entity)
+        return HistogramMetric(
+            failure.entity, failure.name, failure.instance, failure.value
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Histogram):
+            return NotImplemented
+        return (
+            type(self) is type(other)
+            and super().__eq__(other)
+            and self.edges == other.edges
+            and self.max_detail_bins == other.max_detail_bins
+        )
+
+    def __hash__(self):
+        return super().__hash__() ^ hash((self.edges, self.max_detail_bins))
+
+    def __repr__(self):
+        if self.edges is None:
+            return super().__repr__()
+        return super().__repr__()[:-1] + f", bins={len(self.edges) - 1})"
+
+
+def _edges(
+    bins: Union[int, Sequence[float], None], range: Optional[Tuple[float, float]]
+) -> Optional[Tuple[float, ...]]:
+    if bins is None:
+        return None
+    if isinstance(bins, int):
+        if range is None:
+            raise ValueError("The range of the bins is required with a number of bins")
+        if bins < 1:
+            raise ValueError("The number of bins should be positive")
+        return tuple(np.linspace(range[0], range[1], bins + 1).tolist())
+    edges = tuple(float(e) for e in bins)
+    if len(edges) < 2 or any(lo >= hi for lo, hi in zip(edges, edges[1:])):
+        raise ValueError("The edges of the bins should be at least 2 and increase")
+    return edges
@@ -1,3 +1,4 @@
+import math
 from dataclasses import dataclass
 from typing import Callable, List, Optional
 
@@ -13,6 +14,11 @@ class MaxState(DoubledValuedState["MaxState"]):
     max_value: float
 
     def sum(self, other: "MaxState") -> "MaxState":
+        # NaN is the maximum of an empty column (as in Pandas)
+        if math.isnan(self.max_value):
+            return other
+        if math.isnan(other.max_value):
+            return self
         return MaxState(max(self.max_value, other.max_value))
 
     def metric_value(self):
@@ -1,3 +1,4 @@
+import math
 from dataclasses import dataclass
 from typing import Callable, List, Optional
 
@@ -12,8 +13,13 @@ class MinState(DoubledValuedState["MinState"]):
 
     min_value: float
 
-    def sum(self, other: "MinState"):
-        return min(self.min_value, other.min_value)
+    def sum(self, other: "MinState") -> "MinState":
+        # NaN is the minimum of an empty column (as in Pandas)
+        if math.isnan(self.min_value):
+            return other
+        if math.isnan(other.min_value):
+            return self
+        return MinState(min(self.min_value, other.min_value))
 
     def metric_value(self):
         return self.min_value
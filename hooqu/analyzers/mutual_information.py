@@ -0,0 +1,99 @@
+# coding: utf-8
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from hooqu.metrics import DoubleMetric
+
+from .analyzer import (
+    AggDefinition,
+    MetricCalculationException,
+    entity_from,
+    metric_from_empty,
+    metric_from_value,
+)
+from .grouping_analyzers import (
+    COUNT_COL,
+    FrequenciesAndNumRows,
+    ScanShareableFrequencyBasedAnalyzer,
+    _as_pandas,
+)
+
+
+def _codes(values) -> np.ndarray:
+    # the missing values are a value of their own
+    codes, uniques = pd.factorize(values)
+    return np.where(codes < 0, len(uniques), codes)
+
+
+def mutual_information(
+    first: np.ndarray, second: np.ndarray, counts: np.ndarray
+) -> float:
+    """
+    Mutual information of two variables from the sparse contingency table of
+    their (factorized) codes: the ``counts`` of the pairs ``(first, second)``
+    occurring in the data. The marginal counts are summed up per code, no dense
+    table of all the pairs of values is built.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total == 0:
+        return 0.0
+    p = counts / total
+    p_first = np.bincount(first, weights=counts) / total
+    p_second = np.bincount(second, weights=counts) / total
+    terms = p * np.log(p / (p_first[first] * p_second[second]))
+    # sorted, so the sum does not depend on the order of the pairs
+    return float(np.sort(terms).sum())
+
+
+@dataclass
+class _MutualInformationDataClassMixin:
+    columns: Sequence[str]
+    where: Optional[str]
+
+
+class MutualInformation(
+    ScanShareableFrequencyBasedAnalyzer, _MutualInformationDataClassMixin
+):
+    """
+    Mutual information of two columns: how much knowing the value of one of
+    the columns reduces the uncertainty about the value of the other one.
+
+    The frequencies of the pairs of values are the state (shared with the other
+    frequency based analyzers of the same columns), so they must keep the values
+    of the groups: the metric can not be computed from compacted frequencies or
+    frequencies counted out of core.
+    """
+
+    def __init__(self, columns: Sequence[str], where: Optional[str] = None):
+        if len(columns) != 2:
+            raise ValueError("Mutual information is computed for two columns")
+        super().__init__("MutualInformation", columns)
+        self.columns = columns
+        self.where = where
+
+    def _aggregation_functions(self, num_rows: int) -> AggDefinition:
+        # the metric needs the values of the groups, see compute_metric_from
+        return {}
+
+    def compute_metric_from(
+        self, state: Optional[FrequenciesAndNumRows]
+    ) -> DoubleMetric:
+        entity = entity_from(self.grouping_columns)
+        if state is None:
+            return metric_from_empty(self, self.name, self.instance, entity)
+        if state.is_histogram or not state.has_keys:
+            return self.to_failure_metric(
+                MetricCalculationException(
+                    f"{self} requires the values of the groups in the frequencies"
+                )
+            )
+
+        frequencies = _as_pandas(state.frequencies)
+        first, second = (_codes(frequencies[c]) for c in self.grouping_columns)
+        value = mutual_information(first, second, frequencies[COUNT_COL].to_numpy())
+        return metric_from_value(value, self.name, self.instance, entity)
@@ -1,15 +1,20 @@
 from typing import Callable, List, Optional, Pattern, Union
 
+import numpy as np
+
 from hooqu.analyzers.analyzer import (
     AggDefinition,
     NumMatchesAndCount,
+    RowLevelAnalyzer,
     StandardScanShareableAnalyzer,
 )
 from hooqu.analyzers.preconditions import has_column, is_string
 from hooqu.dataframe import DataFrameLike, contains_regex, count_all
 
 
-class PatternMatch(StandardScanShareableAnalyzer[NumMatchesAndCount]):
+class PatternMatch(
+    StandardScanShareableAnalyzer[NumMatchesAndCount], RowLevelAnalyzer
+):
     def __init__(
         self, column: str, pattern: Union[Pattern, str], where: Optional[str] = None
     ):
@@ -30,5 +35,10 @@ class PatternMatch(StandardScanShareableAnalyzer[NumMatchesAndCount]):
     def _aggregation_functions(self, where: Optional[str] = None) -> AggDefinition:
         return {self.instance: {contains_regex(self.pattern), count_all}}
 
+    def row_matches(self, data: DataFrameLike) -> np.ndarray:
+        # the missing values do not match
+        matches = data[self.instance].str.contains(self.pattern)
+        return matches.fillna(False).to_numpy(dtype=bool)
+
     def additional_preconditions(self) -> List[Callable[[DataFrameLike], None]]:
         return [has_column(self.instance), is_string(self.instance)]
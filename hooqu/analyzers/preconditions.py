@@ -2,7 +2,12 @@
 
 from typing import Callable, Optional, Sequence
 
-from hooqu.dataframe import DataFrameLike, generic_is_numeric, generic_is_string
+from hooqu.dataframe import (
+    DataFrameLike,
+    column_names,
+    generic_is_numeric,
+    generic_is_string,
+)
 
 
 class NotColumnSpecifiedException(Exception):
@@ -28,7 +33,7 @@ def has_column(column: str) -> Callable[[DataFrameLike], None]:
     """ Specified column exists in the data """
 
     def f(df: DataFrameLike):
-        if column not in df.columns:
+        if column not in column_names(df):
             raise KeyError(f"Input data does not include column {column}")
 
     return f
@@ -1,26 +1,37 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
 from itertools import accumulate
-from typing import Dict, List, Mapping, Optional, Sequence, Set, cast
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple, cast
 
+import numpy as np
 import pandas as pd
 from more_itertools import partition
+from tryingsnake import Failure, Try_
 
-from hooqu.analyzers import Analyzer, ScanShareableAnalyzer
-from hooqu.analyzers.analyzer import AggDefinition
+from hooqu.analyzers import Analyzer, MutualInformation, ScanShareableAnalyzer
+from hooqu.analyzers.analyzer import AggDefinition, RowLevelAnalyzer
+from hooqu.analyzers.grouping_analyzers import FrequencyBasedAnalyzer
 from hooqu.analyzers.preconditions import find_first_failing
+from hooqu.backends import backend_for
 from hooqu.metrics import Metric
 
 
 @dataclass(frozen=True, eq=True)
 class AnalyzerContext:
     metric_map: Mapping[Analyzer, Metric] = field(default_factory=dict)
+    # the outcome of each row of the row level analyzers, when requested
+    row_level_results: Mapping[Analyzer, np.ndarray] = field(
+        default_factory=dict, compare=False
+    )
 
     def all_metrics(self) -> List[Metric]:
         return list(self.metric_map.values())
 
     def __add__(self, other: "AnalyzerContext"):
-        return AnalyzerContext({**self.metric_map, **other.metric_map})
+        return AnalyzerContext(
+            {**self.metric_map, **other.metric_map},
+            {**self.row_level_results, **other.row_level_results},
+        )
 
     def metric(self, analyzer: Analyzer) -> Optional[Metric]:
         return self.metric_map.get(analyzer, None)
@@ -62,9 +73,10 @@ class AnalyzerContext:
 def do_analysis_run(
     data,
     analyzers: Sequence[Analyzer],
-    aggregate_with=None,  # unused for now
-    save_state_with=None,  # unused for now
+    aggregate_with=None,
+    save_state_with=None,
     metric_repository_options=None,  # it will be a dict or something similar
+    row_level_results: bool = False,
 ) -> AnalyzerContext:
     """
 
@@ -77,15 +89,20 @@ def do_analysis_run(
          data on which to operate
     analyzers:
          the analyzers to run
-    aggregate_With: (not implemented)
-         load existing states for the configured analyzers
-         and aggregate them (optional)
-    save_States_With: (not implemented)
-        persist resulting states for the configured analyzers (optional)
+    aggregate_with:
+         ``StateLoader`` of existing states for the configured analyzers
+         to aggregate them (optional)
+    save_state_with:
+        ``StatePersister`` of the resulting states for the configured analyzers
+        (optional)
     metric_repository_options: (not implemented)
         options related to the MetricsRepository
     file_output_options: (not implemented probably will be removed)
         options related to File Ouput.
+    row_level_results:
+        Whether to keep the outcome of each row of the row level analyzers
+        (``AnalyzerContext.row_level_results``), not supported by all the
+        backends
 
     Returns
     -------
@@ -114,17 +131,127 @@ def do_analysis_run(
     failed_analyzers = set(analyzers_to_run) - set(passed_analyzers)
     precondition_failures = compute_precondition_failure_metrics(failed_analyzers, data)
 
-    # Originally the idea is be able to run all the analysis on a single scan
-    # assuming that internally pandas would do something like that
-    # however apparently there is no big gain from running all aggregations at once
-    # so for now we run the aggregation sequentially.
-
-    # TODO: Deal with gruping analyzers (if necessary)
-    metrics = run_analyzers_sequentially(data, analyzers)
+    # The backend decides how the states are computed: for Pandas there is no big
+    # gain from running all aggregations at once so they run sequentially,
+    # other backends (e.g. Arrow) compute all of them in a single scan.
+    metrics = run_analyzers_on_backend(
+        data, passed_analyzers, aggregate_with, save_state_with, row_level_results
+    )
 
     return metrics + precondition_failures
 
 
+def run_analyzers_on_backend(
+    data,
+    analyzers: Sequence[Analyzer],
+    aggregate_with=None,
+    save_state_with=None,
+    row_level_results: bool = False,
+) -> AnalyzerContext:
+    """
+    Computes the states of the analyzers with the backend that handles ``data``
+    and calculates the metrics from them.
+    """
+
+    if not len(analyzers):
+        return AnalyzerContext()
+
+    states = compute_backend_states(data, analyzers, row_level_results)
+    return metrics_from_states(analyzers, states, aggregate_with, save_state_with)
+
+
+def metrics_from_states(
+    analyzers: Sequence[Analyzer],
+    states: Mapping[Analyzer, Try_],
+    aggregate_with=None,
+    save_state_with=None,
+) -> AnalyzerContext:
+    """Calculates the metrics from the (``Try`` of the) states of the analyzers"""
+
+    metrics_by_analyzer: Dict[Analyzer, Metric] = {}
+    row_level_results: Dict[Analyzer, np.ndarray] = {}
+    for an in analyzers:
+        try:
+            state = states[an].get()
+            metrics_by_analyzer[an] = an.calculate_metric(
+                state, aggregate_with, save_state_with
+            )
+        except Exception as e:
+            metrics_by_analyzer[an] = an.to_failure_metric(e)
+            continue
+
+        full_column = getattr(state, "full_column", None)
+        if full_column is not None:
+            row_level_results[an] = full_column
+
+    return AnalyzerContext(metrics_by_analyzer, row_level_results)
+
+
+def compute_backend_states(
+    data, analyzers: Sequence[Analyzer], row_level_results: bool = False
+) -> Dict[Analyzer, Try_]:
+    """
+    Computes the states of the analyzers with the backend that handles ``data``.
+    The frequency based analyzers of the same columns and filter share the same
+    state, the frequencies of the groups are only computed once. With
+    ``row_level_results`` the states of the row level analyzers keep the outcome
+    of each row.
+    """
+
+    shared: Dict[Tuple[Tuple[str, ...], Optional[str]], Analyzer] = {}
+    sharing: Dict[Analyzer, Analyzer] = {}
+    to_compute: List[Analyzer] = []
+    # the mutual information needs the values of the groups, which the states
+    # of the other frequency based analyzers may not keep (e.g. with SQL), so
+    # they share its state
+    ordered = sorted(
+        dict.fromkeys(analyzers), key=lambda an: not isinstance(an, MutualInformation)
+    )
+    for an in ordered:
+        if isinstance(an, FrequencyBasedAnalyzer):
+            key = (tuple(an.grouping_columns), an.where)  # type: ignore[attr-defined]
+            if key in shared:
+                sharing[an] = shared[key]
+                continue
+            shared[key] = an
+        to_compute.append(an)
+
+    backend = backend_for(data)
+    row_level: List[Analyzer] = []
+    # the other backends only compute the aggregate states
+    if row_level_results and backend.keeps_row_level_results:
+        row_level = [an for an in to_compute if isinstance(an, RowLevelAnalyzer)]
+        to_compute = [an for an in to_compute if an not in row_level]
+
+    states = dict(backend.compute_states(data, to_compute))
+    if row_level:
+        states.update(backend.compute_row_level_states(data, row_level))
+    for an, other in sharing.items():
+        states[an] = states[other]
+    return states
+
+
+def compute_states(data, analyzers: Sequence[Analyzer]) -> Dict[Analyzer, Try_]:
+    """
+    Computes the states of the analyzers on the data, the analyzers whose
+    preconditions fail get a ``Failure`` with the first failing precondition.
+    """
+
+    states: Dict[Analyzer, Try_] = {}
+    passed_analyzers = []
+    for an in dict.fromkeys(analyzers):
+        exception = find_first_failing(data, an.preconditions())
+        if exception is None:
+            passed_analyzers.append(an)
+        else:
+            states[an] = Failure(exception)
+
+    if passed_analyzers:
+        states.update(compute_backend_states(data, passed_analyzers))
+
+    return states
+
+
 def run_non_scanning_analyzers(data, analyzers: Sequence[Analyzer]):
     metrics_by_analyzer: Dict[Analyzer, Metric] = {}
     for an in analyzers:
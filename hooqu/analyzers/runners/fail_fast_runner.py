@@ -0,0 +1,198 @@
+"""
+Fail-fast analysis runs.
+
+The analyzers whose constraints declare the interval their metric has to be in
+(see ``AnalysisBasedConstraint.bounds``), i.e. the declarative assertions of
+``hooqu.assertions`` such as the default ``is_one`` or ``at_least(0.9)``, are
+computed chunk by chunk, merging the states of the chunks with
+``State.sum``. After each chunk the range of the values their metric can still
+take on the whole data is derived from the merged state and the number of rows
+left, and an analyzer is stopped as soon as none of its constraints can pass
+anymore: a single missing value decides ``is_complete``, a single negative value
+``is_non_negative``, a single value above ``x`` ``has_max(c, at_most(x))``.
+
+The metrics of the stopped analyzers are those of the rows analyzed until they
+were stopped, the constraints fail on them as they would on the whole data. The
+other analyzers are computed in a single run on the whole data, unless the run
+is aborted on the failure of a constraint (e.g. of an ``ERROR`` check), in which
+case they have no metric.
+
+Pandas DataFrames, Arrow tables and record batches and Polars DataFrames are
+split in chunks. The other data is analyzed at once, as in a normal run: the
+Polars lazy frames and Arrow readers, which have no length (and the readers can
+only be read once), and the file sources (``DatasetSource``,
+``ParquetSource``), which already read the batches of their files in a single
+scan and whose number of rows is unknown before reading them (e.g. CSV files).
+"""
+import math
+from functools import singledispatch
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+from tryingsnake import Try_
+
+from hooqu.analyzers import (
+    Analyzer,
+    Completeness,
+    Compliance,
+    Maximum,
+    Minimum,
+    PatternMatch,
+    Size,
+)
+from hooqu.analyzers.runners.analysis_runner import (
+    AnalyzerContext,
+    compute_states,
+    do_analysis_run,
+    metrics_from_states,
+)
+from hooqu.backends.base import is_registered, merge_states
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+Bounds = Tuple[float, float]
+
+
+@singledispatch
+def metric_range(analyzer: Analyzer, state, remaining_rows: int) -> Bounds:
+    """
+    The range of the values the metric of the analyzer can take once the
+    remaining rows are added to the state.
+    """
+    raise NotImplementedError(f"No range for the metric of {analyzer}")
+
+
+@metric_range.register(Completeness)
+@metric_range.register(Compliance)
+@metric_range.register(PatternMatch)
+def _ratio_range(analyzer, state, remaining_rows: int) -> Bounds:
+    # all the remaining rows are selected and either all match or none does
+    count = state.count + remaining_rows
+    if count == 0:
+        return -math.inf, math.inf
+    return state.num_matches / count, (state.num_matches + remaining_rows) / count
+
+
+@metric_range.register(Size)
+def _size_range(analyzer, state, remaining_rows: int) -> Bounds:
+    return state.num_matches, state.num_matches + remaining_rows
+
+
+@metric_range.register(Minimum)
+def _minimum_range(analyzer, state, remaining_rows: int) -> Bounds:
+    if state is None or math.isnan(state.min_value):
+        return -math.inf, math.inf
+    return -math.inf, state.min_value
+
+
+@metric_range.register(Maximum)
+def _maximum_range(analyzer, state, remaining_rows: int) -> Bounds:
+    if state is None or math.isnan(state.max_value):
+        return -math.inf, math.inf
+    return state.max_value, math.inf
+
+
+def can_pass(metric_bounds: Bounds, bounds: Bounds) -> bool:
+    """Whether some value in the range of the metric is within the bounds"""
+    low, high = metric_bounds
+    lower, upper = bounds
+    return low <= upper and high >= lower
+
+
+def _chunks(data, chunk_size: int) -> Optional[Tuple[int, Iterable]]:
+    # the number of rows and the chunks, None when the data can not be split
+    if isinstance(data, pd.DataFrame):
+        num_rows = len(data)
+        return num_rows, (
+            data.iloc[offset : offset + chunk_size]
+            for offset in range(0, num_rows, chunk_size)
+        )
+    # Arrow tables and record batches, Polars DataFrames (but not the Arrow
+    # readers and Polars lazy frames, without length)
+    if (
+        type(data).__module__.split(".")[0] in ("pyarrow", "polars")
+        and hasattr(data, "__len__")
+        and hasattr(data, "slice")
+    ):
+        num_rows = len(data)
+        return num_rows, (
+            data.slice(offset, chunk_size) for offset in range(0, num_rows, chunk_size)
+        )
+    return None
+
+
+def _merge_try(state: Try_, other: Try_) -> Try_:
+    return state.flatMap(lambda s: other.map(lambda o: merge_states(s, o)))
+
+
+def do_fail_fast_analysis_run(
+    data,
+    analyzers: Sequence[Analyzer],
+    bounds: Mapping[Analyzer, Sequence[Optional[Bounds]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    abort_on: AbstractSet[Analyzer] = frozenset(),
+) -> AnalyzerContext:
+    """
+    Computes the metrics of the analyzers, stopping the analyzers whose metric
+    can no longer be within the bounds of any of their constraints.
+
+    Parameters
+    ----------
+
+    data:
+        Data handled by any of the backends
+    analyzers:
+        The analyzers to compute
+    bounds:
+        The bounds of the constraints on each analyzer, None for a constraint
+        without bounds (whose analyzer is then never stopped)
+    chunk_size:
+        Number of rows analyzed between two decisions
+    abort_on:
+        Analyzers whose stop aborts the whole run
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunks must have at least one row")
+
+    analyzers = list(dict.fromkeys(analyzers))
+    watched = [
+        an
+        for an in analyzers
+        if is_registered(metric_range, an)
+        and bounds.get(an)
+        and all(b is not None for b in bounds[an])
+    ]
+
+    split = _chunks(data, chunk_size)
+    if split is None or not watched:
+        # a single scan of the data
+        return do_analysis_run(data, analyzers)
+
+    num_rows, chunks = split
+    states: Dict[Analyzer, Try_] = {}
+    active: List[Analyzer] = list(watched)
+    analyzed = 0
+    aborted = False
+    for chunk in chunks:
+        if not active or aborted:
+            break
+        chunk_states = compute_states(chunk, active)
+        analyzed += len(chunk)
+        for an in list(active):
+            state = chunk_states[an]
+            states[an] = _merge_try(states[an], state) if an in states else state
+            if states[an].isSuccess:
+                possible = metric_range(an, states[an].get(), num_rows - analyzed)
+                if any(can_pass(possible, b) for b in bounds[an]):  # type: ignore
+                    continue
+            # the constraints on the analyzer fail whatever the remaining rows
+            active.remove(an)
+            aborted = aborted or an in abort_on
+
+    computed = [an for an in watched if an in states]
+    context = metrics_from_states(computed, states)
+    if aborted:
+        return context
+    # the analyzers without bounds, and those of empty data
+    others = [an for an in analyzers if an not in computed]
+    return context + do_analysis_run(data, others) if others else context
@@ -0,0 +1,178 @@
+"""
+Runs the analyzers on many files in parallel.
+
+Each file is analyzed on its own by a worker process, which only sends back
+the states of the analyzers. The states of all the files are merged with
+``State.sum``, so the metrics are the ones of the concatenation of the files
+while no process ever holds more than one file in memory.
+
+The analyzers whose states can not be merged (e.g. ``Quantile``) fail on the
+merged result but still have a metric per file. The frequencies of the groups
+(e.g. for ``Uniqueness``) are sent back compacted to the hashes of the groups,
+see ``FrequenciesAndNumRows.compact``.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from tryingsnake import Try, Try_
+
+from hooqu.analyzers import Analyzer, FrequenciesAndNumRows
+from hooqu.analyzers.runners.analysis_runner import (
+    AnalyzerContext,
+    compute_states,
+    metrics_from_states,
+)
+from hooqu.backends.base import merge_states
+from hooqu.prefetch import prefetch
+
+PathLike = Union[str, "os.PathLike[str]"]
+Reader = Callable[[str], object]
+
+
+@dataclass(frozen=True)
+class FilesAnalysisResult:
+    context: AnalyzerContext
+    file_contexts: Dict[str, AnalyzerContext] = field(default_factory=dict)
+
+
+def open_file(path: str):
+    """
+    Default reader: Parquet, CSV and Arrow IPC files are opened as
+    ``pyarrow.dataset`` sources (by extension), so that only the columns needed
+    are read.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        from hooqu.backends.parquet import ParquetSource
+
+        return ParquetSource(path, partitioning=None)
+
+    from hooqu.backends.dataset import DatasetSource
+
+    if suffix in (".arrow", ".feather", ".ipc"):
+        return DatasetSource.from_ipc(path)
+    if ".csv" in Path(path).suffixes:  # compressed files too, e.g. data.csv.gz
+        return DatasetSource.from_csv(path)
+    raise ValueError(f"Unknown file type for {path}, use a custom reader")
+
+
+def list_files(paths: Union[PathLike, Sequence[PathLike]]) -> List[str]:
+    """
+    The files to analyze: a directory is replaced by the files it contains,
+    ignoring hidden files and the ones starting with ``_`` (e.g. ``_SUCCESS``).
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                str(p)
+                for p in sorted(path.iterdir())
+                if p.is_file() and not p.name.startswith((".", "_"))
+            )
+        else:
+            files.append(str(path))
+    return files
+
+
+def _read(path: str, reader: Reader) -> Try_:
+    return Try(reader, path)
+
+
+def _data_states(data: Try_, analyzers: Sequence[Analyzer]) -> Dict[Analyzer, Try_]:
+    if data.isFailure:
+        return {an: data for an in analyzers}
+    return compute_states(data.get(), analyzers)
+
+
+def _file_states(
+    path: str, analyzers: Sequence[Analyzer], reader: Reader
+) -> Dict[Analyzer, Try_]:
+    # runs in the worker processes, only the states are sent back
+    states = _data_states(_read(path, reader), analyzers)
+    return {an: state.map(_compact) for an, state in states.items()}
+
+
+def _compact(state):
+    # the hashes of the groups are much cheaper to send than their values
+    if isinstance(state, FrequenciesAndNumRows):
+        return state.compact()
+    return state
+
+
+def _merge_try(state: Try_, other: Try_) -> Try_:
+    return state.flatMap(lambda s: other.map(lambda o: merge_states(s, o)))
+
+
+def _merge_all(states: List[Try_]) -> Try_:
+    # merged pairwise as a balanced tree: a fold would merge the growing result
+    # (e.g. the sorted hashes of all the groups seen so far) once per file
+    while len(states) > 1:
+        states = [
+            _merge_try(*states[i : i + 2]) if i + 1 < len(states) else states[i]
+            for i in range(0, len(states), 2)
+        ]
+    return states[0]
+
+
+def do_analysis_run_on_files(
+    paths: Union[PathLike, Sequence[PathLike]],
+    analyzers: Sequence[Analyzer],
+    workers: Optional[int] = None,
+    reader: Optional[Reader] = None,
+    prefetch_depth: int = 2,
+) -> FilesAnalysisResult:
+    """
+    Computes the states of the analyzers on each file in a process pool and
+    merges them.
+
+    Parameters
+    ----------
+
+    paths:
+        A directory, a file or a list of them
+    analyzers:
+        The analyzers to run
+    workers:
+        Number of processes, by default the number of CPUs. With 1 the files
+        are analyzed in the current process.
+    reader:
+        Function opening a file as data for the analyzers (e.g.
+        ``pandas.read_csv``), it must be picklable. By default ``open_file``.
+    prefetch_depth:
+        With a single worker, number of files read ahead in a background
+        thread while the current one is analyzed (see ``hooqu.prefetch``).
+
+    Returns
+    -------
+    The metrics of the analyzers on all the files, and on each one of them
+    """
+    analyzers = list(dict.fromkeys(analyzers))
+    files = list_files(paths)
+    if not analyzers or not files:
+        return FilesAnalysisResult(AnalyzerContext())
+
+    reader = reader or open_file
+    if workers == 1:
+        # the next files are read while the current one is analyzed
+        data = prefetch((_read(f, reader) for f in files), prefetch_depth)
+        states = [_data_states(d, analyzers) for d in data]
+    else:
+        file_states = partial(_file_states, analyzers=analyzers, reader=reader)
+        workers = workers or os.cpu_count() or 1
+        # a few chunks per worker: less overhead while keeping them all busy
+        chunksize = max(1, len(files) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            states = list(executor.map(file_states, files, chunksize=chunksize))
+
+    merged = {an: _merge_all([s[an] for s in states]) for an in analyzers}
+    return FilesAnalysisResult(
+        metrics_from_states(analyzers, merged),
+        {f: metrics_from_states(analyzers, s) for f, s in zip(files, states)},
+    )
@@ -0,0 +1,167 @@
+"""
+Incremental analysis of append-only data.
+
+The state of each analyzer is persisted together with a watermark: the maximum
+value of a (numeric, non-null and increasing) column of the rows it covers, e.g.
+an auto-incremented id, an ingestion timestamp or a partition number. The next
+run only analyzes the rows strictly past the watermark, by adding a condition to the
+``where`` filter of the analyzers (which the file backends push down to skip
+row groups and partitions), and merges their states into the stored ones with
+``State.sum``.
+
+The values of the appended rows must therefore be strictly greater than the
+watermark: rows appended with a value equal to it (e.g. a timestamp shared with
+the last rows of the previous run) are never analyzed, since the rows already
+covered by the stored states can not be told apart from them.
+
+The watermark is stored with the state of each analyzer, so a state and its
+watermark are always persisted together, and an analyzer without a stored state
+(e.g. added to a check since the last run) is computed on all the rows.
+"""
+import inspect
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from tryingsnake import Try_
+
+from hooqu.analyzers import Analyzer, Maximum
+from hooqu.analyzers.runners.analysis_runner import (
+    AnalyzerContext,
+    compute_states,
+    metrics_from_states,
+)
+from hooqu.analyzers.state_provider import StateLoader, StatePersister
+from hooqu.backends.base import merge_states
+
+
+@dataclass(frozen=True)
+class WatermarkedState:
+    """The state of an analyzer on the rows up to the watermark (included)"""
+
+    state: Any
+    watermark: Optional[float]
+
+
+def _past(column: str, watermark) -> str:
+    # the rows appended later must be strictly past the watermark
+    return f"`{column}` > {watermark!r}"
+
+
+# the constructor parameters stored under another attribute name
+_ATTRIBUTES = {"column": "instance", "bins": "edges"}
+
+
+def with_where(analyzer: Analyzer, condition: Optional[str]) -> Analyzer:
+    """
+    A copy of the analyzer with the condition added to its where filter, built
+    by calling its constructor with the arguments read from its attributes.
+    """
+    if condition is None:
+        return analyzer
+    where = condition
+    if analyzer.where is not None:
+        where = f"({analyzer.where}) and {condition}"
+
+    kwargs = {}
+    parameters = inspect.signature(type(analyzer)).parameters
+    for name, parameter in parameters.items():
+        if name == "where":
+            kwargs[name] = where
+        elif hasattr(analyzer, name):
+            kwargs[name] = getattr(analyzer, name)
+        elif hasattr(analyzer, _ATTRIBUTES.get(name, name)):
+            kwargs[name] = getattr(analyzer, _ATTRIBUTES[name])
+        elif parameter.default is inspect.Parameter.empty:
+            raise TypeError(f"Can not add a where filter to {analyzer!r}")
+    return type(analyzer)(**kwargs)
+
+
+def _watermark_value(state) -> Optional[float]:
+    value = state.max_value if state is not None else math.nan
+    if value is None or math.isnan(value):
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def do_incremental_analysis_run(
+    data,
+    analyzers: Sequence[Analyzer],
+    state_provider: Any,
+    watermark_column: str,
+) -> AnalyzerContext:
+    """
+    Computes the metrics of the analyzers on the data, only analyzing the rows
+    past the watermarks of the states stored in ``state_provider``.
+
+    Parameters
+    ----------
+
+    data:
+        The whole (append-only) data
+    analyzers:
+        The analyzers to run
+    state_provider:
+        A ``StateLoader`` and ``StatePersister`` (e.g.
+        ``FileSystemStateProvider``) storing a ``WatermarkedState`` per analyzer
+    watermark_column:
+        Numeric column whose values strictly increase from one run to the
+        next: the rows appended since the last run must be past its watermark
+
+    Returns
+    -------
+    An AnalyzerContext holding the metrics of the analyzers on all the rows
+    """
+    loader: StateLoader = state_provider
+    persister: StatePersister = state_provider
+
+    analyzers = list(dict.fromkeys(analyzers))
+    if not analyzers:
+        return AnalyzerContext()
+
+    stored: Dict[Analyzer, Optional[WatermarkedState]] = {
+        an: loader.load(an) for an in analyzers
+    }
+    watermarks = {
+        an: s.watermark if s is not None else None for an, s in stored.items()
+    }
+    restricted = {
+        an: with_where(an, None if w is None else _past(watermark_column, w))
+        for an, w in watermarks.items()
+    }
+
+    # the new watermark is the maximum of the rows read by any of the analyzers
+    lowest = None if None in watermarks.values() else min(watermarks.values())
+    marker = Maximum(
+        watermark_column,
+        where=None if lowest is None else _past(watermark_column, lowest),
+    )
+
+    states = compute_states(data, list(restricted.values()) + [marker])
+    new_watermark = states[marker].map(_watermark_value)
+
+    merged: Dict[Analyzer, Try_] = {}
+    for an in analyzers:
+        previous = stored[an].state if stored[an] is not None else None
+        merged[an] = states[restricted[an]].map(
+            lambda state, previous=previous: merge_states(previous, state)
+        )
+
+        # without the new watermark the state can not be stored: the next run
+        # would not know which rows it covers
+        if merged[an].isFailure or new_watermark.isFailure:
+            continue
+        state = merged[an].get()
+        if state is None:
+            continue
+        watermark = watermarks[an]
+        if new_watermark.get() is not None:
+            watermark = (
+                new_watermark.get()
+                if watermark is None
+                else max(watermark, new_watermark.get())
+            )
+        persister.persist(an, WatermarkedState(state, watermark))
+
+    return metrics_from_states(analyzers, merged)
@@ -14,8 +14,8 @@ class NumMatches(DoubledValuedState["NumMatches"]):
 
     num_matches: int
 
-    def sum(self, other) -> "NumMatches":
-        return self.num_matches + other.num_matches
+    def sum(self, other: "NumMatches") -> "NumMatches":
+        return NumMatches(self.num_matches + other.num_matches)
 
     def metric_value(self):
         return float(self.num_matches)
@@ -27,4 +27,6 @@ class Size(NonScanAnalyzer[NumMatches]):
         super().__init__("Size", "*", Entity.DATASET, where)
 
     def compute_state_from(self, dataframe: DataFrameLike) -> NumMatches:
+        if self.where:
+            dataframe = dataframe.query(self.where)
         return NumMatches(len(dataframe))
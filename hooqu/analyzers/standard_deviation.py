@@ -55,10 +55,13 @@ class StandardDeviation(StandardScanShareableAnalyzer[StandardDeviationState]):
         self, result: DataFrameLike, offset: int = 0
     ) -> Optional[StandardDeviationState]:
         if not len(result):
-            return StandardDeviationState(0, 0, 0)
+            return None
 
         values = result.loc["pop_variance"][self.instance]
         n, avg, m2 = values
+        # no values (e.g. all the rows are filtered out), as with empty data
+        if n == 0:
+            return None
 
         return StandardDeviationState(n, avg, m2)
 
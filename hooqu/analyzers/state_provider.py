@@ -0,0 +1,91 @@
+"""
+Loaders and persisters of the states of the analyzers.
+
+States persisted by a run can be aggregated into the states of a later run (see
+``aggregate_with`` and ``save_states_with`` in ``do_analysis_run``), so the
+metrics of a dataset can be computed from the states of its parts, e.g. when
+only the new data is analyzed at each run.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from hooqu.analyzers.analyzer import Analyzer
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class StateLoader(ABC):
+    @abstractmethod
+    def load(self, analyzer: Analyzer) -> Optional[Any]:
+        """The state stored for the analyzer, None if there is none"""
+        pass
+
+
+class StatePersister(ABC):
+    @abstractmethod
+    def persist(self, analyzer: Analyzer, state: Any) -> None:
+        """Stores the state of the analyzer, replacing the previous one"""
+        pass
+
+
+class InMemoryStateProvider(StateLoader, StatePersister):
+    def __init__(self):
+        self.states: Dict[Analyzer, Any] = {}
+
+    def load(self, analyzer: Analyzer) -> Optional[Any]:
+        return self.states.get(analyzer)
+
+    def persist(self, analyzer: Analyzer, state: Any) -> None:
+        self.states[analyzer] = state
+
+    def __repr__(self):
+        return f"InMemoryStateProvider({self.states})"
+
+
+def analyzer_key(analyzer: Analyzer) -> str:
+    """Identifier of the analyzer, stable across processes"""
+    attributes = sorted(vars(analyzer).items())
+    description = f"{type(analyzer).__qualname__}{attributes!r}"
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+class FileSystemStateProvider(StateLoader, StatePersister):
+    """
+    Stores the states as pickle files in a directory, one file per analyzer.
+    Each file is replaced atomically, so a state is never partially written.
+
+    Parameters
+    ----------
+
+    directory:
+        Where the states are stored, it is created if needed.
+    """
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, analyzer: Analyzer) -> Path:
+        return self.directory / f"{analyzer_key(analyzer)}.pkl"
+
+    def load(self, analyzer: Analyzer) -> Optional[Any]:
+        path = self._path(analyzer)
+        if not path.exists():
+            return None
+        with path.open("rb") as f:
+            return pickle.load(f)
+
+    def persist(self, analyzer: Analyzer, state: Any) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(state, f)
+            os.replace(tmp, self._path(analyzer))
+        except BaseException:
+            os.unlink(tmp)
+            raise
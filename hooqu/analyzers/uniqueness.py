@@ -26,7 +26,10 @@ class Uniqueness(ScanShareableFrequencyBasedAnalyzer, _UniquenessDataClassMixin)
         self.where = where
 
     def _aggregation_functions(self, num_rows: int) -> AggDefinition:
-        def uniqueness_aggregation(s):
-            return (s == 1).astype(int).sum() / num_rows
+        def uniqueness_aggregation(s, groups=None):
+            unique = (s == 1).astype(int)
+            if groups is not None:
+                unique = unique * groups
+            return unique.sum() / num_rows
 
         return {COUNT_COL: {uniqueness_aggregation}}
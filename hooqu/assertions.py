@@ -0,0 +1,60 @@
+# coding: utf-8
+"""
+Declarative assertions, usable wherever a ``Check`` method takes an assertion
+callable: ``between(a, b)``, ``at_least(x)``, ``at_most(x)`` and ``equals(x)``.
+
+Unlike lambdas, they declare the (closed) interval of the values passing them
+(``bounds``), which lets the fail-fast runs stop an analyzer as soon as its
+metric can no longer be in it (see
+``hooqu.analyzers.runners.fail_fast_runner``), and they pickle, so checks using
+them can be sent to worker processes.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Between:
+    """Asserts that the value is in ``[lower, upper]``, bounds included"""
+
+    lower: float = -math.inf
+    upper: float = math.inf
+
+    def __post_init__(self):
+        if self.lower > self.upper:
+            raise ValueError(f"Empty interval [{self.lower}, {self.upper}]")
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        return self.lower, self.upper
+
+    def __call__(self, value) -> bool:
+        return bool(self.lower <= value <= self.upper)
+
+    def __repr__(self) -> str:
+        # the code creating the assertion
+        if self.lower == self.upper:
+            return f"equals({self.lower!r})"
+        if self.upper == math.inf:
+            return f"at_least({self.lower!r})"
+        if self.lower == -math.inf:
+            return f"at_most({self.upper!r})"
+        return f"between({self.lower!r}, {self.upper!r})"
+
+
+def between(lower: float, upper: float) -> Between:
+    return Between(lower, upper)
+
+
+def at_least(lower: float) -> Between:
+    return Between(lower=lower)
+
+
+def at_most(upper: float) -> Between:
+    return Between(upper=upper)
+
+
+def equals(value: float) -> Between:
+    return Between(value, value)
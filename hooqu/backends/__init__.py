@@ -0,0 +1,66 @@
+import sys
+from collections.abc import Mapping
+
+import numpy as np
+
+from hooqu.backends.base import Backend, backend_for, register_backend
+
+
+def _is_arrow(data) -> bool:
+    # pyarrow is optional: if it was never imported, data can't be Arrow data
+    pa = sys.modules.get("pyarrow")
+    return pa is not None and isinstance(
+        data, (pa.Table, pa.RecordBatch, pa.RecordBatchReader)
+    )
+
+
+def _is_polars(data) -> bool:
+    pl = sys.modules.get("polars")
+    return pl is not None and isinstance(data, (pl.DataFrame, pl.LazyFrame))
+
+
+def _is_numpy(data) -> bool:
+    # structured arrays or mappings of column names to arrays
+    if isinstance(data, np.ndarray):
+        return data.dtype.names is not None
+    return (
+        isinstance(data, Mapping)
+        and len(data) > 0
+        and all(isinstance(v, np.ndarray) for v in data.values())
+    )
+
+
+def _is_dask(data) -> bool:
+    dd = sys.modules.get("dask.dataframe")
+    return dd is not None and isinstance(data, dd.DataFrame)
+
+
+def _is_dataset(data) -> bool:
+    dataset = sys.modules.get("hooqu.backends.dataset")
+    return dataset is not None and isinstance(data, dataset.DatasetSource)
+
+
+def _is_parquet(data) -> bool:
+    parquet = sys.modules.get("hooqu.backends.parquet")
+    return parquet is not None and isinstance(data, parquet.ParquetSource)
+
+
+def _is_sql(data) -> bool:
+    # SQLTable objects can only exist once their module has been imported
+    sql = sys.modules.get("hooqu.backends.sql")
+    return sql is not None and isinstance(data, sql.SQLTable)
+
+
+register_backend(_is_numpy, "hooqu.backends.numpy:NumpyBackend")
+register_backend(_is_arrow, "hooqu.backends.arrow:ArrowBackend")
+register_backend(_is_polars, "hooqu.backends.polars:PolarsBackend")
+register_backend(_is_dask, "hooqu.backends.dask:DaskBackend")
+register_backend(_is_dataset, "hooqu.backends.dataset:DatasetBackend")
+register_backend(_is_parquet, "hooqu.backends.parquet:ParquetBackend")
+register_backend(_is_sql, "hooqu.backends.sql:SQLBackend")
+
+__all__ = [
+    "Backend",
+    "backend_for",
+    "register_backend",
+]
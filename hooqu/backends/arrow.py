@@ -0,0 +1,504 @@
+"""
+Backend for ``pyarrow.Table``, ``pyarrow.RecordBatch`` and
+``pyarrow.RecordBatchReader`` objects.
+
+All the analyzers are computed with ``pyarrow.compute`` kernels, without
+converting the data to Pandas. The data is processed record batch by record
+batch: analyzers whose state can be merged compute a state per batch and the
+states are combined with ``State.sum``, so all of them are computed in a single
+pass over the data (which also makes it possible to verify a stream of
+batches). Quantile and the frequency based analyzers need to see all the values
+at once, for those only the columns they use are collected.
+
+As with Pandas, nulls and NaN values are considered missing values.
+"""
+import re
+from functools import reduce, singledispatch
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from tryingsnake import Failure, Success, Try, Try_
+
+from hooqu.analyzers import (
+    Completeness,
+    Compliance,
+    Correlation,
+    DataType,
+    DataTypeHistogram,
+    Histogram,
+    HistogramState,
+    Maximum,
+    MaxState,
+    Mean,
+    MeanState,
+    Minimum,
+    MinState,
+    NumMatches,
+    NumMatchesAndCount,
+    PatternMatch,
+    Quantile,
+    QuantileState,
+    Size,
+    StandardDeviation,
+    StandardDeviationState,
+    Sum,
+    SumState,
+)
+from hooqu.analyzers.analyzer import COUNT_COL, Analyzer, State
+from hooqu.analyzers.correlation import CorrelationState, correlation_states
+from hooqu.analyzers.grouping_analyzers import (
+    ApproxCountDistinct,
+    ApproxCountDistinctState,
+    FrequenciesAndNumRows,
+    FrequencyBasedAnalyzer,
+    TopK,
+    TopKState,
+)
+from hooqu.backends.base import Backend, is_registered, merge_states
+from hooqu.backends.spill import SpillingFrequencies
+from hooqu.expressions import ExpressionCompiler, UnsupportedExpressionException
+
+_COMPARISON_KERNELS = {
+    "==": pc.equal,
+    "!=": pc.not_equal,
+    "<": pc.less,
+    "<=": pc.less_equal,
+    ">": pc.greater,
+    ">=": pc.greater_equal,
+}
+
+
+def _is_array(value) -> bool:
+    return isinstance(value, (pa.Array, pa.ChunkedArray))
+
+
+def _nan_to_null(values):
+    """Replaces NaN by nulls on floating point arrays"""
+    if not _is_array(values) or not pa.types.is_floating(values.type):
+        return values
+    if not pc.any(pc.is_nan(values)).as_py():
+        return values
+    return pc.if_else(pc.is_nan(values), pa.scalar(None, values.type), values)
+
+
+def _to_float(value):
+    if _is_array(value) and pa.types.is_integer(value.type):
+        return pc.cast(value, pa.float64())
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+class ArrowExpressionCompiler(ExpressionCompiler[Any]):
+    """Evaluates an expression on a ``RecordBatch`` or a ``Table``"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def column(self, name: str):
+        if name not in self.data.schema.names:
+            raise KeyError(f"Input data does not include column {name}")
+        return self.data.column(name)
+
+    def literal(self, value: Any):
+        return value
+
+    def compare(self, op: str, left, right):
+        return pc.fill_null(_COMPARISON_KERNELS[op](left, right), op == "!=")
+
+    def and_(self, operands: Sequence):
+        return reduce(pc.and_kleene, operands)
+
+    def or_(self, operands: Sequence):
+        return reduce(pc.or_kleene, operands)
+
+    def not_(self, operand):
+        return pc.invert(operand)
+
+    def arithmetic(self, op: str, left, right):
+        if op == "+":
+            return pc.add(left, right)
+        if op == "-":
+            return pc.subtract(left, right)
+        if op == "*":
+            return pc.multiply(left, right)
+        if op == "/":
+            return pc.divide(_to_float(left), right)
+        if op == "**":
+            return pc.power(left, right)
+        if op == "%":
+            # floored modulo as in Python and Pandas
+            left = _to_float(left)
+            quotient = pc.floor(pc.divide(left, right))
+            return pc.subtract(left, pc.multiply(quotient, right))
+
+        raise UnsupportedExpressionException(f"Unsupported operator {op}")
+
+    def negate(self, operand):
+        return pc.negate(operand)
+
+    def is_null(self, operand):
+        return pc.is_null(operand, nan_is_null=True)
+
+    def fill_null(self, operand, value: Any):
+        return pc.fill_null(_nan_to_null(operand), value)
+
+    def is_in(self, operand, values: Sequence[Any]):
+        try:
+            value_set = pa.array(values, type=operand.type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, AttributeError):
+            value_set = pa.array(values)
+        return pc.is_in(operand, value_set=value_set)
+
+    def mask(self, expression: str):
+        result = self.compile(expression)
+        if not _is_array(result):
+            result = pa.array(np.full(self.data.num_rows, bool(result)))
+        if not pa.types.is_boolean(result.type):
+            raise ValueError(f"Expression '{expression}' is not a boolean predicate")
+        return pc.fill_null(result, False)
+
+
+def apply_where(data, where: Optional[str]):
+    """Filters the batch or table with the given ``where`` expression"""
+    if where is None:
+        return data
+    return data.filter(ArrowExpressionCompiler(data).mask(where))
+
+
+def _values(data, column: str):
+    return _nan_to_null(data.column(column))
+
+
+def _count_true(mask) -> int:
+    return pc.sum(mask).as_py() or 0
+
+
+# Kernels for the analyzers whose state can be computed batch by batch.
+# They receive the data already filtered by the analyzer's where clause.
+
+
+@singledispatch
+def batch_state(analyzer: Analyzer, batch) -> Optional[State]:
+    raise NotImplementedError(f"{analyzer} is not supported by the Arrow backend")
+
+
+@batch_state.register(Size)
+def _size_state(analyzer: Size, batch) -> NumMatches:
+    return NumMatches(batch.num_rows)
+
+
+@batch_state.register(Completeness)
+def _completeness_state(analyzer: Completeness, batch) -> NumMatchesAndCount:
+    values = _values(batch, analyzer.instance)
+    return NumMatchesAndCount(batch.num_rows - values.null_count, batch.num_rows)
+
+
+@batch_state.register(Compliance)
+def _compliance_state(analyzer: Compliance, batch) -> NumMatchesAndCount:
+    mask = ArrowExpressionCompiler(batch).mask(analyzer.predicate)
+    return NumMatchesAndCount(_count_true(mask), batch.num_rows)
+
+
+def _regex_matches(values, pattern) -> int:
+    regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+    try:
+        matches = pc.match_substring_regex(
+            values, regex.pattern, ignore_case=bool(regex.flags & re.IGNORECASE)
+        )
+        return _count_true(matches)
+    except pa.ArrowInvalid:
+        # RE2 does not support some constructs (e.g. backreferences), fall back
+        # to Python's re module but evaluated only once per distinct value
+        encoded = pc.dictionary_encode(values)
+        if isinstance(encoded, pa.ChunkedArray):
+            encoded = encoded.combine_chunks()
+        hits = np.fromiter(
+            (regex.search(v) is not None for v in encoded.dictionary.to_pylist()),
+            dtype=bool,
+            count=len(encoded.dictionary),
+        )
+        indices = encoded.indices.drop_null().to_numpy()
+        return int(hits[indices].sum())
+
+
+@batch_state.register(PatternMatch)
+def _pattern_match_state(analyzer: PatternMatch, batch) -> NumMatchesAndCount:
+    values = batch.column(analyzer.instance)
+    return NumMatchesAndCount(
+        _regex_matches(values, analyzer.pattern), batch.num_rows
+    )
+
+
+@batch_state.register(Mean)
+def _mean_state(analyzer: Mean, batch) -> MeanState:
+    values = _values(batch, analyzer.instance)
+    return MeanState(pc.sum(values).as_py() or 0, len(values) - values.null_count)
+
+
+@batch_state.register(Sum)
+def _sum_state(analyzer: Sum, batch) -> SumState:
+    values = _values(batch, analyzer.instance)
+    return SumState(pc.sum(values).as_py() or 0)
+
+
+def _min_max(data, column: str) -> Mapping[str, Any]:
+    result = pc.min_max(_values(data, column)).as_py()
+    return {k: float("nan") if v is None else v for k, v in result.items()}
+
+
+@batch_state.register(Minimum)
+def _min_state(analyzer: Minimum, batch) -> MinState:
+    return MinState(_min_max(batch, analyzer.instance)["min"])
+
+
+@batch_state.register(Maximum)
+def _max_state(analyzer: Maximum, batch) -> MaxState:
+    return MaxState(_min_max(batch, analyzer.instance)["max"])
+
+
+@batch_state.register(StandardDeviation)
+def _std_state(analyzer: StandardDeviation, batch) -> Optional[StandardDeviationState]:
+    values = _values(batch, analyzer.instance)
+    n = len(values) - values.null_count
+    if n == 0:
+        return None
+    avg = pc.mean(values).as_py()
+    m2 = pc.variance(values, ddof=0).as_py() * n
+    return StandardDeviationState(n, avg, m2)
+
+
+@batch_state.register(Correlation)
+def _correlation_state(analyzer: Correlation, batch) -> Optional[CorrelationState]:
+    columns = {
+        c: _values(batch, c).to_numpy(zero_copy_only=False) for c in analyzer.columns
+    }
+    return correlation_states(columns, [analyzer])[analyzer]
+
+
+@batch_state.register(ApproxCountDistinct)
+def _approx_count_distinct_state(
+    analyzer: ApproxCountDistinct, batch
+) -> ApproxCountDistinctState:
+    values = _values(batch, analyzer.instance).drop_null()
+    return ApproxCountDistinctState.from_values(values.to_numpy(zero_copy_only=False))
+
+
+@batch_state.register(TopK)
+def _top_k_state(analyzer: TopK, batch) -> TopKState:
+    counts = pc.value_counts(_values(batch, analyzer.instance))
+    values = counts.field("values")
+    valid = pc.is_valid(values)
+    counts = pd.Series(
+        counts.field("counts").filter(valid).to_numpy(),
+        index=values.filter(valid).to_numpy(zero_copy_only=False),
+    )
+    return TopKState.from_counts(counts, batch.num_rows, analyzer.capacity)
+
+
+@batch_state.register(Histogram)
+def _histogram_state(analyzer: Histogram, batch) -> HistogramState:
+    values = _values(batch, analyzer.instance)
+    if analyzer.edges is not None:
+        return HistogramState.from_values(
+            values.to_numpy(zero_copy_only=False), analyzer.edges_array
+        )
+    counts = pc.value_counts(values.drop_null())
+    counts = pd.Series(
+        counts.field("counts").to_numpy(),
+        index=counts.field("values").to_numpy(zero_copy_only=False),
+    )
+    return HistogramState.with_nulls(counts, values.null_count, batch.num_rows)
+
+
+@batch_state.register(DataType)
+def _data_type_state(analyzer: DataType, batch) -> DataTypeHistogram:
+    values = _values(batch, analyzer.instance)
+    return DataTypeHistogram.from_values(values.to_numpy(zero_copy_only=False))
+
+
+# Kernels for the analyzers that need all the (filtered) values of the columns
+# they operate on.
+
+
+@singledispatch
+def table_state(analyzer: Analyzer, table: pa.Table) -> Optional[State]:
+    raise NotImplementedError(f"{analyzer} is not supported by the Arrow backend")
+
+
+@table_state.register(Quantile)
+def _quantile_state(analyzer: Quantile, table: pa.Table) -> QuantileState:
+    values = _values(table, analyzer.instance)
+    result = pc.quantile(values, q=analyzer.quantile, interpolation="nearest")
+    value = result[0].as_py()
+    return QuantileState(float("nan") if value is None else value)
+
+
+@table_state.register(FrequencyBasedAnalyzer)
+def _frequencies_state(
+    analyzer: FrequencyBasedAnalyzer, table: pa.Table
+) -> FrequenciesAndNumRows:
+    return compute_frequencies(table, analyzer.grouping_columns)
+
+
+def compute_frequencies(
+    table: pa.Table, grouping_columns: Sequence[str]
+) -> FrequenciesAndNumRows:
+    """
+    Arrow version of ``FrequencyBasedAnalyzer.compute_frequencies``, the
+    frequencies are returned as an Arrow table.
+    """
+    columns = list(grouping_columns)
+    not_null = [
+        pc.invert(pc.is_null(table.column(c), nan_is_null=True)) for c in columns
+    ]
+    table = table.select(columns).filter(reduce(pc.or_, not_null))
+
+    grouped = table.group_by(columns).aggregate(
+        [(columns[0], "count", pc.CountOptions(mode="all"))]
+    )
+    frequencies = pa.table(
+        [grouped.column(c) for c in columns] + [grouped.column(f"{columns[0]}_count")],
+        names=columns + [COUNT_COL],
+    )
+    return FrequenciesAndNumRows(frequencies, table.num_rows)
+
+
+def _holistic_columns(analyzer: Analyzer) -> List[str]:
+    if isinstance(analyzer, FrequencyBasedAnalyzer):
+        return list(analyzer.grouping_columns)
+    return [analyzer.instance]
+
+
+def record_batches(data) -> Iterable[pa.RecordBatch]:
+    if isinstance(data, pa.RecordBatch):
+        return [data]
+    if isinstance(data, pa.Table):
+        return data.to_batches()
+    return data
+
+
+def _or_empty(batches: Iterable[pa.RecordBatch], schema: pa.Schema):
+    # without any batch (e.g. an empty table or a scan whose filter skips every
+    # row group) the states are those of an empty batch, e.g. a Size of 0
+    empty = True
+    for batch in batches:
+        empty = False
+        yield batch
+    if empty:
+        yield pa.RecordBatch.from_pylist([], schema=schema)
+
+
+class ArrowBackend(Backend):
+
+    name = "arrow"
+
+    def column_names(self, data) -> Sequence[str]:
+        return data.schema.names
+
+    def dtype(self, data, column: str):
+        return data.schema.field(column).type
+
+    def is_numeric(self, data, column: str) -> bool:
+        dtype = self.dtype(data, column)
+        return (
+            pa.types.is_integer(dtype)
+            or pa.types.is_floating(dtype)
+            or pa.types.is_decimal(dtype)
+            or pa.types.is_boolean(dtype)
+        )
+
+    def is_string(self, data, column: str) -> bool:
+        dtype = self.dtype(data, column)
+        if pa.types.is_dictionary(dtype):
+            dtype = dtype.value_type
+        return pa.types.is_string(dtype) or pa.types.is_large_string(dtype)
+
+    def compute_state(self, analyzer: Analyzer, data) -> Optional[State]:
+        return self.compute_states(data, [analyzer])[analyzer].get()
+
+    def compute_states(
+        self, data, analyzers: Sequence[Analyzer]
+    ) -> Mapping[Analyzer, Try_]:
+        return self.compute_states_from_batches(
+            record_batches(data), data.schema, analyzers
+        )
+
+    def compute_states_from_batches(
+        self,
+        batches: Iterable[pa.RecordBatch],
+        schema: pa.Schema,
+        analyzers: Sequence[Analyzer],
+        memory_budget: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> Mapping[Analyzer, Try_]:
+        """
+        Computes the states of all the analyzers in a single pass over
+        the batches.
+
+        With a ``memory_budget`` (in bytes), the frequency based analyzers
+        whose columns do not fit in it count their groups out of core, in
+        ``spill_dir`` (see ``hooqu.backends.spill``).
+        """
+        analyzers = list(dict.fromkeys(analyzers))
+        failures: Dict[Analyzer, Exception] = {}
+        states: Dict[Analyzer, Optional[State]] = {}
+        collected: Dict[Analyzer, List[pa.RecordBatch]] = {}
+        spilling: Dict[Analyzer, SpillingFrequencies] = {}
+
+        for an in analyzers:
+            if is_registered(batch_state, an):
+                states[an] = None
+            elif memory_budget is not None and isinstance(an, FrequencyBasedAnalyzer):
+                spilling[an] = SpillingFrequencies(
+                    an.grouping_columns, memory_budget, spill_dir
+                )
+            elif is_registered(table_state, an):
+                collected[an] = []
+            else:
+                failures[an] = NotImplementedError(
+                    f"{an} is not supported by the Arrow backend"
+                )
+
+        for batch in _or_empty(batches, schema):
+            filtered: Dict[Optional[str], Try_] = {}
+            for an in analyzers:
+                if an in failures:
+                    continue
+                if an.where not in filtered:
+                    filtered[an.where] = Try(apply_where, batch, an.where)
+                try:
+                    view = filtered[an.where].get()
+                    if an in spilling:
+                        spilling[an].add(view.select(_holistic_columns(an)))
+                    elif an in collected:
+                        collected[an].append(view.select(_holistic_columns(an)))
+                    else:
+                        states[an] = merge_states(states[an], batch_state(an, view))
+                except Exception as e:
+                    failures[an] = e
+
+        results: Dict[Analyzer, Try_] = {}
+        for an in analyzers:
+            if an in failures:
+                results[an] = Failure(failures[an])
+            elif an in spilling:
+                columns = _holistic_columns(an)
+                table_schema = pa.schema([schema.field(c) for c in columns])
+                results[an] = Try(spilling[an].state, table_schema)
+            elif an in collected:
+                columns = _holistic_columns(an)
+                table_schema = pa.schema([schema.field(c) for c in columns])
+                results[an] = Try(
+                    lambda a, b, s: table_state(a, pa.Table.from_batches(b, s)),
+                    an,
+                    collected[an],
+                    table_schema,
+                )
+            else:
+                results[an] = Success(states[an])
+
+        return results
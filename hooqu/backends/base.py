@@ -0,0 +1,149 @@
+"""
+Backends compute the states of the analyzers on a specific kind of
+DataFrameLike object (Pandas, Arrow, ...).
+
+The analyzers define *what* should be computed (the state classes are backend
+independent and can be merged with ``State.sum``) while a backend defines *how*
+the state is computed on its data.
+"""
+import importlib
+from abc import ABC, abstractmethod
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from tryingsnake import Try, Try_
+
+if TYPE_CHECKING:  # pragma: no cover
+    from hooqu.analyzers.analyzer import Analyzer, State  # noqa: F401
+
+
+class Backend(ABC):
+    """
+    Interface between the analyzers and a data frame implementation.
+
+    Implementations need to provide the column metadata used by the
+    preconditions and a way to compute the state of an analyzer.
+    ``compute_states`` can be overridden to compute the states of several
+    analyzers in a single scan over the data.
+    """
+
+    name: str = "backend"
+    # whether compute_row_level_states is implemented
+    keeps_row_level_results: bool = False
+
+    @abstractmethod
+    def column_names(self, data) -> Sequence[str]:
+        pass
+
+    @abstractmethod
+    def dtype(self, data, column: str) -> Any:
+        pass
+
+    @abstractmethod
+    def is_numeric(self, data, column: str) -> bool:
+        pass
+
+    @abstractmethod
+    def is_string(self, data, column: str) -> bool:
+        pass
+
+    @abstractmethod
+    def compute_state(self, analyzer: "Analyzer", data) -> Optional["State"]:
+        pass
+
+    def compute_states(
+        self, data, analyzers: Sequence["Analyzer"]
+    ) -> Mapping["Analyzer", Try_]:
+        """
+        Computes the state of each of the analyzers, returning a ``Success``
+        with the state or a ``Failure`` with the exception raised while computing
+        it.
+        """
+        return {an: Try(self.compute_state, an, data) for an in analyzers}
+
+    def compute_row_level_states(
+        self, data, analyzers: Sequence["Analyzer"]
+    ) -> Mapping["Analyzer", Try_]:
+        """
+        Computes the states of row level analyzers (see
+        ``hooqu.analyzers.analyzer.RowLevelAnalyzer``) keeping the outcome of
+        each row of the data.
+        """
+        raise NotImplementedError(
+            f"The {self.name} backend does not keep the row level results"
+        )
+
+
+def is_registered(dispatcher, analyzer: "Analyzer") -> bool:
+    """
+    Whether the ``singledispatch`` function has an implementation for the
+    type of the analyzer (other than the default one).
+    """
+    return dispatcher.dispatch(type(analyzer)) is not dispatcher.dispatch(object)
+
+
+def merge_states(
+    state: Optional["State"], other: Optional["State"]
+) -> Optional["State"]:
+    """Combines two states, where ``None`` is the state of empty data"""
+    if state is None:
+        return other
+    if other is None:
+        return state
+    return state.sum(other)
+
+
+BackendSpec = Union[Backend, str]
+
+# Predicates are evaluated in reverse registration order, so backends registered
+# later take precedence. Backends can be given as "module:Class" strings
+# so optional dependencies are only imported when data of that kind shows up.
+_REGISTRY: List[Tuple[Callable[[Any], bool], BackendSpec]] = []
+_INSTANCES: Dict[str, Backend] = {}
+
+
+def register_backend(handles: Callable[[Any], bool], backend: BackendSpec) -> None:
+    """
+    Registers a backend for the data for which ``handles`` returns True.
+
+    Parameters
+    ----------
+
+    handles:
+        Predicate receiving the data passed to the analyzers.
+    backend:
+        A backend instance or a ``"module:Class"`` string to import the backend
+        lazily.
+    """
+    _REGISTRY.append((handles, backend))
+
+
+def _instantiate(spec: BackendSpec) -> Backend:
+    if isinstance(spec, Backend):
+        return spec
+
+    if spec not in _INSTANCES:
+        module_name, class_name = spec.split(":")
+        module = importlib.import_module(module_name)
+        _INSTANCES[spec] = getattr(module, class_name)()
+
+    return _INSTANCES[spec]
+
+
+def backend_for(data) -> Backend:
+    """Returns the backend able to handle ``data``. Defaults to Pandas."""
+    for handles, spec in reversed(_REGISTRY):
+        if handles(data):
+            return _instantiate(spec)
+
+    return _instantiate("hooqu.backends.pandas:PandasBackend")
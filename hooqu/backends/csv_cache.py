@@ -0,0 +1,105 @@
+"""
+Cache of CSV files converted to Arrow IPC files.
+
+Parsing a large CSV file is much slower than computing the metrics on it. The
+first time a CSV file is verified with a cache, it is converted (batch by batch,
+so in constant memory) to an Arrow IPC file; the following runs memory map the
+IPC file instead of parsing the CSV again. The cached files are keyed by the
+path, size and modification time of the CSV file, so a modified file is
+converted again.
+
+As with ``pandas.read_csv``, empty fields (and ``NA``, ``null``, ...) are read as
+missing values by default, in string columns too (see ``csv_format``).
+
+Note that the parsing options are not part of the key: files verified with
+different parsing options should use different cache directories.
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def csv_format() -> ds.CsvFileFormat:
+    """
+    The default format of the CSV files: unlike the ``pyarrow`` default, the
+    empty strings are missing values, as with ``pandas.read_csv``.
+    """
+    return ds.CsvFileFormat(
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+    )
+
+
+class CSVCache:
+    """
+    Parameters
+    ----------
+
+    directory:
+        Where the IPC files are stored, it is created if needed.
+    """
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _prefix(self, path: Path) -> str:
+        return hashlib.sha256(str(path).encode()).hexdigest()[:32]
+
+    def cached_path(self, path: PathLike) -> Path:
+        """Path of the IPC file for the current version of the CSV file"""
+        path = Path(path).resolve()
+        stat = path.stat()
+        name = f"{self._prefix(path)}-{stat.st_size}-{stat.st_mtime_ns}.arrow"
+        return self.directory / name
+
+    def get(self, path: PathLike, **kwargs) -> Path:
+        """
+        Returns the IPC file of the CSV file, converting it if it is not in the
+        cache. ``kwargs`` are passed to ``pyarrow.dataset.dataset``.
+        """
+        cached = self.cached_path(path)
+        if not cached.exists():
+            self._convert(Path(path), cached, **kwargs)
+        return cached
+
+    def get_all(
+        self, path: Union[PathLike, Sequence[PathLike]], **kwargs
+    ) -> List[Path]:
+        """
+        IPC files for a CSV file, a directory of CSV files or a list of them.
+        The files are converted one by one, so partitioning columns (encoded in
+        the directory names) are not available in the cached files.
+        """
+        kwargs.setdefault("format", csv_format())
+        files = ds.dataset(path, **kwargs).files
+        return [self.get(f, **kwargs) for f in files]
+
+    def _convert(self, path: Path, cached: Path, **kwargs):
+        kwargs.setdefault("format", csv_format())
+        dataset = ds.dataset(path, **kwargs)
+
+        # written to a temporary file first, so that a failed conversion (or a
+        # concurrent run) never leaves a partial file in the cache
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as sink:
+                with pa.ipc.new_file(sink, dataset.schema) as writer:
+                    for batch in dataset.to_batches():
+                        writer.write_batch(batch)
+            os.replace(tmp, cached)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        # older versions of the same file are not needed anymore
+        for old in self.directory.glob(f"{self._prefix(path.resolve())}-*.arrow"):
+            if old != cached:
+                old.unlink()
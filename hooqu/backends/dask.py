@@ -0,0 +1,261 @@
+"""
+Backend for ``dask.dataframe.DataFrame`` objects.
+
+Each analyzer whose state can be merged computes it on every partition with
+the Pandas implementation. The per partition states are combined with
+``State.sum`` in a tree reduction, so the data is processed in parallel (and
+out of core) without ever being collected. Quantile needs all the values of its
+column, which are collected, while the frequency based analyzers group the data
+with Dask and only collect the number of groups having each count (except
+MutualInformation, which collects the counts of the groups).
+
+The states of all the analyzers are computed by a single ``dask.compute`` call
+on the configured scheduler.
+"""
+from functools import partial, reduce, singledispatch
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import dask
+import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_string_dtype
+from tryingsnake import Failure, Try, Try_
+
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    Correlation,
+    DataType,
+    Histogram,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    PatternMatch,
+    Quantile,
+    Size,
+    StandardDeviation,
+    StandardDeviationState,
+    Sum,
+    TopK,
+)
+from hooqu.analyzers.analyzer import COUNT_COL, Analyzer, State
+from hooqu.analyzers.grouping_analyzers import (
+    GROUPS_COL,
+    FrequenciesAndNumRows,
+    FrequencyBasedAnalyzer,
+)
+from hooqu.backends.base import Backend, is_registered, merge_states
+from hooqu.expressions import referenced_columns
+
+
+@singledispatch
+def partition_state(analyzer: Analyzer, partition) -> Optional[State]:
+    """Computes the state of the analyzer on a (Pandas) partition"""
+    raise NotImplementedError(f"{analyzer} is not supported by the Dask backend")
+
+
+@partition_state.register(Size)
+@partition_state.register(Completeness)
+@partition_state.register(Compliance)
+@partition_state.register(PatternMatch)
+@partition_state.register(Mean)
+@partition_state.register(Sum)
+@partition_state.register(Minimum)
+@partition_state.register(Maximum)
+@partition_state.register(ApproxCountDistinct)
+@partition_state.register(TopK)
+@partition_state.register(Histogram)
+@partition_state.register(Correlation)
+@partition_state.register(DataType)
+def _pandas_state(analyzer: Analyzer, partition) -> Optional[State]:
+    return analyzer.compute_state_from(partition)
+
+
+@partition_state.register(StandardDeviation)
+def _std_state(
+    analyzer: StandardDeviation, partition
+) -> Optional[StandardDeviationState]:
+    if analyzer.where is not None:
+        partition = partition.query(analyzer.where)
+    values = partition[analyzer.instance]
+    n = values.count()
+    # partitions without values do not contribute to the state
+    if n == 0:
+        return None
+    return StandardDeviationState(n, values.mean(), values.var(ddof=0) * n)
+
+
+def _partition_states(partition, analyzers: Sequence[Analyzer]) -> Dict[Analyzer, Try_]:
+    return {an: Try(partition_state, an, partition) for an in analyzers}
+
+
+def _merge_try(state: Try_, other: Try_) -> Try_:
+    return state.flatMap(lambda s: other.map(lambda o: merge_states(s, o)))
+
+
+def _merge_partition_states(*partials: Dict[Analyzer, Try_]) -> Dict[Analyzer, Try_]:
+    return {an: reduce(_merge_try, (p[an] for p in partials)) for an in partials[0]}
+
+
+def _tree_reduce(states: List, split_every: int):
+    while len(states) > 1:
+        states = [
+            dask.delayed(_merge_partition_states)(*states[i:i + split_every])
+            for i in range(0, len(states), split_every)
+        ]
+    return states[0]
+
+
+@singledispatch
+def collection_state(analyzer: Analyzer, data: dd.DataFrame):
+    """
+    Returns a lazy (``dask.delayed``) computation of the ``Try`` of the state,
+    for the analyzers that can not be computed partition by partition.
+    """
+    raise NotImplementedError(f"{analyzer} is not supported by the Dask backend")
+
+
+@collection_state.register(Quantile)
+def _quantile_state(analyzer: Quantile, data: dd.DataFrame):
+    # only the columns the analyzer needs are collected
+    columns = {analyzer.instance}
+    if analyzer.where is not None:
+        columns |= referenced_columns(analyzer.where)
+    return dask.delayed(Try)(analyzer.compute_state_from, data[sorted(columns)])
+
+
+def _group_counts(analyzer: FrequencyBasedAnalyzer, data: dd.DataFrame):
+    columns = list(analyzer.grouping_columns)
+    if analyzer.where is not None:
+        data = data.query(analyzer.where)
+    data = data[columns]
+    data = data[data.notnull().any(axis=1)]
+
+    # same as FrequencyBasedAnalyzer.compute_frequencies but grouped by Dask
+    return (
+        data.assign(**{COUNT_COL: 1}).fillna(-1).groupby(columns)[COUNT_COL].count()
+    )
+
+
+def _histogram_state(histogram: pd.Series) -> FrequenciesAndNumRows:
+    counts = histogram.index.to_numpy(dtype=np.int64)
+    groups = histogram.to_numpy(dtype=np.int64)
+    frequencies = pd.DataFrame({COUNT_COL: counts, GROUPS_COL: groups})
+    return FrequenciesAndNumRows(frequencies, int(counts @ groups))
+
+
+def _keyed_state(frequencies: pd.DataFrame) -> FrequenciesAndNumRows:
+    return FrequenciesAndNumRows(frequencies, int(frequencies[COUNT_COL].sum()))
+
+
+@collection_state.register(FrequencyBasedAnalyzer)
+def _frequencies_state(analyzer: FrequencyBasedAnalyzer, data: dd.DataFrame):
+    # the number of groups having each count is reduced on the cluster, as when
+    # the groups are counted out of core, only it is collected
+    histogram = _group_counts(analyzer, data).value_counts()
+    return dask.delayed(Try)(_histogram_state, histogram)
+
+
+@collection_state.register(MutualInformation)
+def _mutual_information_state(analyzer: MutualInformation, data: dd.DataFrame):
+    # the metric needs the values of the groups, which are collected
+    frequencies = _group_counts(analyzer, data).reset_index()
+    return dask.delayed(Try)(_keyed_state, frequencies)
+
+
+class DaskBackend(Backend):
+    """
+    Parameters
+    ----------
+
+    scheduler:
+        Dask scheduler used to compute the states (e.g. ``"threads"`` or
+        ``"processes"``), by default Dask's default scheduler.
+    split_every:
+        Number of partition states combined by each node of the tree reduction.
+    """
+
+    name = "dask"
+
+    def __init__(self, scheduler: Optional[str] = None, split_every: int = 8):
+        self.scheduler = scheduler
+        self.split_every = split_every
+
+    def column_names(self, data: dd.DataFrame) -> Sequence[str]:
+        return list(data.columns)
+
+    def dtype(self, data: dd.DataFrame, column: str):
+        return data.dtypes[column]
+
+    def is_numeric(self, data: dd.DataFrame, column: str) -> bool:
+        return is_numeric_dtype(self.dtype(data, column))
+
+    def is_string(self, data: dd.DataFrame, column: str) -> bool:
+        return is_string_dtype(self.dtype(data, column))
+
+    def compute_state(self, analyzer: Analyzer, data: dd.DataFrame) -> Optional[State]:
+        return self.compute_states(data, [analyzer])[analyzer].get()
+
+    def compute_states(
+        self, data: dd.DataFrame, analyzers: Sequence[Analyzer]
+    ) -> Mapping[Analyzer, Try_]:
+        analyzers = list(dict.fromkeys(analyzers))
+        results: Dict[Analyzer, Try_] = {}
+
+        mergeable = [an for an in analyzers if is_registered(partition_state, an)]
+        tasks = {}
+        if mergeable:
+            # partial keeps Dask from traversing (and rebuilding) the analyzers
+            partition_states = partial(_partition_states, analyzers=mergeable)
+            partials = [
+                dask.delayed(partition_states)(partition)
+                for partition in data.to_delayed()
+            ]
+            tasks[None] = _tree_reduce(partials, self.split_every)
+
+        for an in analyzers:
+            if an in mergeable:
+                continue
+            task = Try(collection_state, an, data)
+            if task.isSuccess:
+                tasks[an] = task.get()
+            else:
+                results[an] = task
+
+        if not tasks:
+            return results
+
+        try:
+            # everything is computed at once, sharing the reads of the data
+            (computed,) = dask.compute(tasks, scheduler=self.scheduler)
+        except Exception:
+            # reading the data failed for one of the computations, run them one
+            # by one to find out which
+            computed = {
+                key: Try(self._compute, task).flatMap(lambda t: t)
+                if key is not None
+                else self._compute_or_fail(task, mergeable)
+                for key, task in tasks.items()
+            }
+
+        for key, value in computed.items():
+            if key is None:
+                results.update(value)
+            else:
+                results[key] = value
+
+        return results
+
+    def _compute(self, task):
+        return dask.compute(task, scheduler=self.scheduler)[0]
+
+    def _compute_or_fail(
+        self, task, analyzers: Sequence[Analyzer]
+    ) -> Dict[Analyzer, Try_]:
+        try:
+            return self._compute(task)
+        except Exception as e:
+            return {an: Failure(e) for an in analyzers}
@@ -0,0 +1,297 @@
+"""
+Backend for file backed data (Parquet, CSV, Arrow IPC, ...) read with
+``pyarrow.dataset``.
+
+Only the columns used by the analyzers are read: the ones they operate on plus
+the ones referenced by their ``where`` filters and predicates. When all the
+analyzers have a ``where`` filter, the disjunction of the filters is pushed
+down to the dataset scan so that Arrow can skip partitions and row groups (using
+their statistics) before decoding them. Only comparisons between a column and
+literal values (and ``in`` / ``isin``) combined with ``and`` / ``or`` are
+pushed down, the analyzers still apply their whole filter on the rows read.
+"""
+import os
+from typing import Any, Dict, Optional, Sequence, Set, Union
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+from tryingsnake import Failure, Try_
+
+from hooqu.analyzers import Compliance, Correlation, Size
+from hooqu.analyzers.analyzer import Analyzer
+from hooqu.analyzers.grouping_analyzers import FrequencyBasedAnalyzer
+from hooqu.backends.arrow import ArrowBackend
+from hooqu.backends.csv_cache import CSVCache, csv_format
+from hooqu.expressions import (
+    BoolOp,
+    Column,
+    Compare,
+    Expr,
+    IsIn,
+    Literal,
+    UnsupportedExpressionException,
+    parse_expression,
+    referenced_columns,
+)
+from hooqu.prefetch import prefetch
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+_FLIPPED = {"==": "==", "!=": "!=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+class DatasetSource:
+    """
+    A ``pyarrow.dataset.Dataset`` to be passed to the analyzers or to
+    ``VerificationSuite.on_data``.
+
+    Parameters
+    ----------
+
+    dataset:
+        The dataset to verify
+    prefetch:
+        Number of record batches read and decoded in a background thread while
+        the analyzers process the current one (see ``hooqu.prefetch``), 0 to
+        read them in the calling thread.
+    memory_budget:
+        Bytes of key columns each frequency based analyzer (e.g.
+        ``Uniqueness``) keeps in memory, past it the groups are counted out of
+        core (see ``hooqu.backends.spill``). None to always count in memory.
+    spill_dir:
+        Where the groups are spilled, by default the temporary directory.
+    """
+
+    def __init__(
+        self,
+        dataset: ds.Dataset,
+        prefetch: int = 2,
+        memory_budget: Optional[int] = None,
+        spill_dir: Optional[PathLike] = None,
+    ):
+        self.dataset = dataset
+        self.prefetch = prefetch
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: Union[PathLike, Sequence[PathLike]],
+        cache_dir: Optional[PathLike] = None,
+        prefetch: int = 2,
+        memory_budget: Optional[int] = None,
+        spill_dir: Optional[PathLike] = None,
+        **kwargs,
+    ):
+        """
+        CSV file(s), ``kwargs`` are passed to ``pyarrow.dataset.dataset``. By
+        default the empty fields are missing values, in string columns too, as
+        with ``pandas.read_csv`` (see ``hooqu.backends.csv_cache.csv_format``).
+
+        With a ``cache_dir``, the files are converted to Arrow IPC files the
+        first time they are read (see ``hooqu.backends.csv_cache``) and the
+        cached files are memory mapped afterwards.
+        """
+        kwargs.setdefault("format", csv_format())
+        if cache_dir is not None:
+            cached = CSVCache(cache_dir).get_all(path, **kwargs)
+            return cls.from_ipc(
+                cached,
+                prefetch=prefetch,
+                memory_budget=memory_budget,
+                spill_dir=spill_dir,
+            )
+
+        return cls(
+            ds.dataset(path, **kwargs),
+            prefetch=prefetch,
+            memory_budget=memory_budget,
+            spill_dir=spill_dir,
+        )
+
+    @classmethod
+    def from_ipc(
+        cls,
+        path: Union[PathLike, Sequence[PathLike]],
+        prefetch: int = 2,
+        memory_budget: Optional[int] = None,
+        spill_dir: Optional[PathLike] = None,
+        **kwargs,
+    ):
+        """
+        Arrow IPC (Feather V2) file(s), memory mapped: the columns are read
+        straight from the page cache instead of being copied in memory.
+        ``kwargs`` are passed to ``pyarrow.dataset.dataset``.
+        """
+        if isinstance(path, (str, os.PathLike)):
+            path = os.path.abspath(path)
+        else:
+            path = [os.path.abspath(p) for p in path]
+        kwargs.setdefault("format", "ipc")
+        kwargs.setdefault("filesystem", pafs.LocalFileSystem(use_mmap=True))
+        return cls(
+            ds.dataset(path, **kwargs),
+            prefetch=prefetch,
+            memory_budget=memory_budget,
+            spill_dir=spill_dir,
+        )
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self.dataset.schema
+
+
+def required_columns(analyzer: Analyzer) -> Set[str]:
+    """Names of the columns an analyzer reads, including the ones of its filters"""
+    columns: Set[str] = set()
+    if isinstance(analyzer, FrequencyBasedAnalyzer):
+        columns |= set(analyzer.grouping_columns)
+    elif isinstance(analyzer, Compliance):
+        columns |= referenced_columns(analyzer.predicate)
+    elif isinstance(analyzer, Correlation):
+        # its instance is the names of both columns joined by a comma
+        columns |= set(analyzer.columns)
+    elif not isinstance(analyzer, Size):
+        columns.add(analyzer.instance)
+    if analyzer.where is not None:
+        columns |= referenced_columns(analyzer.where)
+    return columns
+
+
+def _comparable(dtype: pa.DataType, value: Any) -> bool:
+    if isinstance(value, bool):
+        return pa.types.is_boolean(dtype)
+    if isinstance(value, (int, float)):
+        return pa.types.is_integer(dtype) or pa.types.is_floating(dtype)
+    if isinstance(value, str):
+        return pa.types.is_string(dtype) or pa.types.is_large_string(dtype)
+    return False
+
+
+def _to_filter(expr: Expr, schema: pa.Schema) -> Optional[ds.Expression]:
+    """
+    Translates the expression into a dataset filter that keeps (at least) all
+    the rows for which the expression is true, None if it can not be translated.
+
+    Nulls make the comparisons false, except ``!=`` which is true on nulls (as in
+    Pandas) and so keeps them explicitly. The expressions translated are
+    monotone (there is no negation), so Arrow's null semantics keep the same
+    rows.
+    """
+    if isinstance(expr, BoolOp):
+        filters = [_to_filter(o, schema) for o in expr.operands]
+        if expr.op == "and":
+            # dropping a conjunct only keeps more rows
+            filters = [f for f in filters if f is not None]
+            if not filters:
+                return None
+        elif any(f is None for f in filters):
+            return None
+
+        result = filters[0]
+        for f in filters[1:]:
+            result = result & f if expr.op == "and" else result | f
+        return result
+
+    if isinstance(expr, Compare):
+        left, right, op = expr.left, expr.right, expr.op
+        if isinstance(left, Literal) and isinstance(right, Column):
+            left, right, op = right, left, _FLIPPED[op]
+        if not (isinstance(left, Column) and isinstance(right, Literal)):
+            return None
+        if left.name not in schema.names:
+            return None
+        if not _comparable(schema.field(left.name).type, right.value):
+            return None
+
+        field, value = ds.field(left.name), right.value
+        if op == "==":
+            return field == value
+        if op == "!=":
+            return (field != value) | field.is_null()
+        if op == "<":
+            return field < value
+        if op == "<=":
+            return field <= value
+        if op == ">":
+            return field > value
+        return field >= value
+
+    if isinstance(expr, IsIn) and isinstance(expr.operand, Column):
+        name = expr.operand.name
+        if name not in schema.names or not expr.values:
+            return None
+        dtype = schema.field(name).type
+        if not all(_comparable(dtype, v) for v in expr.values):
+            return None
+        return ds.field(name).isin(list(expr.values))
+
+    return None
+
+
+def pushdown_filter(
+    analyzers: Sequence[Analyzer], schema: pa.Schema
+) -> Optional[ds.Expression]:
+    """
+    The filter of the rows needed by at least one of the analyzers, None if all
+    the rows are needed.
+    """
+    filters = []
+    for an in analyzers:
+        if an.where is None:
+            return None
+        try:
+            where = _to_filter(parse_expression(an.where), schema)
+        except UnsupportedExpressionException:
+            where = None
+        if where is None:
+            return None
+        filters.append(where)
+
+    result = filters[0] if filters else None
+    for f in filters[1:]:
+        result = result | f
+    return result
+
+
+class DatasetBackend(ArrowBackend):
+
+    name = "dataset"
+
+    def compute_states(
+        self, data: DatasetSource, analyzers: Sequence[Analyzer]
+    ) -> Dict[Analyzer, Try_]:
+        """
+        Computes the states in a single scan, reading only the columns (and
+        the rows, when possible) needed by the analyzers.
+        """
+        analyzers = list(dict.fromkeys(analyzers))
+        schema = data.schema
+
+        try:
+            needed = set().union(*(required_columns(an) for an in analyzers))
+        except UnsupportedExpressionException:
+            # the analyzer with the wrong expression will fail, read everything
+            needed = set(schema.names)
+
+        columns = [c for c in schema.names if c in needed]
+        projected = pa.schema([schema.field(c) for c in columns])
+        batches = data.dataset.to_batches(
+            columns=columns, filter=pushdown_filter(analyzers, schema)
+        )
+        # the next batches are decoded while the analyzers process the current one
+        batches = prefetch(batches, data.prefetch)
+        try:
+            states = self.compute_states_from_batches(
+                batches,
+                projected,
+                analyzers,
+                memory_budget=data.memory_budget,
+                spill_dir=data.spill_dir,
+            )
+            return dict(states)
+        except Exception as e:
+            # reading the data failed (e.g. a malformed CSV file)
+            return {an: Failure(e) for an in analyzers}
@@ -0,0 +1,432 @@
+"""
+Backend for NumPy data: mappings of column names to one dimensional arrays
+(e.g. ``Dict[str, np.ndarray]``) and structured arrays.
+
+The analyzers run directly on the arrays, without building a DataFrame: the
+``where`` filters and ``Compliance`` predicates are evaluated into boolean
+masks, which are passed to the NumPy reductions (``where=`` argument) instead of
+copying the selected values whenever possible.
+
+As with Pandas, NaN and ``None`` are considered missing values.
+"""
+import operator
+import re
+from collections import defaultdict
+from functools import singledispatch
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_string_dtype
+from tryingsnake import Failure, Success, Try_
+
+from hooqu.analyzers import (
+    Completeness,
+    Compliance,
+    Correlation,
+    DataType,
+    DataTypeHistogram,
+    Histogram,
+    HistogramState,
+    Maximum,
+    MaxState,
+    Mean,
+    MeanState,
+    Minimum,
+    MinState,
+    NumMatches,
+    NumMatchesAndCount,
+    PatternMatch,
+    Quantile,
+    QuantileState,
+    Size,
+    StandardDeviation,
+    StandardDeviationState,
+    Sum,
+    SumState,
+)
+from hooqu.analyzers.analyzer import Analyzer, State
+from hooqu.analyzers.correlation import correlation_states
+from hooqu.analyzers.grouping_analyzers import (
+    ApproxCountDistinct,
+    ApproxCountDistinctState,
+    FrequenciesAndNumRows,
+    FrequencyBasedAnalyzer,
+    TopK,
+    TopKState,
+)
+from hooqu.backends.base import Backend
+from hooqu.expressions import ExpressionCompiler
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_ARITHMETIC = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.true_divide,
+    "%": np.mod,
+    "**": np.power,
+}
+
+Columns = Mapping[str, np.ndarray]
+
+
+def columns_of(data) -> Columns:
+    """Returns the columns of the data as a mapping, without copying them"""
+    if isinstance(data, np.ndarray):
+        return {name: data[name] for name in data.dtype.names}
+    return data
+
+
+def num_rows(columns: Columns) -> int:
+    return len(next(iter(columns.values())))
+
+
+def is_missing(values) -> np.ndarray:
+    """Missing values mask, NaN for floats and None (or NaN) for objects"""
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind == "f":
+            return np.isnan(values)
+        if values.dtype.kind != "O":
+            return np.zeros(len(values), dtype=bool)
+    return pd.isna(values)
+
+
+def _select(value, mask: np.ndarray):
+    return value[mask] if isinstance(value, np.ndarray) else value
+
+
+class NumpyExpressionCompiler(ExpressionCompiler[Any]):
+    """Evaluates an expression on a mapping of columns"""
+
+    def __init__(self, columns: Columns):
+        self.columns = columns
+
+    def column(self, name: str):
+        if name not in self.columns:
+            raise KeyError(f"Input data does not include column {name}")
+        return self.columns[name]
+
+    def literal(self, value: Any):
+        return value
+
+    def compare(self, op: str, left, right):
+        missing = np.logical_or(is_missing(left), is_missing(right))
+        if not np.any(missing):
+            return np.asarray(_COMPARISONS[op](left, right), dtype=bool)
+
+        # comparisons with missing values are false (true for !=), they are
+        # evaluated only on the valid values (comparisons with None raise on
+        # object arrays)
+        valid = ~np.broadcast_to(missing, (num_rows(self.columns),))
+        result = np.full(len(valid), op == "!=")
+        result[valid] = _COMPARISONS[op](_select(left, valid), _select(right, valid))
+        return result
+
+    def and_(self, operands: Sequence):
+        return np.logical_and.reduce(operands)
+
+    def or_(self, operands: Sequence):
+        return np.logical_or.reduce(operands)
+
+    def not_(self, operand):
+        return np.logical_not(operand)
+
+    def arithmetic(self, op: str, left, right):
+        return _ARITHMETIC[op](left, right)
+
+    def negate(self, operand):
+        return np.negative(operand)
+
+    def is_null(self, operand):
+        return is_missing(operand)
+
+    def fill_null(self, operand, value: Any):
+        return np.where(is_missing(operand), value, operand)
+
+    def is_in(self, operand, values: Sequence[Any]):
+        if isinstance(operand, np.ndarray):
+            return np.isin(operand, list(values))
+        return operand in values
+
+    def mask(self, expression: Optional[str]) -> Optional[np.ndarray]:
+        if expression is None:
+            return None
+        result = np.broadcast_to(
+            self.compile(expression), (num_rows(self.columns),)
+        )
+        if result.dtype != bool:
+            raise ValueError(f"Expression '{expression}' is not a boolean predicate")
+        return result
+
+
+def _and(mask: Optional[np.ndarray], other: np.ndarray) -> np.ndarray:
+    return other if mask is None else mask & other
+
+
+def _count(mask: Optional[np.ndarray], columns: Columns) -> int:
+    return num_rows(columns) if mask is None else int(np.count_nonzero(mask))
+
+
+def _valid(columns: Columns, column: str, mask: Optional[np.ndarray]) -> np.ndarray:
+    return _and(mask, ~is_missing(columns[column]))
+
+
+def _numeric(columns: Columns, column: str) -> np.ndarray:
+    values = columns[column]
+    if values.dtype.kind == "b":
+        return values.view(np.uint8)
+    return values
+
+
+# The kernels receive the columns and the mask of the rows selected by the
+# where clause of the analyzer (None when all the rows are selected).
+
+
+@singledispatch
+def array_state(
+    analyzer: Analyzer, columns: Columns, mask: Optional[np.ndarray]
+) -> Optional[State]:
+    raise NotImplementedError(f"{analyzer} is not supported by the NumPy backend")
+
+
+@array_state.register(Size)
+def _size_state(analyzer: Size, columns: Columns, mask) -> NumMatches:
+    return NumMatches(_count(mask, columns))
+
+
+# Whether each row matches the condition of the row level analyzers, the
+# outcomes are kept in the state when the row level results are requested.
+
+
+@singledispatch
+def array_matches(analyzer: Analyzer, columns: Columns) -> np.ndarray:
+    raise NotImplementedError(f"{analyzer} has no row level results")
+
+
+@array_matches.register(Completeness)
+def _completeness_matches(analyzer: Completeness, columns: Columns) -> np.ndarray:
+    return ~is_missing(columns[analyzer.instance])
+
+
+@array_matches.register(Compliance)
+def _compliance_matches(analyzer: Compliance, columns: Columns) -> np.ndarray:
+    return NumpyExpressionCompiler(columns).mask(analyzer.predicate)
+
+
+@array_matches.register(PatternMatch)
+def _pattern_match_matches(analyzer: PatternMatch, columns: Columns) -> np.ndarray:
+    pattern = analyzer.pattern
+    regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+
+    # the regex is evaluated once per distinct value
+    codes, uniques = pd.factorize(columns[analyzer.instance])
+    hits = np.fromiter(
+        (regex.search(v) is not None for v in uniques), dtype=bool, count=len(uniques)
+    )
+    if len(uniques) == 0:
+        # only missing values, whose code -1 can not index the hits
+        return np.zeros(len(codes), dtype=bool)
+    return (codes >= 0) & hits[codes]
+
+
+@array_state.register(Completeness)
+@array_state.register(Compliance)
+@array_state.register(PatternMatch)
+def _matches_state(analyzer: Analyzer, columns: Columns, mask) -> NumMatchesAndCount:
+    matches = _and(mask, array_matches(analyzer, columns))
+    return NumMatchesAndCount(int(np.count_nonzero(matches)), _count(mask, columns))
+
+
+@array_state.register(Mean)
+def _mean_state(analyzer: Mean, columns: Columns, mask) -> MeanState:
+    valid = _valid(columns, analyzer.instance, mask)
+    values = _numeric(columns, analyzer.instance)
+    return MeanState(
+        np.sum(values, where=valid).item(), int(np.count_nonzero(valid))
+    )
+
+
+@array_state.register(Sum)
+def _sum_state(analyzer: Sum, columns: Columns, mask) -> SumState:
+    valid = _valid(columns, analyzer.instance, mask)
+    values = _numeric(columns, analyzer.instance)
+    return SumState(np.sum(values, where=valid).item())
+
+
+@array_state.register(Minimum)
+def _min_state(analyzer: Minimum, columns: Columns, mask) -> MinState:
+    valid = _valid(columns, analyzer.instance, mask)
+    if not np.any(valid):
+        return MinState(float("nan"))
+    values = _numeric(columns, analyzer.instance)
+    initial = values[np.argmax(valid)]  # the first valid value
+    return MinState(np.min(values, where=valid, initial=initial).item())
+
+
+@array_state.register(Maximum)
+def _max_state(analyzer: Maximum, columns: Columns, mask) -> MaxState:
+    valid = _valid(columns, analyzer.instance, mask)
+    if not np.any(valid):
+        return MaxState(float("nan"))
+    values = _numeric(columns, analyzer.instance)
+    initial = values[np.argmax(valid)]  # the first valid value
+    return MaxState(np.max(values, where=valid, initial=initial).item())
+
+
+@array_state.register(StandardDeviation)
+def _std_state(
+    analyzer: StandardDeviation, columns: Columns, mask
+) -> Optional[StandardDeviationState]:
+    valid = _valid(columns, analyzer.instance, mask)
+    n = int(np.count_nonzero(valid))
+    if n == 0:
+        return None
+    values = _numeric(columns, analyzer.instance)
+    avg = np.sum(values, where=valid).item() / n
+    deviations = np.subtract(values, avg, where=valid, out=np.zeros(len(values)))
+    m2 = np.dot(deviations, deviations).item()
+    return StandardDeviationState(n, avg, m2)
+
+
+@array_state.register(Quantile)
+def _quantile_state(analyzer: Quantile, columns: Columns, mask) -> QuantileState:
+    valid = _valid(columns, analyzer.instance, mask)
+    values = _numeric(columns, analyzer.instance)[valid]
+    if not len(values):
+        return QuantileState(float("nan"))
+    if not 0 <= analyzer.quantile <= 1:
+        raise ValueError("percentiles should all be in the interval [0, 1]")
+    # "nearest" interpolation as in Pandas, selecting without a full sort
+    index = int(np.around((len(values) - 1) * analyzer.quantile))
+    return QuantileState(np.partition(values, index)[index].item())
+
+
+@array_state.register(ApproxCountDistinct)
+def _approx_count_distinct_state(
+    analyzer: ApproxCountDistinct, columns: Columns, mask
+) -> ApproxCountDistinctState:
+    values = columns[analyzer.instance]
+    return ApproxCountDistinctState.from_values(
+        values if mask is None else values[mask]
+    )
+
+
+@array_state.register(TopK)
+def _top_k_state(analyzer: TopK, columns: Columns, mask) -> TopKState:
+    values = columns[analyzer.instance]
+    return TopKState.from_values(
+        values if mask is None else values[mask], analyzer.capacity
+    )
+
+
+@array_state.register(Histogram)
+def _histogram_state(analyzer: Histogram, columns: Columns, mask) -> HistogramState:
+    values = columns[analyzer.instance]
+    return HistogramState.from_values(
+        values if mask is None else values[mask], analyzer.edges_array
+    )
+
+
+@array_state.register(DataType)
+def _data_type_state(analyzer: DataType, columns: Columns, mask) -> DataTypeHistogram:
+    values = columns[analyzer.instance]
+    return DataTypeHistogram.from_values(values if mask is None else values[mask])
+
+
+@array_state.register(FrequencyBasedAnalyzer)
+def _frequencies_state(
+    analyzer: FrequencyBasedAnalyzer, columns: Columns, mask
+) -> FrequenciesAndNumRows:
+    # only the grouping columns (and selected rows) are turned into a DataFrame
+    frame = pd.DataFrame(
+        {
+            c: columns[c] if mask is None else columns[c][mask]
+            for c in analyzer.grouping_columns
+        }
+    )
+    return FrequencyBasedAnalyzer.compute_frequencies(
+        frame, analyzer.grouping_columns
+    )
+
+
+class NumpyBackend(Backend):
+
+    name = "numpy"
+    keeps_row_level_results = True
+
+    def column_names(self, data) -> Sequence[str]:
+        return list(columns_of(data))
+
+    def dtype(self, data, column: str):
+        return columns_of(data)[column].dtype
+
+    def is_numeric(self, data, column: str) -> bool:
+        return is_numeric_dtype(self.dtype(data, column))
+
+    def is_string(self, data, column: str) -> bool:
+        return is_string_dtype(self.dtype(data, column))
+
+    def compute_state(self, analyzer: Analyzer, data) -> Optional[State]:
+        return self.compute_states(data, [analyzer])[analyzer].get()
+
+    def compute_states(
+        self, data, analyzers: Sequence[Analyzer]
+    ) -> Mapping[Analyzer, Try_]:
+        columns = columns_of(data)
+        compiler = NumpyExpressionCompiler(columns)
+
+        # the where masks are shared by the analyzers with the same filter
+        masks: Dict[Optional[str], Any] = {}
+        results: Dict[Analyzer, Try_] = {}
+        # the correlations with the same filter are computed together
+        correlations: Dict[Optional[str], List[Correlation]] = defaultdict(list)
+        for an in dict.fromkeys(analyzers):
+            try:
+                if an.where not in masks:
+                    masks[an.where] = compiler.mask(an.where)
+                if isinstance(an, Correlation):
+                    correlations[an.where].append(an)
+                else:
+                    results[an] = Success(array_state(an, columns, masks[an.where]))
+            except Exception as e:
+                results[an] = Failure(e)
+
+        for where, group in correlations.items():
+            mask = masks[where]
+            try:
+                selected = {
+                    c: columns[c] if mask is None else columns[c][mask]
+                    for an in group
+                    for c in an.columns
+                }
+                states = correlation_states(selected, group)
+                results.update({an: Success(s) for an, s in states.items()})
+            except Exception as e:
+                results.update({an: Failure(e) for an in group})
+
+        return results
+
+    def compute_row_level_states(
+        self, data, analyzers: Sequence[Analyzer]
+    ) -> Mapping[Analyzer, Try_]:
+        columns = columns_of(data)
+        compiler = NumpyExpressionCompiler(columns)
+        results: Dict[Analyzer, Try_] = {}
+        for an in dict.fromkeys(analyzers):
+            try:
+                state = NumMatchesAndCount.from_row_outcomes(
+                    array_matches(an, columns), compiler.mask(an.where)
+                )
+                results[an] = Success(state)
+            except Exception as e:
+                results[an] = Failure(e)
+        return results
@@ -0,0 +1,61 @@
+"""
+Default backend. It works with Pandas DataFrames (and any DataFrameLike
+following the Pandas API) by delegating to the aggregations defined by
+the analyzers themselves.
+"""
+from collections import defaultdict
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from pandas.api.types import is_numeric_dtype, is_string_dtype
+from tryingsnake import Failure, Success, Try, Try_
+
+from hooqu.analyzers.correlation import Correlation, frame_correlation_states
+from hooqu.backends.base import Backend
+
+
+class PandasBackend(Backend):
+
+    name = "pandas"
+    keeps_row_level_results = True
+
+    def column_names(self, data) -> Sequence[str]:
+        return data.columns
+
+    def dtype(self, data, column: str):
+        return data[column].dtype
+
+    def is_numeric(self, data, column: str) -> bool:
+        return is_numeric_dtype(data[column])
+
+    def is_string(self, data, column: str) -> bool:
+        return is_string_dtype(data[column])
+
+    def compute_state(self, analyzer, data) -> Optional[object]:
+        return analyzer.compute_state_from(data)
+
+    def compute_row_level_states(self, data, analyzers) -> Mapping[object, Try_]:
+        return {an: Try(an.row_level_state_from, data) for an in analyzers}
+
+    def compute_states(self, data, analyzers) -> Mapping[object, Try_]:
+        """
+        Computes the state of each analyzer, the correlations with the same
+        filter being computed together from the matrix of their columns.
+        """
+        analyzers = list(dict.fromkeys(analyzers))
+        correlations: Dict[Optional[str], List[Correlation]] = defaultdict(list)
+        for an in analyzers:
+            if isinstance(an, Correlation):
+                correlations[an.where].append(an)
+
+        states = dict(
+            super().compute_states(
+                data, [an for an in analyzers if not isinstance(an, Correlation)]
+            )
+        )
+        for group in correlations.values():
+            try:
+                computed = frame_correlation_states(data, group)
+                states.update({an: Success(s) for an, s in computed.items()})
+            except Exception as e:
+                states.update({an: Failure(e) for an in group})
+        return states
@@ -0,0 +1,200 @@
+"""
+Backend for Parquet files, read with PyArrow.
+
+Parquet files store the number of rows and, per row group and column, the
+number of nulls and the minimum and maximum values. When those statistics are
+enough to compute the state of an analyzer exactly, it is answered from the
+file footers without decoding any page:
+
+- ``Size`` without a ``where`` filter.
+- ``Completeness`` without a ``where`` filter, for non floating point columns
+  (NaN values are missing values for Hooqu but they are not counted as nulls).
+- ``Minimum`` and ``Maximum`` without a ``where`` filter.
+
+The other analyzers are computed by a dataset scan (see
+``hooqu.backends.dataset``), which only reads the columns they use and pushes
+their ``where`` filters down so that Arrow skips the row groups whose statistics
+prove that no row is needed.
+
+Example::
+
+    VerificationSuite().on_data(ParquetSource("lake/orders/")).add_check(check)
+"""
+import math
+from functools import singledispatch
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from tryingsnake import Failure, Success, Try_
+
+from hooqu.analyzers import (
+    Completeness,
+    Maximum,
+    MaxState,
+    Minimum,
+    MinState,
+    NumMatches,
+    NumMatchesAndCount,
+    Size,
+)
+from hooqu.analyzers.analyzer import Analyzer, State
+from hooqu.backends.dataset import DatasetBackend, DatasetSource, PathLike
+
+
+class ParquetSource(DatasetSource):
+    """
+    Parquet file(s) to be passed to the analyzers or to
+    ``VerificationSuite.on_data``.
+
+    Parameters
+    ----------
+
+    path:
+        A Parquet file, a directory (e.g. a Hive partitioned dataset) or a list
+        of files.
+    partitioning:
+        Partitioning of the directory, see ``pyarrow.dataset.dataset``.
+    prefetch:
+        Number of record batches decoded ahead, see ``DatasetSource``.
+    memory_budget, spill_dir:
+        Out of core counting of the groups, see ``DatasetSource``.
+    """
+
+    def __init__(
+        self,
+        path: Union[PathLike, Sequence[PathLike]],
+        partitioning: Optional[str] = "hive",
+        prefetch: int = 2,
+        memory_budget: Optional[int] = None,
+        spill_dir: Optional[PathLike] = None,
+    ):
+        super().__init__(
+            ds.dataset(path, format="parquet", partitioning=partitioning),
+            prefetch=prefetch,
+            memory_budget=memory_budget,
+            spill_dir=spill_dir,
+        )
+
+        self._row_groups: Optional[List["RowGroup"]] = None
+
+    @property
+    def num_rows(self) -> int:
+        return sum(rg.num_rows for rg in self.row_groups())
+
+    def row_groups(self) -> List["RowGroup"]:
+        """The row groups of the files, whose footers are read once per source"""
+        if self._row_groups is None:
+            self._row_groups = [
+                RowGroup(metadata.row_group(i))
+                for metadata in (f.metadata for f in self.dataset.get_fragments())
+                for i in range(metadata.num_row_groups)
+            ]
+        return self._row_groups
+
+
+class RowGroup:
+    """The statistics of a row group, by column name"""
+
+    def __init__(self, metadata: pq.RowGroupMetaData):
+        self.metadata = metadata
+
+    @property
+    def num_rows(self) -> int:
+        return self.metadata.num_rows
+
+    def statistics(self, column: str):
+        for i in range(self.metadata.num_columns):
+            chunk = self.metadata.column(i)
+            if chunk.path_in_schema == column:
+                return chunk.statistics if chunk.is_stats_set else None
+        return None
+
+
+class StatisticsNotSufficient(Exception):
+    pass
+
+
+def _null_count(row_group: RowGroup, column: str) -> int:
+    stats = row_group.statistics(column)
+    if stats is None or not stats.has_null_count:
+        raise StatisticsNotSufficient(f"No null count for {column}")
+    return stats.null_count
+
+
+def _min_max_values(source: ParquetSource, column: str) -> Iterator[Any]:
+    for row_group in source.row_groups():
+        stats = row_group.statistics(column)
+        if stats is not None and stats.has_min_max:
+            yield stats.min, stats.max
+        elif _null_count(row_group, column) != row_group.num_rows:
+            raise StatisticsNotSufficient(f"No min/max for {column}")
+
+
+@singledispatch
+def statistics_state(analyzer: Analyzer, source: ParquetSource) -> Optional[State]:
+    """
+    Computes the state of the analyzer from the statistics of the files, raising
+    ``StatisticsNotSufficient`` if that is not possible.
+    """
+    raise StatisticsNotSufficient(f"{analyzer} needs to scan the data")
+
+
+def _check_no_where(analyzer: Analyzer):
+    if analyzer.where is not None:
+        raise StatisticsNotSufficient(f"{analyzer} has a where filter")
+
+
+@statistics_state.register(Size)
+def _size_state(analyzer: Size, source: ParquetSource) -> NumMatches:
+    _check_no_where(analyzer)
+    return NumMatches(source.num_rows)
+
+
+@statistics_state.register(Completeness)
+def _completeness_state(
+    analyzer: Completeness, source: ParquetSource
+) -> NumMatchesAndCount:
+    _check_no_where(analyzer)
+    if pa.types.is_floating(source.schema.field(analyzer.instance).type):
+        raise StatisticsNotSufficient("NaN values are not counted as nulls")
+    nulls = sum(_null_count(rg, analyzer.instance) for rg in source.row_groups())
+    return NumMatchesAndCount(source.num_rows - nulls, source.num_rows)
+
+
+@statistics_state.register(Minimum)
+def _min_state(analyzer: Minimum, source: ParquetSource) -> MinState:
+    _check_no_where(analyzer)
+    values = [v for v, _ in _min_max_values(source, analyzer.instance)]
+    return MinState(min(values) if values else math.nan)
+
+
+@statistics_state.register(Maximum)
+def _max_state(analyzer: Maximum, source: ParquetSource) -> MaxState:
+    _check_no_where(analyzer)
+    values = [v for _, v in _min_max_values(source, analyzer.instance)]
+    return MaxState(max(values) if values else math.nan)
+
+
+class ParquetBackend(DatasetBackend):
+
+    name = "parquet"
+
+    def compute_states(
+        self, data: ParquetSource, analyzers: Sequence[Analyzer]
+    ) -> Dict[Analyzer, Try_]:
+        results: Dict[Analyzer, Try_] = {}
+        to_scan: List[Analyzer] = []
+        for an in dict.fromkeys(analyzers):
+            try:
+                results[an] = Success(statistics_state(an, data))
+            except StatisticsNotSufficient:
+                to_scan.append(an)
+            except Exception as e:
+                results[an] = Failure(e)
+
+        if to_scan:
+            results.update(super().compute_states(data, to_scan))
+
+        return results
@@ -0,0 +1,559 @@
+"""
+Backend for ``polars.DataFrame`` and ``polars.LazyFrame`` objects.
+
+The analyzers are translated into Polars expressions and all of them are
+computed with a single lazy ``select``, so that Polars' query engine can
+optimize the plan (e.g. sharing the ``filter`` expressions derived from ``where``
+clauses) and run it on all cores.
+
+Scan shareable analyzers are translated through the aggregations they declare
+in ``_aggregation_functions``, the other built-in analyzers have their own
+translation. The sketches (``TopK``, ``ApproxCountDistinct``) and the histograms
+are built from the distinct values and their counts, aggregated by Polars, and
+``Correlation`` from moments aggregated by Polars, so the values of the columns
+are never collected.
+
+As with Pandas, nulls and NaN values are considered missing values.
+"""
+import re
+from dataclasses import dataclass
+from functools import singledispatch
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import polars as pl
+from tryingsnake import Try, Try_
+
+from hooqu.analyzers import (
+    Compliance,
+    Correlation,
+    DataType,
+    DataTypeHistogram,
+    Histogram,
+    HistogramState,
+    NumMatches,
+    NumMatchesAndCount,
+    Size,
+)
+from hooqu.analyzers.analyzer import (
+    COUNT_COL,
+    Analyzer,
+    State,
+    StandardScanShareableAnalyzer,
+)
+from hooqu.analyzers.grouping_analyzers import (
+    ApproxCountDistinct,
+    ApproxCountDistinctState,
+    FrequenciesAndNumRows,
+    FrequencyBasedAnalyzer,
+    TopK,
+    TopKState,
+)
+from hooqu.analyzers.correlation import CorrelationState
+from hooqu.analyzers.histogram import bin_labels
+from hooqu.backends.base import Backend
+from hooqu.expressions import ExpressionCompiler, UnsupportedExpressionException
+
+_STRING_TYPES = (pl.String, pl.Categorical, pl.Enum)
+
+
+class PolarsExpressionCompiler(ExpressionCompiler[pl.Expr]):
+    """Translates an expression into a Polars expression"""
+
+    def __init__(self, schema: Mapping[str, pl.DataType]):
+        self.schema = schema
+
+    def column(self, name: str) -> pl.Expr:
+        if name not in self.schema:
+            raise KeyError(f"Input data does not include column {name}")
+        if self.schema[name].is_float():
+            return pl.col(name).fill_nan(None)
+        return pl.col(name)
+
+    def literal(self, value: Any) -> pl.Expr:
+        return pl.lit(value)
+
+    def compare(self, op: str, left: pl.Expr, right: pl.Expr) -> pl.Expr:
+        if op == "==":
+            result = left == right
+        elif op == "!=":
+            result = left != right
+        elif op == "<":
+            result = left < right
+        elif op == "<=":
+            result = left <= right
+        elif op == ">":
+            result = left > right
+        else:
+            result = left >= right
+        return result.fill_null(op == "!=")
+
+    def and_(self, operands: Sequence[pl.Expr]) -> pl.Expr:
+        return pl.all_horizontal(operands)
+
+    def or_(self, operands: Sequence[pl.Expr]) -> pl.Expr:
+        return pl.any_horizontal(operands)
+
+    def not_(self, operand: pl.Expr) -> pl.Expr:
+        return ~operand
+
+    def arithmetic(self, op: str, left: pl.Expr, right: pl.Expr) -> pl.Expr:
+        if op == "+":
+            return left + right
+        if op == "-":
+            return left - right
+        if op == "*":
+            return left * right
+        if op == "/":
+            return left / right
+        if op == "%":
+            return left % right
+        if op == "**":
+            return left.pow(right)
+
+        raise UnsupportedExpressionException(f"Unsupported operator {op}")
+
+    def negate(self, operand: pl.Expr) -> pl.Expr:
+        return -operand
+
+    def is_null(self, operand: pl.Expr) -> pl.Expr:
+        return operand.is_null()
+
+    def fill_null(self, operand: pl.Expr, value: Any) -> pl.Expr:
+        return operand.fill_null(value)
+
+    def is_in(self, operand: pl.Expr, values: Sequence[Any]) -> pl.Expr:
+        return operand.is_in(list(values))
+
+    def mask(self, expression: Optional[str]) -> pl.Expr:
+        if expression is None:
+            return pl.repeat(True, pl.len())
+        return self.compile(expression).fill_null(False)
+
+
+@dataclass
+class PolarsPlan:
+    """
+    The aggregation expressions required by an analyzer, and how to build
+    its state from the (single row) result of the aggregation.
+    """
+
+    expressions: Dict[str, pl.Expr]
+    to_state: Callable[[pl.DataFrame], Optional[State]]
+
+
+def _scalar(result: pl.DataFrame, alias: str) -> Any:
+    return result.get_column(alias)[0]
+
+
+def _contains_regex(values: pl.Expr, pattern) -> pl.Expr:
+    regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+    flags = "(?i)" if regex.flags & re.IGNORECASE else ""
+    try:
+        pl.Series([""]).str.contains(flags + regex.pattern)
+        return values.str.contains(flags + regex.pattern)
+    except pl.exceptions.ComputeError:
+        # The Rust regex engine does not support some constructs (e.g.
+        # backreferences): use Python's re but only once per distinct value
+        def matches(series: pl.Series) -> pl.Series:
+            distinct = series.drop_nulls().unique().to_list()
+            hits = [v for v in distinct if regex.search(v) is not None]
+            return series.is_in(hits).fill_null(False)
+
+        return values.map_batches(matches, return_dtype=pl.Boolean)
+
+
+def _nearest_quantile(values: pl.Expr, quantile: float) -> pl.Expr:
+    # Polars rounds half up when picking the nearest value, unlike Pandas (and
+    # NumPy) which round half to even. Pick the value by index to be consistent.
+    if not 0 <= quantile <= 1:
+        raise ValueError("percentiles should all be in the interval [0, 1]")
+
+    n = values.count()
+    position = (n - 1).cast(pl.Float64) * quantile
+    lower = position.floor()
+    fraction = position - lower
+    round_up = (fraction > 0.5) | ((fraction == 0.5) & (lower % 2 == 1))
+    index = (lower + round_up.cast(pl.Float64)).cast(pl.Int64)
+
+    return values.drop_nulls().sort().slice(index, 1).first()
+
+
+def _aggregation(name: str, function: Any, values: pl.Expr) -> pl.Expr:
+    """Translates an aggregation declared by ``_aggregation_functions``"""
+    if name == "sum":
+        return values.sum()
+    if name in ("count", "count_not_null"):
+        return values.count()
+    if name == "count_all":
+        return values.len()
+    if name == "min":
+        return values.min()
+    if name == "max":
+        return values.max()
+    if name == "mean":
+        return values.mean()
+    if name == "pop_variance":
+        return pl.struct(
+            values.count().alias("n"),
+            values.mean().alias("avg"),
+            (values.var(ddof=0) * values.count()).alias("m2"),
+        )
+    if name == "quantile_aggregation":
+        return _nearest_quantile(values, function.quantile)
+    if name == "contains_regex":
+        return _contains_regex(values, function.regex).sum()
+
+    raise NotImplementedError(f"Aggregation {name} is not supported by Polars")
+
+
+def _aggregation_value(name: str, value: Any) -> Any:
+    if name == "pop_variance":
+        return (value["n"], value["avg"], value["m2"] or 0.0)
+    if value is None and name in ("min", "max", "mean", "quantile_aggregation"):
+        return float("nan")
+    return value
+
+
+@singledispatch
+def polars_plan(analyzer: Analyzer, compiler: PolarsExpressionCompiler, prefix: str):
+    raise NotImplementedError(f"{analyzer} is not supported by the Polars backend")
+
+
+@polars_plan.register(StandardScanShareableAnalyzer)
+def _scan_shareable_plan(
+    analyzer: StandardScanShareableAnalyzer,
+    compiler: PolarsExpressionCompiler,
+    prefix: str,
+) -> PolarsPlan:
+    mask = compiler.mask(analyzer.where)
+    names: Dict[str, List[str]] = {}
+    expressions: Dict[str, pl.Expr] = {}
+
+    for column, aggregations in analyzer._aggregation_functions().items():
+        values = compiler.column(column).filter(mask)
+        names[column] = []
+        for agg in aggregations:
+            name = agg if isinstance(agg, str) else agg.__name__
+            names[column].append(name)
+            expressions[f"{prefix}{column}:{name}"] = _aggregation(name, agg, values)
+
+    def to_state(result: pl.DataFrame) -> Optional[State]:
+        # rebuild the (tiny) aggregation result the analyzers know how to read
+        aggregation_result = pd.DataFrame(
+            {
+                column: {
+                    name: _aggregation_value(
+                        name, _scalar(result, f"{prefix}{column}:{name}")
+                    )
+                    for name in column_names
+                }
+                for column, column_names in names.items()
+            }
+        )
+        return analyzer.from_aggregation_result(aggregation_result, 0)
+
+    return PolarsPlan(expressions, to_state)
+
+
+@polars_plan.register(Size)
+def _size_plan(
+    analyzer: Size, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    expressions = {f"{prefix}size": compiler.mask(analyzer.where).sum()}
+    return PolarsPlan(
+        expressions, lambda r: NumMatches(_scalar(r, f"{prefix}size"))
+    )
+
+
+@polars_plan.register(Compliance)
+def _compliance_plan(
+    analyzer: Compliance, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    mask = compiler.mask(analyzer.where)
+    expressions = {
+        f"{prefix}matches": compiler.mask(analyzer.predicate).filter(mask).sum(),
+        f"{prefix}count": mask.sum(),
+    }
+
+    def to_state(result: pl.DataFrame) -> NumMatchesAndCount:
+        return NumMatchesAndCount(
+            _scalar(result, f"{prefix}matches"), _scalar(result, f"{prefix}count")
+        )
+
+    return PolarsPlan(expressions, to_state)
+
+
+def _value_counts(values: pl.Expr) -> pl.Expr:
+    # the distinct (non missing) values and their counts, in the order of their
+    # first appearance as with Pandas' value_counts(sort=False): only they are
+    # collected, not the values
+    values = values.drop_nulls()
+    return pl.struct(
+        values.unique(maintain_order=True).alias("value"),
+        values.unique_counts().alias(COUNT_COL),
+    ).implode()
+
+
+def _counts(result: pl.DataFrame, alias: str) -> pd.Series:
+    counts = _scalar(result, alias).struct.unnest()
+    return pd.Series(
+        counts.get_column(COUNT_COL).to_numpy().astype(np.int64),
+        index=counts.get_column("value").to_numpy(),
+    )
+
+
+@polars_plan.register(ApproxCountDistinct)
+def _approx_count_distinct_plan(
+    analyzer: ApproxCountDistinct, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    # the sketch of the distinct values is the sketch of all the values, they
+    # are hashed as by the other backends, so the sketches can be merged
+    values = compiler.column(analyzer.instance).filter(compiler.mask(analyzer.where))
+    expressions = {f"{prefix}values": values.drop_nulls().unique().implode()}
+
+    def to_state(result: pl.DataFrame) -> ApproxCountDistinctState:
+        values = _scalar(result, f"{prefix}values")
+        return ApproxCountDistinctState.from_values(values.to_numpy())
+
+    return PolarsPlan(expressions, to_state)
+
+
+@polars_plan.register(TopK)
+def _top_k_plan(
+    analyzer: TopK, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    values = compiler.column(analyzer.instance).filter(compiler.mask(analyzer.where))
+    expressions = {
+        f"{prefix}counts": _value_counts(values),
+        f"{prefix}num_rows": values.len(),
+    }
+
+    def to_state(result: pl.DataFrame) -> TopKState:
+        return TopKState.from_counts(
+            _counts(result, f"{prefix}counts"),
+            _scalar(result, f"{prefix}num_rows"),
+            analyzer.capacity,
+        )
+
+    return PolarsPlan(expressions, to_state)
+
+
+def _bin_masks(values: pl.Expr, edges: Sequence[float]) -> List[pl.Expr]:
+    # the bins of hooqu.analyzers.histogram.bin_counts
+    masks = [values < edges[0]]
+    masks += [(values >= lo) & (values < hi) for lo, hi in zip(edges[:-2], edges[1:-1])]
+    masks += [(values >= edges[-2]) & (values <= edges[-1]), values > edges[-1]]
+    return masks
+
+
+@polars_plan.register(Histogram)
+def _histogram_plan(
+    analyzer: Histogram, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    values = compiler.column(analyzer.instance).filter(compiler.mask(analyzer.where))
+    expressions = {
+        f"{prefix}num_rows": values.len(),
+        f"{prefix}nulls": values.null_count(),
+    }
+
+    if analyzer.edges is not None:
+        # the bins are counted by Polars
+        edges = analyzer.edges
+        bins = [f"{prefix}bin_{i}" for i in range(len(edges) + 1)]
+        for alias, mask in zip(bins, _bin_masks(values.cast(pl.Float64), edges)):
+            expressions[alias] = mask.sum()
+
+        def to_binned_state(result: pl.DataFrame) -> HistogramState:
+            counts = pd.Series(
+                [_scalar(result, alias) or 0 for alias in bins],
+                index=bin_labels(edges),
+            )
+            return HistogramState.with_nulls(
+                counts,
+                _scalar(result, f"{prefix}nulls"),
+                _scalar(result, f"{prefix}num_rows"),
+            )
+
+        return PolarsPlan(expressions, to_binned_state)
+
+    expressions[f"{prefix}counts"] = _value_counts(values)
+
+    def to_state(result: pl.DataFrame) -> HistogramState:
+        return HistogramState.with_nulls(
+            _counts(result, f"{prefix}counts"),
+            _scalar(result, f"{prefix}nulls"),
+            _scalar(result, f"{prefix}num_rows"),
+        )
+
+    return PolarsPlan(expressions, to_state)
+
+
+@polars_plan.register(DataType)
+def _data_type_plan(
+    analyzer: DataType, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    values = compiler.column(analyzer.instance).filter(compiler.mask(analyzer.where))
+    dtype = compiler.schema[analyzer.instance]
+    expressions = {
+        f"{prefix}num_rows": values.len(),
+        f"{prefix}nulls": values.null_count(),
+    }
+
+    if dtype.is_integer() or dtype.is_float() or dtype == pl.Boolean:
+        # the type of the values is the type of the column
+        field = (
+            "num_integral"
+            if dtype.is_integer()
+            else "num_fractional" if dtype.is_float() else "num_boolean"
+        )
+
+        def to_typed_state(result: pl.DataFrame) -> DataTypeHistogram:
+            nulls = _scalar(result, f"{prefix}nulls")
+            present = _scalar(result, f"{prefix}num_rows") - nulls
+            counts = dict.fromkeys(DataTypeHistogram.__dataclass_fields__, 0)
+            counts.update({"num_null": nulls, field: present})
+            return DataTypeHistogram(**counts)
+
+        return PolarsPlan(expressions, to_typed_state)
+
+    # only the distinct values are collected (and classified)
+    expressions[f"{prefix}counts"] = _value_counts(values)
+
+    def to_state(result: pl.DataFrame) -> DataTypeHistogram:
+        counts = _counts(result, f"{prefix}counts")
+        return DataTypeHistogram.from_distinct_values(
+            pd.Series(counts.index, dtype=object),
+            counts.to_numpy(),
+            _scalar(result, f"{prefix}nulls"),
+        )
+
+    return PolarsPlan(expressions, to_state)
+
+
+@polars_plan.register(Correlation)
+def _correlation_plan(
+    analyzer: Correlation, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    # the moments are aggregated by Polars, on the rows where both columns have
+    # a value (centered first, as by comoment_states)
+    x, y = (compiler.column(c).cast(pl.Float64) for c in analyzer.columns)
+    rows = compiler.mask(analyzer.where) & x.is_not_null() & y.is_not_null()
+    x, y = x.filter(rows), y.filter(rows)
+    dx, dy = x - x.mean(), y - y.mean()
+    expressions = {
+        f"{prefix}n": rows.sum(),
+        f"{prefix}x_avg": x.mean(),
+        f"{prefix}y_avg": y.mean(),
+        f"{prefix}ck": (dx * dy).sum(),
+        f"{prefix}x_mk": (dx * dx).sum(),
+        f"{prefix}y_mk": (dy * dy).sum(),
+    }
+
+    def to_state(result: pl.DataFrame) -> Optional[CorrelationState]:
+        n = _scalar(result, f"{prefix}n")
+        if not n:
+            return None
+        return CorrelationState(
+            n,
+            *(
+                float(_scalar(result, f"{prefix}{name}"))
+                for name in ("x_avg", "y_avg", "ck", "x_mk", "y_mk")
+            ),
+        )
+
+    return PolarsPlan(expressions, to_state)
+
+
+@polars_plan.register(FrequencyBasedAnalyzer)
+def _frequencies_plan(
+    analyzer: FrequencyBasedAnalyzer, compiler: PolarsExpressionCompiler, prefix: str
+) -> PolarsPlan:
+    columns = [compiler.column(c) for c in analyzer.grouping_columns]
+    mask = compiler.mask(analyzer.where) & pl.any_horizontal(
+        [c.is_not_null() for c in columns]
+    )
+    expressions = {
+        f"{prefix}frequencies": pl.struct(columns)
+        .filter(mask)
+        .value_counts(name=COUNT_COL)
+        .implode(),
+        f"{prefix}num_rows": mask.sum(),
+    }
+
+    def to_state(result: pl.DataFrame) -> FrequenciesAndNumRows:
+        counts = _scalar(result, f"{prefix}frequencies").struct.unnest()
+        key_column = counts.columns[0]
+        frequencies = counts.select(
+            pl.col(key_column).struct.unnest(), pl.col(COUNT_COL).cast(pl.Int64)
+        )
+        return FrequenciesAndNumRows(frequencies, _scalar(result, f"{prefix}num_rows"))
+
+    return PolarsPlan(expressions, to_state)
+
+
+def _run(
+    lazy_frame: pl.LazyFrame, plans: Mapping[Analyzer, PolarsPlan]
+) -> pl.DataFrame:
+    expressions = [
+        expr.alias(alias)
+        for plan in plans.values()
+        for alias, expr in plan.expressions.items()
+    ]
+    return lazy_frame.select(expressions).collect()
+
+
+class PolarsBackend(Backend):
+
+    name = "polars"
+
+    def schema(self, data) -> Mapping[str, pl.DataType]:
+        return data.collect_schema()
+
+    def column_names(self, data) -> Sequence[str]:
+        return list(self.schema(data).names())
+
+    def dtype(self, data, column: str):
+        return self.schema(data)[column]
+
+    def is_numeric(self, data, column: str) -> bool:
+        dtype = self.dtype(data, column)
+        return dtype.is_numeric() or dtype == pl.Boolean
+
+    def is_string(self, data, column: str) -> bool:
+        return isinstance(self.dtype(data, column), _STRING_TYPES)
+
+    def compute_state(self, analyzer: Analyzer, data) -> Optional[State]:
+        return self.compute_states(data, [analyzer])[analyzer].get()
+
+    def compute_states(
+        self, data, analyzers: Sequence[Analyzer]
+    ) -> Mapping[Analyzer, Try_]:
+        lazy_frame = data.lazy()
+        compiler = PolarsExpressionCompiler(self.schema(data))
+
+        results: Dict[Analyzer, Try_] = {}
+        plans: Dict[Analyzer, PolarsPlan] = {}
+        for i, an in enumerate(dict.fromkeys(analyzers)):
+            plan = Try(polars_plan, an, compiler, f"__hooqu_{i}_")
+            if plan.isSuccess:
+                plans[an] = plan.get()
+            else:
+                results[an] = plan
+
+        if not plans:
+            return results
+
+        try:
+            # all the analyzers in a single query plan
+            result = _run(lazy_frame, plans)
+            for an, plan in plans.items():
+                results[an] = Try(plan.to_state, result)
+        except Exception:
+            # an expression failed at execution time (e.g. a comparison between
+            # incompatible types), run each analyzer on its own to find out which
+            for an, plan in plans.items():
+                results[an] = Try(_run, lazy_frame, {an: plan}).map(plan.to_state)
+
+        return results
@@ -0,0 +1,212 @@
+"""
+Out of core counting of the groups of the frequency based analyzers (e.g.
+``Uniqueness``) for data streamed by the Arrow backends.
+
+The key columns of the batches are kept in memory until they exceed a memory
+budget. From then on, each row is reduced to a 64 bits hash of its group; the
+hashes are buffered and, when the buffer is full, partitioned by hash into
+``num_partitions`` runs written to disk as ``.npy`` files. At the end each
+partition is counted on its own (its runs are memory mapped), so only one
+partition needs to fit in memory at a time.
+
+All the frequency based metrics only depend on the number of occurrences of
+each group, so the counts are returned as a histogram: the number of groups
+having each count. Two different groups with the same hash are counted as the
+same group, which for 64 bits hashes is unlikely even with billions of groups.
+"""
+import tempfile
+from functools import reduce
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from hooqu.analyzers.analyzer import COUNT_COL
+from hooqu.analyzers.grouping_analyzers import GROUPS_COL, FrequenciesAndNumRows
+
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+_MULTIPLIER = np.uint64(1000003)
+
+
+class SpillingCounter:
+    """
+    Counts the occurrences of 64 bits hashes, spilling them to disk.
+
+    Parameters
+    ----------
+
+    memory_budget:
+        Bytes of hashes buffered in memory before they are written to disk
+    directory:
+        Where the temporary runs are written, by default the system temporary
+        directory
+    num_partitions:
+        Number of partitions of the hashes, each one is counted on its own
+    """
+
+    def __init__(
+        self,
+        memory_budget: int,
+        directory: Optional[str] = None,
+        num_partitions: int = 256,
+    ):
+        self.buffer_size = max(1, memory_budget // 8)
+        self.num_partitions = num_partitions
+        self._directory = tempfile.TemporaryDirectory(
+            prefix="hooqu-spill-", dir=directory
+        )
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0
+        self._runs: List[List[Path]] = [[] for _ in range(num_partitions)]
+
+    def add(self, hashes: np.ndarray):
+        self._buffer.append(hashes)
+        self._buffered += len(hashes)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered hashes to a run per partition"""
+        if not self._buffered:
+            return
+        hashes = np.concatenate(self._buffer)
+        self._buffer, self._buffered = [], 0
+
+        partitions = (hashes % np.uint64(self.num_partitions)).astype(np.intp)
+        order = np.argsort(partitions, kind="stable")
+        hashes = hashes[order]
+        bounds = np.cumsum(np.bincount(partitions, minlength=self.num_partitions))
+        start = 0
+        for partition, end in enumerate(bounds):
+            if end > start:
+                path = Path(self._directory.name) / (
+                    f"{partition}-{len(self._runs[partition])}.npy"
+                )
+                np.save(path, hashes[start:end])
+                self._runs[partition].append(path)
+            start = end
+
+    def count_histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the distinct counts of the hashes and the number of hashes
+        having each of them.
+        """
+        self.flush()
+        histogram: Dict[int, int] = {}
+        for runs in self._runs:
+            if not runs:
+                continue
+            hashes = np.concatenate([np.load(r, mmap_mode="r") for r in runs])
+            _, counts = np.unique(hashes, return_counts=True)
+            for count, groups in zip(*np.unique(counts, return_counts=True)):
+                histogram[int(count)] = histogram.get(int(count), 0) + int(groups)
+
+        counts = np.fromiter(histogram.keys(), dtype=np.int64, count=len(histogram))
+        groups = np.fromiter(histogram.values(), dtype=np.int64, count=len(histogram))
+        return counts, groups
+
+    def close(self):
+        self._directory.cleanup()
+
+
+def _column_hashes(values) -> np.ndarray:
+    """Hashes of the values of an Arrow array, the same for any chunking"""
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    dtype = values.type
+    nulls = pc.is_null(values, nan_is_null=True).to_numpy(zero_copy_only=False)
+
+    if pa.types.is_floating(dtype):
+        numbers = values.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        numbers = np.where(nulls, 0.0, numbers) + 0.0  # -0.0 is 0.0
+        hashes = pd.util.hash_array(numbers)
+    elif (
+        pa.types.is_integer(dtype)
+        or pa.types.is_boolean(dtype)
+        or pa.types.is_temporal(dtype)
+    ):
+        if not pa.types.is_integer(dtype):
+            values = values.cast(pa.int64())
+        numbers = pc.fill_null(values, 0).to_numpy(zero_copy_only=False)
+        hashes = pd.util.hash_array(numbers)
+    else:
+        objects = values.to_pandas().to_numpy(dtype=object)
+        hashes = pd.util.hash_array(objects)
+
+    return np.where(nulls, _NULL_HASH, hashes)
+
+
+def group_hashes(batch, columns: Sequence[str]) -> np.ndarray:
+    """Combined hashes of the values of the columns of each row"""
+    hashes = [_column_hashes(batch.column(c)) for c in columns]
+    return reduce(lambda h, other: h * _MULTIPLIER ^ other, hashes)
+
+
+class SpillingFrequencies:
+    """
+    Computes the frequencies of the groups of values of ``columns`` in the
+    batches added, in memory while they fit in ``memory_budget`` bytes and out of
+    core afterwards.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        memory_budget: int,
+        directory: Optional[str] = None,
+        num_partitions: int = 256,
+    ):
+        self.columns = list(columns)
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.num_partitions = num_partitions
+        self._batches: List = []
+        self._size = 0
+        self._counter: Optional[SpillingCounter] = None
+        self._num_rows = 0
+
+    @property
+    def spilled(self) -> bool:
+        return self._counter is not None
+
+    def add(self, batch):
+        if self._counter is not None:
+            self._spill(batch)
+            return
+
+        self._batches.append(batch)
+        self._size += batch.nbytes
+        if self._size > self.memory_budget:
+            self._counter = SpillingCounter(
+                self.memory_budget, self.directory, self.num_partitions
+            )
+            for b in self._batches:
+                self._spill(b)
+            self._batches = []
+
+    def _spill(self, batch):
+        not_null = [
+            pc.invert(pc.is_null(batch.column(c), nan_is_null=True))
+            for c in self.columns
+        ]
+        batch = batch.filter(reduce(pc.or_, not_null))
+        self._num_rows += batch.num_rows
+        if batch.num_rows:
+            self._counter.add(group_hashes(batch, self.columns))
+
+    def state(self, schema: pa.Schema) -> FrequenciesAndNumRows:
+        if self._counter is None:
+            from hooqu.backends.arrow import compute_frequencies
+
+            table = pa.Table.from_batches(self._batches, schema)
+            return compute_frequencies(table, self.columns)
+
+        try:
+            counts, groups = self._counter.count_histogram()
+        finally:
+            self._counter.close()
+        frequencies = pd.DataFrame({COUNT_COL: counts, GROUPS_COL: groups})
+        return FrequenciesAndNumRows(frequencies, self._num_rows)
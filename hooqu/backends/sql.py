@@ -0,0 +1,740 @@
+"""
+Backend for tables living in a database, accessed through a DB-API (PEP 249)
+connection.
+
+The analyzers are compiled into SQL so that the rows never leave the database.
+All the scan shareable analyzers of a run are computed by a single ``SELECT``
+statement made of conditional aggregations, e.g. ``Completeness("att1",
+where="item > 2")`` becomes::
+
+    SUM(CASE WHEN ("item" > 2) AND "att1" IS NOT NULL THEN 1 ELSE 0 END)
+
+The frequency based analyzers (e.g. ``Uniqueness``) run a query each, which
+counts the groups in a ``GROUP BY`` subquery and then the number of groups
+having each count: only these few rows are fetched, the metrics are computed
+from the histogram of the counts. ``MutualInformation``, which needs the values
+of the groups, fetches the groups and their counts. ``ApproxCountDistinct``
+fetches the distinct values (deduplicated by the database) and sketches them.
+``Quantile`` needs an extra query to fetch the value at the right position.
+
+The SQL generated is ANSI, differences between databases are handled by a
+:class:`SQLDialect`; SQLite is the reference implementation.
+
+Example::
+
+    data = SQLTable(sqlite3.connect("shop.db"), "orders")
+    VerificationSuite().on_data(data).add_check(check).run()
+"""
+import math
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from functools import lru_cache, singledispatch
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from tryingsnake import Try, Try_
+
+from hooqu.analyzers import (
+    Completeness,
+    Compliance,
+    Correlation,
+    CorrelationState,
+    DataType,
+    DataTypeHistogram,
+    Histogram,
+    HistogramState,
+    Maximum,
+    MaxState,
+    Mean,
+    MeanState,
+    Minimum,
+    MinState,
+    NumMatches,
+    NumMatchesAndCount,
+    PatternMatch,
+    Quantile,
+    QuantileState,
+    Size,
+    StandardDeviation,
+    StandardDeviationState,
+    Sum,
+    SumState,
+)
+from hooqu.analyzers.analyzer import COUNT_COL, Analyzer, State
+from hooqu.analyzers.grouping_analyzers import (
+    GROUPS_COL,
+    ApproxCountDistinct,
+    ApproxCountDistinctState,
+    FrequenciesAndNumRows,
+    FrequencyBasedAnalyzer,
+    TopK,
+    TopKState,
+)
+from hooqu.analyzers.mutual_information import MutualInformation
+from hooqu.analyzers.histogram import bin_labels
+from hooqu.backends.base import Backend
+from hooqu.expressions import ExpressionCompiler, UnsupportedExpressionException
+
+_COMPARISONS = {"==": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+# Type affinity rules of SQLite, which are a good guess for other databases too
+_STRING_TYPES = ("CHAR", "CLOB", "TEXT", "STRING")
+_NUMERIC_TYPES = ("INT", "REAL", "FLOA", "DOUB", "NUM", "DEC", "BOOL")
+
+
+class SQLDialect:
+    """
+    ANSI SQL. Subclasses adapt the generated SQL and the metadata queries to
+    a specific database.
+    """
+
+    def quote_identifier(self, name: str) -> str:
+        return '"{}"'.format(name.replace('"', '""'))
+
+    def literal(self, value: Any) -> str:
+        if value is None:
+            return "NULL"
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, (int, float)):
+            if isinstance(value, float) and not math.isfinite(value):
+                raise UnsupportedExpressionException(
+                    f"Literal {value} is not supported in SQL"
+                )
+            return repr(value)
+        if isinstance(value, str):
+            return "'{}'".format(value.replace("'", "''"))
+
+        raise UnsupportedExpressionException(
+            f"Literal {value!r} is not supported in SQL"
+        )
+
+    def to_float(self, sql: str) -> str:
+        return f"CAST({sql} AS DOUBLE PRECISION)"
+
+    def regex_match(self, connection, sql: str, pattern: "re.Pattern") -> str:
+        """
+        Returns a boolean SQL expression, true when ``sql`` contains a match
+        of ``pattern``.
+        """
+        raise UnsupportedExpressionException(
+            f"Regular expressions are not supported by {type(self).__name__}"
+        )
+
+    def column_types(self, connection, table: str) -> Dict[str, str]:
+        """Returns the declared type of each of the columns of the table"""
+        query = (
+            "SELECT column_name, data_type FROM information_schema.columns "
+            f"WHERE table_name = {self.literal(table)} ORDER BY ordinal_position"
+        )
+        return {name: str(dtype) for name, dtype in _fetch_all(connection, query)}
+
+
+def _regexp(pattern: str, flags: int, value: Optional[str]) -> Optional[bool]:
+    if value is None:
+        return None
+    return _compile(pattern, flags).search(value) is not None
+
+
+@lru_cache(maxsize=128)
+def _compile(pattern: str, flags: int) -> "re.Pattern":
+    return re.compile(pattern, flags)
+
+
+class SQLiteDialect(SQLDialect):
+    """
+    SQLite has no regular expression support built in, Python's ``re`` module
+    is registered on the connection as a user defined function.
+    """
+
+    def to_float(self, sql: str) -> str:
+        return f"CAST({sql} AS REAL)"
+
+    def regex_match(self, connection, sql: str, pattern: "re.Pattern") -> str:
+        connection.create_function("hooqu_regexp", 3, _regexp)
+        return "hooqu_regexp({}, {}, {})".format(
+            self.literal(pattern.pattern), int(pattern.flags), sql
+        )
+
+    def column_types(self, connection, table: str) -> Dict[str, str]:
+        query = f"PRAGMA table_info({self.quote_identifier(table)})"
+        return {row[1]: row[2] for row in _fetch_all(connection, query)}
+
+
+def default_dialect(connection) -> SQLDialect:
+    if isinstance(connection, sqlite3.Connection):
+        return SQLiteDialect()
+    return SQLDialect()
+
+
+def _fetch_all(connection, query: str) -> List[Sequence[Any]]:
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+@dataclass
+class SQLTable:
+    """
+    A table (or view) of the database behind a DB-API connection, to be passed
+    to the analyzers or to ``VerificationSuite.on_data``.
+
+    Parameters
+    ----------
+
+    connection:
+        An open DB-API connection.
+    table:
+        Name of the table.
+    dialect:
+        SQL dialect of the database, by default it is guessed from the
+        connection.
+    """
+
+    connection: Any
+    table: str
+    dialect: Optional[SQLDialect] = None
+    _column_types: Optional[Dict[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.dialect is None:
+            self.dialect = default_dialect(self.connection)
+
+    @property
+    def column_types(self) -> Dict[str, str]:
+        if self._column_types is None:
+            self._column_types = self.dialect.column_types(  # type: ignore
+                self.connection, self.table
+            )
+        return self._column_types
+
+    @property
+    def from_clause(self) -> str:
+        return self.dialect.quote_identifier(self.table)  # type: ignore
+
+    def execute(self, query: str) -> List[Sequence[Any]]:
+        return _fetch_all(self.connection, query)
+
+
+class SQLExpressionCompiler(ExpressionCompiler[str]):
+    """Translates an expression into a SQL boolean or scalar expression"""
+
+    def __init__(self, table: SQLTable):
+        self.table = table
+        self.dialect: SQLDialect = table.dialect  # type: ignore
+
+    def column(self, name: str) -> str:
+        if name not in self.table.column_types:
+            raise KeyError(f"Input data does not include column {name}")
+        return self.dialect.quote_identifier(name)
+
+    def literal(self, value: Any) -> str:
+        return self.dialect.literal(value)
+
+    def compare(self, op: str, left: str, right: str) -> str:
+        # comparisons with NULL are false (true for !=) and not unknown, as in
+        # Pandas
+        on_null = "TRUE" if op == "!=" else "FALSE"
+        return f"COALESCE({left} {_COMPARISONS[op]} {right}, {on_null})"
+
+    def and_(self, operands: Sequence[str]) -> str:
+        return "({})".format(" AND ".join(operands))
+
+    def or_(self, operands: Sequence[str]) -> str:
+        return "({})".format(" OR ".join(operands))
+
+    def not_(self, operand: str) -> str:
+        return f"(NOT {operand})"
+
+    def arithmetic(self, op: str, left: str, right: str) -> str:
+        if op in ("+", "-", "*"):
+            return f"({left} {op} {right})"
+        if op == "/":
+            return f"({self.dialect.to_float(left)} / {right})"
+
+        # the semantics of modulo and power differ between databases
+        raise UnsupportedExpressionException(f"Unsupported operator {op} in SQL")
+
+    def negate(self, operand: str) -> str:
+        return f"(-{operand})"
+
+    def is_null(self, operand: str) -> str:
+        return f"({operand} IS NULL)"
+
+    def fill_null(self, operand: str, value: Any) -> str:
+        return f"COALESCE({operand}, {self.literal(value)})"
+
+    def is_in(self, operand: str, values: Sequence[Any]) -> str:
+        if not values:
+            return "FALSE"
+        items = ", ".join(self.literal(v) for v in values)
+        return f"COALESCE({operand} IN ({items}), FALSE)"
+
+    def mask(self, expression: Optional[str]) -> Optional[str]:
+        if expression is None:
+            return None
+        return self.compile(expression)
+
+
+def _and(*conditions: Optional[str]) -> Optional[str]:
+    conditions_ = [c for c in conditions if c is not None]
+    if not conditions_:
+        return None
+    return " AND ".join(conditions_)
+
+
+def _when(condition: Optional[str], value: str) -> str:
+    if condition is None:
+        return value
+    return f"CASE WHEN {condition} THEN {value} END"
+
+
+def _count_if(condition: Optional[str]) -> str:
+    if condition is None:
+        return "COUNT(*)"
+    return f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+
+
+def _nan_if_null(value: Any) -> Any:
+    return float("nan") if value is None else value
+
+
+@dataclass
+class SQLPlan:
+    """
+    The aggregate expressions an analyzer needs in the shared ``SELECT``, and
+    how to build its state from their values. ``to_state`` receives the table,
+    so it can run additional queries.
+    """
+
+    aggregates: List[str]
+    to_state: Callable[[Sequence[Any], SQLTable], Optional[State]]
+
+
+@singledispatch
+def sql_plan(analyzer: Analyzer, compiler: SQLExpressionCompiler) -> SQLPlan:
+    raise NotImplementedError(f"{analyzer} is not supported by the SQL backend")
+
+
+@sql_plan.register(Size)
+def _size_plan(analyzer: Size, compiler: SQLExpressionCompiler) -> SQLPlan:
+    return SQLPlan(
+        [_count_if(compiler.mask(analyzer.where))],
+        lambda values, _: NumMatches(values[0] or 0),
+    )
+
+
+def _matches_and_count(values: Sequence[Any], _) -> NumMatchesAndCount:
+    return NumMatchesAndCount(values[0] or 0, values[1] or 0)
+
+
+@sql_plan.register(Completeness)
+def _completeness_plan(
+    analyzer: Completeness, compiler: SQLExpressionCompiler
+) -> SQLPlan:
+    where = compiler.mask(analyzer.where)
+    not_null = f"{compiler.column(analyzer.instance)} IS NOT NULL"
+    return SQLPlan(
+        [_count_if(_and(where, not_null)), _count_if(where)], _matches_and_count
+    )
+
+
+@sql_plan.register(Compliance)
+def _compliance_plan(analyzer: Compliance, compiler: SQLExpressionCompiler) -> SQLPlan:
+    where = compiler.mask(analyzer.where)
+    predicate = compiler.mask(analyzer.predicate)
+    return SQLPlan(
+        [_count_if(_and(where, predicate)), _count_if(where)], _matches_and_count
+    )
+
+
+@sql_plan.register(PatternMatch)
+def _pattern_match_plan(
+    analyzer: PatternMatch, compiler: SQLExpressionCompiler
+) -> SQLPlan:
+    pattern = analyzer.pattern
+    regex = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+    where = compiler.mask(analyzer.where)
+    matches = compiler.dialect.regex_match(
+        compiler.table.connection, compiler.column(analyzer.instance), regex
+    )
+    return SQLPlan(
+        [_count_if(_and(where, matches)), _count_if(where)], _matches_and_count
+    )
+
+
+@sql_plan.register(Mean)
+def _mean_plan(analyzer: Mean, compiler: SQLExpressionCompiler) -> SQLPlan:
+    values = _when(
+        compiler.mask(analyzer.where), compiler.column(analyzer.instance)
+    )
+    return SQLPlan(
+        [f"SUM({values})", f"COUNT({values})"],
+        lambda r, _: MeanState(r[0] or 0, r[1] or 0),
+    )
+
+
+@sql_plan.register(Sum)
+def _sum_plan(analyzer: Sum, compiler: SQLExpressionCompiler) -> SQLPlan:
+    values = _when(
+        compiler.mask(analyzer.where), compiler.column(analyzer.instance)
+    )
+    return SQLPlan([f"SUM({values})"], lambda r, _: SumState(r[0] or 0))
+
+
+@sql_plan.register(Minimum)
+def _min_plan(analyzer: Minimum, compiler: SQLExpressionCompiler) -> SQLPlan:
+    values = _when(
+        compiler.mask(analyzer.where), compiler.column(analyzer.instance)
+    )
+    return SQLPlan([f"MIN({values})"], lambda r, _: MinState(_nan_if_null(r[0])))
+
+
+@sql_plan.register(Maximum)
+def _max_plan(analyzer: Maximum, compiler: SQLExpressionCompiler) -> SQLPlan:
+    values = _when(
+        compiler.mask(analyzer.where), compiler.column(analyzer.instance)
+    )
+    return SQLPlan([f"MAX({values})"], lambda r, _: MaxState(_nan_if_null(r[0])))
+
+
+@sql_plan.register(StandardDeviation)
+def _std_plan(analyzer: StandardDeviation, compiler: SQLExpressionCompiler) -> SQLPlan:
+    where = compiler.mask(analyzer.where)
+    column = compiler.column(analyzer.instance)
+    values = _when(where, column)
+
+    # the squared deviations from the mean (computed by an uncorrelated
+    # subquery) are summed, which is more accurate than SUM(x * x)
+    where_clause = "" if where is None else f" WHERE {where}"
+    avg = f"(SELECT AVG({column}) FROM {compiler.table.from_clause}{where_clause})"
+    deviation = f"({values} - {avg})"
+
+    def to_state(r: Sequence[Any], _) -> Optional[StandardDeviationState]:
+        n, avg, m2 = r
+        if not n:
+            return None
+        return StandardDeviationState(n, avg, m2)
+
+    return SQLPlan(
+        [f"COUNT({values})", f"AVG({values})", f"SUM({deviation} * {deviation})"],
+        to_state,
+    )
+
+
+def _nearest_index(n: int, quantile: float) -> int:
+    # same as Pandas' "nearest" interpolation, which rounds half to even
+    return int(round((n - 1) * quantile))
+
+
+@sql_plan.register(Quantile)
+def _quantile_plan(analyzer: Quantile, compiler: SQLExpressionCompiler) -> SQLPlan:
+    if not 0 <= analyzer.quantile <= 1:
+        raise ValueError("percentiles should all be in the interval [0, 1]")
+
+    where = compiler.mask(analyzer.where)
+    column = compiler.column(analyzer.instance)
+    values = _when(where, column)
+    condition = _and(where, f"{column} IS NOT NULL")
+
+    def to_state(r: Sequence[Any], table: SQLTable) -> QuantileState:
+        n = r[0]
+        if not n:
+            return QuantileState(float("nan"))
+        rows = table.execute(
+            f"SELECT {column} FROM {table.from_clause} WHERE {condition} "
+            f"ORDER BY {column} LIMIT 1 OFFSET {_nearest_index(n, analyzer.quantile)}"
+        )
+        return QuantileState(rows[0][0])
+
+    return SQLPlan([f"COUNT({values})"], to_state)
+
+
+@sql_plan.register(Correlation)
+def _correlation_plan(
+    analyzer: Correlation, compiler: SQLExpressionCompiler
+) -> SQLPlan:
+    x, y = (compiler.column(c) for c in analyzer.columns)
+    condition = _and(
+        compiler.mask(analyzer.where), f"{x} IS NOT NULL", f"{y} IS NOT NULL"
+    )
+
+    # as for StandardDeviation, the deviations from the means (computed by
+    # uncorrelated subqueries on the same rows) are summed
+    def deviation(column: str) -> str:
+        avg = (
+            f"(SELECT AVG({column}) FROM {compiler.table.from_clause} "
+            f"WHERE {condition})"
+        )
+        return f"({_when(condition, column)} - {avg})"
+
+    dx, dy = deviation(x), deviation(y)
+
+    def to_state(r: Sequence[Any], _) -> Optional[CorrelationState]:
+        n, x_avg, y_avg, ck, x_mk, y_mk = r
+        if not n:
+            return None
+        return CorrelationState(n, x_avg, y_avg, ck, x_mk, y_mk)
+
+    return SQLPlan(
+        [
+            _count_if(condition),
+            f"AVG({_when(condition, x)})",
+            f"AVG({_when(condition, y)})",
+            f"SUM({dx} * {dy})",
+            f"SUM({dx} * {dx})",
+            f"SUM({dy} * {dy})",
+        ],
+        to_state,
+    )
+
+
+@sql_plan.register(ApproxCountDistinct)
+def _approx_count_distinct_plan(
+    analyzer: ApproxCountDistinct, compiler: SQLExpressionCompiler
+) -> SQLPlan:
+    column = compiler.column(analyzer.instance)
+    condition = _and(compiler.mask(analyzer.where), f"{column} IS NOT NULL")
+
+    def to_state(_, table: SQLTable) -> ApproxCountDistinctState:
+        # the sketch of the distinct values is the sketch of all the values,
+        # ANSI SQL (and SQLite) has no 64 bits hash to sketch them in the database
+        rows = table.execute(
+            f"SELECT DISTINCT {column} FROM {table.from_clause} WHERE {condition}"
+        )
+        values = pd.Series([r[0] for r in rows], dtype=object).infer_objects()
+        return ApproxCountDistinctState.from_values(values.to_numpy())
+
+    return SQLPlan([], to_state)
+
+
+@sql_plan.register(TopK)
+def _top_k_plan(analyzer: TopK, compiler: SQLExpressionCompiler) -> SQLPlan:
+    where = compiler.mask(analyzer.where)
+    column = compiler.column(analyzer.instance)
+    condition = _and(where, f"{column} IS NOT NULL")
+
+    def to_state(r: Sequence[Any], table: SQLTable) -> TopKState:
+        # the database counts the values, only the most frequent ones (and the
+        # first one dropped by the sketch) are fetched, the ties ordered by
+        # value so that the same values are kept whatever the database
+        rows = table.execute(
+            f"SELECT {column}, COUNT(*) FROM {table.from_clause} WHERE {condition} "
+            f"GROUP BY {column} ORDER BY 2 DESC, 1 LIMIT {analyzer.capacity + 1}"
+        )
+        counts = pd.Series(
+            [row[1] for row in rows], index=[row[0] for row in rows], dtype=np.int64
+        )
+        return TopKState.from_counts(counts, r[0] or 0, analyzer.capacity)
+
+    return SQLPlan([_count_if(where)], to_state)
+
+
+def _bin_conditions(column: str, edges: Sequence[float]) -> List[str]:
+    # the bins of hooqu.analyzers.histogram.bin_counts
+    conditions = [f"{column} < {edges[0]!r}"]
+    conditions += [
+        f"{column} >= {lo!r} AND {column} < {hi!r}"
+        for lo, hi in zip(edges[:-2], edges[1:-1])
+    ]
+    conditions += [
+        f"{column} >= {edges[-2]!r} AND {column} <= {edges[-1]!r}",
+        f"{column} > {edges[-1]!r}",
+    ]
+    return conditions
+
+
+@sql_plan.register(Histogram)
+def _histogram_plan(analyzer: Histogram, compiler: SQLExpressionCompiler) -> SQLPlan:
+    where = compiler.mask(analyzer.where)
+    column = compiler.column(analyzer.instance)
+    aggregates = [_count_if(where), _count_if(_and(where, f"{column} IS NULL"))]
+
+    if analyzer.edges is not None:
+        # the bins are counted by the shared query
+        bins = [
+            _count_if(_and(where, condition))
+            for condition in _bin_conditions(column, analyzer.edges)
+        ]
+
+        def to_binned_state(r: Sequence[Any], _) -> HistogramState:
+            counts = pd.Series(
+                [c or 0 for c in r[2:]], index=bin_labels(analyzer.edges)
+            )
+            return HistogramState.with_nulls(counts, r[1] or 0, r[0] or 0)
+
+        return SQLPlan(aggregates + bins, to_binned_state)
+
+    condition = _and(where, f"{column} IS NOT NULL")
+
+    def to_state(r: Sequence[Any], table: SQLTable) -> HistogramState:
+        rows = table.execute(
+            f"SELECT {column}, COUNT(*) FROM {table.from_clause} "
+            f"WHERE {condition} GROUP BY {column}"
+        )
+        counts = pd.Series(
+            [row[1] for row in rows], index=[row[0] for row in rows], dtype=np.int64
+        )
+        return HistogramState.with_nulls(counts, r[1] or 0, r[0] or 0)
+
+    return SQLPlan(aggregates, to_state)
+
+
+@sql_plan.register(DataType)
+def _data_type_plan(analyzer: DataType, compiler: SQLExpressionCompiler) -> SQLPlan:
+    where = compiler.mask(analyzer.where)
+    column = compiler.column(analyzer.instance)
+    condition = _and(where, f"{column} IS NOT NULL")
+
+    def to_state(r: Sequence[Any], table: SQLTable) -> DataTypeHistogram:
+        # only the distinct values are fetched (and classified)
+        rows = table.execute(
+            f"SELECT {column}, COUNT(*) FROM {table.from_clause} "
+            f"WHERE {condition} GROUP BY {column}"
+        )
+        return DataTypeHistogram.from_distinct_values(
+            pd.Series([row[0] for row in rows], dtype=object),
+            np.array([row[1] for row in rows], dtype=np.int64),
+            r[0] or 0,
+        )
+
+    return SQLPlan([_count_if(_and(where, f"{column} IS NULL"))], to_state)
+
+
+def _grouping(
+    analyzer: FrequencyBasedAnalyzer, compiler: SQLExpressionCompiler
+) -> Tuple[str, str]:
+    # the condition of the rows counted and the GROUP BY columns
+    columns = [compiler.column(c) for c in analyzer.grouping_columns]
+    at_least_one_not_null = "({})".format(
+        " OR ".join(f"{c} IS NOT NULL" for c in columns)
+    )
+    condition = _and(compiler.mask(analyzer.where), at_least_one_not_null)
+    return condition, ", ".join(columns)  # type: ignore[return-value]
+
+
+@sql_plan.register(FrequencyBasedAnalyzer)
+def _frequencies_plan(
+    analyzer: FrequencyBasedAnalyzer, compiler: SQLExpressionCompiler
+) -> SQLPlan:
+    condition, group_by = _grouping(analyzer, compiler)
+
+    def to_state(_, table: SQLTable) -> FrequenciesAndNumRows:
+        # the number of groups having each count, as when the groups are
+        # counted out of core
+        rows = table.execute(
+            "SELECT group_count, COUNT(*) FROM ("
+            f"SELECT COUNT(*) AS group_count FROM {table.from_clause} "
+            f"WHERE {condition} GROUP BY {group_by}"
+            ") AS group_counts GROUP BY group_count"
+        )
+        counts = np.array([row[0] for row in rows], dtype=np.int64)
+        groups = np.array([row[1] for row in rows], dtype=np.int64)
+        frequencies = pd.DataFrame({COUNT_COL: counts, GROUPS_COL: groups})
+        return FrequenciesAndNumRows(frequencies, int(counts @ groups))
+
+    return SQLPlan([], to_state)
+
+
+@sql_plan.register(MutualInformation)
+def _mutual_information_plan(
+    analyzer: MutualInformation, compiler: SQLExpressionCompiler
+) -> SQLPlan:
+    condition, group_by = _grouping(analyzer, compiler)
+
+    def to_state(_, table: SQLTable) -> FrequenciesAndNumRows:
+        # the metric needs the values of the groups
+        rows = table.execute(
+            f"SELECT {group_by}, COUNT(*) FROM {table.from_clause} "
+            f"WHERE {condition} GROUP BY {group_by}"
+        )
+        frequencies = pd.DataFrame(
+            rows, columns=list(analyzer.grouping_columns) + [COUNT_COL]
+        )
+        return FrequenciesAndNumRows(frequencies, int(frequencies[COUNT_COL].sum()))
+
+    return SQLPlan([], to_state)
+
+
+def _select(table: SQLTable, plans: Mapping[Analyzer, SQLPlan]) -> Sequence[Any]:
+    aggregates = [agg for plan in plans.values() for agg in plan.aggregates]
+    if not aggregates:
+        return []
+    return table.execute(
+        "SELECT {} FROM {}".format(", ".join(aggregates), table.from_clause)
+    )[0]
+
+
+def _to_states(
+    table: SQLTable, plans: Mapping[Analyzer, SQLPlan], values: Sequence[Any]
+) -> Dict[Analyzer, Try_]:
+    results: Dict[Analyzer, Try_] = {}
+    offset = 0
+    for an, plan in plans.items():
+        size = len(plan.aggregates)
+        results[an] = Try(plan.to_state, values[offset:offset + size], table)
+        offset += size
+    return results
+
+
+class SQLBackend(Backend):
+
+    name = "sql"
+
+    def column_names(self, data: SQLTable) -> Sequence[str]:
+        return list(data.column_types)
+
+    def dtype(self, data: SQLTable, column: str) -> str:
+        return data.column_types[column]
+
+    def is_numeric(self, data: SQLTable, column: str) -> bool:
+        dtype = self.dtype(data, column).upper()
+        return not any(t in dtype for t in _STRING_TYPES) and any(
+            t in dtype for t in _NUMERIC_TYPES
+        )
+
+    def is_string(self, data: SQLTable, column: str) -> bool:
+        dtype = self.dtype(data, column).upper()
+        return any(t in dtype for t in _STRING_TYPES)
+
+    def compute_state(self, analyzer: Analyzer, data: SQLTable) -> Optional[State]:
+        return self.compute_states(data, [analyzer])[analyzer].get()
+
+    def compute_states(
+        self, data: SQLTable, analyzers: Sequence[Analyzer]
+    ) -> Mapping[Analyzer, Try_]:
+        compiler = SQLExpressionCompiler(data)
+
+        results: Dict[Analyzer, Try_] = {}
+        plans: Dict[Analyzer, SQLPlan] = {}
+        for an in dict.fromkeys(analyzers):
+            plan = Try(sql_plan, an, compiler)
+            if plan.isSuccess:
+                plans[an] = plan.get()
+            else:
+                results[an] = plan
+
+        if not plans:
+            return results
+
+        try:
+            # all the aggregations in a single query
+            results.update(_to_states(data, plans, _select(data, plans)))
+        except Exception:
+            # the query failed (e.g. a type error raised by the database),
+            # run each analyzer on its own to find out which one is failing
+            for an, plan in plans.items():
+                results[an] = Try(_select, data, {an: plan}).flatMap(
+                    lambda values, an=an, plan=plan: _to_states(
+                        data, {an: plan}, values
+                    )[an]
+                )
+
+        return results
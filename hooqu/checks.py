@@ -6,6 +6,7 @@ from typing import (
     Any,
     Callable,
     List,
+    Mapping,
     Optional,
     Pattern,
     Sequence,
@@ -17,26 +18,39 @@ from typing import (
 
 import hooqu.patterns as patterns
 import numpy as np
-from hooqu.analyzers import Analyzer
+from hooqu.analyzers import Analyzer, HistogramState
 from hooqu.analyzers.runners import AnalyzerContext
+from hooqu.assertions import equals
 from hooqu.constraints import (
     AnalysisBasedConstraint,
+    ConstrainableDataTypes,
     Constraint,
     ConstraintDecorator,
     ConstraintResult,
+    approx_count_distinct_constraint,
     completeness_constraint,
     compliance_constraint,
+    correlation_constraint,
+    count_distinct_constraint,
+    data_type_constraint,
+    distinctness_constraint,
+    drift_constraint,
+    entropy_constraint,
+    histogram_constraint,
     max_constraint,
     mean_constraint,
     min_constraint,
+    mutual_information_constraint,
     pattern_match_constraint,
     quantile_constraint,
     size_constraint,
     standard_deviation_constraint,
     sum_constraint,
+    top_k_constraint,
     uniqueness_constraint,
 )
 from hooqu.constraints.constraint import ConstraintStatus
+from hooqu.metrics import Distribution
 
 
 class CheckLevel(Enum):
@@ -57,8 +71,8 @@ class CheckResult:
     constraint_results: Sequence[ConstraintResult] = field(default_factory=tuple)
 
 
-def is_one(value: Union[float, int]) -> bool:
-    return value == 1
+# the default assertion of the constraints on the fraction of the rows
+is_one = equals(1)
 
 
 @dataclass(frozen=True, eq=True)
@@ -282,6 +296,36 @@ class Check:
             )
         )
 
+    def has_correlation(
+        self,
+        first: str,
+        second: str,
+        assertion: Callable[[float], bool],
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the Pearson correlation of two
+        columns.
+
+        Parameters
+        ----------
+
+        first:
+                First column to run the assertion on.
+        second:
+                Second column to run the assertion on.
+        assertion:
+                A callable that receives a float and returns a boolean
+        hint:
+                A hint to provide additional context why a constraint could have failed
+
+        """
+        return self._add_filterable_constraint(
+            lambda filter_: correlation_constraint(
+                first, second, assertion, filter_, hint
+            )
+        )
+
     def has_sum(
         self,
         column: str,
@@ -568,6 +612,284 @@ class Check:
             )
         )
 
+    def has_distinctness(
+        self,
+        columns: Union[Sequence[str], str],
+        assertion: Callable[[float], bool],
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the distinctness in a single or
+        combined set of key columns.
+
+        Parameters
+        ----------
+        columns:
+            Column or columns to run the assertion on
+        assertion:
+            Callable that receives a double input parameter and returns a boolean.
+            The input is the fraction of distinct values in columns.
+        hint:
+            A hint to provide additional context why a constraint could have failed
+        """
+
+        if isinstance(columns, str):
+            columns = [columns]
+
+        return self._add_filterable_constraint(
+            lambda filter_: distinctness_constraint(
+                columns, assertion, filter_, hint=hint
+            )
+        )
+
+    def has_number_of_distinct_values(
+        self,
+        columns: Union[Sequence[str], str],
+        assertion: Callable[[float], bool],
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the exact number of distinct values
+        in a single or combined set of columns.
+
+        Parameters
+        ----------
+        columns:
+            Column or columns to run the assertion on
+        assertion:
+            Callable that receives the number of distinct values and returns a
+            boolean.
+        hint:
+            A hint to provide additional context why a constraint could have failed
+        """
+
+        if isinstance(columns, str):
+            columns = [columns]
+
+        return self._add_filterable_constraint(
+            lambda filter_: count_distinct_constraint(
+                columns, assertion, filter_, hint=hint
+            )
+        )
+
+    def has_entropy(
+        self,
+        column: str,
+        assertion: Callable[[float], bool],
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the entropy of the column.
+
+        Parameters
+        ----------
+        column:
+            Column to run the assertion on
+        assertion:
+            Callable that receives a double input parameter and returns a boolean.
+        hint:
+            A hint to provide additional context why a constraint could have failed
+        """
+
+        return self._add_filterable_constraint(
+            lambda filter_: entropy_constraint(column, assertion, filter_, hint=hint)
+        )
+
+    def has_mutual_information(
+        self,
+        first: str,
+        second: str,
+        assertion: Callable[[float], bool],
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the mutual information of two
+        columns.
+
+        Parameters
+        ----------
+        first:
+            First column to run the assertion on
+        second:
+            Second column to run the assertion on
+        assertion:
+            Callable that receives a double input parameter and returns a boolean.
+        hint:
+            A hint to provide additional context why a constraint could have failed
+        """
+
+        return self._add_filterable_constraint(
+            lambda filter_: mutual_information_constraint(
+                [first, second], assertion, filter_, hint=hint
+            )
+        )
+
+    def has_approx_count_distinct(
+        self,
+        column: str,
+        assertion: Callable[[float], bool],
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the approximate number of distinct
+        values of the column, estimated with a HyperLogLog sketch instead of
+        counting the occurrences of each value.
+
+        Parameters
+        ----------
+
+        column:
+                Column to run the assertion on.
+        assertion:
+                A callable that receives a float and returns a boolean
+        hint:
+                A hint to provide additional context why a constraint could have failed
+
+        """
+        return self._add_filterable_constraint(
+            lambda filter_: approx_count_distinct_constraint(
+                column, assertion, filter_, hint
+            )
+        )
+
+    def has_top_k(
+        self,
+        column: str,
+        k: int,
+        assertion: Callable[[Mapping[Any, float]], bool],
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the k most frequent values of the
+        column, e.g. that no value is in more than 5% of the rows
+        (``lambda top: max(top.values(), default=0) <= 0.05``) or that a
+        placeholder is rare (``lambda top: top.get("unknown", 0) < 0.01``).
+
+        The values are counted with a bounded memory sketch, the fractions may
+        be underestimated by at most 0.1% (see ``TopK``).
+
+        Parameters
+        ----------
+
+        column:
+                Column to run the assertion on.
+        k:
+                Number of most frequent values passed to the assertion.
+        assertion:
+                A callable that receives a mapping of the values to their fraction
+                of the rows and returns a boolean
+        hint:
+                A hint to provide additional context why a constraint could have failed
+
+        """
+        return self._add_filterable_constraint(
+            lambda filter_: top_k_constraint(column, k, assertion, filter_, hint)
+        )
+
+    def has_histogram_values(
+        self,
+        column: str,
+        assertion: Callable[[Distribution], bool],
+        bins: Union[int, Sequence[float], None] = None,
+        range: Optional[Tuple[float, float]] = None,
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the distribution of the values of
+        the column, e.g. ``lambda d: d["NullValue"].ratio < 0.1``.
+
+        Parameters
+        ----------
+
+        column:
+                Column to run the assertion on.
+        assertion:
+                A callable that receives a ``Distribution`` and returns a boolean
+        bins:
+                Edges (or number) of numeric bins, by default each value is a bin
+        range:
+                The lowest and highest edges when ``bins`` is a number
+        hint:
+                A hint to provide additional context why a constraint could have failed
+
+        """
+        return self._add_filterable_constraint(
+            lambda filter_: histogram_constraint(
+                column, assertion, bins, range, filter_, hint
+            )
+        )
+
+    def has_drift(
+        self,
+        column: str,
+        reference: HistogramState,
+        assertion: Callable[[float], bool],
+        distance: str = "psi",
+        bins: Union[int, Sequence[float], None] = None,
+        range: Optional[Tuple[float, float]] = None,
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the distance of the distribution of
+        the column to a reference distribution, e.g. ``lambda psi: psi < 0.2``.
+
+        Parameters
+        ----------
+
+        column:
+                Column to run the assertion on.
+        reference:
+                Histogram state of the reference, e.g. persisted by a previous run
+        assertion:
+                A callable that receives the distance and returns a boolean
+        distance:
+                ``"psi"``, ``"linf"`` or ``"ks"`` (numeric bins only)
+        bins:
+                Edges (or number) of numeric bins, the bins of the reference
+        range:
+                The lowest and highest edges when ``bins`` is a number
+        hint:
+                A hint to provide additional context why a constraint could have failed
+
+        """
+        return self._add_filterable_constraint(
+            lambda filter_: drift_constraint(
+                column, reference, assertion, distance, bins, range, filter_, hint
+            )
+        )
+
+    def has_data_type(
+        self,
+        column: str,
+        data_type: ConstrainableDataTypes,
+        assertion: Callable[[float], bool] = is_one,
+        hint: Optional[str] = None,
+    ) -> "CheckWithLastConstraintFilterable":
+        """
+        Creates a constraint that asserts on the ratio of the values of the column
+        that have the given type, e.g. ``lambda r: r >= 0.999`` with
+        ``ConstrainableDataTypes.NUMERIC`` for a column that should be numeric.
+        The ratio is over the non missing values (except for ``NULL``).
+
+        Parameters
+        ----------
+
+        column:
+                Column to run the assertion on.
+        data_type:
+                The ``ConstrainableDataTypes`` of the values
+        assertion:
+                A callable that receives the ratio and returns a boolean
+        hint:
+                A hint to provide additional context why a constraint could have failed
+
+        """
+        return self._add_filterable_constraint(
+            lambda filter_: data_type_constraint(
+                column, data_type, assertion, filter_, hint
+            )
+        )
+
     def has_pattern(
         self,
         column: str,
@@ -738,6 +1060,11 @@ class CheckWithLastConstraintFilterable(Check):
         adjusted_constraints = self.constraints[:-1] + (self.create_replacement(query),)
         return Check(self.level, self.description, adjusted_constraints)
 
+    def __reduce__(self):
+        # the replacement is a lambda, so the check is pickled as a plain Check
+        # (whose last constraint can no longer be filtered)
+        return Check, (self.level, self.description, self.constraints)
+
     @classmethod
     def apply(
         cls,
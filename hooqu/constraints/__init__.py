@@ -6,16 +6,27 @@ from hooqu.constraints.constraint import (
     ConstraintStatus,
 )
 from hooqu.constraints.constraints import (
+    ConstrainableDataTypes,
+    approx_count_distinct_constraint,
     completeness_constraint,
     compliance_constraint,
+    correlation_constraint,
+    count_distinct_constraint,
+    data_type_constraint,
+    distinctness_constraint,
+    drift_constraint,
+    entropy_constraint,
+    histogram_constraint,
     max_constraint,
     mean_constraint,
     min_constraint,
+    mutual_information_constraint,
     pattern_match_constraint,
     quantile_constraint,
     size_constraint,
     standard_deviation_constraint,
     sum_constraint,
+    top_k_constraint,
     uniqueness_constraint,
 )
 
@@ -27,9 +38,20 @@ __all__ = [
     "min_constraint",
     "size_constraint",
     "standard_deviation_constraint",
+    "correlation_constraint",
     "sum_constraint",
     "quantile_constraint",
     "uniqueness_constraint",
+    "distinctness_constraint",
+    "count_distinct_constraint",
+    "entropy_constraint",
+    "mutual_information_constraint",
+    "approx_count_distinct_constraint",
+    "top_k_constraint",
+    "histogram_constraint",
+    "drift_constraint",
+    "data_type_constraint",
+    "ConstrainableDataTypes",
     "compliance_constraint",
     "AnalysisBasedConstraint",
     "Constraint",
@@ -1,4 +1,4 @@
-from typing import Callable, Generic, Mapping, Optional, TypeVar
+from typing import Callable, Generic, Mapping, Optional, Tuple, TypeVar
 
 from tryingsnake import Success
 
@@ -29,7 +29,6 @@ class AnalysisBasedConstraint(Constraint, Generic[S, M, V]):
     metric picker runs the assertion.
     """
 
-    # TODO: Check if implementing value pickler makes sense
     def __init__(
         self,
         analyzer: Analyzer[S, Metric[M]],
@@ -44,7 +43,7 @@ class AnalysisBasedConstraint(Constraint, Generic[S, M, V]):
         analyzer:
             Analyzer to be run on the data frame
         assertion:   Assertion callable
-        value_picker: (NOT IMPLEMENTED)
+        value_picker:
             Optional function to pick the interested part of the
             metric value that the assertion will be running on.
             Absence of such function means the metric value would be
@@ -54,8 +53,23 @@ class AnalysisBasedConstraint(Constraint, Generic[S, M, V]):
         """
         self.analyzer = analyzer
         self._assertion = assertion  # type: ignore
+        self._value_picker = value_picker
         self._hint = hint
 
+    def bounds(self) -> Optional[Tuple[float, float]]:
+        """
+        The (closed) interval the metric has to be in for the assertion to hold,
+        when the assertion declares it with a ``bounds`` attribute (see
+        ``hooqu.assertions``). The runners can then decide the constraint
+        before the whole data is analyzed.
+
+        None with a ``value_picker`` (e.g. ``has_data_type``): the bounds are
+        then those of the picked value, not of the metric.
+        """
+        if self._value_picker is not None:
+            return None
+        return getattr(self._assertion, "bounds", None)
+
     def calculate_and_evaluate(self, data):
         metric = self.analyzer.calculate(data)
         return self.evaluate({self.analyzer: metric})
@@ -75,8 +89,7 @@ class AnalysisBasedConstraint(Constraint, Generic[S, M, V]):
         hint = self._hint or ""
         if isinstance(metric_value, Success):
             try:
-                # TODO: run_picker_on_metric, not sure if needed
-                assert_on = metric_value.get()
+                assert_on = self._run_picker(metric_value.get())
                 # run assertion
                 assertion_ok = self._run_assertion(assert_on)
                 if assertion_ok:
@@ -100,6 +113,14 @@ class AnalysisBasedConstraint(Constraint, Generic[S, M, V]):
             e = metric_value.failed().get()
             return ConstraintResult(self, ConstraintStatus.FAILURE, str(e), metric)
 
+    def _run_picker(self, value):
+        if self._value_picker is None:
+            return value
+        try:
+            return self._value_picker(value)
+        except Exception as e:
+            raise ConstraintAssertionException(e) from e
+
     def _run_assertion(self, assert_on):
         try:
             assertion_result = self._assertion(assert_on)  # type: ignore
@@ -1,15 +1,31 @@
-from typing import Callable, Optional, Pattern, Sequence, Union
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Mapping, Optional, Pattern, Sequence, Tuple, Union
 
 from hooqu.analyzers import (
+    ApproxCountDistinct,
+    ApproxCountDistinctState,
     Completeness,
     Compliance,
+    Correlation,
+    CorrelationState,
+    CountDistinct,
+    DataType,
+    DataTypeHistogram,
+    DataTypeInstance,
+    Distinctness,
+    Drift,
+    Entropy,
     FrequenciesAndNumRows,
+    Histogram,
+    HistogramState,
     Maximum,
     MaxState,
     Mean,
     MeanState,
     Minimum,
     MinState,
+    MutualInformation,
     NumMatches,
     NumMatchesAndCount,
     PatternMatch,
@@ -20,10 +36,13 @@ from hooqu.analyzers import (
     StandardDeviationState,
     Sum,
     SumState,
+    TopK,
+    TopKState,
     Uniqueness,
 )
 from hooqu.constraints.analysis_based_constraint import AnalysisBasedConstraint
 from hooqu.constraints.constraint import Constraint, NamedConstraint
+from hooqu.metrics import Distribution
 
 # A lot of mypy ignores because mypy is not able to understand that the
 # Analyzers are specialization of Analyzer[K, S, V]
@@ -136,6 +155,22 @@ def standard_deviation_constraint(
     return NamedConstraint(constraint, f"StandardDeviationConstraint({std})")
 
 
+def correlation_constraint(
+    first: str,
+    second: str,
+    assertion: Callable[[float], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+
+    correlation = Correlation(first, second, where)
+    constraint = AnalysisBasedConstraint[CorrelationState, float, float](
+        correlation, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(constraint, f"CorrelationConstraint({correlation})")
+
+
 def quantile_constraint(
     column: str,
     quantile: float,
@@ -229,6 +264,349 @@ def uniqueness_constraint(
     return NamedConstraint(constraint, f"UniquenessConstraint({uniqueness})")
 
 
+def distinctness_constraint(
+    columns: Sequence[str],
+    assertion: Callable[[float], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs Distinctness analysis on the given columns and executes the assertion.
+
+    Parameters:
+    ----------
+
+    columns:
+        Columns to run the assertion on.
+    assertion:
+        Callable that receives a float input parameter and returns a boolean
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+
+    """
+
+    distinctness = Distinctness(columns, where)
+    constraint = AnalysisBasedConstraint[FrequenciesAndNumRows, float, float](
+        distinctness, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(constraint, f"DistinctnessConstraint({distinctness})")
+
+
+def count_distinct_constraint(
+    columns: Sequence[str],
+    assertion: Callable[[float], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs CountDistinct analysis on the given columns and executes the assertion.
+
+    Parameters:
+    ----------
+
+    columns:
+        Columns to run the assertion on.
+    assertion:
+        Callable that receives a float input parameter and returns a boolean
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+
+    """
+
+    count_distinct = CountDistinct(columns, where)
+    constraint = AnalysisBasedConstraint[FrequenciesAndNumRows, float, float](
+        count_distinct, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(constraint, f"CountDistinctConstraint({count_distinct})")
+
+
+def entropy_constraint(
+    column: str,
+    assertion: Callable[[float], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs Entropy analysis on the given column and executes the assertion.
+
+    Parameters:
+    ----------
+
+    column:
+        Column to run the assertion on.
+    assertion:
+        Callable that receives a float input parameter and returns a boolean
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+
+    """
+
+    entropy = Entropy(column, where)
+    constraint = AnalysisBasedConstraint[FrequenciesAndNumRows, float, float](
+        entropy, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(constraint, f"EntropyConstraint({entropy})")
+
+
+def mutual_information_constraint(
+    columns: Sequence[str],
+    assertion: Callable[[float], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs MutualInformation analysis on the given pair of columns and executes the
+    assertion.
+
+    Parameters:
+    ----------
+
+    columns:
+        The two columns to run the assertion on.
+    assertion:
+        Callable that receives a float input parameter and returns a boolean
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+
+    """
+
+    mutual_information = MutualInformation(columns, where)
+    constraint = AnalysisBasedConstraint[FrequenciesAndNumRows, float, float](
+        mutual_information, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(
+        constraint, f"MutualInformationConstraint({mutual_information})"
+    )
+
+
+def approx_count_distinct_constraint(
+    column: str,
+    assertion: Callable[[float], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs an approximate count distinct analysis on the given column and executes
+    the assertion.
+
+    Parameters
+    ----------
+
+    column:
+        Column to run the assertion on.
+    assertion:
+        Callable that receives a float input parameter (the approximate number
+        of distinct values) and returns a boolean
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+    """
+
+    approx_count_distinct = ApproxCountDistinct(column, where)
+    constraint = AnalysisBasedConstraint[ApproxCountDistinctState, float, float](
+        approx_count_distinct, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(
+        constraint, f"ApproxCountDistinctConstraint({approx_count_distinct})"
+    )
+
+
+def top_k_constraint(
+    column: str,
+    k: int,
+    assertion: Callable[[Mapping[Any, float]], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs a top-k analysis on the given column and executes the assertion on the
+    k most frequent values.
+
+    Parameters
+    ----------
+
+    column:
+        Column to run the assertion on.
+    k:
+        Number of most frequent values passed to the assertion.
+    assertion:
+        Callable that receives a mapping of the k most frequent values to their
+        fraction of the rows and returns a boolean
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+    """
+
+    top_k = TopK(column, k, where)
+    constraint = AnalysisBasedConstraint[TopKState, Mapping[Any, float], Any](
+        top_k, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(constraint, f"TopKConstraint({top_k})")
+
+
+def histogram_constraint(
+    column: str,
+    assertion: Callable[[Distribution], bool],
+    bins: Union[int, Sequence[float], None] = None,
+    range: Optional[Tuple[float, float]] = None,
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs a histogram analysis on the given column and executes the assertion on
+    the distribution of its values.
+
+    Parameters
+    ----------
+
+    column:
+        Column to run the assertion on.
+    assertion:
+        Callable that receives a ``Distribution`` and returns a boolean
+    bins, range:
+        Numeric bins of the histogram, see ``Histogram``.
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+    """
+
+    histogram = Histogram(column, bins, range, where=where)
+    constraint = AnalysisBasedConstraint[HistogramState, Distribution, Distribution](
+        histogram, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(constraint, f"HistogramConstraint({histogram})")
+
+
+def drift_constraint(
+    column: str,
+    reference: HistogramState,
+    assertion: Callable[[float], bool],
+    distance: str = "psi",
+    bins: Union[int, Sequence[float], None] = None,
+    range: Optional[Tuple[float, float]] = None,
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs a drift analysis on the given column and executes the assertion on the
+    distance of its distribution to the reference.
+
+    Parameters
+    ----------
+
+    column:
+        Column to run the assertion on.
+    reference:
+        Histogram state of the reference distribution, see ``Drift``.
+    assertion:
+        Callable that receives a float input parameter and returns a boolean
+    distance:
+        ``"psi"``, ``"linf"`` or ``"ks"``, see ``Drift``.
+    bins, range:
+        Numeric bins of the histograms, see ``Histogram``.
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+    """
+
+    drift = Drift(column, reference, distance, bins, range, where=where)
+    constraint = AnalysisBasedConstraint[HistogramState, float, float](
+        drift, assertion, hint=hint  # type: ignore[arg-type]
+    )
+
+    return NamedConstraint(constraint, f"DriftConstraint({drift})")
+
+
+class ConstrainableDataTypes(Enum):
+    """The data types a column can be asserted to have, see ``data_type_constraint``"""
+
+    NULL = "Null"
+    FRACTIONAL = "Fractional"
+    INTEGRAL = "Integral"
+    BOOLEAN = "Boolean"
+    STRING = "String"
+    NUMERIC = "Numeric"
+
+
+def _data_type_ratio(data_type: ConstrainableDataTypes, distribution: Distribution):
+    # the ratio of the missing values is over all the values, the ratio of the
+    # other types is over the non missing values
+    def absolute(instance: DataTypeInstance) -> int:
+        return distribution[instance.value].absolute
+
+    if data_type == ConstrainableDataTypes.NULL:
+        return distribution[DataTypeInstance.UNKNOWN.value].ratio
+    if data_type == ConstrainableDataTypes.NUMERIC:
+        count = absolute(DataTypeInstance.FRACTIONAL) + absolute(
+            DataTypeInstance.INTEGRAL
+        )
+    else:
+        count = absolute(DataTypeInstance(data_type.value))
+    if count == 0:
+        return 0.0
+    total = sum(v.absolute for v in distribution.values.values())
+    return count / (total - absolute(DataTypeInstance.UNKNOWN))
+
+
+def data_type_constraint(
+    column: str,
+    data_type: ConstrainableDataTypes,
+    assertion: Callable[[float], bool],
+    where: Optional[str] = None,
+    hint: Optional[str] = None,
+) -> Constraint:
+    """
+    Runs a data type analysis on the given column and executes the assertion on
+    the ratio of the values of the given type. The ratio of ``NULL`` values is
+    over all the rows, the ratio of the other types is over the non missing
+    values.
+
+    Parameters
+    ----------
+
+    column:
+        Column to run the assertion on.
+    data_type:
+        The ``ConstrainableDataTypes`` whose ratio is asserted.
+    assertion:
+        Callable that receives a double input parameter and returns a boolean
+    where:
+        Additional filter to apply before the analyzer is run.
+    hint:
+         A hint to provide additional context why a constraint could have failed
+    """
+
+    analyzer = DataType(column, where)
+    constraint = AnalysisBasedConstraint[DataTypeHistogram, Distribution, float](
+        analyzer,  # type: ignore[arg-type]
+        assertion,
+        # a partial, unlike a lambda, pickles with the constraint
+        value_picker=partial(_data_type_ratio, data_type),
+        hint=hint,
+    )
+
+    return NamedConstraint(constraint, f"DataTypeConstraint({analyzer})")
+
+
 def pattern_match_constraint(
     column: str,
     pattern: Union[str, Pattern],
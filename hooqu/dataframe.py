@@ -1,13 +1,15 @@
 """
 Data-Frame like functions. The idea of this module is to an extend
-serve as an interface to specific implementation of dataframes. For now the support
-is focused solely on Pandas.
+serve as an interface to specific implementation of dataframes. The generic
+functions dispatch to the backend handling the data (see ``hooqu.backends``),
+the aggregation functions are the ones used by the Pandas backend.
 """
 from functools import partial
-from typing import Callable, Pattern, Union
+from typing import Callable, Pattern, Sequence, Union
 
 import pandas as pd
-from pandas.api.types import is_numeric_dtype, is_string_dtype
+
+from hooqu.backends import backend_for
 
 from ._typing import DataFrameLike # noqa:
 
@@ -16,14 +18,17 @@ class DataFrame:
     pass
 
 
+def column_names(df) -> Sequence[str]:
+    return backend_for(df).column_names(df)
+
+
 def generic_is_numeric(column: str):
-    # TODO: eventually, depending on the type of te dataframe
-    # return the appopiate callable or one that handle both
     def f(df, column):
-        if not is_numeric_dtype(df[column]):
-            dtype = df[column].dtype
+        backend = backend_for(df)
+        if not backend.is_numeric(df, column):
+            dtype = backend.dtype(df, column)
             msg = (
-                f"Expected type of column $column to be one of numeric"
+                f"Expected type of column {column} to be one of numeric"
                 f" but found {dtype} instead!"
             )
             raise ValueError(msg)
@@ -33,10 +38,11 @@ def generic_is_numeric(column: str):
 
 def generic_is_string(column: str):
     def f(df, column):
-        if not is_string_dtype(df[column]):
-            dtype = df[column].dtype
+        backend = backend_for(df)
+        if not backend.is_string(df, column):
+            dtype = backend.dtype(df, column)
             msg = (
-                f"Expected type of column $column to be string"
+                f"Expected type of column {column} to be string"
                 f" but found {dtype} instead!"
             )
             raise ValueError(msg)
@@ -62,6 +68,8 @@ def contains_regex(regex: Union[Pattern, str]) -> Callable:
         return series.str.contains(regex).sum()
     # Hacky way to get the desired column name on the returned dataframex
     _contains_regex.__name__ = "contains_regex"
+    # exposed so that other backends can translate the aggregation
+    _contains_regex.regex = regex  # type: ignore[attr-defined]
     return _contains_regex
 
 
@@ -120,4 +128,6 @@ def quantile_aggregation(quantile: float) -> Callable[[pd.Series], float]:
         return series.quantile(quantile, interpolation="nearest")
     f = quantile_agg
     f.__name__ = "quantile_aggregation"
+    # exposed so that other backends can translate the aggregation
+    f.quantile = quantile  # type: ignore[attr-defined]
     return f
@@ -0,0 +1,376 @@
+"""
+Parsing of the expression strings used in ``where`` filters and ``Compliance``
+predicates.
+
+Hooqu expressions follow the syntax of Pandas' ``DataFrame.query`` and
+``DataFrame.eval``. For Pandas the strings are passed through untouched, but
+the other backends need to translate them into their own vocabulary (Arrow
+compute kernels, SQL, ...). This module turns an expression string into a small
+tree that an :class:`ExpressionCompiler` can walk.
+
+Supported constructs are:
+
+- Column references, either as plain names or quoted with backticks
+  (``` `my column` ```)
+- Literals (numbers, strings, booleans, ``None``) and lists of literals
+- Comparisons (``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``), including chained
+  ones, and the ``in`` / ``not in`` operators
+- Boolean operators: ``and``, ``or``, ``not``, ``&``, ``|``, ``~``
+- Arithmetic: ``+``, ``-``, ``*``, ``/``, ``%``, ``**``
+- The Series methods ``isna``, ``isnull``, ``notna``, ``notnull``, ``fillna``
+  and ``isin``.
+"""
+
+import ast
+import io
+import re
+import tokenize
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Generic, Sequence, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_BACKTICK_RE = re.compile(r"`([^`]*)`")
+_PLACEHOLDER = "__hooqu_column_{}__"
+
+
+class UnsupportedExpressionException(ValueError):
+    pass
+
+
+class Expr:
+    pass
+
+
+@dataclass(frozen=True)
+class Column(Expr):
+    name: str
+
+
+@dataclass(frozen=True)
+class Literal(Expr):
+    value: Any
+
+
+@dataclass(frozen=True)
+class Compare(Expr):
+    op: str
+    left: Expr
+    right: Expr
+
+
+@dataclass(frozen=True)
+class BoolOp(Expr):
+    op: str  # "and" or "or"
+    operands: Tuple[Expr, ...]
+
+
+@dataclass(frozen=True)
+class Not(Expr):
+    operand: Expr
+
+
+@dataclass(frozen=True)
+class Arithmetic(Expr):
+    op: str
+    left: Expr
+    right: Expr
+
+
+@dataclass(frozen=True)
+class Negate(Expr):
+    operand: Expr
+
+
+@dataclass(frozen=True)
+class IsNull(Expr):
+    operand: Expr
+
+
+@dataclass(frozen=True)
+class FillNull(Expr):
+    operand: Expr
+    value: Any
+
+
+@dataclass(frozen=True)
+class IsIn(Expr):
+    operand: Expr
+    values: Tuple[Any, ...]
+
+
+_COMPARISONS = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+}
+
+_BOOLEANS = {"&": "and", "|": "or"}
+
+_ARITHMETIC = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.Div: "/",
+    ast.Mod: "%",
+    ast.Pow: "**",
+}
+
+
+def _replace_booleans(source: str) -> str:
+    # as in DataFrame.query, & and | are the boolean operators, with their
+    # precedence: "a > 1 & b > 1" is "a > 1 and b > 1", not "a > (1 & b) > 1"
+    tokens = [
+        (tokenize.NAME, _BOOLEANS[tok.string])
+        if tok.type == tokenize.OP and tok.string in _BOOLEANS
+        else (tok.type, tok.string)
+        for tok in tokenize.generate_tokens(io.StringIO(source).readline)
+    ]
+    return tokenize.untokenize(tokens)
+
+
+class _Parser:
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.columns: Dict[str, str] = {}
+
+    def parse(self) -> Expr:
+        def replace(match):
+            placeholder = _PLACEHOLDER.format(len(self.columns))
+            self.columns[placeholder] = match.group(1)
+            return placeholder
+
+        source = _BACKTICK_RE.sub(replace, self.expression.strip())
+        try:
+            tree = ast.parse(_replace_booleans(source), mode="eval")
+        except (SyntaxError, tokenize.TokenError) as ex:
+            raise UnsupportedExpressionException(
+                f"Unable to parse expression '{self.expression}': {ex.args[0]}"
+            ) from ex
+
+        return self.visit(tree.body)
+
+    def unsupported(self, node: ast.AST) -> UnsupportedExpressionException:
+        return UnsupportedExpressionException(
+            f"Unsupported construct {type(node).__name__} "
+            f"in expression '{self.expression}'"
+        )
+
+    def visit(self, node: ast.AST) -> Expr:
+        if isinstance(node, ast.Name):
+            return Column(self.columns.get(node.id, node.id))
+
+        try:
+            return Literal(ast.literal_eval(node))
+        except (ValueError, TypeError):
+            pass
+
+        if isinstance(node, ast.BoolOp):
+            op = "and" if isinstance(node.op, ast.And) else "or"
+            return BoolOp(op, tuple(self.visit(v) for v in node.values))
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.visit(node.operand)
+            if isinstance(node.op, (ast.Not, ast.Invert)):
+                return Not(operand)
+            if isinstance(node.op, ast.USub):
+                return Negate(operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            raise self.unsupported(node.op)
+
+        if isinstance(node, ast.BinOp):
+            if type(node.op) not in _ARITHMETIC:
+                raise self.unsupported(node.op)
+            return Arithmetic(
+                _ARITHMETIC[type(node.op)],
+                self.visit(node.left),
+                self.visit(node.right),
+            )
+
+        if isinstance(node, ast.Compare):
+            return self.visit_compare(node)
+
+        if isinstance(node, ast.Call):
+            return self.visit_call(node)
+
+        raise self.unsupported(node)
+
+    def visit_compare(self, node: ast.Compare) -> Expr:
+        comparisons = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            comparisons.append(self.comparison(op, left, right))
+            left = right
+
+        if len(comparisons) == 1:
+            return comparisons[0]
+        return BoolOp("and", tuple(comparisons))
+
+    def comparison(self, op: ast.cmpop, left: ast.AST, right: ast.AST) -> Expr:
+        if isinstance(op, (ast.In, ast.NotIn)):
+            expr: Expr = IsIn(self.visit(left), self.literal_list(right))
+            return Not(expr) if isinstance(op, ast.NotIn) else expr
+
+        if type(op) not in _COMPARISONS:
+            raise self.unsupported(op)
+
+        # like Pandas, comparing against a list means membership
+        if isinstance(right, (ast.List, ast.Tuple)) and type(op) in (ast.Eq, ast.NotEq):
+            expr = IsIn(self.visit(left), self.literal_list(right))
+            return Not(expr) if isinstance(op, ast.NotEq) else expr
+
+        return Compare(_COMPARISONS[type(op)], self.visit(left), self.visit(right))
+
+    def visit_call(self, node: ast.Call) -> Expr:
+        func = node.func
+        if not isinstance(func, ast.Attribute) or node.keywords:
+            raise self.unsupported(node)
+
+        target = self.visit(func.value)
+        method = func.attr
+        args = node.args
+
+        if method in ("isna", "isnull") and not args:
+            return IsNull(target)
+        if method in ("notna", "notnull") and not args:
+            return Not(IsNull(target))
+        if method == "fillna" and len(args) == 1:
+            return FillNull(target, self.literal(args[0]))
+        if method == "isin" and len(args) == 1:
+            return IsIn(target, self.literal_list(args[0]))
+
+        raise UnsupportedExpressionException(
+            f"Unsupported method '{method}' in expression '{self.expression}'"
+        )
+
+    def literal(self, node: ast.AST) -> Any:
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError) as ex:
+            raise self.unsupported(node) from ex
+
+    def literal_list(self, node: ast.AST) -> Tuple[Any, ...]:
+        value = self.literal(node)
+        if not isinstance(value, (list, tuple, set)):
+            raise self.unsupported(node)
+        return tuple(value)
+
+
+@lru_cache(maxsize=256)
+def parse_expression(expression: str) -> Expr:
+    """
+    Parses a Pandas-like query string into an expression tree.
+
+    Raises
+    ------
+    UnsupportedExpressionException:
+        If the expression uses a construct that can not be translated.
+    """
+    return _Parser(expression).parse()
+
+
+def referenced_columns(expression: str) -> Set[str]:
+    """Returns the names of the columns referenced by the expression"""
+
+    def collect(node: Expr) -> Set[str]:
+        if isinstance(node, Column):
+            return {node.name}
+        if isinstance(node, (Compare, Arithmetic)):
+            return collect(node.left) | collect(node.right)
+        if isinstance(node, BoolOp):
+            return set().union(*(collect(o) for o in node.operands))
+        if isinstance(node, (Not, Negate, IsNull, FillNull, IsIn)):
+            return collect(node.operand)
+        return set()
+
+    return collect(parse_expression(expression))
+
+
+class ExpressionCompiler(ABC, Generic[T]):
+    """
+    Translates an expression tree into a backend specific representation
+    (e.g. an Arrow array, a SQL snippet, ...).
+
+    Comparisons involving nulls must evaluate to false as they do in Pandas,
+    except ``!=`` which evaluates to true.
+    """
+
+    def compile(self, expression: str) -> T:
+        return self.visit(parse_expression(expression))
+
+    def visit(self, node: Expr) -> T:
+        if isinstance(node, Column):
+            return self.column(node.name)
+        if isinstance(node, Literal):
+            return self.literal(node.value)
+        if isinstance(node, Compare):
+            return self.compare(node.op, self.visit(node.left), self.visit(node.right))
+        if isinstance(node, BoolOp):
+            operands = [self.visit(o) for o in node.operands]
+            return self.and_(operands) if node.op == "and" else self.or_(operands)
+        if isinstance(node, Not):
+            return self.not_(self.visit(node.operand))
+        if isinstance(node, Arithmetic):
+            return self.arithmetic(
+                node.op, self.visit(node.left), self.visit(node.right)
+            )
+        if isinstance(node, Negate):
+            return self.negate(self.visit(node.operand))
+        if isinstance(node, IsNull):
+            return self.is_null(self.visit(node.operand))
+        if isinstance(node, FillNull):
+            return self.fill_null(self.visit(node.operand), node.value)
+        if isinstance(node, IsIn):
+            return self.is_in(self.visit(node.operand), node.values)
+
+        raise UnsupportedExpressionException(f"Unknown expression node {node}")
+
+    @abstractmethod
+    def column(self, name: str) -> T:
+        pass
+
+    @abstractmethod
+    def literal(self, value: Any) -> T:
+        pass
+
+    @abstractmethod
+    def compare(self, op: str, left: T, right: T) -> T:
+        pass
+
+    @abstractmethod
+    def and_(self, operands: Sequence[T]) -> T:
+        pass
+
+    @abstractmethod
+    def or_(self, operands: Sequence[T]) -> T:
+        pass
+
+    @abstractmethod
+    def not_(self, operand: T) -> T:
+        pass
+
+    @abstractmethod
+    def arithmetic(self, op: str, left: T, right: T) -> T:
+        pass
+
+    @abstractmethod
+    def negate(self, operand: T) -> T:
+        pass
+
+    @abstractmethod
+    def is_null(self, operand: T) -> T:
+        pass
+
+    @abstractmethod
+    def fill_null(self, operand: T, value: Any) -> T:
+        pass
+
+    @abstractmethod
+    def is_in(self, operand: T, values: Sequence[Any]) -> T:
+        pass
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Generic, Mapping, Optional, Sequence, TypeVar, Union
+from typing import Any, Generic, Mapping, Optional, Sequence, TypeVar, Union
 
-from tryingsnake import Try_
+from tryingsnake import Success, Try_
 
 
 class Entity(Enum):
@@ -37,3 +37,75 @@ class Metric(Generic[T]):
 class DoubleMetric(Metric[float]):
     def flatten(self) -> Sequence[Metric[float]]:
         return (self,)
+
+
+class KeyedDoubleMetric(Metric[Mapping[Any, float]]):
+    """A metric whose value maps keys (e.g. the values of a column) to doubles"""
+
+    def flatten(self) -> Sequence[Metric[float]]:
+        if self.value.isFailure:
+            return (DoubleMetric(self.entity, self.name, self.instance, self.value),)
+        return tuple(
+            DoubleMetric(
+                self.entity, f"{self.name}-{key}", self.instance, Success(value)
+            )
+            for key, value in self.value.get().items()
+        )
+
+
+@dataclass(frozen=True)
+class DistributionValue:
+    absolute: int
+    ratio: float
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    The number of rows (``absolute``) and fraction of the rows (``ratio``) of
+    each bin, and the total number of bins (which can be more than the bins in
+    ``values``).
+    """
+
+    values: Mapping[Any, DistributionValue]
+    number_of_bins: int
+
+    def __getitem__(self, key) -> DistributionValue:
+        return self.values[key]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class HistogramMetric(Metric[Distribution]):
+    def flatten(self) -> Sequence[Metric[float]]:
+        name = f"{self.name}.bins"
+        if self.value.isFailure:
+            return (DoubleMetric(self.entity, name, self.instance, self.value),)
+        distribution = self.value.get()
+        metrics = [
+            DoubleMetric(
+                self.entity,
+                name,
+                self.instance,
+                Success(float(distribution.number_of_bins)),
+            )
+        ]
+        for key, value in distribution.values.items():
+            metrics.append(
+                DoubleMetric(
+                    self.entity,
+                    f"{self.name}.abs.{key}",
+                    self.instance,
+                    Success(float(value.absolute)),
+                )
+            )
+            metrics.append(
+                DoubleMetric(
+                    self.entity,
+                    f"{self.name}.ratio.{key}",
+                    self.instance,
+                    Success(value.ratio),
+                )
+            )
+        return tuple(metrics)
@@ -0,0 +1,69 @@
+"""
+Bounded prefetching of an iterator in a background thread.
+
+Reading and decoding data (CSV parsing, Parquet decompression, ...) and
+computing the analyzers are both mostly done by native code releasing the GIL,
+so producing the next item in a thread while the current one is analyzed keeps
+both the disk and the CPU busy. The queue between the two is bounded, so the
+producer never gets more than ``depth`` items ahead of the consumer.
+"""
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+_POLL_INTERVAL = 0.1
+
+
+def prefetch(iterable: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """
+    Iterates over ``iterable`` with the next ``depth`` items produced in a
+    background thread. Exceptions raised by the iterable are raised by the
+    returned iterator, at the position they happened. With ``depth`` 0 there is
+    no prefetching.
+
+    Closing the returned iterator (or not consuming it fully) stops the thread
+    after the item it is producing.
+    """
+    if depth <= 0:
+        yield from iterable
+        return
+
+    items: "queue.Queue" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # gives up when the consumer is gone, instead of blocking forever
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((_DONE, e))
+        else:
+            put((_DONE, None))
+
+    thread = threading.Thread(target=produce, name="hooqu-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
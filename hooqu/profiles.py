@@ -0,0 +1,217 @@
+# coding: utf-8
+"""
+Column profiles: the basic statistics of every column of the data, computed
+by a fixed set of analyzers in (at most) two runs of the analysis.
+
+The first run computes the completeness, the approximate number of distinct
+values and the distribution of the data types of every column. The second run
+computes the statistics of the numeric columns (with integral or fractional
+values) and finds the most frequent values of the columns with few distinct
+values. The backends compute all the analyzers of a run in a single scan of
+the data when they can (e.g. Arrow, Polars or SQL), so a profile takes two
+scans whatever the number of columns.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from hooqu.analyzers import (
+    Analyzer,
+    ApproxCountDistinct,
+    Completeness,
+    DataType,
+    DataTypeInstance,
+    Maximum,
+    Mean,
+    Minimum,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+)
+from hooqu.analyzers.data_type import determine_type
+from hooqu.analyzers.runners import AnalyzerContext
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.backends import backend_for
+
+# columns with more (approximate) distinct values have no top values in their
+# profile, as in Deequ
+DEFAULT_CARDINALITY_THRESHOLD = 120
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+
+@dataclass(frozen=True)
+class ColumnProfile:
+    """
+    Profile of a column. The statistics that could not be computed (e.g. on
+    empty data) are ``None``.
+
+    ``data_type`` is the type of the column (see
+    ``hooqu.analyzers.data_type.determine_type``), inferred from the text of the
+    values for the string columns (``is_data_type_inferred``). ``type_counts``
+    is the number of values of each type and ``top_values`` the fraction of the
+    rows holding the most frequent values of the columns with few distinct
+    values.
+    """
+
+    column: str
+    completeness: Optional[float]
+    approximate_num_distinct_values: Optional[int]
+    data_type: DataTypeInstance
+    is_data_type_inferred: bool
+    type_counts: Mapping[str, int] = field(default_factory=dict)
+    top_values: Optional[Mapping[Any, float]] = None
+
+
+@dataclass(frozen=True)
+class NumericColumnProfile(ColumnProfile):
+    """Profile of a numeric column, with the statistics of its values"""
+
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    mean: Optional[float] = None
+    std_dev: Optional[float] = None
+    sum: Optional[float] = None
+    quantiles: Mapping[float, Optional[float]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ColumnProfiles:
+    profiles: Mapping[str, ColumnProfile]
+    num_records: int
+
+    def __getitem__(self, column: str) -> ColumnProfile:
+        return self.profiles[column]
+
+
+def _value(context: AnalyzerContext, analyzer: Analyzer):
+    metric = context.metric(analyzer)
+    if metric is None or metric.value.isFailure:
+        return None
+    return metric.value.get()
+
+
+class ColumnProfiler:
+    @staticmethod
+    def profile(
+        data,
+        restrict_to_columns: Optional[Sequence[str]] = None,
+        low_cardinality_threshold: int = DEFAULT_CARDINALITY_THRESHOLD,
+        top_k: int = 10,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> ColumnProfiles:
+        """
+        Profiles the columns of the data.
+
+        Parameters
+        ----------
+
+        data:
+            Data handled by any of the backends
+        restrict_to_columns:
+            Columns to profile, by default all of them
+        low_cardinality_threshold:
+            Maximum (approximate) number of distinct values of the columns whose
+            most frequent values are found
+        top_k:
+            Number of most frequent values of those columns
+        quantiles:
+            Quantiles of the numeric columns
+
+        Returns
+        -------
+        The ``ColumnProfiles`` by column name
+        """
+        backend = backend_for(data)
+        columns = list(restrict_to_columns or backend.column_names(data))
+
+        size = Size()
+        generic = {
+            c: (Completeness(c), ApproxCountDistinct(c), DataType(c)) for c in columns
+        }
+        analyzers: List[Analyzer] = [size]
+        analyzers += [an for ans in generic.values() for an in ans]
+        context = do_analysis_run(data, analyzers)
+
+        num_distinct: Dict[str, Optional[int]] = {}
+        distributions = {}
+        data_types = {}
+        for c in columns:
+            value = _value(context, generic[c][1])
+            num_distinct[c] = None if value is None else int(value)
+            distributions[c] = _value(context, generic[c][2])
+            data_types[c] = (
+                DataTypeInstance.UNKNOWN
+                if distributions[c] is None
+                else determine_type(distributions[c])
+            )
+
+        # the statistics of the numeric columns (the string columns holding
+        # numbers are not converted) and the most frequent values of the
+        # columns with few distinct values are computed in a second run
+        numeric = [
+            c
+            for c in columns
+            if data_types[c] in (DataTypeInstance.INTEGRAL, DataTypeInstance.FRACTIONAL)
+            and backend.is_numeric(data, c)
+        ]
+        statistics = {
+            c: (Minimum(c), Maximum(c), Mean(c), StandardDeviation(c), Sum(c))
+            for c in numeric
+        }
+        quantile_analyzers = {c: [Quantile(c, q) for q in quantiles] for c in numeric}
+        top_k_analyzers = {
+            c: TopK(c, top_k)
+            for c in columns
+            if num_distinct[c] is not None
+            and num_distinct[c] <= low_cardinality_threshold
+        }
+
+        analyzers = list(top_k_analyzers.values())
+        analyzers += [an for ans in statistics.values() for an in ans]
+        analyzers += [an for ans in quantile_analyzers.values() for an in ans]
+        if analyzers:
+            context = context + do_analysis_run(data, analyzers)
+
+        profiles: Dict[str, ColumnProfile] = {}
+        for c in columns:
+            distribution = distributions[c]
+            arguments: Dict[str, Any] = dict(
+                column=c,
+                completeness=_value(context, generic[c][0]),
+                approximate_num_distinct_values=num_distinct[c],
+                data_type=data_types[c],
+                is_data_type_inferred=backend.is_string(data, c),
+                type_counts=(
+                    {}
+                    if distribution is None
+                    else {k: v.absolute for k, v in distribution.values.items()}
+                ),
+                top_values=(
+                    _value(context, top_k_analyzers[c])
+                    if c in top_k_analyzers
+                    else None
+                ),
+            )
+            if c not in statistics:
+                profiles[c] = ColumnProfile(**arguments)
+                continue
+
+            minimum, maximum, mean, std_dev, sum_ = (
+                _value(context, an) for an in statistics[c]
+            )
+            profiles[c] = NumericColumnProfile(
+                **arguments,
+                minimum=minimum,
+                maximum=maximum,
+                mean=mean,
+                std_dev=std_dev,
+                sum=sum_,
+                quantiles={
+                    an.quantile: _value(context, an) for an in quantile_analyzers[c]
+                },
+            )
+
+        num_records = _value(context, size)
+        return ColumnProfiles(profiles, 0 if num_records is None else int(num_records))
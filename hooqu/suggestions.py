@@ -0,0 +1,365 @@
+# coding: utf-8
+"""
+Constraint suggestions: constraints that the data satisfies, found by rules
+applied to the profiles of its columns (see ``hooqu.profiles``). The rules only
+look at the profiles, the data is not scanned again to suggest the constraints.
+
+The suggestions can be evaluated on a held-out part of the data, to drop the
+ones that only hold by chance on the profiled rows.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from hooqu.analyzers import DataTypeInstance
+from hooqu.assertions import at_least
+from hooqu.checks import Check, CheckLevel
+from hooqu.constraints import ConstrainableDataTypes, Constraint, ConstraintStatus
+from hooqu.profiles import (
+    DEFAULT_CARDINALITY_THRESHOLD,
+    ColumnProfile,
+    ColumnProfiler,
+    ColumnProfiles,
+    NumericColumnProfile,
+)
+from hooqu.verification_suite import VerificationResult, VerificationSuite
+
+# about three times the relative standard error of ApproxCountDistinct
+APPROX_DISTINCT_TOLERANCE = 0.03
+
+
+@dataclass(frozen=True)
+class ConstraintSuggestion:
+    """
+    A suggested constraint, with the value of the profile it is based on and
+    the code adding it to a ``Check``.
+    """
+
+    constraint: Constraint
+    column: str
+    current_value: str
+    description: str
+    suggesting_rule: str
+    code_for_constraint: str
+
+
+def _constraint(add: Callable[[Check], Check]) -> Constraint:
+    # the constraint added to a check by one of its methods
+    return add(Check(CheckLevel.WARNING, "suggestion")).constraints[-1]
+
+
+class ConstraintRule(ABC):
+    """A rule suggesting a constraint from the profile of a column"""
+
+    @abstractmethod
+    def should_be_applied(self, profile: ColumnProfile, num_records: int) -> bool:
+        pass
+
+    @abstractmethod
+    def candidate(
+        self, profile: ColumnProfile, num_records: int
+    ) -> ConstraintSuggestion:
+        pass
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+
+class CompleteIfCompleteRule(ConstraintRule):
+    """Suggests ``is_complete`` for the columns without missing values"""
+
+    def should_be_applied(self, profile: ColumnProfile, num_records: int) -> bool:
+        return profile.completeness == 1.0
+
+    def candidate(
+        self, profile: ColumnProfile, num_records: int
+    ) -> ConstraintSuggestion:
+        column = profile.column
+        return ConstraintSuggestion(
+            _constraint(lambda check: check.is_complete(column)),
+            column,
+            "Completeness: 1.0",
+            f"'{column}' is not null",
+            self.name,
+            f".is_complete({column!r})",
+        )
+
+
+class RetainCompletenessRule(ConstraintRule):
+    """
+    Suggests a minimum completeness for the columns with some missing values:
+    the lower bound of the (normal approximation) 95% confidence interval of
+    the completeness.
+    """
+
+    def should_be_applied(self, profile: ColumnProfile, num_records: int) -> bool:
+        completeness = profile.completeness
+        return completeness is not None and 0.2 < completeness < 1.0
+
+    def candidate(
+        self, profile: ColumnProfile, num_records: int
+    ) -> ConstraintSuggestion:
+        column = profile.column
+        p = profile.completeness or 0.0
+        bound = p - 1.96 * math.sqrt(p * (1 - p) / num_records)
+        bound = math.floor(bound * 100) / 100
+        return ConstraintSuggestion(
+            _constraint(lambda check: check.has_completeness(column, at_least(bound))),
+            column,
+            f"Completeness: {p}",
+            f"'{column}' has less than {100 - 100 * bound:.0f}% missing values",
+            self.name,
+            f".has_completeness({column!r}, {at_least(bound)!r})",
+        )
+
+
+class RetainTypeRule(ConstraintRule):
+    """
+    Suggests the type inferred from the values of the string columns holding
+    numbers or booleans.
+    """
+
+    _TYPES = {
+        DataTypeInstance.INTEGRAL: ConstrainableDataTypes.INTEGRAL,
+        DataTypeInstance.FRACTIONAL: ConstrainableDataTypes.FRACTIONAL,
+        DataTypeInstance.BOOLEAN: ConstrainableDataTypes.BOOLEAN,
+    }
+
+    def should_be_applied(self, profile: ColumnProfile, num_records: int) -> bool:
+        return profile.is_data_type_inferred and profile.data_type in self._TYPES
+
+    def candidate(
+        self, profile: ColumnProfile, num_records: int
+    ) -> ConstraintSuggestion:
+        column = profile.column
+        data_type = self._TYPES[profile.data_type]
+        return ConstraintSuggestion(
+            _constraint(lambda check: check.has_data_type(column, data_type)),
+            column,
+            f"DataType: {profile.data_type.value}",
+            f"'{column}' has type {profile.data_type.value}",
+            self.name,
+            f".has_data_type({column!r}, ConstrainableDataTypes.{data_type.name})",
+        )
+
+
+class CategoricalRangeRule(ConstraintRule):
+    """
+    Suggests the values of the string columns with few distinct values, when
+    all of them are known (``ColumnProfile.top_values``) and at most 10% of
+    them occur a single time.
+    """
+
+    def should_be_applied(self, profile: ColumnProfile, num_records: int) -> bool:
+        values = profile.top_values
+        if (
+            not values
+            or profile.data_type != DataTypeInstance.STRING
+            or not all(isinstance(v, str) for v in values)
+        ):
+            return False
+
+        counts = np.round(np.array(list(values.values())) * num_records)
+        # otherwise the column has values missing from the top values
+        if counts.sum() != round((profile.completeness or 0.0) * num_records):
+            return False
+        return np.count_nonzero(counts == 1) <= 0.1 * len(counts)
+
+    def candidate(
+        self, profile: ColumnProfile, num_records: int
+    ) -> ConstraintSuggestion:
+        column = profile.column
+        values = sorted(profile.top_values or {})
+        return ConstraintSuggestion(
+            _constraint(lambda check: check.is_contained_in(column, values)),
+            column,
+            f"Compliance: {values}",
+            f"'{column}' has value range {', '.join(values)}",
+            self.name,
+            f".is_contained_in({column!r}, {values!r})",
+        )
+
+
+class NonNegativeNumbersRule(ConstraintRule):
+    """Suggests ``is_non_negative`` for the numeric columns without negatives"""
+
+    def should_be_applied(self, profile: ColumnProfile, num_records: int) -> bool:
+        return (
+            isinstance(profile, NumericColumnProfile)
+            and profile.minimum is not None
+            and profile.minimum >= 0
+        )
+
+    def candidate(
+        self, profile: ColumnProfile, num_records: int
+    ) -> ConstraintSuggestion:
+        column = profile.column
+        minimum = profile.minimum  # type: ignore[attr-defined]
+        return ConstraintSuggestion(
+            _constraint(lambda check: check.is_non_negative(column)),
+            column,
+            f"Minimum: {minimum}",
+            f"'{column}' has no negative values",
+            self.name,
+            f".is_non_negative({column!r})",
+        )
+
+
+class UniqueIfApproximatelyUniqueRule(ConstraintRule):
+    """
+    Suggests ``is_unique`` for the complete columns whose approximate number of
+    distinct values is (within the error of the sketch) the number of rows.
+    """
+
+    def should_be_applied(self, profile: ColumnProfile, num_records: int) -> bool:
+        num_distinct = profile.approximate_num_distinct_values
+        return (
+            profile.completeness == 1.0
+            and num_distinct is not None
+            and num_records > 0
+            and abs(1.0 - num_distinct / num_records) <= APPROX_DISTINCT_TOLERANCE
+        )
+
+    def candidate(
+        self, profile: ColumnProfile, num_records: int
+    ) -> ConstraintSuggestion:
+        column = profile.column
+        num_distinct = profile.approximate_num_distinct_values
+        return ConstraintSuggestion(
+            _constraint(lambda check: check.is_unique(column)),
+            column,
+            f"ApproxDistinctness: {num_distinct / num_records}",  # type: ignore
+            f"'{column}' is unique",
+            self.name,
+            f".is_unique({column!r})",
+        )
+
+
+DEFAULT_RULES: Sequence[ConstraintRule] = (
+    CompleteIfCompleteRule(),
+    RetainCompletenessRule(),
+    RetainTypeRule(),
+    CategoricalRangeRule(),
+    NonNegativeNumbersRule(),
+    UniqueIfApproximatelyUniqueRule(),
+)
+
+
+@dataclass(frozen=True)
+class ConstraintSuggestionResult:
+    column_profiles: ColumnProfiles
+    # suggestions by column
+    constraint_suggestions: Mapping[str, Sequence[ConstraintSuggestion]]
+    # the evaluation of the suggestions on the test set, if any
+    verification_result: Optional[VerificationResult] = field(default=None)
+
+    def all_suggestions(self) -> List[ConstraintSuggestion]:
+        return [s for ss in self.constraint_suggestions.values() for s in ss]
+
+    def check(
+        self,
+        level: CheckLevel = CheckLevel.WARNING,
+        description: str = "Suggested constraints",
+    ) -> Check:
+        """A ``Check`` with all the suggested constraints"""
+        check = Check(level, description)
+        for suggestion in self.all_suggestions():
+            check = check.add_constraint(suggestion.constraint)
+        return check
+
+
+def _split(data, testset_ratio: float, seed: Optional[int]):
+    if not isinstance(data, pd.DataFrame):
+        raise ValueError(
+            "Only Pandas DataFrames can be split into a training and a test set, "
+            "pass the test set instead"
+        )
+    if not 0.0 < testset_ratio < 1.0:
+        raise ValueError("The ratio of the test set must be between 0 and 1")
+    testset = data.sample(frac=testset_ratio, random_state=seed)
+    return data.drop(testset.index), testset
+
+
+class ConstraintSuggestionRunner:
+    def __init__(self, rules: Sequence[ConstraintRule] = DEFAULT_RULES):
+        self.rules = list(rules)
+
+    def run(
+        self,
+        data,
+        restrict_to_columns: Optional[Sequence[str]] = None,
+        testset=None,
+        testset_ratio: Optional[float] = None,
+        seed: Optional[int] = None,
+        low_cardinality_threshold: int = DEFAULT_CARDINALITY_THRESHOLD,
+    ) -> ConstraintSuggestionResult:
+        """
+        Profiles the data and suggests constraints for its columns.
+
+        Parameters
+        ----------
+
+        data:
+            Data handled by any of the backends
+        restrict_to_columns:
+            Columns to suggest constraints for, by default all of them
+        testset:
+            Data on which the suggestions are evaluated, the suggestions whose
+            constraints do not hold on it are dropped (optional)
+        testset_ratio:
+            Instead of ``testset``, the fraction of the rows of a Pandas
+            DataFrame randomly held out of the profile to evaluate the
+            suggestions on (optional)
+        seed:
+            Random seed of the split of the rows
+        low_cardinality_threshold:
+            Maximum (approximate) number of distinct values of the columns whose
+            values can be suggested
+
+        Returns
+        -------
+        The profiles of the columns and the suggestions by column
+        """
+        if testset is not None and testset_ratio is not None:
+            raise ValueError("Either a test set or the ratio of a split can be given")
+        if testset_ratio is not None:
+            data, testset = _split(data, testset_ratio, seed)
+
+        # all the values of the columns with few distinct values are needed
+        profiles = ColumnProfiler.profile(
+            data,
+            restrict_to_columns,
+            low_cardinality_threshold,
+            top_k=low_cardinality_threshold,
+        )
+        suggestions: Dict[str, List[ConstraintSuggestion]] = {
+            column: [
+                rule.candidate(profile, profiles.num_records)
+                for rule in self.rules
+                if rule.should_be_applied(profile, profiles.num_records)
+            ]
+            for column, profile in profiles.profiles.items()
+        }
+        result = ConstraintSuggestionResult(profiles, suggestions)
+        if testset is None:
+            return result
+
+        check = result.check()
+        suite = VerificationSuite().add_check(check)
+        verification_result = suite.run(testset)
+        statuses = iter(
+            r.status
+            for r in verification_result.check_results[check].constraint_results
+        )
+        # the constraint results are in the order of the suggestions
+        evaluated = {
+            column: [s for s in ss if next(statuses) == ConstraintStatus.SUCCESS]
+            for column, ss in suggestions.items()
+        }
+        return ConstraintSuggestionResult(profiles, evaluated, verification_result)
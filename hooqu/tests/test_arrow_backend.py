@@ -0,0 +1,193 @@
+import math
+
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+import hooqu.patterns as hpatterns
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    Correlation,
+    CountDistinct,
+    DataType,
+    Distinctness,
+    Drift,
+    Entropy,
+    Histogram,
+    HistogramState,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    PatternMatch,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+pa = pytest.importorskip("pyarrow")
+
+
+def to_arrow(df: pd.DataFrame, max_chunksize=None) -> "pa.Table":
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if max_chunksize is None:
+        return table
+    return pa.Table.from_batches(table.to_batches(max_chunksize=max_chunksize))
+
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Completeness("att2", where="item > 2"),
+    Compliance("rule1", "att1 > 3"),
+    Compliance("rule2", "`att2`.fillna(0) >= 0 and att3 in [0, 4]"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    StandardDeviation("att1"),
+    Quantile("att1", 0.5),
+    Uniqueness(["att2"]),
+    Uniqueness(["att1", "att2"], where="att1 > 1"),
+    Distinctness(["att2"]),
+    CountDistinct(["att1", "att2"], where="att1 > 1"),
+    Entropy("att2"),
+    MutualInformation(["att1", "att2"], where="att1 > 1"),
+    DataType("att1"),
+    DataType("att2", where="att1 > 1"),
+    ApproxCountDistinct("att2"),
+    ApproxCountDistinct("att1", where="att1 > 1"),
+    TopK("att2"),
+    TopK("att1", where="att1 > 1"),
+    Histogram("att2"),
+    Histogram("att1", bins=[0, 2, 4], where="att1 > 1"),
+    Histogram("att3", bins=3, range=(0, 6)),
+    Drift("att3", HistogramState.from_values([0, 1, 5], (0, 3, 6)), bins=[0, 3, 6]),
+    Drift("att1", HistogramState.from_values([1, 3], (0, 2, 4)), "ks", bins=[0, 2, 4]),
+    Correlation("att1", "att2"),
+    Correlation("att2", "att3", where="item > 1"),
+    Correlation("att1", "att3", where="item > 1"),
+]
+
+
+class TestArrowBackend:
+    @pytest.mark.parametrize("max_chunksize", [None, 1, 4])
+    def test_computes_the_same_metrics_as_pandas(
+        self, df_with_numeric_values, max_chunksize
+    ):
+        df = df_with_numeric_values
+        table = to_arrow(df, max_chunksize)
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(table, ANALYZERS)
+
+        for an in ANALYZERS:
+            if isinstance(an, Correlation):
+                # the merged co-moments are rounded differently
+                value = expected.metric(an).value.get()
+                assert result.metric(an).value.get() == pytest.approx(value), an
+            else:
+                assert result.metric(an) == expected.metric(an), an
+
+    def test_runs_on_a_single_pass_over_a_record_batch_reader(
+        self, df_with_numeric_values
+    ):
+        table = to_arrow(df_with_numeric_values, max_chunksize=2)
+        reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches())
+        analyzers = [Size(), Mean("att1"), Uniqueness(["att1"])]
+
+        ctx = do_analysis_run(reader, analyzers)
+
+        assert ctx.metric(analyzers[0]).value == Success(6.0)
+        assert ctx.metric(analyzers[1]).value == Success(3.5)
+        assert ctx.metric(analyzers[2]).value == Success(1.0)
+
+    def test_nulls_and_nans_are_missing_values(self, df_missing):
+        table = to_arrow(df_missing, max_chunksize=5)
+        assert Completeness("att1").calculate(table).value == Success(0.5)
+        assert Completeness("att2").calculate(table).value == Success(0.75)
+
+        nan_table = pa.table({"x": pa.array([1.0, float("nan"), None, 3.0])})
+        assert Completeness("x").calculate(nan_table).value == Success(0.5)
+        assert Mean("x").calculate(nan_table).value == Success(2.0)
+        assert Minimum("x").calculate(nan_table).value == Success(1.0)
+
+        # NaN values are not compared, as in Pandas
+        all_nan = pa.table({"x": pa.array([float("nan")] * 3)})
+        for analyzer in (Minimum("x"), Maximum("x")):
+            assert math.isnan(analyzer.calculate(all_nan).value.get())
+
+    def test_pattern_match(self):
+        table = pa.table({"some": ["someone@somewhere.org", "someone@else", None]})
+        metric = PatternMatch("some", hpatterns.EMAIL).calculate(table)
+        assert metric.value == Success(1 / 3)
+
+    def test_pattern_match_falls_back_for_regex_not_supported_by_re2(self):
+        # the credit card pattern uses backreferences
+        numbers = ["4111 1111 1111 1111", "4111-1111-1111-1111", "0000111122223333"]
+        table = to_arrow(pd.DataFrame({"some": numbers}), max_chunksize=2)
+        metric = PatternMatch("some", hpatterns.CREDITCARD).calculate(table)
+        assert metric.value == Success(2 / 3)
+
+    def test_fails_on_wrong_input(self, df_full):
+        table = to_arrow(df_full)
+
+        assert Mean("att1").calculate(table).value.isFailure
+        assert PatternMatch("item", r"\d").calculate(table).value.isFailure
+        assert Completeness("nosuchcolumn").calculate(table).value.isFailure
+        assert Compliance("rule", "nosuchcolumn > 1").calculate(table).value.isFailure
+
+    def test_empty_columns(self):
+        table = pa.table({"x": pa.array([None, None], type=pa.float64())})
+
+        assert Completeness("x").calculate(table).value == Success(0.0)
+        assert StandardDeviation("x").calculate(table).value.isFailure
+
+    def test_data_without_batches(self, df_with_numeric_values, tmp_path):
+        from hooqu.backends.parquet import ParquetSource
+
+        pq = pytest.importorskip("pyarrow.parquet")
+        df = df_with_numeric_values
+
+        def assert_same_metrics(data, expected_data, analyzers):
+            ctx = do_analysis_run(data, analyzers)
+            expected = do_analysis_run(expected_data, analyzers)
+            for an in analyzers:
+                # the ratios of no rows are NaN
+                value = expected.metric(an).value.get()
+                assert ctx.metric(an).value.get() == pytest.approx(
+                    value, nan_ok=True
+                ), an
+
+        empty = to_arrow(df.iloc[:0])
+        analyzers = [Size(), Completeness("att1"), Mean("att1"), Uniqueness(["att1"])]
+        assert_same_metrics(empty, df.iloc[:0], analyzers)
+        reader = pa.RecordBatchReader.from_batches(empty.schema, [])
+        assert_same_metrics(reader, df.iloc[:0], analyzers)
+
+        # the pushed down filter skips the only row group
+        pq.write_table(to_arrow(df), tmp_path / "data.parquet")
+        filtered = [Size(where="item > 10"), Completeness("att1", where="item > 10")]
+        assert_same_metrics(ParquetSource(tmp_path), df, filtered)
+
+    def test_verification_suite_on_arrow_table(self, df_comp_incomp):
+        table = to_arrow(df_comp_incomp, max_chunksize=4)
+        check = (
+            Check(CheckLevel.ERROR, "arrow")
+            .is_complete("att1")
+            .has_completeness("att2", lambda v: v > 0.5)
+            .is_contained_in("att1", ["a", "b"])
+            .is_unique("item")
+        )
+
+        result = VerificationSuite().on_data(table).add_check(check).run()
+        assert result.status == CheckStatus.SUCCESS
@@ -0,0 +1,87 @@
+import math
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hooqu.analyzers import Maximum, Size
+from hooqu.analyzers.runners import fail_fast_runner
+from hooqu.assertions import Between, at_least, at_most, between, equals
+from hooqu.checks import Check, CheckLevel, CheckStatus, is_one
+from hooqu.constraints import ConstraintStatus
+from hooqu.verification_suite import VerificationSuite
+
+
+def test_assertions():
+    assert between(1, 2)(1) and between(1, 2)(2) and not between(1, 2)(2.5)
+    assert at_least(0.9)(0.95) and not at_least(0.9)(0.5)
+    assert at_most(3)(-10) and not at_most(3)(4)
+    assert equals(1)(1.0) and not equals(1)(0.99)
+    assert not at_least(0)(math.nan)
+
+    assert between(1, 2).bounds == (1, 2)
+    assert at_least(0.9).bounds == (0.9, math.inf)
+    assert at_most(3).bounds == (-math.inf, 3)
+    assert is_one == equals(1)
+
+    assert [repr(a) for a in (between(1, 2), at_least(0.5), at_most(3), is_one)] == [
+        "between(1, 2)",
+        "at_least(0.5)",
+        "at_most(3)",
+        "equals(1)",
+    ]
+    with pytest.raises(ValueError):
+        between(2, 1)
+
+
+def test_assertions_pickle():
+    for assertion in (between(1, 2), at_least(0.5), at_most(3), equals(1)):
+        assert pickle.loads(pickle.dumps(assertion)) == assertion
+    assert isinstance(pickle.loads(pickle.dumps(is_one)), Between)
+
+
+def test_checks_with_assertions_pickle(df_with_numeric_values):
+    check = (
+        Check(CheckLevel.ERROR, "declarative")
+        .has_size(at_least(6))
+        .has_mean("att1", between(3, 4))
+        .has_completeness("att1", at_least(0.9))
+        .where("att2 > 0")
+        .has_max("att1", at_most(5))
+    )
+    unpickled = pickle.loads(pickle.dumps(check))
+
+    def statuses(c):
+        result = VerificationSuite().on_data(df_with_numeric_values).add_check(c).run()
+        return [r.status for r in result.check_results[c].constraint_results]
+
+    assert statuses(check) == statuses(unpickled) == [
+        ConstraintStatus.SUCCESS,
+        ConstraintStatus.SUCCESS,
+        ConstraintStatus.SUCCESS,
+        ConstraintStatus.FAILURE,
+    ]
+
+
+def test_the_bounds_stop_the_fail_fast_runs(monkeypatch):
+    calls = []
+    compute_states = fail_fast_runner.compute_states
+
+    def recording(data, analyzers):
+        calls.append(set(analyzers))
+        return compute_states(data, analyzers)
+
+    monkeypatch.setattr(fail_fast_runner, "compute_states", recording)
+    df = pd.DataFrame({"att1": np.arange(1000)})
+    check = (
+        Check(CheckLevel.ERROR, "bounds")
+        .has_max("att1", at_most(50))
+        .has_size(at_most(500))
+    )
+    result = VerificationSuite().add_check(check).run_fail_fast(df, chunk_size=100)
+
+    assert result.status == CheckStatus.ERROR
+    # the maximum fails on the first chunk, the size on the sixth
+    assert calls[0] == {Maximum("att1"), Size()}
+    assert calls[1:] == [{Size()}] * 5
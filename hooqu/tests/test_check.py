@@ -388,6 +388,67 @@ class TestUniquenessCheck:
         assert statuses[9] == ConstraintStatus.SUCCESS
 
 
+class TestApproxCountDistinctCheck:
+    def test_return_the_correct_check_status(self, df_with_distinct_values):
+        df = df_with_distinct_values
+
+        check = (
+            Check(CheckLevel.ERROR, "approx-count-distinct")
+            .has_approx_count_distinct("att1", lambda n: n == 3)
+            .has_approx_count_distinct("att2", lambda n: n == 2)
+            .has_approx_count_distinct("att1", lambda n: n == 1)
+            .where("att2 == 'x'")
+            .has_approx_count_distinct("att2", lambda n: n > 2)
+        )
+
+        result = check.evaluate(run_checks(df, check))
+        statuses = [cr.status for cr in result.constraint_results]
+
+        assert result.status == CheckStatus.ERROR
+        assert statuses == [ConstraintStatus.SUCCESS] * 3 + [ConstraintStatus.FAILURE]
+
+
+class TestFrequencyBasedChecks:
+    def test_return_the_correct_check_status(self, df_with_distinct_values):
+        df = df_with_distinct_values
+
+        check = (
+            Check(CheckLevel.ERROR, "frequencies")
+            .has_distinctness("att1", lambda d: d == 0.6)
+            .has_number_of_distinct_values(["att1", "att2"], lambda n: n == 4)
+            .has_entropy("att2", lambda e: e > 0)
+            .has_mutual_information("att1", "att2", lambda mi: mi > 0)
+            .has_entropy("att1", lambda e: e == 0)
+            .where("att1 == 'a'")
+            .has_distinctness(["att1", "att2"], lambda d: d == 1)
+        )
+
+        result = check.evaluate(run_checks(df, check))
+        statuses = [cr.status for cr in result.constraint_results]
+
+        assert result.status == CheckStatus.ERROR
+        assert statuses == [ConstraintStatus.SUCCESS] * 5 + [ConstraintStatus.FAILURE]
+
+
+class TestTopKCheck:
+    def test_return_the_correct_check_status(self, df_with_distinct_values):
+        df = df_with_distinct_values
+
+        check = (
+            Check(CheckLevel.ERROR, "top-k")
+            .has_top_k("att1", 1, lambda top: max(top.values()) <= 1 / 3)
+            .has_top_k("att2", 3, lambda top: top.get("y", 0) < 0.2)
+            .has_top_k("att2", 1, lambda top: top == {"x": 0.5})
+            .has_top_k("att1", 3, lambda top: top.get("c", 0) < 0.1)
+        )
+
+        result = check.evaluate(run_checks(df, check))
+        statuses = [cr.status for cr in result.constraint_results]
+
+        assert result.status == CheckStatus.ERROR
+        assert statuses == [ConstraintStatus.SUCCESS] * 3 + [ConstraintStatus.FAILURE]
+
+
 class TestPatternMatchCheck:
     def test_has_pattern_work_with_normal_patterns(self,):
         col = "some"
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hooqu.analyzers import Correlation, CorrelationState
+from hooqu.analyzers.correlation import comoment_states
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+
+@pytest.fixture
+def df_correlated():
+    rng = np.random.default_rng(0)
+    x = rng.normal(1e6, 10, 200)
+    df = pd.DataFrame(
+        {"x": x, "y": 3 * x + rng.normal(0, 5, 200), "z": rng.normal(0, 1, 200)}
+    )
+    df.loc[::7, "y"] = np.nan
+    df.loc[::11, "z"] = np.nan
+    return df
+
+
+def test_correlation_of_the_rows_with_both_values(df_correlated):
+    df = df_correlated
+    for first, second in [("x", "y"), ("y", "z"), ("x", "z")]:
+        metric = Correlation(first, second).calculate(df)
+        expected = df[first].corr(df[second])
+        assert metric.value.get() == pytest.approx(expected, rel=1e-9)
+
+
+def test_states_are_merged(df_correlated):
+    analyzer = Correlation("x", "y", where="z > -1")
+    states = [
+        analyzer.compute_state_from(part) for part in np.array_split(df_correlated, 5)
+    ]
+    merged = states[0] + states[1] + states[2] + states[3] + states[4]
+    state = analyzer.compute_state_from(df_correlated)
+
+    assert merged.n == state.n
+    assert merged.metric_value() == pytest.approx(state.metric_value(), rel=1e-9)
+
+
+def test_pairs_of_a_block():
+    block = np.array(
+        [[1.0, 2.0, np.nan], [2.0, np.nan, 1.0], [3.0, 7.0, 3.0], [4.0, 8.0, 2.0]]
+    )
+    states = comoment_states(block, [(0, 1), (1, 2), (0, 2)])
+    for (i, j), state in zip([(0, 1), (1, 2), (0, 2)], states):
+        rows = ~np.isnan(block[:, i]) & ~np.isnan(block[:, j])
+        x, y = block[rows, i], block[rows, j]
+        assert state.n == rows.sum()
+        assert state.ck == pytest.approx(np.sum((x - x.mean()) * (y - y.mean())))
+        assert state.metric_value() == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+    assert comoment_states(np.full((2, 2), np.nan), [(0, 1)]) == [None]
+
+
+def test_constant_columns_have_no_correlation():
+    state = CorrelationState(3, 1.0, 2.0, 0.0, 0.0, 2.0)
+    assert np.isnan(state.metric_value())
+
+
+def test_correlations_are_computed_together(df_correlated):
+    analyzers = [Correlation("x", "y"), Correlation("y", "z"), Correlation("x", "z")]
+    ctx = do_analysis_run(df_correlated, analyzers + [Correlation("x", "missing")])
+
+    for an in analyzers:
+        expected = an.calculate(df_correlated).value.get()
+        assert ctx.metric(an).value.get() == pytest.approx(expected, rel=1e-12)
+    assert ctx.metric(Correlation("x", "missing")).value.isFailure
+    assert Correlation("x", "y") != Correlation("y", "x")
+
+
+def test_has_correlation(df_correlated):
+    check = (
+        Check(CheckLevel.ERROR, "correlation")
+        .has_correlation("x", "y", lambda r: r > 0.9)
+        .has_correlation("x", "z", lambda r: r > 0.9)
+        .where("z > 0")
+    )
+
+    result = VerificationSuite().on_data(df_correlated).add_check(check).run()
+    assert result.status == CheckStatus.ERROR
+    statuses = [r.status.name for r in result.check_results[check].constraint_results]
+    assert statuses == ["SUCCESS", "FAILURE"]
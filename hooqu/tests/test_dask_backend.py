@@ -0,0 +1,161 @@
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    Correlation,
+    CountDistinct,
+    DataType,
+    Distinctness,
+    Drift,
+    Entropy,
+    Histogram,
+    HistogramState,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    PatternMatch,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+dd = pytest.importorskip("dask.dataframe")
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Completeness("att2", where="item > 2"),
+    Compliance("rule1", "att1 > 3"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    StandardDeviation("att1"),
+    StandardDeviation("att2", where="item > 3"),
+    Quantile("att1", 0.5),
+    Quantile("att2", 0.5, where="item > 2"),
+    Uniqueness(["att2"]),
+    Uniqueness(["att1", "att2"], where="att1 > 1"),
+    Distinctness(["att2"]),
+    CountDistinct(["att1", "att2"], where="att1 > 1"),
+    Entropy("att2"),
+    MutualInformation(["att1", "att2"], where="att1 > 1"),
+    DataType("att1"),
+    DataType("att2", where="att1 > 1"),
+    ApproxCountDistinct("att2"),
+    ApproxCountDistinct("att1", where="att1 > 1"),
+    TopK("att2"),
+    TopK("att1", where="att1 > 1"),
+    Histogram("att2"),
+    Histogram("att1", bins=[0, 2, 4], where="att1 > 1"),
+    Histogram("att3", bins=3, range=(0, 6)),
+    Drift("att3", HistogramState.from_values([0, 1, 5], (0, 3, 6)), bins=[0, 3, 6]),
+    Drift("att1", HistogramState.from_values([1, 3], (0, 2, 4)), "ks", bins=[0, 2, 4]),
+    Correlation("att1", "att2"),
+    Correlation("att2", "att3", where="item > 1"),
+    Correlation("att1", "att3", where="item > 1"),
+]
+
+
+class TestDaskBackend:
+    @pytest.mark.parametrize("npartitions", [1, 3, 6])
+    def test_computes_the_same_metrics_as_pandas(
+        self, df_with_numeric_values, npartitions
+    ):
+        df = df_with_numeric_values
+        data = dd.from_pandas(df, npartitions=npartitions)
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(data, ANALYZERS)
+
+        for an in ANALYZERS:
+            if isinstance(an, Correlation):
+                # the merged co-moments are rounded differently
+                value = expected.metric(an).value.get()
+                assert result.metric(an).value.get() == pytest.approx(value), an
+            else:
+                assert result.metric(an) == expected.metric(an), an
+
+    def test_tree_reduction_on_the_process_scheduler(self, df_with_numeric_values):
+        from hooqu.backends.dask import DaskBackend
+
+        data = dd.from_pandas(df_with_numeric_values, npartitions=6)
+        backend = DaskBackend(scheduler="processes", split_every=2)
+        analyzers = [Size(), Mean("att1"), StandardDeviation("att2", where="item > 3")]
+
+        states = backend.compute_states(data, analyzers)
+
+        assert states[analyzers[0]].get().metric_value() == 6
+        assert states[analyzers[1]].get().metric_value() == 3.5
+        assert states[analyzers[2]].get().n == 3
+
+    def test_failing_analyzers_do_not_affect_the_others(self, df_full):
+        data = dd.from_pandas(df_full, npartitions=2)
+        analyzers = [
+            Size(),
+            Compliance("rule", "nosuchcolumn > 1"),
+            PatternMatch("att1", r"(a"),
+            Mean("item"),
+        ]
+
+        ctx = do_analysis_run(data, analyzers)
+
+        assert ctx.metric(analyzers[0]).value == Success(4.0)
+        assert ctx.metric(analyzers[1]).value.isFailure
+        assert ctx.metric(analyzers[2]).value.isFailure
+        assert ctx.metric(analyzers[3]).value == Success(2.5)
+
+    def test_verification_suite_on_dask_dataframe(self, df_comp_incomp):
+        data = dd.from_pandas(df_comp_incomp, npartitions=3)
+        check = (
+            Check(CheckLevel.ERROR, "dask")
+            .is_complete("att1")
+            .has_completeness("att2", lambda v: v > 0.5)
+            .is_contained_in("att1", ["a", "b"])
+            .is_unique("item")
+        )
+
+        result = VerificationSuite().on_data(data).add_check(check).run()
+        assert result.status == CheckStatus.SUCCESS
+
+    def test_empty_partitions(self):
+        df = pd.DataFrame({"x": [None, None, 1.0, 3.0]})
+        data = dd.from_pandas(df, npartitions=2)
+
+        assert StandardDeviation("x").calculate(data).value == Success(1.0)
+        assert Minimum("x", where="x > 2").calculate(data).value == Success(3.0)
+
+    def test_only_the_number_of_groups_by_count_is_collected(self):
+        from hooqu.backends.dask import DaskBackend
+
+        df = pd.DataFrame({"x": list(range(1000)) + [0, 1, 1], "y": 1})
+        data = dd.from_pandas(df, npartitions=4)
+        analyzers = [
+            Uniqueness(["x"]),
+            CountDistinct(["x"]),
+            MutualInformation(["x", "y"]),
+        ]
+
+        states = DaskBackend().compute_states(data, analyzers)
+
+        # 997 values once, 1 twice and 1 three times
+        assert len(states[analyzers[0]].get().frequencies) == 3
+        assert states[analyzers[0]].get().num_rows == 1003
+        # the mutual information needs the values
+        assert len(states[analyzers[2]].get().frequencies) == 1000
+        expected = do_analysis_run(df, analyzers)
+        result = do_analysis_run(data, analyzers)
+        for an in analyzers:
+            assert result.metric(an) == expected.metric(an), an
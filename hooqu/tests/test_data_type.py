@@ -0,0 +1,110 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hooqu.analyzers import DataType, DataTypeHistogram
+from hooqu.analyzers.data_type import classify
+from hooqu.assertions import at_least, equals
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.constraints import ConstrainableDataTypes
+from hooqu.verification_suite import VerificationSuite
+
+
+@pytest.fixture
+def df_with_mixed_types():
+    values = ["1", " -2", "3.5", "1e5", ".5", "true", "False", "x", "", None]
+    return pd.DataFrame({"att1": values * 3, "item": range(30)})
+
+
+def test_classifies_the_text_of_the_values():
+    values = pd.Series(["7", "+7", "7.", "-.7", "7E-3", "TRUE", "7a", "1.2.3", " "])
+    types = classify(values)
+    assert list(types) == [2, 2, 1, 1, 1, 3, 4, 4, 4]
+
+
+def test_distribution_of_the_types(df_with_mixed_types):
+    metric = DataType("att1").calculate(df_with_mixed_types)
+    distribution = metric.value.get()
+
+    assert {k: v.absolute for k, v in distribution.values.items()} == {
+        "Unknown": 3,
+        "Fractional": 9,
+        "Integral": 6,
+        "Boolean": 6,
+        "String": 6,
+    }
+    assert distribution["Integral"].ratio == 0.2
+    assert distribution.number_of_bins == 5
+
+
+def test_types_of_typed_columns():
+    assert DataTypeHistogram.from_values(np.array([1, 2])) == DataTypeHistogram(
+        0, 0, 2, 0, 0
+    )
+    assert DataTypeHistogram.from_values(
+        np.array([1.0, np.nan])
+    ) == DataTypeHistogram(1, 1, 0, 0, 0)
+    assert DataTypeHistogram.from_values(
+        np.array([True, False, True])
+    ) == DataTypeHistogram(0, 0, 0, 3, 0)
+    # mixed python objects are classified by their text
+    assert DataTypeHistogram.from_values(
+        np.array([1, 2.5, True, "a", None], dtype=object)
+    ) == DataTypeHistogram(1, 1, 1, 1, 1)
+
+
+def test_states_are_merged(df_with_mixed_types):
+    analyzer = DataType("att1", where="item > 3")
+    states = [
+        analyzer.compute_state_from(part)
+        for part in np.array_split(df_with_mixed_types, 4)
+    ]
+    merged = states[0] + states[1] + states[2] + states[3]
+    assert merged == analyzer.compute_state_from(df_with_mixed_types)
+
+
+def test_distinct_values_are_weighted_by_their_counts():
+    state = DataTypeHistogram.from_distinct_values(
+        pd.Series(["1", "a", "0.5"], dtype=object), np.array([3, 2, 1]), 4
+    )
+    assert state == DataTypeHistogram(4, 1, 3, 0, 2)
+
+
+def test_missing_column_is_a_failure():
+    metric = DataType("missing").calculate(pd.DataFrame({"att1": [1]}))
+    assert metric.value.isFailure
+    assert metric.flatten()[0].value.isFailure
+
+
+def test_has_data_type():
+    df = pd.DataFrame({"att1": ["1.5"] * 999 + ["n/a"] + [None] * 10})
+    check = (
+        Check(CheckLevel.ERROR, "data types")
+        .has_data_type("att1", ConstrainableDataTypes.NUMERIC, lambda r: r >= 0.999)
+        .has_data_type("att1", ConstrainableDataTypes.NUMERIC)
+        .has_data_type("att1", ConstrainableDataTypes.NULL, lambda r: r < 0.01)
+        .has_data_type("att1", ConstrainableDataTypes.BOOLEAN, lambda r: r == 0)
+    )
+
+    result = VerificationSuite().on_data(df).add_check(check).run()
+    assert result.status == CheckStatus.ERROR
+    statuses = [r.status.name for r in result.check_results[check].constraint_results]
+    assert statuses == ["SUCCESS", "FAILURE", "SUCCESS", "SUCCESS"]
+
+
+def test_has_data_type_pickle():
+    df = pd.DataFrame({"att1": ["1.5"] * 9 + ["true"]})
+    check = (
+        Check(CheckLevel.ERROR, "data types")
+        .has_data_type("att1", ConstrainableDataTypes.NUMERIC, at_least(0.9))
+        .has_data_type("att1", ConstrainableDataTypes.BOOLEAN, equals(0))
+    )
+    unpickled = pickle.loads(pickle.dumps(check))
+
+    def statuses(c):
+        result = VerificationSuite().on_data(df).add_check(c).run()
+        return [r.status.name for r in result.check_results[c].constraint_results]
+
+    assert statuses(check) == statuses(unpickled) == ["SUCCESS", "FAILURE"]
@@ -0,0 +1,273 @@
+import os
+
+import pytest
+from tryingsnake import Success
+
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    Correlation,
+    CountDistinct,
+    DataType,
+    Distinctness,
+    Drift,
+    Entropy,
+    Histogram,
+    HistogramState,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+pa = pytest.importorskip("pyarrow")
+pc = pytest.importorskip("pyarrow.compute")
+pq = pytest.importorskip("pyarrow.parquet")
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Completeness("att2", where="item > 2"),
+    Compliance("rule1", "att1 > 3"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    StandardDeviation("att1"),
+    Quantile("att1", 0.5),
+    Uniqueness(["att2"]),
+    Uniqueness(["att1", "att2"], where="att1 > 1"),
+    Distinctness(["att2"]),
+    CountDistinct(["att1", "att2"], where="att1 > 1"),
+    Entropy("att2"),
+    MutualInformation(["att1", "att2"], where="att1 > 1"),
+    DataType("att1"),
+    DataType("att2", where="att1 > 1"),
+    ApproxCountDistinct("att2"),
+    ApproxCountDistinct("att1", where="att1 > 1"),
+    TopK("att2"),
+    TopK("att1", where="att1 > 1"),
+    Histogram("att2"),
+    Histogram("att1", bins=[0, 2, 4], where="att1 > 1"),
+    Histogram("att3", bins=3, range=(0, 6)),
+    Drift("att3", HistogramState.from_values([0, 1, 5], (0, 3, 6)), bins=[0, 3, 6]),
+    Drift("att1", HistogramState.from_values([1, 3], (0, 2, 4)), "ks", bins=[0, 2, 4]),
+    Correlation("att1", "att2"),
+    Correlation("att2", "att3", where="item > 1"),
+    Correlation("att1", "att3", where="item > 1"),
+]
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    def write(df):
+        path = tmp_path / "data.csv"
+        df.to_csv(path, index=False)
+        return path
+
+    return write
+
+
+class TestDatasetBackend:
+    def test_computes_the_same_metrics_as_pandas(
+        self, df_with_numeric_values, csv_file
+    ):
+        from hooqu.backends.dataset import DatasetSource
+
+        df = df_with_numeric_values
+        source = DatasetSource.from_csv(csv_file(df))
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(source, ANALYZERS)
+
+        for an in ANALYZERS:
+            assert result.metric(an) == expected.metric(an), an
+
+    def test_pushdown_filter(self):
+        from hooqu.backends.dataset import pushdown_filter
+
+        schema = pa.schema(
+            [("a", pa.int64()), ("b", pa.string()), ("c", pa.float64())]
+        )
+
+        def pushdown(*wheres):
+            return pushdown_filter([Size(where=w) for w in wheres], schema)
+
+        assert pushdown("a > 1").equals(pc.field("a") > 1)
+        assert pushdown("1 < a").equals(pc.field("a") > 1)
+        assert pushdown("a > 1", "b == 'x'").equals(
+            (pc.field("a") > 1) | (pc.field("b") == "x")
+        )
+        assert pushdown("b in ['x', 'y'] and not c > 1").equals(
+            pc.field("b").isin(["x", "y"])
+        )
+        # != keeps the nulls, as in Pandas
+        assert pushdown("b != 'x'").equals(
+            (pc.field("b") != "x") | pc.field("b").is_null()
+        )
+        assert pushdown("a > 1", None) is None
+        assert pushdown("a > 1 or not c > 1") is None
+        assert pushdown("a > 'x'") is None
+        assert pushdown("a > c") is None
+
+    def test_not_equal_keeps_the_null_rows(self, tmp_path):
+        import pandas as pd
+
+        from hooqu.backends.parquet import ParquetSource
+
+        df = pd.DataFrame({"a": [5.0, None, 3.0, None], "b": ["x", None, "y", "z"]})
+        pq.write_table(pa.Table.from_pandas(df), tmp_path / "data.parquet")
+        analyzers = [
+            Size(where="a != 5"),
+            Completeness("b", where="a != 5"),
+            Size(where="b != 'y' and a != 3"),
+        ]
+
+        expected = do_analysis_run(df, analyzers)
+        result = do_analysis_run(ParquetSource(tmp_path), analyzers)
+        for an in analyzers:
+            assert result.metric(an) == expected.metric(an), an
+
+    def test_reads_only_the_columns_needed(self, df_full, csv_file):
+        from hooqu.backends.dataset import DatasetSource
+
+        df_full["unused"] = "not an int"
+        source = DatasetSource.from_csv(csv_file(df_full))
+
+        ctx = do_analysis_run(source, [Size(), Mean("item", where="att1 == 'a'")])
+
+        assert ctx.metric(Size()).value == Success(4.0)
+        assert ctx.metric(Mean("item", where="att1 == 'a'")).value == Success(2.0)
+
+    def test_reads_both_columns_of_correlations(
+        self, df_with_numeric_values, csv_file, tmp_path
+    ):
+        from hooqu.backends.dataset import DatasetSource
+        from hooqu.backends.parquet import ParquetSource
+
+        df = df_with_numeric_values
+        pq.write_table(pa.Table.from_pandas(df), tmp_path / "data.parquet")
+        analyzers = [Correlation("att1", "att2"), Correlation("att2", "att3")]
+        expected = do_analysis_run(df, analyzers)
+
+        for source in (
+            DatasetSource.from_csv(csv_file(df)),
+            ParquetSource(tmp_path / "data.parquet"),
+        ):
+            # alone, no other analyzer reads the columns
+            for an in analyzers:
+                ctx = do_analysis_run(source, [an])
+                assert ctx.metric(an) == expected.metric(an), (source, an)
+
+    def test_empty_fields_are_missing_values(self, tmp_path):
+        import pandas as pd
+
+        from hooqu.backends.dataset import DatasetSource
+
+        path = tmp_path / "data.csv"
+        path.write_text("name,city,score\nbob,,1\n,paris,\nann,NA,3\ntom,rome,4\n")
+        analyzers = [
+            Completeness("name"),
+            Completeness("city"),
+            Completeness("score"),
+            CountDistinct(["city"]),
+            DataType("city"),
+        ]
+
+        expected = do_analysis_run(pd.read_csv(path), analyzers)
+        for source in (
+            DatasetSource.from_csv(path),
+            DatasetSource.from_csv(path, cache_dir=tmp_path / "cache"),
+        ):
+            result = do_analysis_run(source, analyzers)
+            for an in analyzers:
+                assert result.metric(an) == expected.metric(an), an
+
+    def test_reading_errors_are_failures(self, tmp_path):
+        from hooqu.backends.dataset import DatasetSource
+
+        path = tmp_path / "data.csv"
+        # the malformed row is after the first block, used to infer the schema
+        path.write_text("a,b\n" + "1,2\n" * 500_000 + "3\n")
+
+        ctx = do_analysis_run(DatasetSource.from_csv(path), [Size()])
+        assert ctx.metric(Size()).value.isFailure
+
+    def test_verification_suite_on_files(self, df_comp_incomp, csv_file, tmp_path):
+        check = (
+            Check(CheckLevel.ERROR, "files")
+            .is_complete("att1")
+            .has_completeness("att2", lambda v: v > 0.5)
+            .is_contained_in("att1", ["a", "b"])
+            .is_unique("item")
+        )
+        parquet_path = tmp_path / "data.parquet"
+        pq.write_table(pa.Table.from_pandas(df_comp_incomp), parquet_path)
+
+        on_csv = VerificationSuite().on_csv(csv_file(df_comp_incomp))
+        on_parquet = VerificationSuite().on_parquet(parquet_path)
+
+        assert on_csv.add_check(check).run().status == CheckStatus.SUCCESS
+        assert on_parquet.add_check(check).run().status == CheckStatus.SUCCESS
+
+    def test_memory_mapped_ipc_files(self, df_with_numeric_values, tmp_path):
+        from hooqu.backends.dataset import DatasetSource
+
+        df = df_with_numeric_values
+        path = tmp_path / "data.arrow"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(DatasetSource.from_ipc(path), ANALYZERS)
+
+        for an in ANALYZERS:
+            assert result.metric(an) == expected.metric(an), an
+
+        check = Check(CheckLevel.ERROR, "ipc").has_size(lambda s: s == len(df))
+        suite = VerificationSuite().on_ipc(path).add_check(check)
+        assert suite.run().status == CheckStatus.SUCCESS
+
+    def test_csv_cache(self, df_with_numeric_values, csv_file, tmp_path):
+        from hooqu.backends.csv_cache import CSVCache
+        from hooqu.backends.dataset import DatasetSource
+
+        df = df_with_numeric_values
+        path = csv_file(df)
+        cache = CSVCache(tmp_path / "cache")
+
+        cached = cache.get(path)
+        assert cached.exists()
+        mtime = cached.stat().st_mtime_ns
+        # the second read is a hit, the file is not converted again
+        assert cache.get(path) == cached
+        assert cached.stat().st_mtime_ns == mtime
+
+        source = DatasetSource.from_csv(path, cache_dir=tmp_path / "cache")
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(source, ANALYZERS)
+        for an in ANALYZERS:
+            assert result.metric(an) == expected.metric(an), an
+
+        # modifying the file invalidates (and removes) the cached version
+        df.iloc[:2].to_csv(path, index=False)
+        os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+        updated = cache.get(path)
+        assert updated != cached
+        assert list(cache.directory.iterdir()) == [updated]
+
+        suite = VerificationSuite().on_csv(path, cache_dir=cache.directory)
+        check = Check(CheckLevel.ERROR, "cached").has_size(lambda s: s == 2)
+        assert suite.add_check(check).run().status == CheckStatus.SUCCESS
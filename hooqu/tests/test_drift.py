@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hooqu.analyzers import Drift, Histogram, HistogramState, Size
+from hooqu.analyzers.drift import ks_distance, linf_distance, psi
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.analyzers.state_provider import FileSystemStateProvider
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+
+def test_distances_of_counts():
+    reference = pd.Series([50, 30, 20], index=["a", "b", "c"])
+    current = pd.Series([20, 30, 40, 10], index=["c", "b", "a", "d"])
+
+    expected = np.array([0.5, 0.3, 0.2, 1e-4])
+    actual = np.array([0.4, 0.3, 0.2, 0.1])
+    assert psi(reference, current) == pytest.approx(
+        np.sum((actual - expected) * np.log(actual / expected))
+    )
+    assert psi(reference, reference) == 0.0
+    assert linf_distance(reference, current) == pytest.approx(0.1)
+    # cumulative ratios over the bins of the reference: 0.5, 0.8, 1 / 4/9, 7/9, 1
+    assert ks_distance(reference, current) == pytest.approx(0.5 - 4 / 9)
+
+
+def test_drift_of_numeric_bins(df_with_numeric_values):
+    reference = HistogramState.from_values(np.array([0, 1, 2, 4, 5]), (0, 3, 6))
+    metric = Drift("att1", reference, "ks", bins=[0, 3, 6]).calculate(
+        df_with_numeric_values
+    )
+    # att1 is 1, 2, 3, 4, 5, 6: the ratio of [0, 3) is 2/6 against 3/5
+    assert metric.name == "Drift"
+    assert metric.value.get() == pytest.approx(3 / 5 - 2 / 6)
+
+
+def test_reference_of_a_previous_run(df_with_numeric_values, tmp_path):
+    df = df_with_numeric_values
+    provider = FileSystemStateProvider(tmp_path)
+    drift = Drift("att2", HistogramState(pd.Series(dtype=np.int64), 0), "linf")
+
+    do_analysis_run(df.iloc[:3], [Size(), drift.histogram], save_state_with=provider)
+    reference = provider.load(drift.histogram)
+    assert reference.num_rows == 3
+
+    same = Drift("att2", reference, "linf")
+    assert same.calculate(df.iloc[:3]).value.get() == 0.0
+    assert same.calculate(df).value.get() > 0.0
+
+
+def test_reference_with_other_bins(df_with_numeric_values):
+    reference = HistogramState.from_values(np.array([1.0]), (0, 1))
+    metric = Drift("att1", reference, bins=[0, 3, 6]).calculate(df_with_numeric_values)
+    assert metric.value.isFailure
+
+
+def test_wrong_distances():
+    reference = HistogramState(pd.Series(dtype=np.int64), 0)
+    with pytest.raises(ValueError):
+        Drift("att1", reference, "hellinger")
+    with pytest.raises(ValueError):
+        Drift("att1", reference, "ks")
+    assert Drift("att1", reference) != Histogram("att1")
+    assert Drift("att1", reference) == Drift("att1", reference)
+    assert Drift("att1", reference) != Drift("att1", reference, "linf")
+
+
+def test_has_drift(df_with_numeric_values):
+    df = df_with_numeric_values
+    reference = Histogram("att1", bins=3, range=(0, 6)).compute_state_from(df)
+    check = (
+        Check(CheckLevel.ERROR, "drift")
+        .has_drift("att1", reference, lambda d: d < 0.1, bins=3, range=(0, 6))
+        .has_drift("att1", reference, lambda d: d < 0.1, bins=3, range=(0, 6))
+        .where("att1 > 3")
+    )
+
+    result = VerificationSuite().on_data(df).add_check(check).run()
+    assert result.status == CheckStatus.ERROR
+    statuses = [r.status.name for r in result.check_results[check].constraint_results]
+    assert statuses == ["SUCCESS", "FAILURE"]
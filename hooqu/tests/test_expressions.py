@@ -0,0 +1,117 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from hooqu.analyzers import Compliance, Size
+from hooqu.expressions import (
+    BoolOp,
+    Column,
+    Compare,
+    FillNull,
+    IsIn,
+    IsNull,
+    Literal,
+    Not,
+    UnsupportedExpressionException,
+    parse_expression,
+    referenced_columns,
+)
+
+
+class TestParseExpression:
+    def test_parses_predicates_generated_by_checks(self):
+        assert parse_expression("`att1`.fillna(0) >= 0") == Compare(
+            ">=", FillNull(Column("att1"), 0), Literal(0)
+        )
+
+        assert parse_expression("`my col`.isna() or `my col`.isin(['a', 'b'])") == (
+            BoolOp("or", (IsNull(Column("my col")), IsIn(Column("my col"), ("a", "b"))))
+        )
+
+    def test_parses_pandas_query_syntax(self):
+        # & and | have the precedence of and / or, as in DataFrame.query
+        assert parse_expression("a > 1 & b > 1 | c") == parse_expression(
+            "a > 1 and b > 1 or c"
+        )
+        assert parse_expression("a == '&' | b == '|'") == BoolOp(
+            "or",
+            (
+                Compare("==", Column("a"), Literal("&")),
+                Compare("==", Column("b"), Literal("|")),
+            ),
+        )
+        assert parse_expression("~(a == [1, 2]) & b.notna()") == BoolOp(
+            "and", (Not(IsIn(Column("a"), (1, 2))), Not(IsNull(Column("b"))))
+        )
+        assert parse_expression("1 < a <= 3") == BoolOp(
+            "and",
+            (
+                Compare("<", Literal(1), Column("a")),
+                Compare("<=", Column("a"), Literal(3)),
+            ),
+        )
+
+    @pytest.mark.parametrize(
+        "expression", ["a.str.len() > 1", "a >", "@value > a", "lambda x: x"]
+    )
+    def test_fails_on_unsupported_expressions(self, expression):
+        with pytest.raises(UnsupportedExpressionException):
+            parse_expression(expression)
+
+    def test_referenced_columns(self):
+        columns = referenced_columns("`a b` > c * 2 or not d.isin([1]) and e")
+        assert columns == {"a b", "c", "d", "e"}
+
+
+def to_arrow(df):
+    pa = pytest.importorskip("pyarrow")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def to_numpy(df):
+    return {c: df[c].to_numpy() for c in df.columns}
+
+
+def to_polars(df):
+    pl = pytest.importorskip("polars")
+    return pl.from_pandas(df)
+
+
+def to_sql(df):
+    from hooqu.backends.sql import SQLTable
+
+    connection = sqlite3.connect(":memory:")
+    df.to_sql("data", connection, index=False)
+    return SQLTable(connection, "data")
+
+
+@pytest.mark.parametrize("convert", [to_arrow, to_numpy, to_polars, to_sql])
+class TestBackendsEvaluateLikePandas:
+    def test_unparenthesized_boolean_operators(self, convert):
+        df = pd.DataFrame({"a": [1, 2, 3, 4], "b": [4.0, 3.0, 2.0, 1.0]})
+        data = convert(df)
+
+        for expression in ("a > 1 & b > 1", "a > 1 | b > 3", "a < 2 | a > 3 & b < 2"):
+            analyzer = Compliance("rule", expression)
+            expected = analyzer.calculate(df).value
+            assert analyzer.calculate(data).value == expected, expression
+            assert Size(where=expression).calculate(data).value == Size(
+                where=expression
+            ).calculate(df).value, expression
+
+    def test_comparisons_with_nulls(self, convert):
+        df = pd.DataFrame({"a": [5.0, None, 3.0, 5.0], "b": ["x", None, "y", None]})
+        data = convert(df)
+
+        for expression in (
+            "a != 5",
+            "a == 5",
+            "a > 4",
+            "b != 'x'",
+            "not (a != 5)",
+            "a != 5 and b != 'y'",
+        ):
+            analyzer = Size(where=expression)
+            expected = analyzer.calculate(df).value
+            assert analyzer.calculate(data).value == expected, expression
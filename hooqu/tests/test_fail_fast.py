@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+from hooqu.analyzers import Completeness, Compliance, Maximum, Mean, Minimum, Size
+from hooqu.analyzers.analyzer import NumMatchesAndCount
+from hooqu.analyzers.runners import fail_fast_runner
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.analyzers.runners.fail_fast_runner import (
+    can_pass,
+    do_fail_fast_analysis_run,
+    metric_range,
+)
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.constraints import ConstraintStatus
+from hooqu.verification_suite import VerificationSuite
+
+
+@pytest.fixture
+def recorded_chunks(monkeypatch):
+    """The number of rows and the analyzers of each chunk analyzed"""
+    calls = []
+    compute_states = fail_fast_runner.compute_states
+
+    def recording(data, analyzers):
+        calls.append((len(data), set(analyzers)))
+        return compute_states(data, analyzers)
+
+    monkeypatch.setattr(fail_fast_runner, "compute_states", recording)
+    return calls
+
+
+@pytest.fixture
+def df_with_late_null():
+    values = np.arange(1000, dtype="float")
+    values[3] = np.nan
+    return pd.DataFrame({"att1": values, "att2": np.arange(1000) - 500})
+
+
+def test_metric_range():
+    state = NumMatchesAndCount(8, 10)
+    assert metric_range(Completeness("att1"), state, 10) == (0.4, 0.9)
+    assert metric_range(Completeness("att1"), NumMatchesAndCount(0, 0), 0)[1] > 1
+    assert not can_pass((0.4, 0.9), (1.0, 1.0))
+    assert can_pass((0.4, 0.9), (0.9, 1.0))
+
+
+def test_stops_the_analyzers_that_can_no_longer_pass(
+    df_with_late_null, recorded_chunks
+):
+    completeness = Completeness("att1")
+    maximum = Maximum("att2")
+    ctx = do_fail_fast_analysis_run(
+        df_with_late_null,
+        [completeness, maximum, Size()],
+        {completeness: [(1.0, 1.0)], maximum: [(-np.inf, 1000)]},
+        chunk_size=100,
+    )
+
+    # completeness is decided on the first chunk, the maximum needs all the rows
+    assert recorded_chunks[0] == (100, {completeness, maximum})
+    assert all(analyzers == {maximum} for _, analyzers in recorded_chunks[1:])
+    assert len(recorded_chunks) == 10
+    assert ctx.metric(completeness).value == Success(0.99)
+    assert ctx.metric(maximum).value == Success(499.0)
+    # the analyzers without bounds are computed on the whole data
+    assert ctx.metric(Size()).value == Success(1000.0)
+
+
+def test_analyzers_kept_by_a_constraint_without_bounds(df_with_late_null):
+    completeness = Completeness("att1")
+    ctx = do_fail_fast_analysis_run(
+        df_with_late_null,
+        [completeness],
+        {completeness: [(1.0, 1.0), None]},
+        chunk_size=100,
+    )
+    assert ctx.metric(completeness) == do_analysis_run(
+        df_with_late_null, [completeness]
+    ).metric(completeness)
+
+
+def test_same_metrics_when_nothing_fails(df_with_numeric_values):
+    analyzers = [Completeness("att1"), Minimum("att1"), Compliance("r", "att1 > 0")]
+    bounds = {an: [(0.0, 1.0)] for an in analyzers}
+    ctx = do_fail_fast_analysis_run(df_with_numeric_values, analyzers, bounds, 2)
+    expected = do_analysis_run(df_with_numeric_values, analyzers)
+    for an in analyzers:
+        assert ctx.metric(an) == expected.metric(an), an
+
+
+def test_chunks_of_arrow_tables(df_with_late_null):
+    pa = pytest.importorskip("pyarrow")
+    completeness = Completeness("att1")
+    ctx = do_fail_fast_analysis_run(
+        pa.Table.from_pandas(df_with_late_null),
+        [completeness],
+        {completeness: [(1.0, 1.0)]},
+        chunk_size=10,
+    )
+    assert ctx.metric(completeness).value == Success(0.9)
+
+
+def test_data_without_length_is_analyzed_at_once(df_with_late_null, recorded_chunks):
+    pa = pytest.importorskip("pyarrow")
+    pl = pytest.importorskip("polars")
+    completeness = Completeness("att1")
+    analyzers = [completeness, Size()]
+    expected = do_analysis_run(df_with_late_null, analyzers)
+
+    table = pa.Table.from_pandas(df_with_late_null, preserve_index=False)
+    for data in (
+        pl.from_pandas(df_with_late_null).lazy(),
+        # readers can only be read once, the size is computed in the same scan
+        pa.RecordBatchReader.from_batches(table.schema, table.to_batches(100)),
+    ):
+        ctx = do_fail_fast_analysis_run(
+            data, analyzers, {completeness: [(1.0, 1.0)]}, chunk_size=100
+        )
+        for an in analyzers:
+            assert ctx.metric(an) == expected.metric(an), (data, an)
+    assert recorded_chunks == []
+
+
+def test_verification_suite_run_fail_fast(df_with_late_null, recorded_chunks):
+    error = (
+        Check(CheckLevel.ERROR, "error")
+        .is_complete("att1")
+        .has_mean("att2", lambda m: m < 0)
+    )
+    warning = Check(CheckLevel.WARNING, "warning").is_non_negative("att1")
+    suite = VerificationSuite().add_check(error).add_check(warning)
+
+    result = suite.run_fail_fast(df_with_late_null, chunk_size=100)
+    assert result.status == CheckStatus.ERROR
+    statuses = [r.status for r in result.check_results[error].constraint_results]
+    assert statuses == [ConstraintStatus.FAILURE, ConstraintStatus.SUCCESS]
+    assert result.check_results[warning].status == CheckStatus.SUCCESS
+    assert result.metrics[Mean("att2")].value == Success(-0.5)
+
+    recorded_chunks.clear()
+    result = suite.run_fail_fast(
+        df_with_late_null, chunk_size=100, abort_on_error=True
+    )
+    # the run stops after the first chunk, the mean is never computed
+    assert len(recorded_chunks) == 1
+    assert result.status == CheckStatus.ERROR
+    mean_result = result.check_results[error].constraint_results[1]
+    assert mean_result.status == ConstraintStatus.FAILURE
+    assert "Missing Analysis" in mean_result.message
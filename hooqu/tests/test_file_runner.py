@@ -0,0 +1,156 @@
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    CountDistinct,
+    Histogram,
+    Maximum,
+    Mean,
+    Minimum,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.size import NumMatches
+from hooqu.analyzers.runners import file_runner
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.analyzers.runners.file_runner import do_analysis_run_on_files, list_files
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+MERGEABLE = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Compliance("rule1", "att1 > 3"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    StandardDeviation("att1"),
+    ApproxCountDistinct("att2"),
+    TopK("att2"),
+    Histogram("att3", bins=3, range=(0, 6)),
+]
+
+
+@pytest.fixture
+def parquet_files(df_with_numeric_values, tmp_path):
+    df = df_with_numeric_values
+    for i, start in enumerate(range(0, len(df), 2)):
+        part = pa.Table.from_pandas(df.iloc[start:start + 2], preserve_index=False)
+        pq.write_table(part, tmp_path / f"part-{i}.parquet")
+    (tmp_path / "_SUCCESS").touch()
+    return tmp_path
+
+
+class TestFileRunner:
+    def test_list_files(self, parquet_files):
+        files = list_files(parquet_files)
+        assert [f.rsplit("/", 1)[-1] for f in files] == [
+            "part-0.parquet",
+            "part-1.parquet",
+            "part-2.parquet",
+        ]
+        assert list_files(files[:2]) == files[:2]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_merged_metrics_are_the_ones_of_all_the_files(
+        self, df_with_numeric_values, parquet_files, workers
+    ):
+        expected = do_analysis_run(df_with_numeric_values, MERGEABLE)
+        result = do_analysis_run_on_files(parquet_files, MERGEABLE, workers=workers)
+
+        for an in MERGEABLE:
+            assert result.context.metric(an) == expected.metric(an), an
+        assert len(result.file_contexts) == 3
+        for ctx in result.file_contexts.values():
+            assert ctx.metric(Size()).value == Success(2.0)
+
+    def test_uniqueness_is_merged(self, df_with_numeric_values, parquet_files):
+        analyzers = [Uniqueness(["att2"]), Uniqueness(["att1", "att3"])]
+        expected = do_analysis_run(df_with_numeric_values, analyzers)
+        result = do_analysis_run_on_files(parquet_files, analyzers, workers=2)
+
+        for an in analyzers:
+            assert result.context.metric(an) == expected.metric(an), an
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_groups_merged_across_dtypes(self, tmp_path, workers):
+        # the column x is read as floats from the file where it has nulls
+        a = pd.DataFrame({"id": [1, 2, 3], "x": [1, 1, 1]})
+        b = pd.DataFrame({"id": [3, 4, 5], "x": [1, None, 1]})
+        pq.write_table(pa.Table.from_pandas(a), tmp_path / "a.parquet")
+        pq.write_table(pa.Table.from_pandas(b), tmp_path / "b.parquet")
+        analyzers = [Uniqueness(["id", "x"]), CountDistinct(["id", "x"])]
+
+        expected = do_analysis_run(pd.concat([a, b]), analyzers)
+        result = do_analysis_run_on_files(tmp_path, analyzers, workers=workers)
+        for an in analyzers:
+            assert result.context.metric(an) == expected.metric(an), an
+        assert result.context.metric(analyzers[1]).value == Success(5.0)
+
+    def test_states_that_can_not_be_merged_fail(self, parquet_files):
+        result = do_analysis_run_on_files(
+            parquet_files, [Quantile("att1", 0.5), Size()], workers=1
+        )
+        assert result.context.metric(Quantile("att1", 0.5)).value.isFailure
+        assert result.context.metric(Size()).value == Success(6.0)
+        # the metrics of each file are still available
+        for ctx in result.file_contexts.values():
+            assert ctx.metric(Quantile("att1", 0.5)).value.isSuccess
+
+    def test_states_are_merged_as_a_balanced_tree(self, monkeypatch):
+        merged = []
+        merge_states = file_runner.merge_states
+
+        def recording(state, other):
+            merged.append((state.num_matches, other.num_matches))
+            return merge_states(state, other)
+
+        monkeypatch.setattr(file_runner, "merge_states", recording)
+        states = [Success(NumMatches(1)) for _ in range(8)]
+        assert file_runner._merge_all(states) == Success(NumMatches(8))
+        assert merged == [(1, 1)] * 4 + [(2, 2)] * 2 + [(4, 4)]
+
+        merged.clear()
+        assert file_runner._merge_all(states[:5]) == Success(NumMatches(5))
+        assert max(max(m) for m in merged) == 4
+
+    def test_custom_reader_and_read_errors(self, df_with_numeric_values, tmp_path):
+        df_with_numeric_values.to_csv(tmp_path / "a.txt", index=False)
+        (tmp_path / "b.txt").write_text("")
+
+        result = do_analysis_run_on_files(
+            tmp_path, [Size()], workers=2, reader=pd.read_csv
+        )
+        files = list_files(tmp_path)
+        assert result.file_contexts[files[0]].metric(Size()).value == Success(6.0)
+        assert result.file_contexts[files[1]].metric(Size()).value.isFailure
+        assert result.context.metric(Size()).value.isFailure
+
+    def test_verification_suite_run_on_files(self, parquet_files):
+        check = (
+            Check(CheckLevel.ERROR, "files")
+            .has_size(lambda s: s == 6)
+            .is_complete("att1")
+            .has_max("att1", lambda v: v == 6)
+        )
+        result = VerificationSuite().add_check(check).run_on_files(
+            parquet_files, workers=2
+        )
+
+        assert result.status == CheckStatus.SUCCESS
+        assert len(result.file_metrics) == 3
+        sizes = [m[Size()].value.get() for m in result.file_metrics.values()]
+        assert sizes == [2.0, 2.0, 2.0]
@@ -1,7 +1,30 @@
+import numpy as np
 import pandas as pd
+import pytest
+from tryingsnake import Success
 
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    ApproxCountDistinctState,
+    CountDistinct,
+    Distinctness,
+    Entropy,
+    MutualInformation,
+    TopK,
+    TopKState,
+    Uniqueness,
+)
 from hooqu.analyzers.analyzer import COUNT_COL
-from hooqu.analyzers.grouping_analyzers import FrequencyBasedAnalyzer
+from hooqu.analyzers.grouping_analyzers import (
+    GROUPS_COL,
+    HASH_COL,
+    FrequenciesAndNumRows,
+    FrequencyBasedAnalyzer,
+    hll_hashes,
+    hll_registers,
+)
+from hooqu.analyzers.mutual_information import mutual_information
+from hooqu.analyzers.runners.analysis_runner import compute_backend_states
 
 
 class TestBaseGroupingAnalyzer:
@@ -12,3 +35,206 @@ class TestBaseGroupingAnalyzer:
         assert state.num_rows == 3
         expected = pd.DataFrame({"att1": ["A", "B"], f"{COUNT_COL}": [1, 2]})
         pd.testing.assert_frame_equal(expected, state.frequencies)
+
+    def test_frequencies_can_be_merged(self):
+        first = pd.DataFrame({"att1": ["A", "B", "B", None], "att2": [1, 2, 2, 3]})
+        second = pd.DataFrame({"att1": ["B", "C", None], "att2": [2, 3, 3]})
+        states = [
+            FrequencyBasedAnalyzer.compute_frequencies(df, ["att1", "att2"])
+            for df in (first, second)
+        ]
+        expected = FrequencyBasedAnalyzer.compute_frequencies(
+            pd.concat([first, second]), ["att1", "att2"]
+        )
+
+        def counts(state):
+            return sorted(state.frequencies[COUNT_COL].tolist())
+
+        # by the values of the groups
+        merged = states[0].sum(states[1])
+        assert merged.has_keys
+        assert merged.num_rows == expected.num_rows == 7
+        pd.testing.assert_frame_equal(
+            merged.frequencies.sort_values(["att1", "att2"], ignore_index=True),
+            expected.frequencies,
+            check_dtype=False,
+        )
+
+        # by the hashes of the groups
+        compact = states[0].compact().sum(states[1].compact())
+        assert not compact.has_keys
+        assert list(compact.frequencies.columns) == [HASH_COL, COUNT_COL]
+        assert compact.frequencies[COUNT_COL].dtype == np.int64
+        assert compact.num_rows == 7
+        assert counts(compact) == counts(expected) == [1, 1, 2, 3]
+
+        mixed = states[0].compact(keep_keys=True).sum(states[1])
+        assert mixed.has_keys
+        assert counts(mixed) == counts(expected)
+        assert counts(states[0].sum(states[1].compact())) == counts(expected)
+
+    def test_uniqueness_of_merged_states(self):
+        df = pd.DataFrame({"id": [1, 2, 3, 3, 4, 5, 5, 6]})
+        uniqueness = Uniqueness(["id"])
+        states = [
+            uniqueness.compute_state_from(df.iloc[i:i + 3].copy()) for i in (0, 3, 6)
+        ]
+
+        expected = uniqueness.calculate(df).value
+        assert expected == Success(0.5)
+        merged = states[0].sum(states[1]).sum(states[2])
+        assert uniqueness.compute_metric_from(merged).value == expected
+        compact = [s.compact() for s in states]
+        merged = compact[0].sum(compact[1]).sum(compact[2])
+        assert uniqueness.compute_metric_from(merged).value == expected
+
+
+class TestFrequencyBasedMetrics:
+    def test_metrics_of_a_column(self, df_with_distinct_values):
+        df = df_with_distinct_values
+        # att1 has 5 values: a, a, b, b, c
+        p = np.array([2, 2, 1]) / 5
+
+        assert Distinctness(["att1"]).calculate(df).value == Success(3 / 5)
+        assert CountDistinct(["att1"]).calculate(df).value == Success(3.0)
+        assert CountDistinct(["att1", "att2"]).calculate(df).value == Success(4.0)
+        entropy = Entropy("att1").calculate(df).value.get()
+        assert entropy == pytest.approx(-np.sum(p * np.log(p)))
+
+    def test_metrics_of_histograms_of_the_counts(self):
+        # 2 groups seen once, 3 seen twice and 1 seen 4 times
+        histogram = pd.DataFrame({COUNT_COL: [1, 2, 4], GROUPS_COL: [2, 3, 1]})
+        state = FrequenciesAndNumRows(histogram, 12)
+        p = np.array([1, 1, 2, 2, 2, 4]) / 12
+
+        assert CountDistinct(["x"]).compute_metric_from(state).value == Success(6.0)
+        assert Distinctness(["x"]).compute_metric_from(state).value == Success(0.5)
+        entropy = Entropy("x").compute_metric_from(state).value.get()
+        assert entropy == pytest.approx(-np.sum(p * np.log(p)))
+
+    def test_mutual_information(self, df_with_distinct_values):
+        df = df_with_distinct_values
+        metric = MutualInformation(["att1", "att2"]).calculate(df)
+
+        # the missing values are a value of their own
+        x = df["att1"].fillna("-").to_numpy()
+        y = df["att2"].fillna("-").to_numpy()
+        expected = sum(
+            pxy * np.log(pxy / (np.mean(x == a) * np.mean(y == b)))
+            for a, b in set(zip(x, y))
+            for pxy in [np.mean((x == a) & (y == b))]
+        )
+        assert metric.value.get() == pytest.approx(expected)
+
+        independent = mutual_information(
+            np.array([0, 0, 1, 1]), np.array([0, 1, 0, 1]), np.array([3, 3, 5, 5])
+        )
+        assert independent == pytest.approx(0.0)
+
+    def test_mutual_information_needs_the_values(self, df_with_distinct_values):
+        analyzer = MutualInformation(["att1", "att2"])
+        state = analyzer.compute_state_from(df_with_distinct_values)
+
+        assert analyzer.compute_metric_from(state.compact()).value.isFailure
+        with pytest.raises(ValueError):
+            MutualInformation(["att1"])
+
+    def test_frequencies_are_shared(self, df_with_distinct_values):
+        analyzers = [
+            Uniqueness(["att1", "att2"]),
+            CountDistinct(["att1", "att2"]),
+            MutualInformation(["att1", "att2"]),
+            Distinctness(["att1", "att2"], where="att1 != 'c'"),
+        ]
+        states = compute_backend_states(df_with_distinct_values, analyzers)
+
+        first = states[analyzers[0]].get()
+        assert states[analyzers[1]].get() is first
+        assert states[analyzers[2]].get() is first
+        assert states[analyzers[3]].get() is not first
+
+
+class TestApproxCountDistinct:
+    @pytest.mark.parametrize("n", [0, 1, 100, 5000, 50000, 400000])
+    def test_estimates_the_number_of_distinct_values(self, n):
+        values = np.random.default_rng(n).permutation(np.repeat(np.arange(n), 2))
+        estimate = ApproxCountDistinctState.from_values(values).metric_value()
+        assert abs(estimate - n) <= 0.03 * n
+
+    def test_merged_sketches_are_the_sketch_of_all_the_values(self):
+        values = np.arange(100000) % 30011
+        sketch = ApproxCountDistinctState.from_values(values)
+        chunks = [
+            ApproxCountDistinctState.from_values(chunk)
+            for chunk in np.array_split(values, 7)
+        ]
+        merged = chunks[0]
+        for chunk in chunks[1:]:
+            merged = merged + chunk
+
+        assert np.array_equal(merged.registers, sketch.registers)
+
+    def test_sketches_of_different_precisions_are_not_merged(self):
+        hashes = hll_hashes(np.arange(10))
+        small = ApproxCountDistinctState(hll_registers(hashes, precision=11))
+        with pytest.raises(ValueError):
+            small.sum(ApproxCountDistinctState.from_values(np.arange(10)))
+
+    def test_missing_values_are_skipped_and_numbers_hashed_as_floats(self):
+        assert np.array_equal(
+            hll_hashes(np.array([1, 2, 3])), hll_hashes(np.array([1.0, np.nan, 2, 3]))
+        )
+        assert np.array_equal(
+            hll_hashes(np.array(["a", "b"])), hll_hashes(np.array(["a", None, "b"]))
+        )
+
+    def test_analyzer(self, df_with_distinct_values):
+        df = df_with_distinct_values
+        assert ApproxCountDistinct("att1").calculate(df).value == Success(3.0)
+        assert ApproxCountDistinct("att2").calculate(df).value == Success(2.0)
+        assert ApproxCountDistinct(
+            "att1", where="att2 == 'x'"
+        ).calculate(df).value == Success(1.0)
+        assert ApproxCountDistinct("att3").calculate(df).value.isFailure
+
+
+class TestTopK:
+    def test_counts_are_exact_within_the_capacity(self):
+        values = np.array(["a", "b", None, "a", "c", "a", "b"], dtype=object)
+        state = TopKState.from_values(values, capacity=3)
+
+        assert state.num_rows == 7
+        assert state.max_error == 1 / 4
+        assert state.top(2) == {"a": 3 / 7, "b": 2 / 7}
+
+    def test_merged_sketches_keep_the_error_bound(self):
+        rng = np.random.default_rng(0)
+        values = rng.zipf(1.3, 200000) % 5000
+        capacity = 50
+        chunks = [
+            TopKState.from_values(chunk, capacity)
+            for chunk in np.array_split(values, 9)
+        ]
+        merged = chunks[0]
+        for chunk in chunks[1:]:
+            merged = merged + chunk
+
+        assert len(merged.counts) <= capacity
+        assert merged.num_rows == len(values)
+        exact = pd.Series(values).value_counts()
+        for value, count in merged.counts.items():
+            assert count <= exact[value] <= count + merged.max_error
+        assert list(merged.top(3)) == list(exact.index[:3])
+        assert merged.max_error <= len(values) / (capacity + 1)
+
+    def test_analyzer(self, df_with_distinct_values):
+        df = df_with_distinct_values
+        metric = TopK("att1", 2).calculate(df)
+        assert metric.value == Success({"a": 2 / 6, "b": 2 / 6})
+        assert [m.name for m in metric.flatten()] == ["TopK-a", "TopK-b"]
+
+        assert TopK("att2", where="att1 == 'b'").calculate(df).value == Success(
+            {"x": 1.0}
+        )
+        assert TopK("att1", 1) != TopK("att1", 2)
+        assert TopK("att3").calculate(df).value.isFailure
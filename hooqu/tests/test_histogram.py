@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+from hooqu.analyzers import Histogram, HistogramState
+from hooqu.analyzers.histogram import NULL_VALUE, bin_counts, bin_labels
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.constraints import ConstraintStatus
+from hooqu.metrics import Distribution, DistributionValue
+from hooqu.verification_suite import VerificationSuite
+
+
+def test_bins_of_the_edges():
+    edges = np.array([0.0, 1.0, 2.5])
+    values = np.array([-1, 0, 0.5, 1, 2.5, 3, 2.4])
+
+    assert bin_labels(edges) == ["< 0.0", "[0.0, 1.0)", "[1.0, 2.5]", "> 2.5"]
+    assert bin_counts(values, edges).tolist() == [1, 2, 3, 1]
+    expected, _ = np.histogram(values, edges)
+    assert bin_counts(values, edges)[1:-1].tolist() == expected.tolist()
+
+
+def test_histogram_of_values(df_with_distinct_values):
+    metric = Histogram("att1").calculate(df_with_distinct_values)
+    distribution = metric.value.get()
+
+    assert distribution.number_of_bins == 4
+    assert distribution["a"] == DistributionValue(2, 2 / 6)
+    assert distribution[NULL_VALUE] == DistributionValue(1, 1 / 6)
+    assert distribution["c"] == DistributionValue(1, 1 / 6)
+
+    top = Histogram("att1", max_detail_bins=2).calculate(df_with_distinct_values)
+    assert list(top.value.get().values) == ["a", "b"]
+    assert top.value.get().number_of_bins == 4
+
+
+def test_histogram_of_numeric_bins(df_with_numeric_values):
+    analyzer = Histogram("att2", bins=2, range=(0, 6))
+    metric = analyzer.calculate(df_with_numeric_values)
+    distribution = metric.value.get()
+
+    labels = ["< 0.0", "[0.0, 3.0)", "[3.0, 6.0]", "> 6.0"]
+    assert list(distribution.values) == labels
+    assert [v.absolute for v in distribution.values.values()] == [0, 3, 2, 1]
+    names = [m.name for m in metric.flatten()]
+    assert names[:3] == [
+        "Histogram.bins",
+        "Histogram.abs.< 0.0",
+        "Histogram.ratio.< 0.0",
+    ]
+
+
+def test_states_are_merged(df_with_numeric_values):
+    df = df_with_numeric_values
+    analyzers = [
+        Histogram("att2"),
+        Histogram("att1", bins=[1, 3, 6], where="item > 1"),
+    ]
+    for an in analyzers:
+        states = [an.compute_state_from(part) for part in (df.iloc[:2], df.iloc[2:])]
+        merged = an.compute_metric_from(states[0] + states[1])
+        assert merged == an.calculate(df)
+
+
+def test_wrong_bins():
+    with pytest.raises(ValueError):
+        Histogram("att1", bins=3)
+    with pytest.raises(ValueError):
+        Histogram("att1", bins=[1, 1])
+    fixed = Histogram("att1", bins=2, range=(0, 1))
+    assert fixed == Histogram("att1", bins=[0, 0.5, 1])
+    assert fixed != Histogram("att1")
+
+
+def test_numeric_bins_need_a_numeric_column(df_with_distinct_values):
+    ctx = do_analysis_run(
+        df_with_distinct_values, [Histogram("att1", bins=2, range=(0, 1))]
+    )
+    assert ctx.all_metrics()[0].value.isFailure
+
+
+def test_states_of_arrays():
+    state = HistogramState.from_values(np.array([1.0, np.nan, 1.0, 3.0]))
+    assert state.num_rows == 4
+    assert state.counts.to_dict() == {1.0: 2, 3.0: 1, NULL_VALUE: 1}
+
+
+def test_histogram_of_empty_data():
+    metric = Histogram("att1").calculate(pd.DataFrame({"att1": []}))
+    assert metric.value == Success(Distribution({}, 0))
+
+
+def test_has_histogram_values(df_with_distinct_values):
+    check = (
+        Check(CheckLevel.ERROR, "histogram")
+        .has_histogram_values("att1", lambda d: d[NULL_VALUE].ratio < 0.2)
+        .has_histogram_values("att2", lambda d: d.number_of_bins == 3)
+        .has_histogram_values("att2", lambda d: d["x"].absolute == 1)
+        .where("att1 == 'b'")
+    )
+    result = (
+        VerificationSuite().on_data(df_with_distinct_values).add_check(check).run()
+    )
+    assert result.status == CheckStatus.ERROR
+    statuses = [r.status for r in result.check_results[check].constraint_results]
+    assert statuses == [
+        ConstraintStatus.SUCCESS,
+        ConstraintStatus.SUCCESS,
+        ConstraintStatus.FAILURE,
+    ]
@@ -0,0 +1,177 @@
+import pytest
+from tryingsnake import Success
+
+from hooqu.analyzers import (
+    Completeness,
+    Compliance,
+    Histogram,
+    Maximum,
+    Mean,
+    Minimum,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.runners import incremental_runner
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.analyzers.runners.incremental_runner import (
+    do_incremental_analysis_run,
+    with_where,
+)
+from hooqu.analyzers.state_provider import (
+    FileSystemStateProvider,
+    InMemoryStateProvider,
+)
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Compliance("rule1", "att1 > 3"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3"),
+    StandardDeviation("att1"),
+]
+
+
+@pytest.fixture
+def recorded_where(monkeypatch):
+    """The where filters of the analyzers computed by the incremental runs"""
+    calls = []
+    compute_states = incremental_runner.compute_states
+
+    def recording(data, analyzers):
+        calls.append({an.where for an in analyzers})
+        return compute_states(data, analyzers)
+
+    monkeypatch.setattr(incremental_runner, "compute_states", recording)
+    return calls
+
+
+class TestStateProviders:
+    def test_aggregate_with_and_save_states_with(self, df_with_numeric_values):
+        df = df_with_numeric_values
+        provider = InMemoryStateProvider()
+
+        do_analysis_run(df.iloc[:2], ANALYZERS, save_state_with=provider)
+        ctx = do_analysis_run(df.iloc[2:], ANALYZERS, aggregate_with=provider)
+
+        expected = do_analysis_run(df, ANALYZERS)
+        for an in ANALYZERS:
+            assert ctx.metric(an) == expected.metric(an), an
+
+    def test_file_system_provider(self, tmp_path):
+        provider = FileSystemStateProvider(tmp_path / "states")
+        assert provider.load(Mean("att1")) is None
+
+        provider.persist(Mean("att1"), 1)
+        provider.persist(Mean("att1", where="att2 > 1"), 2)
+        provider.persist(Mean("att1"), 3)
+
+        other = FileSystemStateProvider(tmp_path / "states")
+        assert other.load(Mean("att1")) == 3
+        assert other.load(Mean("att1", where="att2 > 1")) == 2
+        assert other.load(Sum("att1")) is None
+
+
+class TestIncrementalRun:
+    def test_with_where(self):
+        assert with_where(Mean("a"), "id > 3").where == "id > 3"
+        restricted = with_where(Mean("a", where="b < 2 or c"), "id > 3")
+        assert restricted.where == "(b < 2 or c) and id > 3"
+        assert restricted.instance == "a"
+
+        # the copies are built by the constructors, with the same parameters
+        for analyzer in (
+            Compliance("rule", "att1 > 3", where="b"),
+            Histogram("a", bins=3, range=(0, 6), max_detail_bins=2),
+            TopK("a", k=3, capacity=50),
+            Uniqueness(["a", "b"]),
+        ):
+            restricted = with_where(analyzer, "id > 3")
+            assert type(restricted) is type(analyzer)
+            assert {k: v for k, v in vars(restricted).items() if k != "where"} == {
+                k: v for k, v in vars(analyzer).items() if k != "where"
+            }
+
+    def test_watermark_column_with_spaces(self, df_with_numeric_values):
+        df = df_with_numeric_values.rename(columns={"item": "row id"})
+        provider = InMemoryStateProvider()
+
+        do_incremental_analysis_run(df.iloc[:3], [Sum("att1")], provider, "row id")
+        ctx = do_incremental_analysis_run(df, [Sum("att1")], provider, "row id")
+
+        assert ctx.metric(Sum("att1")) == do_analysis_run(df, [Sum("att1")]).metric(
+            Sum("att1")
+        )
+        assert provider.load(Sum("att1")).watermark == 6
+
+    def test_only_the_new_rows_are_analyzed(
+        self, df_with_numeric_values, tmp_path, recorded_where
+    ):
+        df = df_with_numeric_values
+        provider = FileSystemStateProvider(tmp_path)
+
+        first = do_incremental_analysis_run(df.iloc[:3], ANALYZERS, provider, "item")
+        expected = do_analysis_run(df.iloc[:3], ANALYZERS)
+        for an in ANALYZERS:
+            assert first.metric(an) == expected.metric(an), an
+
+        for end in (5, 6, 6):
+            data = df.iloc[:end]
+            ctx = do_incremental_analysis_run(data, ANALYZERS, provider, "item")
+            expected = do_analysis_run(data, ANALYZERS)
+            for an in ANALYZERS:
+                assert ctx.metric(an) == expected.metric(an), (end, an)
+
+        assert recorded_where[0] == {None, "att1 > 3", "att1 < att2"}
+        assert "`item` > 3" in recorded_where[1]
+        assert "(att1 > 3) and `item` > 3" in recorded_where[1]
+        assert "`item` > 5" in recorded_where[2]
+        assert provider.load(Size()).watermark == 6
+
+    def test_new_analyzers_read_all_the_rows(self, df_with_numeric_values):
+        df = df_with_numeric_values
+        provider = InMemoryStateProvider()
+
+        do_incremental_analysis_run(df.iloc[:3], [Size()], provider, "item")
+        ctx = do_incremental_analysis_run(
+            df, [Size(), Sum("att1")], provider, "item"
+        )
+
+        assert ctx.metric(Size()).value == Success(6.0)
+        assert ctx.metric(Sum("att1")).value == Success(21.0)
+
+    def test_nothing_is_stored_without_watermark(self, df_with_numeric_values):
+        provider = InMemoryStateProvider()
+        ctx = do_incremental_analysis_run(
+            df_with_numeric_values, [Size()], provider, "missing"
+        )
+
+        assert ctx.metric(Size()).value == Success(6.0)
+        assert provider.states == {}
+
+    def test_verification_suite_run_incremental(
+        self, df_with_numeric_values, tmp_path
+    ):
+        df = df_with_numeric_values
+        provider = FileSystemStateProvider(tmp_path)
+        suite = VerificationSuite().add_check(
+            Check(CheckLevel.ERROR, "incremental")
+            .has_size(lambda s: s >= 3)
+            .has_max("att1", lambda v: v <= 6)
+            .has_mean("att1", lambda v: v == 2)
+        )
+
+        assert suite.run_incremental(df.iloc[:3], provider, "item").status == (
+            CheckStatus.SUCCESS
+        )
+        assert suite.run_incremental(df, provider, "item").status == (
+            CheckStatus.ERROR
+        )
@@ -1,6 +1,13 @@
 from tryingsnake import Failure, Success
 
-from hooqu.metrics import DoubleMetric, Entity
+from hooqu.metrics import (
+    Distribution,
+    DistributionValue,
+    DoubleMetric,
+    Entity,
+    HistogramMetric,
+    KeyedDoubleMetric,
+)
 
 
 def test_double_metric_should_flatten():
@@ -13,3 +20,37 @@ def test_double_metric_should_flatten():
     )
 
     assert metric.flatten() == (metric,)
+
+
+def test_keyed_double_metric_should_flatten():
+    metric = KeyedDoubleMetric(
+        Entity.COLUMN, "TopK", "att1", Success({"a": 0.5, "b": 0.25})
+    )
+
+    assert metric.flatten() == (
+        DoubleMetric(Entity.COLUMN, "TopK-a", "att1", Success(0.5)),
+        DoubleMetric(Entity.COLUMN, "TopK-b", "att1", Success(0.25)),
+    )
+
+    failure = Failure(Exception("sample"))
+    metric = KeyedDoubleMetric(Entity.COLUMN, "TopK", "att1", failure)
+
+    assert metric.flatten() == (DoubleMetric(Entity.COLUMN, "TopK", "att1", failure),)
+
+
+def test_histogram_metric_should_flatten():
+    distribution = Distribution({"a": DistributionValue(3, 0.75)}, 2)
+    metric = HistogramMetric(Entity.COLUMN, "Histogram", "att1", Success(distribution))
+
+    assert metric.flatten() == (
+        DoubleMetric(Entity.COLUMN, "Histogram.bins", "att1", Success(2.0)),
+        DoubleMetric(Entity.COLUMN, "Histogram.abs.a", "att1", Success(3.0)),
+        DoubleMetric(Entity.COLUMN, "Histogram.ratio.a", "att1", Success(0.75)),
+    )
+
+    failure = Failure(Exception("sample"))
+    metric = HistogramMetric(Entity.COLUMN, "Histogram", "att1", failure)
+
+    assert metric.flatten() == (
+        DoubleMetric(Entity.COLUMN, "Histogram.bins", "att1", failure),
+    )
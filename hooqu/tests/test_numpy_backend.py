@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+import hooqu.patterns as hpatterns
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    Correlation,
+    CountDistinct,
+    DataType,
+    Distinctness,
+    Drift,
+    Entropy,
+    Histogram,
+    HistogramState,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    PatternMatch,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+
+def to_dict(df: pd.DataFrame):
+    return {c: df[c].to_numpy() for c in df.columns}
+
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Completeness("att2", where="item > 2"),
+    Compliance("rule1", "att1 > 3"),
+    Compliance("rule2", "`att2`.fillna(0) >= 0 and att3 in [0, 4]"),
+    Compliance("rule3", "att1 % 2 == 1 or not att3 == 0"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    StandardDeviation("att1"),
+    Quantile("att1", 0.5),
+    Uniqueness(["att2"]),
+    Uniqueness(["att1", "att2"], where="att1 > 1"),
+    Distinctness(["att2"]),
+    CountDistinct(["att1", "att2"], where="att1 > 1"),
+    Entropy("att2"),
+    MutualInformation(["att1", "att2"], where="att1 > 1"),
+    DataType("att1"),
+    DataType("att2", where="att1 > 1"),
+    ApproxCountDistinct("att2"),
+    ApproxCountDistinct("att1", where="att1 > 1"),
+    TopK("att2"),
+    TopK("att1", where="att1 > 1"),
+    Histogram("att2"),
+    Histogram("att1", bins=[0, 2, 4], where="att1 > 1"),
+    Histogram("att3", bins=3, range=(0, 6)),
+    Drift("att3", HistogramState.from_values([0, 1, 5], (0, 3, 6)), bins=[0, 3, 6]),
+    Drift("att1", HistogramState.from_values([1, 3], (0, 2, 4)), "ks", bins=[0, 2, 4]),
+    Correlation("att1", "att2"),
+    Correlation("att2", "att3", where="item > 1"),
+    Correlation("att1", "att3", where="item > 1"),
+]
+
+
+class TestNumpyBackend:
+    @pytest.mark.parametrize("structured", [False, True])
+    def test_computes_the_same_metrics_as_pandas(
+        self, df_with_numeric_values, structured
+    ):
+        df = df_with_numeric_values
+        data = df.to_records(index=False) if structured else to_dict(df)
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(data, ANALYZERS)
+
+        for an in ANALYZERS:
+            assert result.metric(an) == expected.metric(an), an
+
+    def test_nulls_and_nans_are_missing_values(self, df_missing):
+        data = to_dict(df_missing)
+        assert Completeness("att1").calculate(data).value == Success(0.5)
+        assert Completeness("att2").calculate(data).value == Success(0.75)
+        assert Compliance("rule", "att1 == 'a' or att2 > 'e'").calculate(
+            data
+        ).value == Compliance("rule", "att1 == 'a' or att2 > 'e'").calculate(
+            df_missing
+        ).value
+
+        data = {"x": np.array([1.0, np.nan, np.nan, 3.0])}
+        assert Completeness("x").calculate(data).value == Success(0.5)
+        assert Mean("x").calculate(data).value == Success(2.0)
+        assert Minimum("x", where="x > 1").calculate(data).value == Success(3.0)
+
+    def test_pattern_match(self):
+        numbers = ["4111 1111 1111 1111", "4111-1111-1111-1111", "0000111122223333"]
+        data = {"some": np.array(numbers + [None], dtype=object)}
+
+        result = PatternMatch("some", hpatterns.CREDITCARD).calculate(data)
+        assert result.value == Success(0.5)
+
+        # a column without any value
+        missing = pd.DataFrame({"some": [None] * 3}, dtype=object)
+        analyzer = PatternMatch("some", r"\d")
+        assert analyzer.calculate(to_dict(missing)).value == Success(0.0)
+        assert analyzer.calculate(missing).value == Success(0.0)
+
+    def test_fails_on_wrong_input(self, df_full):
+        data = to_dict(df_full)
+
+        assert Mean("att1").calculate(data).value.isFailure
+        assert PatternMatch("item", r"\d").calculate(data).value.isFailure
+        assert Completeness("nosuchcolumn").calculate(data).value.isFailure
+        assert Compliance("rule", "att1 > 1").calculate(data).value.isFailure
+
+    def test_verification_suite_on_arrays(self, df_comp_incomp):
+        data = to_dict(df_comp_incomp)
+        check = (
+            Check(CheckLevel.ERROR, "numpy")
+            .is_complete("att1")
+            .has_completeness("att2", lambda v: v > 0.5)
+            .is_contained_in("att1", ["a", "b"])
+            .is_unique("item")
+        )
+
+        result = VerificationSuite().on_data(data).add_check(check).run()
+        assert result.status == CheckStatus.SUCCESS
+
+    def test_row_level_results_are_the_same_as_pandas(self, df_missing):
+        df_missing = df_missing.assign(none=pd.Series(None, df_missing.index, object))
+        check = (
+            Check(CheckLevel.ERROR, "rows")
+            .is_complete("att1")
+            .satisfies("item > 3", "rule", lambda r: r > 0.5)
+            .where("att2 == 'f'")
+            .has_pattern("att2", "d", lambda r: r > 0.1)
+            .has_pattern("none", "d", lambda r: r == 0)
+        )
+
+        expected = (
+            VerificationSuite()
+            .on_data(df_missing)
+            .add_check(check)
+            .with_row_level_results()
+            .run()
+        )
+        result = (
+            VerificationSuite()
+            .on_data(to_dict(df_missing))
+            .add_check(check)
+            .with_row_level_results()
+            .run()
+        )
+
+        assert len(result.row_level_results) == 4
+        for constraint, rows in expected.row_level_results.items():
+            np.testing.assert_array_equal(result.row_level_results[constraint], rows)
+        np.testing.assert_array_equal(result.passed_rows(), expected.passed_rows())
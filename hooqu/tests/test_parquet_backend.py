@@ -0,0 +1,163 @@
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+from hooqu.analyzers import (
+    Completeness,
+    Compliance,
+    CountDistinct,
+    DataType,
+    Distinctness,
+    Entropy,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    Uniqueness,
+)
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+pa = pytest.importorskip("pyarrow")
+pc = pytest.importorskip("pyarrow.compute")
+pq = pytest.importorskip("pyarrow.parquet")
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Completeness("att2", where="item > 2"),
+    Compliance("rule1", "att1 > 3"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    Maximum("att3"),
+    StandardDeviation("att1"),
+    Quantile("att1", 0.5),
+    Uniqueness(["att2"]),
+    Uniqueness(["att1", "att2"], where="att1 > 1"),
+    Distinctness(["att2"]),
+    CountDistinct(["att1", "att2"], where="att1 > 1"),
+    Entropy("att2"),
+    MutualInformation(["att1", "att2"], where="att1 > 1"),
+    DataType("att1"),
+    DataType("att2", where="att1 > 1"),
+]
+
+
+@pytest.fixture
+def parquet_source(tmp_path):
+    from hooqu.backends.parquet import ParquetSource
+
+    def write(df: pd.DataFrame, row_group_size=2, files=1):
+        step = -(-len(df) // files)
+        for i in range(files):
+            table = pa.Table.from_pandas(
+                df.iloc[i * step:(i + 1) * step], preserve_index=False
+            )
+            pq.write_table(table, tmp_path / f"part-{i}.parquet", row_group_size)
+        return ParquetSource(tmp_path)
+
+    return write
+
+
+class RecordingDataset:
+    """Records the scans of a dataset and the listings of its fragments"""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.scans = []
+        self.listings = 0
+
+    def to_batches(self, **kwargs):
+        self.scans.append(kwargs)
+        return self.dataset.to_batches(**kwargs)
+
+    def get_fragments(self, *args, **kwargs):
+        self.listings += 1
+        return self.dataset.get_fragments(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.dataset, name)
+
+
+class TestParquetBackend:
+    @pytest.mark.parametrize("files", [1, 2])
+    def test_computes_the_same_metrics_as_pandas(
+        self, df_with_numeric_values, parquet_source, files
+    ):
+        df = df_with_numeric_values
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(parquet_source(df, files=files), ANALYZERS)
+
+        for an in ANALYZERS:
+            assert result.metric(an) == expected.metric(an), an
+
+    def test_answers_from_statistics_without_reading_data(
+        self, df_missing, parquet_source
+    ):
+        source = parquet_source(df_missing)
+        source.dataset = RecordingDataset(source.dataset)
+
+        ctx = do_analysis_run(
+            source,
+            [Size(), Completeness("att1"), Minimum("item"), Maximum("item")],
+        )
+
+        assert source.dataset.scans == []
+        assert [m.value for m in ctx.all_metrics()] == [
+            Success(12.0),
+            Success(0.5),
+            Success(1.0),
+            Success(12.0),
+        ]
+
+    def test_footers_are_read_once(self, df_missing, parquet_source):
+        source = parquet_source(df_missing, files=2, row_group_size=4)
+        source.dataset = RecordingDataset(source.dataset)
+        analyzers = [Size(), Completeness("att1"), Minimum("item"), Maximum("item")]
+
+        first = do_analysis_run(source, analyzers)
+        second = do_analysis_run(source, analyzers)
+
+        assert source.dataset.listings == 1
+        assert len(source.row_groups()) == 4
+        assert list(first.all_metrics()) == list(second.all_metrics())
+
+    def test_reads_only_the_columns_and_row_groups_needed(
+        self, df_missing, parquet_source
+    ):
+        source = parquet_source(df_missing, row_group_size=4)
+        source.dataset = RecordingDataset(source.dataset)
+        analyzer = Completeness("att2", where="item > 8")
+
+        assert analyzer.calculate(source).value == Success(0.75)
+        (scan,) = source.dataset.scans
+        assert scan["columns"] == ["item", "att2"]
+        assert scan["filter"].equals(pc.field("item") > 8)
+
+    def test_nan_values_are_missing_values(self, parquet_source):
+        source = parquet_source(pd.DataFrame({"x": [1.0, float("nan"), None, 3.0]}))
+
+        assert Completeness("x").calculate(source).value == Success(0.5)
+        assert Minimum("x").calculate(source).value == Success(1.0)
+
+    def test_verification_suite_on_parquet(self, df_comp_incomp, parquet_source):
+        source = parquet_source(df_comp_incomp, files=2)
+        check = (
+            Check(CheckLevel.ERROR, "parquet")
+            .is_complete("att1")
+            .has_completeness("att2", lambda v: v > 0.5)
+            .is_contained_in("att1", ["a", "b"])
+            .is_unique("item")
+        )
+
+        result = VerificationSuite().on_data(source).add_check(check).run()
+        assert result.status == CheckStatus.SUCCESS
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+import hooqu.patterns as hpatterns
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    Correlation,
+    CountDistinct,
+    DataType,
+    Distinctness,
+    Drift,
+    Entropy,
+    Histogram,
+    HistogramState,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    PatternMatch,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+pl = pytest.importorskip("polars")
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Completeness("att2", where="item > 2"),
+    Compliance("rule1", "att1 > 3"),
+    Compliance("rule2", "`att2`.fillna(0) >= 0 and att3 in [0, 4]"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    StandardDeviation("att1"),
+    Quantile("att1", 0.5),
+    Uniqueness(["att2"]),
+    Uniqueness(["att1", "att2"], where="att1 > 1"),
+    Distinctness(["att2"]),
+    CountDistinct(["att1", "att2"], where="att1 > 1"),
+    Entropy("att2"),
+    MutualInformation(["att1", "att2"], where="att1 > 1"),
+    DataType("att1"),
+    DataType("att2", where="att1 > 1"),
+    ApproxCountDistinct("att2"),
+    ApproxCountDistinct("att1", where="att1 > 1"),
+    TopK("att2"),
+    TopK("att1", where="att1 > 1"),
+    Histogram("att2"),
+    Histogram("att1", bins=[0, 2, 4], where="att1 > 1"),
+    Histogram("att3", bins=3, range=(0, 6)),
+    Drift("att3", HistogramState.from_values([0, 1, 5], (0, 3, 6)), bins=[0, 3, 6]),
+    Drift("att1", HistogramState.from_values([1, 3], (0, 2, 4)), "ks", bins=[0, 2, 4]),
+    Correlation("att1", "att2"),
+    Correlation("att2", "att3", where="item > 1"),
+    Correlation("att1", "att3", where="item > 1"),
+]
+
+
+class TestPolarsBackend:
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_computes_the_same_metrics_as_pandas(self, df_with_numeric_values, lazy):
+        df = df_with_numeric_values
+        data = pl.from_pandas(df)
+        if lazy:
+            data = data.lazy()
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(data, ANALYZERS)
+
+        for an in ANALYZERS:
+            assert result.metric(an) == expected.metric(an), an
+
+    def test_nulls_and_nans_are_missing_values(self, df_missing):
+        data = pl.from_pandas(df_missing)
+        assert Completeness("att1").calculate(data).value == Success(0.5)
+
+        nan_data = pl.DataFrame({"x": [1.0, float("nan"), None, 3.0]})
+        assert Completeness("x").calculate(nan_data).value == Success(0.5)
+        assert Mean("x").calculate(nan_data).value == Success(2.0)
+
+    def test_pattern_match(self):
+        numbers = ["4111 1111 1111 1111", "4111-1111-1111-1111", "0000111122223333"]
+        data = pl.DataFrame({"some": numbers + [None]})
+
+        # the credit card pattern uses backreferences (not supported by Polars)
+        result = PatternMatch("some", hpatterns.CREDITCARD).calculate(data)
+        assert result.value == Success(0.5)
+        assert PatternMatch("some", r"^4111").calculate(data).value == Success(0.5)
+
+    def test_failing_analyzers_do_not_affect_the_others(self, df_full):
+        data = pl.from_pandas(df_full)
+        analyzers = [
+            Size(),
+            Compliance("rule", "att1 > 1"),  # comparing strings and numbers
+            Quantile("item", 1.5),
+            Mean("att1"),
+        ]
+
+        ctx = do_analysis_run(data, analyzers)
+
+        assert ctx.metric(analyzers[0]).value == Success(4.0)
+        assert all(ctx.metric(an).value.isFailure for an in analyzers[1:])
+
+    def test_only_aggregates_are_collected(self, monkeypatch):
+        from hooqu.backends import polars as polars_backend
+
+        collected = []
+        run = polars_backend._run
+
+        def recording(lazy_frame, plans):
+            result = run(lazy_frame, plans)
+            collected.append(result.estimated_size())
+            return result
+
+        monkeypatch.setattr(polars_backend, "_run", recording)
+        n = 100_000
+        df = pd.DataFrame({"x": np.arange(n) % 3, "y": np.arange(n) % 5 * 0.5})
+        analyzers = [
+            TopK("x"),
+            ApproxCountDistinct("x"),
+            Histogram("x"),
+            Histogram("y", bins=[0, 1, 2]),
+            DataType("y"),
+            Correlation("x", "y"),
+        ]
+
+        expected = do_analysis_run(df, analyzers)
+        result = do_analysis_run(pl.from_pandas(df).lazy(), analyzers)
+
+        for an in analyzers:
+            if isinstance(an, Correlation):
+                value = expected.metric(an).value.get()
+                assert result.metric(an).value.get() == pytest.approx(value), an
+            else:
+                assert result.metric(an) == expected.metric(an), an
+        # the distinct values, their counts and the moments, not the n rows
+        assert collected and max(collected) < 1_000
+
+    def test_verification_suite_on_lazy_frame(self, df_comp_incomp):
+        data = pl.from_pandas(df_comp_incomp).lazy()
+        check = (
+            Check(CheckLevel.ERROR, "polars")
+            .is_complete("att1")
+            .has_completeness("att2", lambda v: v > 0.5)
+            .is_contained_in("att1", ["a", "b"])
+            .is_unique("item")
+        )
+
+        result = VerificationSuite().on_data(data).add_check(check).run()
+        assert result.status == CheckStatus.SUCCESS
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import pytest
+
+from hooqu.prefetch import prefetch
+
+
+class TestPrefetch:
+    @pytest.mark.parametrize("depth", [0, 1, 4])
+    def test_keeps_the_order(self, depth):
+        assert list(prefetch(range(100), depth)) == list(range(100))
+
+    def test_exceptions_are_raised_in_place(self):
+        def items():
+            yield 1
+            yield 2
+            raise ValueError("broken file")
+
+        it = prefetch(items())
+        assert next(it) == 1
+        assert next(it) == 2
+        with pytest.raises(ValueError, match="broken file"):
+            next(it)
+
+    def test_producer_is_bounded(self):
+        produced = []
+
+        def items():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        it = prefetch(items(), depth=3)
+        assert next(it) == 0
+        time.sleep(0.3)  # lets the producer run as far as it can
+        # the item consumed, the ones in the queue and the one waiting for room
+        assert len(produced) <= 1 + 3 + 1
+
+        it.close()
+        assert len(produced) < 100
+
+    def test_runs_in_a_background_thread(self):
+        def items():
+            yield threading.current_thread()
+
+        (thread,) = prefetch(items())
+        assert thread is not threading.current_thread()
+        (thread,) = prefetch(items(), depth=0)
+        assert thread is threading.current_thread()
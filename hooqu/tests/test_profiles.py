@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import hooqu.profiles
+from hooqu.analyzers import DataTypeInstance
+from hooqu.profiles import ColumnProfile, ColumnProfiler, NumericColumnProfile
+
+
+@pytest.fixture
+def df_to_profile():
+    return pd.DataFrame(
+        {
+            "att1": [1, 2, 3, 4, 5, 6],
+            "att2": [1.5, np.nan, 2.5, 3.0, 1.0, 2.0],
+            "att3": ["a", "b", "a", None, "c", "a"],
+            "att4": ["1", "2", "x", "3", "4", "5"],
+            "att5": [True, False, True, True, False, True],
+        }
+    )
+
+
+def test_profiles_every_column(df_to_profile):
+    profiles = ColumnProfiler.profile(df_to_profile)
+
+    assert profiles.num_records == 6
+    assert list(profiles.profiles) == list(df_to_profile.columns)
+
+    att1 = profiles["att1"]
+    assert isinstance(att1, NumericColumnProfile)
+    assert att1.data_type == DataTypeInstance.INTEGRAL
+    assert not att1.is_data_type_inferred
+    assert (att1.minimum, att1.maximum, att1.mean, att1.sum) == (1, 6, 3.5, 21)
+    assert att1.quantiles == {0.25: 2, 0.5: 3, 0.75: 5}
+
+    att2 = profiles["att2"]
+    assert att2.data_type == DataTypeInstance.FRACTIONAL
+    assert att2.completeness == 5 / 6
+    assert att2.std_dev == pytest.approx(np.std([1.5, 2.5, 3.0, 1.0, 2.0]))
+
+    att3 = profiles["att3"]
+    assert type(att3) is ColumnProfile
+    assert att3.data_type == DataTypeInstance.STRING
+    assert att3.is_data_type_inferred
+    assert att3.approximate_num_distinct_values == 3
+    assert att3.top_values == {"a": 0.5, "b": 1 / 6, "c": 1 / 6}
+    assert att3.type_counts["Unknown"] == 1
+
+    # the numbers held by strings are not converted
+    att4 = profiles["att4"]
+    assert type(att4) is ColumnProfile
+    assert att4.type_counts["Integral"] == 5
+
+    att5 = profiles["att5"]
+    assert type(att5) is ColumnProfile
+    assert att5.data_type == DataTypeInstance.BOOLEAN
+
+
+def test_profiles_in_two_runs(df_to_profile, monkeypatch):
+    runs = []
+    run = hooqu.profiles.do_analysis_run
+
+    def recording_run(data, analyzers):
+        runs.append(analyzers)
+        return run(data, analyzers)
+
+    monkeypatch.setattr(hooqu.profiles, "do_analysis_run", recording_run)
+    profiles = ColumnProfiler.profile(
+        df_to_profile, ["att1", "att3"], low_cardinality_threshold=3, top_k=1
+    )
+
+    assert len(runs) == 2
+    assert list(profiles.profiles) == ["att1", "att3"]
+    assert profiles["att1"].top_values is None
+    assert profiles["att3"].top_values == {"a": 0.5}
+
+
+def test_profiles_the_same_on_arrow(df_to_profile):
+    pa = pytest.importorskip("pyarrow")
+    expected = ColumnProfiler.profile(df_to_profile)
+    result = ColumnProfiler.profile(pa.Table.from_pandas(df_to_profile))
+    assert result == expected
+
+
+def test_profiles_empty_data():
+    df = pd.DataFrame({"att1": pd.Series([], dtype="float")})
+    profiles = ColumnProfiler.profile(df)
+
+    assert profiles.num_records == 0
+    assert type(profiles["att1"]) is ColumnProfile
+    assert profiles["att1"].data_type == DataTypeInstance.UNKNOWN
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hooqu.analyzers import Uniqueness
+from hooqu.analyzers.analyzer import COUNT_COL
+from hooqu.analyzers.grouping_analyzers import GROUPS_COL, FrequenciesAndNumRows
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from hooqu.backends.dataset import DatasetSource  # noqa: E402
+from hooqu.backends.parquet import ParquetSource  # noqa: E402
+from hooqu.backends.spill import SpillingCounter, SpillingFrequencies  # noqa: E402
+
+UNIQUENESS = [
+    Uniqueness(["unique"]),
+    Uniqueness(["nonUnique"]),
+    Uniqueness(["nonUniqueWithNulls"]),
+    Uniqueness(["uniqueWithNulls"]),
+    Uniqueness(["onlyUniqueWithOtherNonUnique", "nonUnique"]),
+    Uniqueness(["halfUniqueCombinedWithNonUnique", "nonUnique"]),
+    Uniqueness(["nonUnique"], where="unique > 2"),
+]
+
+
+class TestSpillingCounter:
+    def test_histogram_of_the_counts(self, tmp_path):
+        rng = np.random.default_rng(0)
+        hashes = rng.integers(0, 1000, 10000).astype(np.uint64)
+
+        counter = SpillingCounter(800, tmp_path, num_partitions=7)
+        for chunk in np.array_split(hashes, 13):
+            counter.add(chunk)
+        assert any(runs for runs in counter._runs)
+        counts, groups = counter.count_histogram()
+        counter.close()
+
+        _, expected = np.unique(hashes, return_counts=True)
+        expected_counts, expected_groups = np.unique(expected, return_counts=True)
+        order = np.argsort(counts)
+        assert counts[order].tolist() == expected_counts.tolist()
+        assert groups[order].tolist() == expected_groups.tolist()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_the_hashes_do_not_depend_on_the_batches(self):
+        table = pa.table({"a": [1.0, -0.0, 0.0, None, 1.0], "b": ["x"] * 5})
+        spilling = SpillingFrequencies(["a", "b"], memory_budget=1)
+        for batch in table.to_batches(max_chunksize=2):
+            spilling.add(batch)
+        state = spilling.state(table.schema)
+
+        assert spilling.spilled
+        assert state.is_histogram
+        assert state.num_rows == 5
+        assert sorted(state.frequencies.itertuples(index=False)) == [(1, 1), (2, 2)]
+
+
+class TestOutOfCoreUniqueness:
+    @pytest.mark.parametrize("memory_budget", [None, 1, 10 ** 9])
+    def test_uniqueness_on_parquet(
+        self, df_with_unique_columns, tmp_path, memory_budget
+    ):
+        df = df_with_unique_columns
+        path = tmp_path / "data.parquet"
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=2
+        )
+        source = ParquetSource(path, memory_budget=memory_budget, spill_dir=tmp_path)
+
+        expected = do_analysis_run(df, UNIQUENESS)
+        ctx = do_analysis_run(source, UNIQUENESS)
+        for an in UNIQUENESS:
+            assert ctx.metric(an) == expected.metric(an), an
+
+    def test_uniqueness_on_csv(self, df_with_unique_columns, tmp_path):
+        df = df_with_unique_columns
+        df.to_csv(tmp_path / "data.csv", index=False)
+
+        source = DatasetSource.from_csv(tmp_path / "data.csv", memory_budget=1)
+        expected = do_analysis_run(df, UNIQUENESS)
+        ctx = do_analysis_run(source, UNIQUENESS)
+        for an in UNIQUENESS:
+            assert ctx.metric(an) == expected.metric(an), an
+
+    def test_spilled_states_can_not_be_merged(self):
+        histogram = pd.DataFrame({COUNT_COL: [1], GROUPS_COL: [3]})
+        spilled = FrequenciesAndNumRows(histogram, 3)
+        other = FrequenciesAndNumRows(pd.DataFrame({"a": [1], COUNT_COL: [1]}), 1)
+
+        with pytest.raises(NotImplementedError):
+            spilled.sum(other)
+        with pytest.raises(NotImplementedError):
+            other.sum(spilled)
@@ -0,0 +1,237 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+from tryingsnake import Success
+
+import hooqu.patterns as hpatterns
+from hooqu.analyzers import (
+    ApproxCountDistinct,
+    Completeness,
+    Compliance,
+    Correlation,
+    CountDistinct,
+    DataType,
+    Distinctness,
+    Drift,
+    Entropy,
+    Histogram,
+    HistogramState,
+    Maximum,
+    Mean,
+    Minimum,
+    MutualInformation,
+    PatternMatch,
+    Quantile,
+    Size,
+    StandardDeviation,
+    Sum,
+    TopK,
+    Uniqueness,
+)
+from hooqu.analyzers.grouping_analyzers import FrequencyBasedAnalyzer
+from hooqu.analyzers.runners.analysis_runner import do_analysis_run
+from hooqu.backends.sql import SQLTable
+from hooqu.checks import Check, CheckLevel, CheckStatus
+from hooqu.verification_suite import VerificationSuite
+
+
+class RecordingConnection:
+    """DB-API connection wrapper recording the queries executed"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.queries = []
+
+    def cursor(self):
+        queries = self.queries
+        cursor = self.connection.cursor()
+
+        class Cursor:
+            def execute(self, query):
+                queries.append(query)
+                return cursor.execute(query)
+
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+
+        return Cursor()
+
+
+def to_sql(df: pd.DataFrame, name: str = "data") -> SQLTable:
+    connection = sqlite3.connect(":memory:")
+    df.to_sql(name, connection, index=False)
+    return SQLTable(connection, name)
+
+
+ANALYZERS = [
+    Size(),
+    Size(where="att1 > 3"),
+    Completeness("att1"),
+    Completeness("att2", where="item > 2"),
+    Compliance("rule1", "att1 > 3"),
+    Compliance("rule2", "`att2`.fillna(0) >= 0 and att3 in [0, 4]"),
+    Compliance("rule3", "att2 / item > 0.5 or not att3 == 0"),
+    Mean("att1"),
+    Sum("att2", where="att1 < att2"),
+    Minimum("att1"),
+    Maximum("att3", where="item != 6"),
+    StandardDeviation("att1"),
+    StandardDeviation("att2", where="item >= 2"),
+    Quantile("att1", 0.5),
+    Quantile("att2", 0.25, where="att1 > 1"),
+    Uniqueness(["att2"]),
+    Uniqueness(["att1", "att2"], where="att1 > 1"),
+    Distinctness(["att2"]),
+    CountDistinct(["att1", "att2"], where="att1 > 1"),
+    Entropy("att2"),
+    MutualInformation(["att1", "att2"], where="att1 > 1"),
+    DataType("att1"),
+    DataType("att2", where="att1 > 1"),
+    ApproxCountDistinct("att2"),
+    ApproxCountDistinct("att1", where="att1 > 1"),
+    TopK("att2"),
+    TopK("att1", where="att1 > 1"),
+    Histogram("att2"),
+    Histogram("att1", bins=[0, 2, 4], where="att1 > 1"),
+    Histogram("att3", bins=3, range=(0, 6)),
+    Drift("att3", HistogramState.from_values([0, 1, 5], (0, 3, 6)), bins=[0, 3, 6]),
+    Drift("att1", HistogramState.from_values([1, 3], (0, 2, 4)), "ks", bins=[0, 2, 4]),
+    Correlation("att1", "att2"),
+    Correlation("att2", "att3", where="item > 1"),
+    Correlation("att1", "att3", where="item > 1"),
+]
+
+
+class TestSQLBackend:
+    def test_computes_the_same_metrics_as_pandas(self, df_with_numeric_values):
+        df = df_with_numeric_values
+
+        expected = do_analysis_run(df, ANALYZERS)
+        result = do_analysis_run(to_sql(df), ANALYZERS)
+
+        for an in ANALYZERS:
+            assert result.metric(an) == expected.metric(an), an
+
+    def test_scan_shareable_analyzers_run_in_a_single_query(
+        self, df_with_numeric_values
+    ):
+        table = to_sql(df_with_numeric_values)
+        connection = RecordingConnection(table.connection)
+        table = SQLTable(connection, table.table, table.dialect)
+        analyzers = [
+            a
+            for a in ANALYZERS
+            if not isinstance(
+                a,
+                (
+                    Quantile,
+                    FrequencyBasedAnalyzer,
+                    ApproxCountDistinct,
+                    TopK,
+                    DataType,
+                ),
+            )
+            and not (isinstance(a, Histogram) and a.edges is None)
+        ]
+
+        do_analysis_run(table, analyzers)
+
+        selects = [q for q in connection.queries if q.startswith("SELECT")]
+        assert len(selects) == 1
+
+    def test_groups_are_counted_in_the_database(self, monkeypatch):
+        df = pd.DataFrame({"id": range(1000), "code": [i % 7 for i in range(1000)]})
+        table = to_sql(df)
+        fetched = []
+        execute = SQLTable.execute
+
+        def recording(self, query):
+            rows = execute(self, query)
+            fetched.append(len(rows))
+            return rows
+
+        monkeypatch.setattr(SQLTable, "execute", recording)
+        analyzers = [
+            Uniqueness(["id"]),
+            Distinctness(["code"]),
+            CountDistinct(["id", "code"]),
+            Entropy("code"),
+            ApproxCountDistinct("code"),
+        ]
+        ctx = do_analysis_run(table, analyzers)
+
+        expected = do_analysis_run(df, analyzers)
+        for an in analyzers:
+            value = expected.metric(an).value.get()
+            assert ctx.metric(an).value.get() == pytest.approx(value), an
+        # the number of groups having each count, and the distinct values
+        assert max(fetched) <= 7
+
+    def test_top_k_ties_are_ordered_by_value(self):
+        # the values first appear in ascending order, as pandas orders the ties
+        df = pd.DataFrame({"x": ["a", "b", "c", "d", "e", "a", "b", "c", "d"]})
+        table = to_sql(df)
+        connection = RecordingConnection(table.connection)
+        table = SQLTable(connection, table.table, table.dialect)
+        analyzers = [TopK("x", k=2, capacity=2), TopK("x", k=3, capacity=5)]
+
+        expected = do_analysis_run(df, analyzers)
+        result = do_analysis_run(table, analyzers)
+
+        for an in analyzers:
+            assert result.metric(an) == expected.metric(an), an
+        assert any("ORDER BY 2 DESC, 1 " in q for q in connection.queries)
+
+    def test_nulls_are_missing_values(self, df_missing):
+        table = to_sql(df_missing)
+        assert Completeness("att1").calculate(table).value == Success(0.5)
+        assert Completeness("att2").calculate(table).value == Success(0.75)
+        assert Compliance("rule", "~(att1 == 'a')").calculate(
+            table
+        ).value == Success(8 / 12)
+
+    def test_pattern_match(self):
+        numbers = ["4111 1111 1111 1111", "4111-1111-1111-1111", "0000111122223333"]
+        table = to_sql(pd.DataFrame({"some": numbers + [None]}))
+
+        result = PatternMatch("some", hpatterns.CREDITCARD).calculate(table)
+        assert result.value == Success(0.5)
+
+    def test_failing_analyzers_do_not_affect_the_others(self, df_full):
+        table = to_sql(df_full)
+        analyzers = [
+            Size(),
+            Compliance("rule", "nosuchcolumn > 1"),
+            Compliance("rule", "item % 2 == 0"),
+            Quantile("item", 1.5),
+            Mean("att1"),
+            Mean("item"),
+        ]
+
+        ctx = do_analysis_run(table, analyzers)
+
+        assert ctx.metric(analyzers[0]).value == Success(4.0)
+        assert all(ctx.metric(an).value.isFailure for an in analyzers[1:-1])
+        assert ctx.metric(analyzers[-1]).value == Success(2.5)
+
+    def test_quotes_identifiers_and_literals(self):
+        table = to_sql(pd.DataFrame({"my col": ["it's", "a", None]}), "my table")
+
+        assert Compliance("quote", "`my col` == \"it's\"").calculate(
+            table
+        ).value == Success(1 / 3)
+        assert Uniqueness(["my col"]).calculate(table).value == Success(1.0)
+
+    def test_verification_suite_on_sql_table(self, df_comp_incomp):
+        table = to_sql(df_comp_incomp)
+        check = (
+            Check(CheckLevel.ERROR, "sql")
+            .is_complete("att1")
+            .has_completeness("att2", lambda v: v > 0.5)
+            .is_contained_in("att1", ["a", "b"])
+            .is_unique("item")
+        )
+
+        result = VerificationSuite().on_data(table).add_check(check).run()
+        assert result.status == CheckStatus.SUCCESS
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import hooqu.profiles
+from hooqu.analyzers import DataTypeInstance
+from hooqu.checks import CheckLevel, CheckStatus
+from hooqu.profiles import ColumnProfile
+from hooqu.suggestions import (
+    CategoricalRangeRule,
+    ConstraintSuggestionRunner,
+    RetainCompletenessRule,
+    UniqueIfApproximatelyUniqueRule,
+)
+from hooqu.verification_suite import VerificationSuite
+
+
+@pytest.fixture
+def df_to_suggest():
+    rng = np.random.default_rng(0)
+    n = 200
+    return pd.DataFrame(
+        {
+            "id": range(n),
+            "status": rng.choice(["open", "closed", "new"], n),
+            "amount": rng.uniform(0, 100, n),
+            "code": rng.integers(0, 10, n).astype(str),
+            "note": np.where(rng.random(n) < 0.3, None, "note"),
+        }
+    )
+
+
+def suggested(result):
+    return {
+        column: [s.suggesting_rule for s in suggestions]
+        for column, suggestions in result.constraint_suggestions.items()
+    }
+
+
+def test_suggests_constraints_from_the_profiles(df_to_suggest):
+    result = ConstraintSuggestionRunner().run(df_to_suggest)
+
+    assert suggested(result) == {
+        "id": [
+            "CompleteIfCompleteRule",
+            "NonNegativeNumbersRule",
+            "UniqueIfApproximatelyUniqueRule",
+        ],
+        "status": ["CompleteIfCompleteRule", "CategoricalRangeRule"],
+        "amount": [
+            "CompleteIfCompleteRule",
+            "NonNegativeNumbersRule",
+            "UniqueIfApproximatelyUniqueRule",
+        ],
+        "code": ["CompleteIfCompleteRule", "RetainTypeRule"],
+        "note": ["RetainCompletenessRule", "CategoricalRangeRule"],
+    }
+    status = result.constraint_suggestions["status"][1]
+    assert status.code_for_constraint == (
+        ".is_contained_in('status', ['closed', 'new', 'open'])"
+    )
+
+    # the suggested constraints hold on the data they were suggested from
+    check = result.check(CheckLevel.ERROR)
+    assert len(check.constraints) == 12
+    verification = VerificationSuite().on_data(df_to_suggest).add_check(check).run()
+    assert verification.status == CheckStatus.SUCCESS
+
+
+def test_suggestions_do_not_scan_the_data_again(df_to_suggest, monkeypatch):
+    runs = []
+    run = hooqu.profiles.do_analysis_run
+
+    def recording_run(data, analyzers):
+        runs.append(analyzers)
+        return run(data, analyzers)
+
+    monkeypatch.setattr(hooqu.profiles, "do_analysis_run", recording_run)
+    result = ConstraintSuggestionRunner([RetainCompletenessRule()]).run(
+        df_to_suggest, ["note"]
+    )
+
+    assert len(runs) == 2
+    assert suggested(result) == {"note": ["RetainCompletenessRule"]}
+
+
+def test_drops_the_suggestions_failing_on_the_test_set(df_to_suggest):
+    testset = df_to_suggest.assign(amount=-df_to_suggest["amount"], status="x")
+    result = ConstraintSuggestionRunner().run(df_to_suggest, testset=testset)
+
+    assert result.verification_result.status == CheckStatus.WARNING
+    assert suggested(result)["amount"] == [
+        "CompleteIfCompleteRule",
+        "UniqueIfApproximatelyUniqueRule",
+    ]
+    assert suggested(result)["status"] == ["CompleteIfCompleteRule"]
+    assert suggested(result)["id"] == [
+        "CompleteIfCompleteRule",
+        "NonNegativeNumbersRule",
+        "UniqueIfApproximatelyUniqueRule",
+    ]
+
+
+def test_splits_the_rows_into_a_test_set(df_to_suggest):
+    result = ConstraintSuggestionRunner().run(
+        df_to_suggest, testset_ratio=0.25, seed=1
+    )
+    assert result.column_profiles.num_records == 150
+    assert result.verification_result is not None
+
+    with pytest.raises(ValueError):
+        ConstraintSuggestionRunner().run(
+            df_to_suggest, testset=df_to_suggest, testset_ratio=0.25
+        )
+    with pytest.raises(ValueError):
+        ConstraintSuggestionRunner().run(dict(df_to_suggest), testset_ratio=0.1)
+
+
+def test_rules():
+    profile = ColumnProfile("att1", 0.5, 95, DataTypeInstance.STRING, True)
+    assert not UniqueIfApproximatelyUniqueRule().should_be_applied(profile, 100)
+    assert RetainCompletenessRule().should_be_applied(profile, 100)
+    # the lower bound of the confidence interval of the completeness
+    suggestion = RetainCompletenessRule().candidate(profile, 100)
+    assert suggestion.code_for_constraint == (
+        ".has_completeness('att1', at_least(0.4))"
+    )
+
+    # values seen once
+    values = {f"v{i}": 0.01 for i in range(10)}
+    profile = ColumnProfile("att1", 0.1, 10, DataTypeInstance.STRING, True, {}, values)
+    assert not CategoricalRangeRule().should_be_applied(profile, 100)
+    # values missing from the top values
+    values = {"a": 0.2}
+    profile = ColumnProfile("att1", 0.5, 2, DataTypeInstance.STRING, True, {}, values)
+    assert not CategoricalRangeRule().should_be_applied(profile, 100)
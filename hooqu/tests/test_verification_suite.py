@@ -1,4 +1,9 @@
 from itertools import permutations
+
+import numpy as np
+import pandas as pd
+import pytest
+
 from hooqu.checks import Check, CheckLevel, CheckStatus
 from hooqu.verification_suite import VerificationSuite
 
@@ -77,3 +82,93 @@ class TestVerificationRun:
             (check_to_error_out, check_to_warn, check_to_succeed)
         ):
             assert_status_for(df, CheckStatus.ERROR, *checks)
+
+
+class TestRowLevelResults:
+    def test_keeps_the_outcome_of_each_row(self, df_missing):
+        complete = Check(CheckLevel.ERROR, "complete").is_complete("att1")
+        rules = (
+            Check(CheckLevel.ERROR, "rules")
+            .satisfies("item > 3", "rule", lambda r: r > 0.5)
+            .where("att2 == 'f'")
+            .has_size(lambda s: s == 12)
+        )
+        pattern = Check(CheckLevel.WARNING, "pattern").has_pattern(
+            "att2", "f", lambda r: r > 0.1
+        )
+
+        result = (
+            VerificationSuite()
+            .on_data(df_missing)
+            .add_checks([complete, rules, pattern])
+            .with_row_level_results()
+            .run()
+        )
+
+        # the constraints on sizes or statistics have no row level results
+        assert len(result.row_level_results) == 3
+        np.testing.assert_array_equal(
+            result.row_level_results[complete.constraints[0]],
+            df_missing["att1"].notna(),
+        )
+        # the rows excluded by the filter pass
+        np.testing.assert_array_equal(
+            result.row_level_results[rules.constraints[0]],
+            (df_missing["item"] > 3) | (df_missing["att2"] != "f"),
+        )
+        np.testing.assert_array_equal(
+            result.row_level_results[pattern.constraints[0]],
+            df_missing["att2"] == "f",
+        )
+
+        passed = result.passed_rows()
+        np.testing.assert_array_equal(
+            passed,
+            df_missing["att1"].notna()
+            & ((df_missing["item"] > 3) | (df_missing["att2"] != "f")),
+        )
+        # the metrics are the same as without the row level results
+        expected = (
+            VerificationSuite()
+            .on_data(df_missing)
+            .add_checks([complete, rules, pattern])
+            .run()
+        )
+        assert result.metrics == expected.metrics
+        assert expected.row_level_results == {}
+        assert expected.passed_rows() is None
+
+    def test_quarantines_the_failing_rows(self):
+        df = pd.DataFrame(
+            {"id": [1, 2, None, 4], "email": ["a@b.c", "x", None, "d@e.f"]}
+        )
+        check = (
+            Check(CheckLevel.ERROR, "quarantine")
+            .is_complete("id")
+            .contains_email("email", lambda r: r > 0.1)
+        )
+        result = (
+            VerificationSuite()
+            .on_data(df)
+            .add_check(check)
+            .with_row_level_results()
+            .run()
+        )
+
+        passed = result.passed_rows()
+        assert df[passed]["id"].tolist() == [1.0, 4.0]
+        assert df[~passed]["id"].isna().tolist() == [False, True]
+
+    def test_unsupported_backend(self, df_missing):
+        pa = pytest.importorskip("pyarrow")
+        check = Check(CheckLevel.ERROR, "complete").is_complete("att1")
+        table = pa.Table.from_pandas(df_missing)
+
+        # the metrics are computed without the row level results
+        builder = VerificationSuite().on_data(table).add_check(check)
+        result = builder.with_row_level_results().run()
+        expected = VerificationSuite().on_data(df_missing).add_check(check).run()
+        assert result.status == expected.status == CheckStatus.ERROR
+        assert result.metrics == expected.metrics
+        assert result.row_level_results == {}
+        assert result.passed_rows() is None
@@ -1,13 +1,17 @@
 # coding: utf-8
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
+
 from hooqu.analyzers import Analyzer
 from hooqu.analyzers.runners import AnalyzerContext
 from hooqu.analyzers.runners.analysis_runner import do_analysis_run
-from hooqu.checks import Check, CheckResult, CheckStatus
+from hooqu.analyzers.state_provider import StateLoader, StatePersister
+from hooqu.checks import Check, CheckLevel, CheckResult, CheckStatus
+from hooqu.constraints import AnalysisBasedConstraint, Constraint, ConstraintDecorator
 from hooqu.dataframe import DataFrameLike
 from hooqu.metrics import Metric
 
@@ -19,6 +23,34 @@ class VerificationResult:
     status: CheckStatus
     check_results: Mapping[Check, CheckResult]
     metrics: Mapping[Analyzer, Metric]
+    # metrics of each file, for the runs on several files
+    file_metrics: Mapping[str, Mapping[Analyzer, Metric]] = field(default_factory=dict)
+    # whether each row passes the constraints of the row level analyzers, when
+    # the row level results are requested
+    row_level_results: Mapping[Constraint, np.ndarray] = field(
+        default_factory=dict, compare=False
+    )
+
+    def passed_rows(
+        self, level: CheckLevel = CheckLevel.ERROR
+    ) -> Optional[np.ndarray]:
+        """
+        Whether each row passes all the constraints with row level results of
+        the checks of the given level, e.g. to quarantine the rows failing the
+        ``ERROR`` checks. None when no constraint has row level results.
+
+        Use ``np.packbits`` to store the mask compactly.
+        """
+        masks = [
+            self.row_level_results[c]
+            for check in self.check_results
+            if check.level == level
+            for c in check.constraints
+            if c in self.row_level_results
+        ]
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks)
 
 
 # Helper for the fluent Api
@@ -27,13 +59,33 @@ class VerificationRunBuilder:
         self.data = data
         self._checks: List[Check] = []
         self._required_analyzers: Optional[Tuple[Analyzer, ...]] = None
+        self._row_level_results = False
 
     def run(self) -> VerificationResult:
 
         return VerificationSuite().do_verification_run(
-            self.data, self._checks, self._required_analyzers, None, None, None, None,
+            self.data,
+            self._checks,
+            self._required_analyzers,
+            None,
+            None,
+            None,
+            None,
+            self._row_level_results,
         )
 
+    def with_row_level_results(self) -> "VerificationRunBuilder":
+        """
+        Keep whether each row passes the constraints on the fraction of the rows
+        matching a condition (``is_complete``, ``satisfies``, ``has_pattern``, ...)
+        in ``VerificationResult.row_level_results``. The outcomes are those
+        computed for the metrics, the constraints are not evaluated again.
+        Supported by the Pandas and NumPy backends, the other backends only
+        compute the metrics.
+        """
+        self._row_level_results = True
+        return self
+
     def add_check(self, check: Check) -> "VerificationRunBuilder":
         """
         Add a single check to the run.
@@ -110,19 +162,200 @@ class VerificationSuite:
             data, self._checks, self._required_analyzers, None, None, None, None,
         )
 
+    def run_on_files(
+        self, paths, workers: Optional[int] = None, reader=None
+    ) -> VerificationResult:
+        """
+        Runs all check groups on a set of files, without loading them together.
+
+        The states of the analyzers are computed on each file in a process pool
+        and merged with ``State.sum``; the checks are evaluated once on the
+        merged metrics. The metrics of each file are returned in
+        ``VerificationResult.file_metrics``.
+
+        Parameters
+        ----------
+
+        paths:
+            A directory, a file or a list of them
+        workers:
+            Number of processes, by default the number of CPUs
+        reader:
+            Picklable function opening a file, by default Parquet, CSV and Arrow
+            IPC files are read by extension (see
+            ``hooqu.analyzers.runners.file_runner.open_file``)
+        """
+        from hooqu.analyzers.runners.file_runner import do_analysis_run_on_files
+
+        required_analyzers = self._required_analyzers or ()
+        analyzers = required_analyzers + tuple(
+            a for check in self._checks for a in check.required_analyzers()
+        )
+        result = do_analysis_run_on_files(paths, analyzers, workers, reader)
+
+        verification_result = self.evaluate(self._checks, result.context)
+        verification_result.file_metrics = {
+            f: ctx.metric_map for f, ctx in result.file_contexts.items()
+        }
+        return verification_result
+
+    def run_incremental(
+        self, data, state_provider, watermark_column: str
+    ) -> VerificationResult:
+        """
+        Runs all check groups on append-only data, only analyzing the rows
+        appended since the previous run.
+
+        The states of the analyzers are stored in ``state_provider`` with the
+        maximum value of ``watermark_column`` of the rows analyzed. The next run
+        analyzes the rows past it and merges their states into the stored ones,
+        see ``hooqu.analyzers.runners.incremental_runner``.
+
+        Parameters
+        ----------
+
+        data:
+            The whole data, including the rows verified by the previous runs
+        state_provider:
+            Where the states are stored, e.g.
+            ``hooqu.analyzers.state_provider.FileSystemStateProvider``
+        watermark_column:
+            Numeric column whose values only increase as rows are appended
+        """
+        from hooqu.analyzers.runners.incremental_runner import (
+            do_incremental_analysis_run,
+        )
+
+        required_analyzers = self._required_analyzers or ()
+        analyzers = required_analyzers + tuple(
+            a for check in self._checks for a in check.required_analyzers()
+        )
+        context = do_incremental_analysis_run(
+            data, analyzers, state_provider, watermark_column
+        )
+        return self.evaluate(self._checks, context)
+
+    def run_fail_fast(
+        self, data, chunk_size: Optional[int] = None, abort_on_error: bool = False
+    ) -> VerificationResult:
+        """
+        Runs all check groups, analyzing the data chunk by chunk for the
+        constraints whose assertion declares bounds (``hooqu.assertions``, e.g.
+        the default ``is_one`` of ``is_complete`` or ``is_contained_in``) and
+        stopping their analyzers as soon as they can no longer pass, see
+        ``hooqu.analyzers.runners.fail_fast_runner``. The metrics of the stopped
+        analyzers are those of the rows analyzed until then.
+
+        Parameters
+        ----------
+
+        data:
+            Pandas DataFrames, Arrow tables or Polars DataFrames are analyzed
+            chunk by chunk, the other data (e.g. lazy frames, record batch
+            readers or file sources) at once as in ``run``
+        chunk_size:
+            Number of rows analyzed between two decisions
+        abort_on_error:
+            Whether to stop the whole run on the first failing constraint of an
+            ``ERROR`` check, leaving the other constraints without metric
+        """
+        from hooqu.analyzers.runners.fail_fast_runner import (
+            DEFAULT_CHUNK_SIZE,
+            do_fail_fast_analysis_run,
+        )
+
+        required_analyzers = self._required_analyzers or ()
+        analyzers = required_analyzers + tuple(
+            a for check in self._checks for a in check.required_analyzers()
+        )
+        bounds: Dict[Analyzer, List[Optional[Tuple[float, float]]]] = {}
+        abort_on = set()
+        for check in self._checks:
+            for c in check.constraints:
+                inner = c.inner if isinstance(c, ConstraintDecorator) else c
+                if not isinstance(inner, AnalysisBasedConstraint):
+                    continue
+                bounds.setdefault(inner.analyzer, []).append(inner.bounds())
+                if abort_on_error and check.level == CheckLevel.ERROR:
+                    abort_on.add(inner.analyzer)
+
+        context = do_fail_fast_analysis_run(
+            data, analyzers, bounds, chunk_size or DEFAULT_CHUNK_SIZE, abort_on
+        )
+        return self.evaluate(self._checks, context)
+
     def on_data(self, data):
         return VerificationRunBuilder(data)
 
+    def on_parquet(self, path, **kwargs) -> VerificationRunBuilder:
+        """
+        Verifies Parquet file(s), see ``hooqu.backends.parquet.ParquetSource``.
+
+        Only the columns used by the checks are read, and their ``where`` filters
+        are pushed down to skip row groups and partitions. Requires PyArrow.
+
+        Parameters
+        ----------
+
+        path:
+            A Parquet file, a directory or a list of files
+        kwargs:
+            Passed to ``ParquetSource``
+        """
+        from hooqu.backends.parquet import ParquetSource
+
+        return self.on_data(ParquetSource(path, **kwargs))
+
+    def on_csv(self, path, cache_dir=None, **kwargs) -> VerificationRunBuilder:
+        """
+        Verifies CSV file(s), only converting the columns used by the checks.
+        Requires PyArrow.
+
+        Parameters
+        ----------
+
+        path:
+            A CSV file, a directory or a list of files
+        cache_dir:
+            If given, the files are converted to Arrow IPC files in this
+            directory the first time they are verified, and the following runs
+            memory map them instead of parsing the CSV again. A file is converted
+            again when its size or modification time changes.
+        kwargs:
+            Passed to ``pyarrow.dataset.dataset`` (e.g. ``format`` to use a
+            ``pyarrow.dataset.CsvFileFormat`` with custom parse options)
+        """
+        from hooqu.backends.dataset import DatasetSource
+
+        return self.on_data(DatasetSource.from_csv(path, cache_dir=cache_dir, **kwargs))
+
+    def on_ipc(self, path, **kwargs) -> VerificationRunBuilder:
+        """
+        Verifies memory mapped Arrow IPC (Feather V2) file(s). Requires PyArrow.
+
+        Parameters
+        ----------
+
+        path:
+            An IPC file, a directory or a list of files
+        kwargs:
+            Passed to ``pyarrow.dataset.dataset``
+        """
+        from hooqu.backends.dataset import DatasetSource
+
+        return self.on_data(DatasetSource.from_ipc(path, **kwargs))
+
     def do_verification_run(
         self,
         data,
         checks: Sequence[Check],
         required_analyzers: Optional[Tuple[Analyzer, ...]] = None,
-        aggregate_with: Any = None,  # FIXME
-        save_states_with: Any = None,  # FIXME
+        aggregate_with: Optional[StateLoader] = None,
+        save_states_with: Optional[StatePersister] = None,
         # TODO: maybe change this for kwargs
         metric_repository_options: Optional[Dict[str, Any]] = None,
         file_output_options: Optional[Dict[str, Any]] = None,
+        row_level_results: bool = False,
     ) -> VerificationResult:
         """
 
@@ -139,12 +372,15 @@ class VerificationSuite:
         required_analyzers:
            Can be used to enforce the calculation of some some metrics
            regardless of if there are constraints on them (optional)
-        aggregate_with: not implemented
+        aggregate_with:
             loader from which we retrieve initial states to aggregate (optional)
-        save_states_with: not implemented
+        save_states_with:
             persist resulting states for the configured analyzers (optional)
         metrics_repository_options:
             Options related to the MetricsRepository
+        row_level_results:
+            Whether to keep the outcome of each row of the constraints with row
+            level results (optional)
 
         Returns
         --------
@@ -158,7 +394,13 @@ class VerificationSuite:
         )
 
         # This rhis returns AnalysisContext
-        analysis_result = do_analysis_run(data, analyzers)
+        analysis_result = do_analysis_run(
+            data,
+            analyzers,
+            aggregate_with,
+            save_states_with,
+            row_level_results=row_level_results,
+        )
 
         verification_result = self.evaluate(checks, analysis_result)
 
@@ -177,6 +419,19 @@ class VerificationSuite:
         else:
             verification_status = max(cr.status for cr in check_results.values())
 
+        row_level_results = {}
+        for check in checks:
+            for c in check.constraints:
+                inner = c.inner if isinstance(c, ConstraintDecorator) else c
+                if not isinstance(inner, AnalysisBasedConstraint):
+                    continue
+                full_column = analysis_context.row_level_results.get(inner.analyzer)
+                if full_column is not None:
+                    row_level_results[c] = full_column
+
         return VerificationResult(
-            verification_status, check_results, analysis_context.metric_map
+            verification_status,
+            check_results,
+            analysis_context.metric_map,
+            row_level_results=row_level_results,
         )
@@ -46,6 +46,9 @@ setup(
     ],
     test_suite='tests',
     extras_require={
-        'testing': tests_require
+        'testing': tests_require,
+        'arrow': ['pyarrow>=7.0.0'],
+        'polars': ['polars>=1.0'],
+        'dask': ['dask[dataframe]>=2021.3.0'],
     },
 )